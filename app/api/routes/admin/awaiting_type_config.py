@@ -132,6 +132,9 @@ class CacheStatsResponse(BaseModel):
     db_loads: int
     invalidations: int
     cached_keys: int
+    stale_serves: int = 0
+    coalesced_loads: int = 0
+    load_errors: int = 0
 
 
 # =============================================================================
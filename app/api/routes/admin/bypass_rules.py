@@ -20,6 +20,7 @@ from sqlalchemy import desc, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.dependencies import get_organization_by_id, require_admin
+from app.core.cache.bypass_rule_index import bypass_rule_index
 from app.core.schemas.bypass_rule import (
     BypassRuleCreate,
     BypassRuleListResponse,
@@ -128,6 +129,7 @@ async def create_bypass_rule(
     )
     db.add(rule)
     await db.commit()
+    await bypass_rule_index.invalidate()
     await db.refresh(rule)
 
     return BypassRuleResponse(**rule.to_dict())
@@ -232,6 +234,7 @@ async def update_bypass_rule(
     rule.updated_at = datetime.now(UTC)
 
     await db.commit()
+    await bypass_rule_index.invalidate()
     await db.refresh(rule)
 
     return BypassRuleResponse(**rule.to_dict())
@@ -266,6 +269,7 @@ async def toggle_bypass_rule(
     rule.updated_at = datetime.now(UTC)
 
     await db.commit()
+    await bypass_rule_index.invalidate()
     await db.refresh(rule)
 
     return BypassRuleResponse(**rule.to_dict())
@@ -298,6 +302,7 @@ async def delete_bypass_rule(
 
     await db.delete(rule)
     await db.commit()
+    await bypass_rule_index.invalidate()
 
 
 @router.post("/{org_id}/bypass-rules/test", response_model=BypassRuleTestResponse)
@@ -389,6 +394,7 @@ async def reorder_bypass_rules(
             rules[rule_id].updated_at = datetime.now(UTC)
 
     await db.commit()
+    await bypass_rule_index.invalidate()
 
     # Return updated list
     stmt = (
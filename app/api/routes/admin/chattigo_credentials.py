@@ -412,10 +412,9 @@ async def update_chattigo_credentials(
         creds = await service.update_credentials(db, did, request)
         await db.commit()
 
-        # Invalidate token cache if credentials changed
-        if data.username or data.password:
-            factory = get_chattigo_adapter_factory()
-            await factory.token_cache.invalidate(did)
+        # Drop the pooled adapter and cached token so the update takes effect
+        factory = get_chattigo_adapter_factory()
+        await factory.invalidate(did)
 
         return _to_response(creds)
     except ChattigoNotFoundError as e:
@@ -461,9 +460,9 @@ async def delete_chattigo_credentials(
 
     await db.commit()
 
-    # Invalidate token cache
+    # Drop the pooled adapter and cached token
     factory = get_chattigo_adapter_factory()
-    await factory.token_cache.invalidate(did)
+    await factory.invalidate(did)
 
 
 # ============================================================
@@ -20,6 +20,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.dependencies import get_config_cache, get_organization_by_id, require_admin
+from app.core.cache.bypass_rule_index import bypass_rule_index
 from app.core.container import TenantConfigCache
 from app.database.async_db import get_async_db
 from app.models.db.tenancy import Organization, OrganizationUser, TenantConfig
@@ -194,6 +195,8 @@ async def update_tenant_config(
 
     # Invalidate Redis cache
     cache.invalidate(org_id)
+    # Bypass rules fall back to default_domain
+    await bypass_rule_index.invalidate()
 
     return TenantConfigResponse(**config.to_dict())
 
@@ -311,6 +314,8 @@ async def update_domains_config(
 
     # Invalidate Redis cache
     cache.invalidate(org_id)
+    # Bypass rules fall back to default_domain
+    await bypass_rule_index.invalidate()
 
     return {
         "enabled_domains": config.enabled_domains,
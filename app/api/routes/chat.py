@@ -215,6 +215,10 @@ async def process_chat_message_stream(request: ChatStreamRequest):
     Este endpoint utiliza Server-Sent Events (SSE) para enviar actualizaciones de progreso
     en tiempo real mientras los agentes especializados procesan la consulta.
 
+    Los eventos "token" traen deltas del texto de la respuesta a medida que el LLM
+    los genera. Son provisorios: el mensaje del evento "complete" es el definitivo
+    (el supervisor puede reemplazar la respuesta).
+
     Args:
         request: Datos del mensaje para procesamiento con streaming
 
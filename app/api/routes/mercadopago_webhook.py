@@ -34,7 +34,7 @@ from pydantic import BaseModel, model_validator
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.clients.mercado_pago_client import MercadoPagoClient, MercadoPagoError
-from app.clients.plex_client import PlexAPIError, PlexClient
+from app.clients.plex_client import PlexAPIError, get_pooled_plex_client
 from app.config.settings import get_settings
 from app.core.tenancy import PharmacyConfigService
 from app.database.async_db import get_async_db
@@ -360,8 +360,8 @@ async def mercadopago_webhook(
             f"customer_id={plex_customer_id}, amount=${amount}"
         )
 
-        # Register payment in PLEX
-        plex_client = PlexClient()
+        # Register payment in PLEX (pooled client: clears its cached balance for the customer)
+        plex_client = get_pooled_plex_client()
         async with plex_client:
             plex_result = await plex_client.register_payment(
                 customer_id=plex_customer_id,
@@ -9,6 +9,8 @@ WhatsApp Webhook Endpoints (via Chattigo).
 Chattigo ISV Integration Features:
 - Idempotency: Redis SET NX prevents duplicate processing (Section 4.2)
 - Fast Response: Returns 200 OK immediately, processes in background (Section 4.2)
+- Durable Queue: Messages are persisted to a Redis Stream consumed by a
+  consumer group, so work survives worker restarts and scales across pods
 - Multi-format: Supports WhatsApp standard and Chattigo ISV formats
 
 ENDPOINTS:
@@ -23,12 +25,17 @@ import logging
 from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request
 
 from app.config.settings import Settings, get_settings
+from app.core.conversation_dispatcher import get_conversation_dispatcher
+from app.core.message_coalescer import get_message_coalescer
 from app.database.async_db import get_async_db
 from app.services.langgraph_chatbot_service import LangGraphChatbotService
 from app.services.webhook import (
+    CoalesceWindowResolver,
     IdempotencyService,
     ProcessingState,
+    WebhookConsumerPool,
     WebhookProcessor,
+    WebhookQueue,
     WebhookTask,
 )
 
@@ -39,6 +46,11 @@ logger = logging.getLogger(__name__)
 _langgraph_service: LangGraphChatbotService | None = None
 # Idempotency Service (shared instance)
 _idempotency_service: IdempotencyService | None = None
+# Durable ingest queue and its consumers (shared instances)
+_webhook_queue: WebhookQueue | None = None
+_consumer_pool: WebhookConsumerPool | None = None
+# Per-tenant coalescing window lookup (shared instance)
+_coalesce_window_resolver: CoalesceWindowResolver | None = None
 
 
 async def _get_langgraph_service() -> LangGraphChatbotService:
@@ -63,6 +75,52 @@ def _get_idempotency_service() -> IdempotencyService:
     return _idempotency_service
 
 
+def _get_coalesce_window_resolver() -> CoalesceWindowResolver:
+    """Get or create CoalesceWindowResolver singleton."""
+    global _coalesce_window_resolver
+    if _coalesce_window_resolver is None:
+        _coalesce_window_resolver = CoalesceWindowResolver(
+            default_window=get_settings().WEBHOOK_COALESCE_WINDOW_MS / 1000
+        )
+    return _coalesce_window_resolver
+
+
+def _get_webhook_processor() -> WebhookProcessor:
+    """Build a WebhookProcessor wired to the shared services."""
+    return WebhookProcessor(
+        idempotency_service=_get_idempotency_service(),
+        langgraph_service_factory=_get_langgraph_service,
+        db_session_factory=get_async_db,
+        dispatcher=get_conversation_dispatcher(),
+        coalescer=get_message_coalescer(),
+        coalesce_window_resolver=_get_coalesce_window_resolver(),
+    )
+
+
+def _get_webhook_queue() -> WebhookQueue:
+    """Get or create WebhookQueue singleton."""
+    global _webhook_queue
+    if _webhook_queue is None:
+        _webhook_queue = WebhookQueue()
+    return _webhook_queue
+
+
+def get_webhook_consumer_pool() -> WebhookConsumerPool:
+    """
+    Get or create the WebhookConsumerPool singleton.
+
+    Started and stopped by BackgroundServiceManager.
+    """
+    global _consumer_pool
+    if _consumer_pool is None:
+        _consumer_pool = WebhookConsumerPool(
+            queue=_get_webhook_queue(),
+            processor=_get_webhook_processor(),
+            idempotency_service=_get_idempotency_service(),
+        )
+    return _consumer_pool
+
+
 # ============================================================
 # CHATTIGO WEBHOOK ENDPOINT
 # ============================================================
@@ -81,7 +139,8 @@ async def process_webhook(
     Implements Chattigo ISV requirements:
     1. Idempotency check (Redis SET NX) - prevents duplicate processing
     2. Fast response (<50ms) - returns 200 OK immediately
-    3. Background processing - heavy logic runs async
+    3. Background processing - heavy logic runs async via the Redis Streams
+       queue (falls back to in-process BackgroundTasks if Redis is down)
 
     Supports two payload formats:
     - WhatsApp Standard Format (object: "whatsapp_business_account")
@@ -161,19 +220,24 @@ async def process_webhook(
         settings=settings,
     )
 
-    processor = WebhookProcessor(
-        idempotency_service=idempotency,
-        langgraph_service_factory=_get_langgraph_service,
-        db_session_factory=get_async_db,
-    )
-    background_tasks.add_task(processor.process_in_background, task)
+    processing = "background"
+    if settings.WEBHOOK_QUEUE_ENABLED:
+        try:
+            await _get_webhook_queue().enqueue(task)
+            processing = "queued"
+        except Exception as e:
+            logger.warning(f"Webhook queue unavailable, using in-process background task: {e}")
+
+    if processing == "background":
+        processor = _get_webhook_processor()
+        background_tasks.add_task(processor.process_in_background, task)
 
     # 8. Return immediately per Chattigo ISV requirement
-    logger.info(f"Message accepted for processing: {message_id or 'no_id'}")
+    logger.info(f"Message accepted for processing: {message_id or 'no_id'} ({processing})")
     return {
         "status": "accepted",
         "message_id": message_id,
-        "processing": "background",
+        "processing": processing,
     }
 
 
@@ -300,11 +364,16 @@ async def health_check():
             if isinstance(health_status, dict)
             else ("healthy" if health_status else "unhealthy")
         )
-        return {
+        response = {
             "service_type": "langgraph",
             "status": overall_status,
             "details": health_status,
         }
+        if _consumer_pool is not None:
+            response["queue"] = await _consumer_pool.get_stats()
+        response["dispatcher"] = get_conversation_dispatcher().get_stats()
+        response["coalescer"] = get_message_coalescer().get_stats()
+        return response
     except Exception as e:
         logger.error(f"Health check failed: {e}", exc_info=True)
         return {"service_type": "langgraph", "status": "unhealthy", "error": str(e)}
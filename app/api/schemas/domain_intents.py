@@ -323,3 +323,6 @@ class CacheStatsResponse(BaseModel):
     db_loads: int
     invalidations: int
     cached_entries: int
+    stale_serves: int = 0
+    coalesced_loads: int = 0
+    load_errors: int = 0
@@ -271,6 +271,9 @@ class CacheStatsResponse(BaseModel):
     db_loads: int
     invalidations: int
     cached_organizations: int
+    stale_serves: int = 0
+    coalesced_loads: int = 0
+    load_errors: int = 0
 
 
 class CacheWarmRequest(BaseModel):
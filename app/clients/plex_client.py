@@ -12,12 +12,23 @@ Endpoints:
     - GET /wsplex/clientes - Customer search by phone/document/email/cuit
     - GET /wsplex/saldo_cliente - Balance query by customer ID
     - POST /wsplex/recibo - Create payment receipt
+
+Pooling:
+    Conversation flows use `get_pooled_plex_client()`, one long-lived client
+    per credential set. A pooled client keeps its HTTP connections open
+    across `async with` blocks, shares identical in-flight lookups between
+    concurrent callers and keeps balances for PLEX_BALANCE_CACHE_TTL seconds
+    (dropped when a payment or receipt is registered for the customer).
 """
 
 from __future__ import annotations
 
+import asyncio
+import copy
 import logging
 import re
+import time
+from collections.abc import Awaitable, Callable
 from datetime import date
 from decimal import Decimal
 from typing import TYPE_CHECKING, Any
@@ -29,10 +40,14 @@ if TYPE_CHECKING:
     from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config.settings import get_settings
+from app.core.infrastructure.monitoring import metrics_collector
 from app.domains.pharmacy.domain.entities.plex_customer import PlexCustomer
 
 logger = logging.getLogger(__name__)
 
+# Max balance entries kept per client (expired ones are pruned first)
+BALANCE_CACHE_MAX_ENTRIES = 1024
+
 
 class PlexAPIError(Exception):
     """
@@ -75,6 +90,9 @@ class PlexClient:
         PLEX_API_USER: HTTP Basic Auth username
         PLEX_API_PASS: HTTP Basic Auth password
         PLEX_API_TIMEOUT: Request timeout in seconds (default: 30)
+        PLEX_SEARCH_TIMEOUT: Timeout for customer searches in seconds
+        PLEX_BALANCE_TIMEOUT: Timeout for balance queries in seconds
+        PLEX_BALANCE_CACHE_TTL: Seconds a balance is reused (0 disables)
 
     Example:
         async with PlexClient() as client:
@@ -89,6 +107,7 @@ class PlexClient:
         username: str | None = None,
         password: str | None = None,
         timeout_seconds: int | None = None,
+        pooled: bool = False,
     ):
         """
         Initialize Plex ERP client.
@@ -98,26 +117,44 @@ class PlexClient:
             username: HTTP Basic Auth username (defaults to env PLEX_API_USER)
             password: HTTP Basic Auth password (defaults to env PLEX_API_PASS)
             timeout_seconds: Request timeout (defaults to env PLEX_API_TIMEOUT or 30)
+            pooled: Keep the HTTP client open when an `async with` block ends
+                (closed by `aclose()`). Use `get_pooled_plex_client()` instead.
         """
         settings = get_settings()
         self.base_url = (base_url or settings.PLEX_API_BASE_URL or "").rstrip("/")
         self.username = username or settings.PLEX_API_USER or ""
         self.password = password or settings.PLEX_API_PASS or ""
         self.timeout = timeout_seconds or settings.PLEX_API_TIMEOUT or 30
+        self.pooled = pooled
         self._client: httpx.AsyncClient | None = None
 
+        # Read endpoints get their own (shorter) timeouts; writes use self.timeout
+        self._operation_timeouts = {
+            "search_customer": min(self.timeout, settings.PLEX_SEARCH_TIMEOUT or self.timeout),
+            "get_customer_balance": min(self.timeout, settings.PLEX_BALANCE_TIMEOUT or self.timeout),
+        }
+        self.balance_cache_ttl = settings.PLEX_BALANCE_CACHE_TTL
+
+        # Identical in-flight lookups, and balances keyed by (customer, detailed, fecha_hasta)
+        self._inflight: dict[tuple[Any, ...], asyncio.Task[Any]] = {}
+        self._balance_cache: dict[tuple[int, bool, date], tuple[float, dict[str, Any] | None]] = {}
+        # Bumped when a customer's balance changes, so lookups started before are not cached
+        self._balance_generation: dict[int, int] = {}
+        self._stats = {"coalesced": 0, "balance_cache_hits": 0, "balance_cache_misses": 0}
+
     async def __aenter__(self) -> PlexClient:
-        """Initialize async client with HTTP Basic Auth."""
-        auth = httpx.BasicAuth(self.username, self.password)
-        self._client = httpx.AsyncClient(
-            base_url=self.base_url,
-            timeout=httpx.Timeout(self.timeout),
-            auth=auth,
-            headers={
-                "Accept": "application/json",
-                "User-Agent": "Aynux-Pharmacy-Bot/1.0",
-            },
-        )
+        """Initialize async client with HTTP Basic Auth (reused while open)."""
+        if self._client is None or self._client.is_closed:
+            auth = httpx.BasicAuth(self.username, self.password)
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=httpx.Timeout(self.timeout),
+                auth=auth,
+                headers={
+                    "Accept": "application/json",
+                    "User-Agent": "Aynux-Pharmacy-Bot/1.0",
+                },
+            )
         return self
 
     async def __aexit__(
@@ -126,9 +163,15 @@ class PlexClient:
         exc_val: BaseException | None,
         exc_tb: Any,
     ) -> None:
-        """Close async client."""
-        if self._client:
-            await self._client.aclose()
+        """Close async client (pooled clients stay open)."""
+        if not self.pooled:
+            await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close the HTTP client and its connections."""
+        client, self._client = self._client, None
+        if client is not None:
+            await client.aclose()
 
     def _get_client(self) -> httpx.AsyncClient:
         """Get the async client, raising error if not initialized."""
@@ -166,8 +209,6 @@ class PlexClient:
         Raises:
             PlexAPIError: On API errors
         """
-        client = self._get_client()
-
         # Build query params based on priority
         params: dict[str, str] = {}
         if customer_id is not None:
@@ -187,10 +228,16 @@ class PlexClient:
             logger.warning("search_customer called without any criteria")
             return []
 
+        self._get_client()
+        key = ("search_customer", tuple(sorted(params.items())))
+        customers = await self._coalesce(key, lambda: self._fetch_customers(params))
+        return list(customers)
+
+    async def _fetch_customers(self, params: dict[str, str]) -> list[PlexCustomer]:
+        """Run a customer search request and unwrap its response."""
         try:
             logger.info(f"Plex customer search: params={params}")
-            response = await client.get("/clientes", params=params)
-            response.raise_for_status()
+            response = await self._send("search_customer", "GET", "/clientes", params=params)
 
             data = response.json()
             logger.debug(f"Plex search response: {data}")
@@ -255,21 +302,41 @@ class PlexClient:
         Raises:
             PlexAPIError: On API errors
         """
-        client = self._get_client()
+        self._get_client()
 
         if fecha_hasta is None:
             fecha_hasta = date.today()
 
+        cache_key = (customer_id, detailed, fecha_hasta)
+        cached = self._balance_cache.get(cache_key)
+        if cached is not None and cached[0] > time.monotonic():
+            self._stats["balance_cache_hits"] += 1
+            metrics_collector.increment("plex_balance_cache_total", labels={"result": "hit"})
+            return copy.deepcopy(cached[1])
+        self._stats["balance_cache_misses"] += 1
+        metrics_collector.increment("plex_balance_cache_total", labels={"result": "miss"})
+
         params = {
             "idcliente": str(customer_id),
             "fecha_hasta": fecha_hasta.strftime("%Y%m%d"),
             "detallado": "S" if detailed else "N",
         }
 
+        # A payment registered meanwhile bumps the generation: later callers
+        # don't join this lookup and its result is not cached
+        generation = self._balance_generation.get(customer_id, 0)
+        key = ("get_customer_balance", cache_key, generation)
+        balance = await self._coalesce(key, lambda: self._fetch_balance(customer_id, params))
+
+        if self.balance_cache_ttl > 0 and self._balance_generation.get(customer_id, 0) == generation:
+            self._store_balance(cache_key, balance)
+        return copy.deepcopy(balance)
+
+    async def _fetch_balance(self, customer_id: int, params: dict[str, str]) -> dict[str, Any] | None:
+        """Run a balance request and parse its amounts and dates."""
         try:
             logger.info(f"Plex balance query: customer_id={customer_id}")
-            response = await client.get("/saldo_cliente", params=params)
-            response.raise_for_status()
+            response = await self._send("get_customer_balance", "GET", "/saldo_cliente", params=params)
 
             data = response.json()
             logger.debug(f"Plex balance response: {data}")
@@ -365,7 +432,7 @@ class PlexClient:
         Raises:
             PlexAPIError: On API errors
         """
-        client = self._get_client()
+        self._get_client()
 
         if fecha is None:
             fecha = date.today()
@@ -381,8 +448,7 @@ class PlexClient:
 
         try:
             logger.info(f"Plex create receipt: customer_id={customer_id}, amount={amount}")
-            response = await client.post("/recibo", json=payload)
-            response.raise_for_status()
+            response = await self._send("create_receipt", "POST", "/recibo", json=payload)
 
             data = response.json()
             logger.info(f"Plex receipt created: {data}")
@@ -396,6 +462,9 @@ class PlexClient:
             raise PlexConnectionError(f"Connection error (VPN?): {e}") from e
         except Exception as e:
             raise PlexAPIError("UNEXPECTED", str(e)) from e
+        finally:
+            # Also on errors: the receipt may have been created before a timeout
+            self.invalidate_balance(customer_id)
 
         return {}
 
@@ -438,7 +507,7 @@ class PlexClient:
                 )
                 # result["content"]["comprobante"] = "RC X 0001-00016790"
         """
-        client = self._get_client()
+        self._get_client()
 
         payload = {
             "request": {
@@ -456,8 +525,7 @@ class PlexClient:
                 f"Plex register payment: customer_id={customer_id}, "
                 f"amount={amount}, operation={operation_number}"
             )
-            response = await client.post("/saldo_cliente", json=payload)
-            response.raise_for_status()
+            response = await self._send("register_payment", "POST", "/saldo_cliente", json=payload)
 
             data = response.json()
 
@@ -487,6 +555,9 @@ class PlexClient:
             raise
         except Exception as e:
             raise PlexAPIError("UNEXPECTED", str(e)) from e
+        finally:
+            # Also on errors: the payment may have been applied before a timeout
+            self.invalidate_balance(customer_id)
 
         return {}
 
@@ -518,7 +589,7 @@ class PlexClient:
         Raises:
             PlexAPIError: On API errors or if endpoint not supported
         """
-        client = self._get_client()
+        self._get_client()
 
         payload = {
             "nombre": nombre.upper(),
@@ -533,8 +604,7 @@ class PlexClient:
 
         try:
             logger.info(f"Plex create customer: nombre={nombre}, doc={documento}")
-            response = await client.post("/clientes", json=payload)
-            response.raise_for_status()
+            response = await self._send("create_customer", "POST", "/clientes", json=payload)
 
             data = response.json()
             logger.info(f"Plex customer created: {data}")
@@ -578,10 +648,118 @@ class PlexClient:
             logger.error(f"Plex connection test failed: {e}")
             return False
 
+    # =========================================================================
+    # Balance Cache
+    # =========================================================================
+
+    def invalidate_balance(self, customer_id: int) -> None:
+        """
+        Drop cached balances of a customer.
+
+        Lookups already in flight are neither cached nor joined afterwards.
+
+        Args:
+            customer_id: Plex internal customer ID
+        """
+        self._balance_generation[customer_id] = self._balance_generation.get(customer_id, 0) + 1
+        for key in [key for key in self._balance_cache if key[0] == customer_id]:
+            del self._balance_cache[key]
+
+    def _store_balance(self, key: tuple[int, bool, date], balance: dict[str, Any] | None) -> None:
+        """Cache a balance, pruning expired and then oldest entries when full."""
+        now = time.monotonic()
+        if len(self._balance_cache) >= BALANCE_CACHE_MAX_ENTRIES:
+            for expired in [k for k, (expires_at, _) in self._balance_cache.items() if expires_at <= now]:
+                del self._balance_cache[expired]
+            while len(self._balance_cache) >= BALANCE_CACHE_MAX_ENTRIES:
+                del self._balance_cache[next(iter(self._balance_cache))]
+        self._balance_cache[key] = (now + self.balance_cache_ttl, copy.deepcopy(balance))
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get client statistics (connection state, coalescing, balance cache)."""
+        return {
+            **self._stats,
+            "base_url": self.base_url,
+            "pooled": self.pooled,
+            "open": self._client is not None and not self._client.is_closed,
+            "in_flight": len(self._inflight),
+            "balance_cache_size": len(self._balance_cache),
+            "balance_cache_ttl": self.balance_cache_ttl,
+        }
+
     # =========================================================================
     # Helper Methods
     # =========================================================================
 
+    async def _send(self, operation: str, method: str, path: str, **kwargs: Any) -> httpx.Response:
+        """
+        Send a request with the operation's timeout, recording metrics.
+
+        Args:
+            operation: Client method name (metric label and timeout key)
+            method: HTTP method
+            path: Endpoint path
+            **kwargs: httpx request arguments (params, json)
+
+        Returns:
+            Successful response
+
+        Raises:
+            httpx.HTTPStatusError: On non-2xx responses
+            httpx.RequestError: On network errors and timeouts
+        """
+        client = self._get_client()
+        timeout = self._operation_timeouts.get(operation, self.timeout)
+        outcome = "error"
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, path, timeout=timeout, **kwargs)
+            response.raise_for_status()
+            outcome = "success"
+            return response
+        except httpx.HTTPStatusError as e:
+            outcome = f"http_{e.response.status_code}"
+            raise
+        except httpx.TimeoutException:
+            outcome = "timeout"
+            raise
+        finally:
+            labels = {"operation": operation}
+            metrics_collector.increment("plex_requests_total", labels={**labels, "outcome": outcome})
+            metrics_collector.observe("plex_request_duration_seconds", time.perf_counter() - start, labels)
+
+    async def _coalesce(self, key: tuple[Any, ...], fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Share one in-flight request between identical concurrent lookups.
+
+        The request runs as a task, so a caller being cancelled does not
+        cancel it for the others.
+
+        Args:
+            key: Lookup identity (operation and parameters)
+            fetch: Factory of the request coroutine
+
+        Returns:
+            Result of the shared request
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fetch())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish_inflight(key, done))
+        else:
+            self._stats["coalesced"] += 1
+            metrics_collector.increment("plex_coalesced_requests_total", labels={"operation": str(key[0])})
+        return await asyncio.shield(task)
+
+    def _finish_inflight(self, key: tuple[Any, ...], task: asyncio.Task[Any]) -> None:
+        """Forget a finished lookup, marking its error as retrieved."""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()
+
+
     def _normalize_phone(self, phone: str) -> str:
         """
         Normalize phone number for Plex search.
@@ -683,7 +861,7 @@ async def get_plex_client() -> PlexClient:
     This is a dependency injection helper for FastAPI.
 
     Returns:
-        PlexClient instance (use as context manager)
+        Pooled PlexClient instance (use as context manager)
 
     Example:
         @router.get("/customer")
@@ -694,7 +872,7 @@ async def get_plex_client() -> PlexClient:
             async with client:
                 return await client.search_customer(phone=phone)
     """
-    return PlexClient()
+    return get_pooled_plex_client()
 
 
 async def get_plex_client_for_org(
@@ -712,7 +890,7 @@ async def get_plex_client_for_org(
         organization_id: Organization UUID to load credentials for
 
     Returns:
-        PlexClient configured with organization's credentials
+        Pooled PlexClient configured with organization's credentials
 
     Raises:
         CredentialNotFoundError: If no credentials found for organization
@@ -729,8 +907,53 @@ async def get_plex_client_for_org(
     credential_service = get_tenant_credential_service()
     creds = await credential_service.get_plex_credentials(db, organization_id)
 
-    return PlexClient(
+    return get_pooled_plex_client(
         base_url=creds.api_url,
         username=creds.username,
         password=creds.password,
     )
+
+
+# Pooled clients keyed by (base_url, username, password)
+_plex_clients: dict[tuple[str, str, str], PlexClient] = {}
+
+
+def get_pooled_plex_client(
+    base_url: str | None = None,
+    username: str | None = None,
+    password: str | None = None,
+) -> PlexClient:
+    """
+    Get the long-lived Plex client of a credential set.
+
+    All flows using the same credentials share its HTTP connections, its
+    in-flight lookups and its balance cache. `async with` does not close it;
+    `close_plex_clients()` does on shutdown.
+
+    Args:
+        base_url: Base URL for Plex API (defaults to env PLEX_API_BASE_URL)
+        username: HTTP Basic Auth username (defaults to env PLEX_API_USER)
+        password: HTTP Basic Auth password (defaults to env PLEX_API_PASS)
+
+    Returns:
+        Pooled PlexClient (use as context manager)
+    """
+    client = PlexClient(base_url=base_url, username=username, password=password, pooled=True)
+    key = (client.base_url, client.username, client.password)
+    return _plex_clients.setdefault(key, client)
+
+
+async def close_plex_clients() -> None:
+    """Close and forget all pooled Plex clients."""
+    clients = list(_plex_clients.values())
+    _plex_clients.clear()
+    for client in clients:
+        try:
+            await client.aclose()
+        except Exception as e:
+            logger.warning(f"Error closing Plex client for {client.base_url}: {e}")
+
+
+def get_plex_client_stats() -> list[dict[str, Any]]:
+    """Get statistics of all pooled Plex clients."""
+    return [client.get_stats() for client in _plex_clients.values()]
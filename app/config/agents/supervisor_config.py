@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic import BaseModel, Field
 
 
@@ -16,6 +18,7 @@ class SupervisorConfig(BaseModel):
     - Lower skip_threshold (0.90) for faster responses
     - Balanced weights (50/50) for heuristic/LLM
     - Longer timeout (60s) with asyncio.wait_for protection
+    - Sampled mode: LLM analysis runs in the background on a sample of turns
     """
 
     # Control de flujo
@@ -72,6 +75,31 @@ class SupervisorConfig(BaseModel):
         le=1.0,
         description="Weight of LLM score in combined evaluation (0.5 = 50%)",
     )
+    llm_analysis_mode: Literal["sampled", "inline"] = Field(
+        default="sampled",
+        description=(
+            "sampled: heuristic scoring inline, LLM analysis out-of-band on a sample "
+            "(results in metrics); inline: LLM analysis awaited and combined every turn"
+        ),
+    )
+    llm_analysis_sample_rate: float = Field(
+        default=0.1,
+        ge=0.0,
+        le=1.0,
+        description="Fraction of eligible turns analyzed by the LLM in sampled mode",
+    )
+    llm_analysis_max_pending: int = Field(
+        default=16,
+        ge=1,
+        le=256,
+        description="Max background LLM analyses running at once (extra samples are dropped)",
+    )
+    enhancement_score_floor: float = Field(
+        default=0.4,
+        ge=0.0,
+        le=1.0,
+        description="In sampled mode, enhance responses only when the heuristic score is below this",
+    )
 
     # Quality sub-thresholds
     completeness_threshold: float = Field(
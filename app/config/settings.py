@@ -74,6 +74,43 @@ class Settings(BaseSettings):
         "https://channels.chattigo.com/bsp-cloud-chattigo-isv",
         description="Chattigo API base URL (messages sent to /v15.0/{did}/messages)",
     )
+    # Outbound rate limits per DID (token buckets; see app/integrations/chattigo/rate_limiter.py)
+    CHATTIGO_MESSAGES_PER_SECOND: float = Field(20.0, description="Sustained outbound messages per second per DID")
+    CHATTIGO_MESSAGING_TIER: str = Field(
+        "tier_1k",
+        description="WhatsApp messaging tier of the DIDs (tier_1k, tier_10k, tier_100k, unlimited)",
+    )
+    # Outbound send queue (ordered per recipient, retries 429 and connection errors)
+    CHATTIGO_SEND_MAX_CONCURRENCY: int = Field(32, description="Max outbound sends in flight per process")
+    CHATTIGO_SEND_MAX_PER_DID: int = Field(16, description="Max outbound sends in flight per DID")
+    CHATTIGO_SEND_MAX_ATTEMPTS: int = Field(3, description="Attempts per outbound message on 429/connection errors")
+
+    # Webhook Ingest Queue (Redis Streams)
+    # When enabled, the webhook appends messages to a Redis Stream consumed by a
+    # consumer group (at-least-once, dead-lettering, horizontal scaling).
+    # Falls back to in-process BackgroundTasks if Redis is unavailable.
+    WEBHOOK_QUEUE_ENABLED: bool = Field(True, description="Use Redis Streams queue for webhook processing")
+    WEBHOOK_QUEUE_STREAM: str = Field("webhook:ingest", description="Redis Stream key for webhook ingest")
+    WEBHOOK_QUEUE_GROUP: str = Field("webhook-processors", description="Consumer group name")
+    WEBHOOK_QUEUE_CONSUMERS: int = Field(2, description="Stream consumers per worker process")
+    WEBHOOK_QUEUE_CONSUMER_CONCURRENCY: int = Field(8, description="Max in-flight messages per consumer")
+    WEBHOOK_QUEUE_VISIBILITY_TIMEOUT: int = Field(
+        120, description="Seconds before an un-acked message is re-claimed by another consumer"
+    )
+    WEBHOOK_QUEUE_MAX_DELIVERIES: int = Field(3, description="Deliveries before a message is dead-lettered")
+    WEBHOOK_QUEUE_MAXLEN: int = Field(100_000, description="Approximate max length of ingest/dead-letter streams")
+
+    # Conversation Dispatcher (per-process ordering and fairness for webhook processing)
+    # FIFO per conversation, bounded parallelism across conversations, round-robin per tenant (DID)
+    WEBHOOK_DISPATCH_MAX_CONCURRENCY: int = Field(32, description="Max conversations processed concurrently")
+    WEBHOOK_DISPATCH_MAX_PER_TENANT: int = Field(8, description="Max concurrent conversations per tenant")
+    WEBHOOK_DISPATCH_MAX_PENDING: int = Field(10_000, description="Max messages waiting in the dispatcher")
+
+    # Message Coalescing (merge rapid-fire text messages into one graph invocation)
+    # Per-tenant override: TenantConfig.advanced_config["message_coalesce_window_ms"] (0 disables)
+    WEBHOOK_COALESCE_WINDOW_MS: int = Field(1000, description="Quiet period before buffered texts are processed")
+    WEBHOOK_COALESCE_MAX_WAIT_MS: int = Field(4000, description="Max time a message waits in the buffer")
+    WEBHOOK_COALESCE_MAX_MESSAGES: int = Field(10, description="Max messages merged into one turn")
 
     # PostgreSQL Database Settings
     DB_HOST: str = Field("localhost", description="Host de PostgreSQL")
@@ -89,12 +126,68 @@ class Settings(BaseSettings):
     DB_POOL_RECYCLE: int = Field(3600, description="Reciclar conexiones cada X segundos")
     DB_POOL_TIMEOUT: int = Field(30, description="Timeout para obtener conexión del pool")
 
+    # LangGraph checkpointer connection pool (psycopg AsyncConnectionPool)
+    CHECKPOINT_POOL_MIN_SIZE: int = Field(2, description="Connections kept open for checkpoint I/O")
+    CHECKPOINT_POOL_MAX_SIZE: int = Field(20, description="Max concurrent checkpoint connections")
+    CHECKPOINT_POOL_TIMEOUT: float = Field(10.0, description="Max seconds to wait for a checkpoint connection")
+    CHECKPOINT_POOL_MAX_IDLE: float = Field(300.0, description="Close idle connections above min size after X seconds")
+    CHECKPOINT_POOL_HEALTH_CHECK: bool = Field(True, description="Check connections before handing them out")
+    CHECKPOINT_STATEMENT_TIMEOUT_MS: int = Field(
+        5000,
+        description="statement_timeout for checkpoint queries (0 disables)",
+    )
+
+    # LangGraph checkpoint compaction
+    # Older turns are kept only in the HistoryAgent rolling summary
+    CHECKPOINT_MESSAGE_WINDOW: int = Field(40, description="Messages kept in graph state per thread (0 disables)")
+    CHECKPOINT_MESSAGE_WINDOW_SLACK: int = Field(10, description="Extra messages tolerated before trimming")
+    CHECKPOINT_KEEP_PER_THREAD: int = Field(1, description="Most recent checkpoints kept per thread namespace")
+    CHECKPOINT_RETENTION_DAYS: int = Field(30, description="Delete threads idle for more than X days (0 disables)")
+    CHECKPOINT_COMPACTION_INTERVAL: int = Field(3600, description="Seconds between compaction sweeps (0 disables)")
+    CHECKPOINT_COMPACTION_BATCH: int = Field(500, description="Max threads pruned per compaction sweep")
+
+    # Conversation write-behind (history summary + context/message persistence off the response path)
+    CONVERSATION_WRITE_BEHIND_ENABLED: bool = Field(True, description="Persist conversation turns asynchronously")
+    CONVERSATION_WRITE_BEHIND_STREAM: str = Field("conversation:writes", description="Redis Stream for pending writes")
+    CONVERSATION_WRITE_BEHIND_GROUP: str = Field("conversation-writers", description="Consumer group name")
+    CONVERSATION_WRITE_BEHIND_BATCH_SIZE: int = Field(100, description="Max turns persisted per DB transaction")
+    CONVERSATION_WRITE_BEHIND_VISIBILITY_TIMEOUT: int = Field(
+        60, description="Seconds before an un-acked write is re-claimed by another worker"
+    )
+    CONVERSATION_WRITE_BEHIND_MAX_DELIVERIES: int = Field(5, description="Deliveries before a write is dead-lettered")
+    CONVERSATION_WRITE_BEHIND_MAXLEN: int = Field(100_000, description="Approximate max length of the write stream")
+
     # Redis Settings
     REDIS_HOST: str = Field("localhost", description="Host de Redis")
     REDIS_PORT: int = Field(6379, description="Puerto de Redis")
     REDIS_DB: int = Field(0, description="Base de datos de Redis")
     REDIS_PASSWORD: str | None = Field(None, description="Contraseña de Redis")
 
+    # Cache invalidation bus (Redis pub/sub fan-out of config cache invalidations)
+    # While subscribed, L1 memory caches use CACHE_L1_TTL_SECONDS; otherwise each
+    # cache falls back to its own short TTL (60s).
+    CACHE_INVALIDATION_BUS_ENABLED: bool = Field(True, description="Broadcast config cache invalidations")
+    CACHE_INVALIDATION_CHANNEL: str = Field("cache:invalidation", description="Redis pub/sub channel")
+    CACHE_L1_TTL_SECONDS: int = Field(3600, description="L1 memory TTL while the invalidation bus is connected")
+
+    # Semantic classification cache (LLM intent/domain results reused for similar messages)
+    SEMANTIC_CACHE_ENABLED: bool = Field(True, description="Reuse LLM classifications of similar messages")
+    SEMANTIC_CACHE_SIMILARITY_THRESHOLD: float = Field(
+        0.92, description="Min cosine similarity between message embeddings for a hit"
+    )
+    SEMANTIC_CACHE_MAX_ENTRIES: int = Field(2000, description="Max entries per tenant and analyzer (LRU)")
+    SEMANTIC_CACHE_TTL_SECONDS: int = Field(86400, description="Max age of a cached classification")
+    SEMANTIC_CACHE_MIN_CONFIDENCE: float = Field(0.7, description="Min LLM confidence for a result to be cached")
+    SEMANTIC_CACHE_EMBED_TIMEOUT_MS: float = Field(
+        300.0, description="Lookups whose embedding takes longer count as misses"
+    )
+
+    # Pharmacy intent scoring: add similarity to each intent's reference vector
+    # (DomainIntentCache similarity index) on top of lemma/phrase matches
+    PHARMACY_INTENT_SIMILARITY_ENABLED: bool = Field(
+        False, description="Add reference-vector similarity to pharmacy intent scores"
+    )
+
     # File Upload Settings
     MAX_FILE_SIZE: int = Field(10 * 1024 * 1024, description="Tamaño máximo de archivo en bytes (10MB)")
     # NoDecode prevents pydantic-settings from trying json.loads() - we parse manually
@@ -114,12 +207,48 @@ class Settings(BaseSettings):
     VLLM_REQUEST_TIMEOUT: int = Field(120, description="vLLM request timeout in seconds")
     VLLM_MAX_RETRIES: int = Field(3, description="Max retries for vLLM API calls")
 
+    # LLM concurrency governor (adaptive per-model limit, priority classes)
+    LLM_GOVERNOR_ENABLED: bool = Field(True, description="Route vLLM calls through the concurrency governor")
+    LLM_GOVERNOR_INITIAL_LIMIT: int = Field(8, description="Starting concurrent calls per model")
+    LLM_GOVERNOR_MIN_LIMIT: int = Field(2, description="Lowest concurrency limit after backoffs")
+    LLM_GOVERNOR_MAX_LIMIT: int = Field(64, description="Highest concurrency limit after increases")
+    LLM_GOVERNOR_LATENCY_TARGET_S: float = Field(
+        8.0, description="Call latency (time to first token for streams) above which the limit backs off"
+    )
+    LLM_GOVERNOR_MAX_WAIT_INTERACTIVE_S: float = Field(30.0, description="Max queue wait of user-facing calls")
+    LLM_GOVERNOR_MAX_WAIT_BACKGROUND_S: float = Field(120.0, description="Max queue wait of background calls")
+    LLM_GOVERNOR_MAX_WAIT_BATCH_S: float = Field(600.0, description="Max queue wait of batch calls")
+
     # TEI Embeddings Configuration (Text Embeddings Inference - BAAI/bge-m3 with 1024 dimensions)
     TEI_BASE_URL: str = Field("http://localhost:7997", description="TEI embedding server URL")
     TEI_MODEL: str = Field("BAAI/bge-m3", description="TEI embedding model")
     TEI_EMBEDDING_DIMENSION: int = Field(1024, description="Embedding dimension (1024 for bge-m3)")
     TEI_REQUEST_TIMEOUT: int = Field(30, description="TEI request timeout in seconds")
 
+    # Embedding cache (content hash of model + text; in-process LRU + Redis)
+    EMBEDDING_CACHE_ENABLED: bool = Field(True, description="Cache TEI embeddings by content hash")
+    EMBEDDING_CACHE_MAX_ENTRIES: int = Field(5000, description="In-process LRU size (~4 KB per 1024-dim vector)")
+    EMBEDDING_CACHE_TTL: int = Field(604800, description="Redis TTL for cached embeddings in seconds")
+
+    # Embedding micro-batching (concurrent single-text requests merged into one /embed call)
+    EMBEDDING_BATCH_MAX_SIZE: int = Field(32, description="Max texts per batched /embed call")
+    EMBEDDING_BATCH_WAIT_MS: float = Field(5.0, description="Max time a text waits for its batch (0 disables)")
+
+    # spaCy NLP service (parsing in worker processes, micro-batched with nlp.pipe)
+    NLP_PROCESS_WORKERS: int = Field(2, description="spaCy worker processes (0 = one background thread in-process)")
+    NLP_PRELOAD_MODELS: str = Field(
+        "es_core_news_sm,en_core_web_sm", description="Comma-separated spaCy models loaded by each worker at start"
+    )
+    NLP_BATCH_MAX_SIZE: int = Field(32, description="Max texts per nlp.pipe batch")
+    NLP_BATCH_WAIT_MS: float = Field(2.0, description="Max time a text waits for its batch (0 disables)")
+
+    # Shared HTTP connection pool (TEI, vLLM health checks, WhatsApp Graph API)
+    HTTP_POOL_MAX_CONNECTIONS: int = Field(100, description="Max open connections in the shared pool")
+    HTTP_POOL_MAX_KEEPALIVE: int = Field(20, description="Max idle keep-alive connections")
+    HTTP_POOL_KEEPALIVE_EXPIRY: float = Field(30.0, description="Seconds an idle connection is kept alive")
+    HTTP_POOL_HTTP2: bool = Field(True, description="Use HTTP/2 when the 'h2' package is installed")
+    HTTP_POOL_DEFAULT_TIMEOUT: float = Field(30.0, description="Default request timeout in seconds")
+
     # LLM Streaming Configuration
     LLM_STREAMING_ENABLED: bool = Field(False, description="Enable streaming for web responses")
     LLM_STREAMING_FOR_WEBHOOK: bool = Field(False, description="Enable streaming for webhook (usually False)")
@@ -129,6 +258,14 @@ class Settings(BaseSettings):
         0.6, description="Minimum similarity threshold for pgvector search (0.0-1.0)"
     )
 
+    # Tenant RAG ANN search (per-tenant partial HNSW indexes on tenant_documents)
+    RAG_HNSW_M: int = Field(16, description="HNSW graph degree for tenant indexes")
+    RAG_HNSW_EF_CONSTRUCTION: int = Field(64, description="HNSW build-time candidate list size")
+    RAG_HNSW_EF_SEARCH: int = Field(80, description="HNSW query-time candidate list size (recall vs latency)")
+    RAG_HNSW_MIN_DOCUMENTS: int = Field(1000, description="Tenants below this size use exact scans")
+    RAG_HYBRID_CANDIDATES: int = Field(50, description="Top-K candidates per retriever before fusion")
+    RAG_HYBRID_RRF_K: int = Field(60, description="Reciprocal Rank Fusion constant")
+
     # Knowledge Base Configuration
     KNOWLEDGE_BASE_ENABLED: bool = Field(True, description="Enable company knowledge base with RAG")
     # Note: Knowledge base uses TEI (BAAI/bge-m3, 1024 dims) for embeddings
@@ -180,6 +317,11 @@ class Settings(BaseSettings):
     PLEX_API_USER: str = Field("fciacuyo", description="HTTP Basic Auth username for Plex API")
     PLEX_API_PASS: str = Field("cuyo202$", description="HTTP Basic Auth password for Plex API")
     PLEX_API_TIMEOUT: int = Field(30, description="Timeout for Plex API requests in seconds")
+    PLEX_SEARCH_TIMEOUT: int = Field(10, description="Timeout for Plex customer searches in seconds")
+    PLEX_BALANCE_TIMEOUT: int = Field(15, description="Timeout for Plex balance queries in seconds")
+    PLEX_BALANCE_CACHE_TTL: int = Field(
+        30, description="Seconds a Plex balance is reused across nodes (0 disables; cleared on payment)"
+    )
 
     # Receipt Generation Settings
     # Note: Mercado Pago and pharmacy info are now stored per-organization in the database
@@ -3,7 +3,9 @@ Core architecture components for the WhatsApp bot system
 """
 
 from .circuit_breaker import CircuitBreaker, ResilientLLMService, circuit_breaker
+from .conversation_dispatcher import ConversationDispatcher, get_conversation_dispatcher
 from .message_batcher import BatchMessage, WhatsAppMessageBatcher
+from .message_coalescer import MessageCoalescer, get_message_coalescer
 from .multilayer_cache import AynuxResponseCache, CacheLayer, MultiLayerCache
 from .performance_monitor import MetricType, PerformanceMonitor
 
@@ -13,6 +15,10 @@ __all__ = [
     "circuit_breaker",
     "WhatsAppMessageBatcher",
     "BatchMessage",
+    "ConversationDispatcher",
+    "get_conversation_dispatcher",
+    "MessageCoalescer",
+    "get_message_coalescer",
     "MultiLayerCache",
     "AynuxResponseCache",
     "CacheLayer",
@@ -19,13 +19,15 @@ class BackgroundServiceManager:
     Manages background services lifecycle.
 
     Handles starting, stopping, and monitoring of background tasks
-    like DUX synchronization.
+    like DUX synchronization, the webhook queue consumers,
+    LangGraph checkpoint compaction and the cache invalidation bus.
     """
 
     def __init__(self) -> None:
         """Initialize background service manager."""
         self._background_tasks: set[asyncio.Task[Any]] = set()
         self._sync_service: Any = None
+        self._webhook_consumer_pool: Any = None
         self._running = False
 
     @property
@@ -47,6 +49,23 @@ class BackgroundServiceManager:
         else:
             logger.info("DUX sync disabled or not configured")
 
+        # Start webhook queue consumers if enabled
+        if settings.CHATTIGO_ENABLED and settings.WEBHOOK_QUEUE_ENABLED:
+            await self._start_webhook_consumers()
+        else:
+            logger.info("Webhook queue disabled - using in-process BackgroundTasks")
+
+        # Start checkpoint compaction sweeps if enabled
+        if settings.CHECKPOINT_COMPACTION_INTERVAL > 0:
+            self._start_checkpoint_compaction()
+        else:
+            logger.info("Checkpoint compaction disabled")
+
+        # Subscribe to cross-instance cache invalidations
+        from app.core.cache.invalidation_bus import cache_invalidation_bus
+
+        await cache_invalidation_bus.start()
+
         self._running = True
         logger.info("Background services started")
 
@@ -69,10 +88,49 @@ class BackgroundServiceManager:
 
         self._background_tasks.clear()
 
+        # Stop the cache invalidation subscriber (L1 caches fall back to short TTLs)
+        from app.core.cache.invalidation_bus import cache_invalidation_bus
+
+        await cache_invalidation_bus.stop()
+
         # Stop DUX sync service
         if self._sync_service:
             await self._stop_dux_sync()
 
+        # Stop webhook queue consumers (un-acked messages are re-claimed by other workers)
+        if self._webhook_consumer_pool:
+            await self._stop_webhook_consumers()
+
+        # Let sampled supervisor quality audits finish (metrics only)
+        from app.core.graph.agents.supervisor.quality_auditor import drain_quality_auditors
+
+        await drain_quality_auditors()
+
+        # Finish the conversation write-behind batch in progress
+        from app.services.conversation_write_behind import shutdown_conversation_write_behind
+
+        await shutdown_conversation_write_behind()
+
+        # Stop the spaCy worker processes
+        from app.integrations.nlp import shutdown_nlp_service
+
+        await shutdown_nlp_service()
+
+        # Close pooled Plex ERP connections
+        from app.clients.plex_client import close_plex_clients
+
+        await close_plex_clients()
+
+        # Stop HCWeb availability prefetch
+        from app.domains.medical_appointments.infrastructure.external.hcweb.catalog import close_hcweb_catalogs
+
+        await close_hcweb_catalogs()
+
+        # Let queued WhatsApp replies finish and drop pooled Chattigo adapters
+        from app.integrations.chattigo.send_queue import shutdown_chattigo_send_queue
+
+        await shutdown_chattigo_send_queue()
+
         self._running = False
         logger.info("Background services stopped")
 
@@ -118,6 +176,47 @@ class BackgroundServiceManager:
         except Exception as e:
             logger.error(f"Error stopping DUX sync service: {e}", exc_info=True)
 
+    async def _start_webhook_consumers(self) -> None:
+        """Start Redis Streams consumers for the webhook ingest queue."""
+        try:
+            from app.api.routes.webhook import get_webhook_consumer_pool
+
+            self._webhook_consumer_pool = get_webhook_consumer_pool()
+            await self._webhook_consumer_pool.start()
+        except Exception as e:
+            logger.error(f"Failed to start webhook queue consumers: {e}", exc_info=True)
+            self._webhook_consumer_pool = None
+
+    async def _stop_webhook_consumers(self) -> None:
+        """Stop webhook queue consumers."""
+        try:
+            if self._webhook_consumer_pool:
+                await self._webhook_consumer_pool.stop()
+                self._webhook_consumer_pool = None
+        except Exception as e:
+            logger.error(f"Error stopping webhook queue consumers: {e}", exc_info=True)
+
+    def _start_checkpoint_compaction(self) -> None:
+        """Schedule periodic LangGraph checkpoint compaction."""
+        task = asyncio.create_task(self._run_checkpoint_compaction(), name="checkpoint_compaction")
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+        logger.info(f"Checkpoint compaction scheduled every {settings.CHECKPOINT_COMPACTION_INTERVAL}s")
+
+    async def _run_checkpoint_compaction(self) -> None:
+        """Prune superseded checkpoints and idle threads periodically."""
+        from app.integrations.databases.checkpoint_compactor import create_checkpoint_compactor
+
+        compactor = create_checkpoint_compactor()
+        while True:
+            await asyncio.sleep(settings.CHECKPOINT_COMPACTION_INTERVAL)
+            try:
+                await compactor.compact()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Checkpoint compaction failed: {e}", exc_info=True)
+
     async def _run_initial_sync(self) -> None:
         """
         Run initial sync check in background.
@@ -153,6 +252,9 @@ class BackgroundServiceManager:
             "running": self._running,
             "active_tasks": len(self._background_tasks),
             "dux_sync_enabled": self._sync_service is not None,
+            "webhook_consumers_running": (
+                self._webhook_consumer_pool is not None and self._webhook_consumer_pool.is_running
+            ),
         }
 
 
@@ -6,15 +6,28 @@ Provides TTL-based caching for:
 - Domain intent patterns (domain_intent_cache)
 - Response configs (response_config_cache)
 - Intent routing configs (intent_config_cache)
+- Compiled bypass routing rules (bypass_rule_index)
+
+Config caches share ConfigCacheEngine for their L1 (single-flight loads,
+stale-while-revalidate, jittered TTLs). Invalidations are broadcast to every instance over Redis pub/sub
+(cache_invalidation_bus).
 """
 
 from .agent_cache import AgentCache, agent_cache
+from .bypass_rule_index import BypassRuleIndex, bypass_rule_index
+from .cache_engine import ConfigCacheEngine
 from .domain_intent_cache import DomainIntentCache, domain_intent_cache
 from .intent_config_cache import IntentConfigCache, intent_config_cache
+from .invalidation_bus import CacheInvalidationBus, cache_invalidation_bus
 
 __all__ = [
     "AgentCache",
     "agent_cache",
+    "BypassRuleIndex",
+    "bypass_rule_index",
+    "CacheInvalidationBus",
+    "cache_invalidation_bus",
+    "ConfigCacheEngine",
     "DomainIntentCache",
     "domain_intent_cache",
     "IntentConfigCache",
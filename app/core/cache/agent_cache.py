@@ -11,10 +11,11 @@ Provides TTL-based caching for the list of enabled agent keys.
 Reduces database queries for frequently accessed agent configuration.
 
 Features:
-- TTL-based expiration (60 seconds default)
-- Thread-safe singleton pattern
-- Automatic refresh on expiration
-- Manual invalidation on agent changes
+- TTL-based expiration (60 seconds default; longer while the cache
+  invalidation bus is connected)
+- Single-flight refresh; expired data is served while one background
+  refresh runs (ConfigCacheEngine)
+- Manual invalidation on agent changes, broadcast to all instances
 
 Usage:
     from app.core.cache.agent_cache import agent_cache
@@ -26,10 +27,11 @@ Usage:
     agent_cache.invalidate()
 """
 
-import asyncio
 import logging
-from datetime import UTC, datetime
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
+
+from app.core.cache.cache_engine import ConfigCacheEngine
+from app.core.cache.invalidation_bus import cache_invalidation_bus
 
 if TYPE_CHECKING:
     from sqlalchemy.ext.asyncio import AsyncSession
@@ -41,12 +43,15 @@ class AgentCache:
     """
     In-memory cache for enabled agent keys.
 
-    Thread-safe singleton with TTL-based expiration.
+    Singleton with TTL-based expiration and stale-while-revalidate.
     """
 
     # Default TTL in seconds
     DEFAULT_TTL_SECONDS: int = 60
 
+    # Single engine key: keys and configs are loaded together
+    _KEY = "enabled"
+
     def __init__(self, ttl_seconds: int = DEFAULT_TTL_SECONDS) -> None:
         """Initialize cache with TTL.
 
@@ -54,29 +59,21 @@ class AgentCache:
             ttl_seconds: Cache TTL in seconds (default: 60)
         """
         self._ttl_seconds = ttl_seconds
-        self._enabled_keys: list[str] | None = None
-        self._enabled_configs: list[dict] | None = None
-        self._last_refresh: datetime | None = None
-        self._lock = asyncio.Lock()
+        # {"enabled": {"keys": [...], "configs": [...]}}
+        self._engine: ConfigCacheEngine[str, dict[str, list[Any]]] = ConfigCacheEngine("agents", ttl_seconds)
 
-    @property
-    def is_expired(self) -> bool:
-        """Check if cache is expired.
-
-        Returns:
-            True if cache is expired or empty
-        """
-        if self._enabled_keys is None or self._last_refresh is None:
-            return True
+    def invalidate(self) -> None:
+        """Invalidate cache here and in every other instance."""
+        self.invalidate_local({})
+        cache_invalidation_bus.publish_nowait("agents")
 
-        elapsed = (datetime.now(UTC) - self._last_refresh).total_seconds()
-        return elapsed >= self._ttl_seconds
+    def invalidate_local(self, payload: dict[str, Any]) -> None:
+        """Invalidate cache, forcing refresh on next access.
 
-    def invalidate(self) -> None:
-        """Invalidate cache, forcing refresh on next access."""
-        self._enabled_keys = None
-        self._enabled_configs = None
-        self._last_refresh = None
+        Args:
+            payload: Bus payload (unused, the cache is global)
+        """
+        self._engine.clear()
         logger.debug("Agent cache invalidated")
 
     async def get_enabled_keys(self, db: "AsyncSession") -> list[str]:
@@ -90,11 +87,7 @@ class AgentCache:
         Returns:
             List of enabled agent keys
         """
-        async with self._lock:
-            if self.is_expired:
-                await self._refresh(db)
-
-            return self._enabled_keys or []
+        return (await self._get(db))["keys"]
 
     async def get_enabled_configs(self, db: "AsyncSession") -> list[dict]:
         """Get list of enabled agent configurations.
@@ -107,42 +100,42 @@ class AgentCache:
         Returns:
             List of enabled agent config dicts
         """
-        async with self._lock:
-            if self.is_expired:
-                await self._refresh(db)
+        return (await self._get(db))["configs"]
 
-            return self._enabled_configs or []
+    async def _get(self, db: "AsyncSession") -> dict[str, list[Any]]:
+        """Get keys and configs, refreshing through the engine."""
+        try:
+            return await self._engine.get(self._KEY, lambda: self._refresh(db), lambda: self._refresh(None))
+        except Exception as e:
+            logger.error(f"Error refreshing agent cache: {e}")
+            # Keep stale data if refresh fails
+            return self._engine.peek(self._KEY) or {"keys": [], "configs": []}
 
-    async def _refresh(self, db: "AsyncSession") -> None:
-        """Refresh cache from database.
+    async def _refresh(self, db: "AsyncSession | None") -> dict[str, list[Any]]:
+        """Load enabled agents from database.
 
         Args:
-            db: AsyncSession for database access
-        """
-        from app.repositories.agent_repository import AgentRepository
+            db: AsyncSession for database access (None = open a new session)
 
-        try:
-            repository = AgentRepository(db)
-
-            # Get enabled keys
-            self._enabled_keys = await repository.get_enabled_keys()
+        Returns:
+            Dict with enabled agent keys and configs
+        """
+        if db is None:
+            from app.database.async_db import get_async_db_context
 
-            # Get enabled configs
-            self._enabled_configs = await repository.get_enabled_for_config()
+            async with get_async_db_context() as session:
+                return await self._refresh(session)
 
-            self._last_refresh = datetime.now(UTC)
+        from app.repositories.agent_repository import AgentRepository
 
-            logger.debug(
-                f"Agent cache refreshed: {len(self._enabled_keys)} enabled agents"
-            )
+        repository = AgentRepository(db)
+        enabled = {
+            "keys": await repository.get_enabled_keys(),
+            "configs": await repository.get_enabled_for_config(),
+        }
 
-        except Exception as e:
-            logger.error(f"Error refreshing agent cache: {e}")
-            # Keep stale data if refresh fails
-            if self._enabled_keys is None:
-                self._enabled_keys = []
-            if self._enabled_configs is None:
-                self._enabled_configs = []
+        logger.debug(f"Agent cache refreshed: {len(enabled['keys'])} enabled agents")
+        return enabled
 
     def get_cached_keys(self) -> list[str]:
         """Get cached keys without refresh (may be stale).
@@ -152,7 +145,8 @@ class AgentCache:
         Returns:
             Cached list of enabled agent keys (may be stale or empty)
         """
-        return self._enabled_keys or []
+        enabled = self._engine.peek(self._KEY)
+        return enabled["keys"] if enabled else []
 
     def get_cached_configs(self) -> list[dict]:
         """Get cached configs without refresh (may be stale).
@@ -162,8 +156,14 @@ class AgentCache:
         Returns:
             Cached list of enabled agent configs (may be stale or empty)
         """
-        return self._enabled_configs or []
+        enabled = self._engine.peek(self._KEY)
+        return enabled["configs"] if enabled else []
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get cache statistics."""
+        return self._engine.get_stats()
 
 
 # Singleton instance
 agent_cache = AgentCache()
+cache_invalidation_bus.register("agents", agent_cache.invalidate_local)
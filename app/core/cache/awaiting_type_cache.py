@@ -9,10 +9,11 @@
 Awaiting Type Config Cache - Multi-layer caching for database-driven awaiting type configurations.
 
 Features:
-- L1: In-memory cache (60s TTL, per-instance, per-organization)
+- L1: In-memory cache (60s TTL, per-instance, per-organization; longer while
+  the cache invalidation bus is connected)
 - L2: Redis cache (5min TTL, distributed, per-organization)
-- Automatic invalidation on config changes
-- Thread-safe with asyncio locks
+- Automatic invalidation on config changes, broadcast to all instances
+- Lock-free L1 reads, single-flight loads, stale-while-revalidate (ConfigCacheEngine)
 - Keyed by awaiting_type for efficient lookups
 
 Usage:
@@ -31,14 +32,15 @@ Usage:
 
 from __future__ import annotations
 
-import asyncio
 import json
 import logging
 from dataclasses import dataclass
-from datetime import UTC, datetime
 from typing import TYPE_CHECKING, Any
 from uuid import UUID
 
+from app.core.cache.cache_engine import ConfigCacheEngine, multi_layer_stats
+from app.core.cache.invalidation_bus import cache_invalidation_bus
+
 if TYPE_CHECKING:
     from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -118,7 +120,8 @@ class AwaitingTypeCache:
     """
     Multi-layer cache for awaiting type configurations.
 
-    Thread-safe per-organization caching with TTL-based expiration.
+    Per-organization caching with jittered TTLs, single-flight loads and
+    stale-while-revalidate (see ConfigCacheEngine).
     L1 (Memory) -> L2 (Redis) -> L3 (Database)
 
     Cache key format: "{org_id or 'system'}:{domain_key}"
@@ -130,15 +133,15 @@ class AwaitingTypeCache:
 
     def __init__(self) -> None:
         """Initialize cache with per-organization storage."""
-        # Per-key memory cache: {cache_key: {"configs": KeyedConfigs, "timestamp": datetime}}
-        self._memory_cache: dict[str, dict[str, Any]] = {}
-        self._locks: dict[str, asyncio.Lock] = {}
-        self._global_lock = asyncio.Lock()
+        # L1: {cache_key: KeyedConfigs} with single-flight and stale-while-revalidate
+        self._engine: ConfigCacheEngine[str, KeyedConfigs] = ConfigCacheEngine(
+            "awaiting_type",
+            self.MEMORY_TTL_SECONDS,
+            tenant_of=lambda cache_key: cache_key.split(":", 1)[0],
+        )
 
-        # Stats for monitoring
+        # Stats for monitoring (L1 counters live in the engine)
         self._stats: dict[str, int] = {
-            "memory_hits": 0,
-            "memory_misses": 0,
             "redis_hits": 0,
             "redis_misses": 0,
             "db_loads": 0,
@@ -150,13 +153,6 @@ class AwaitingTypeCache:
         org_part = str(organization_id) if organization_id else "system"
         return f"{org_part}:{domain_key}"
 
-    async def _get_lock(self, cache_key: str) -> asyncio.Lock:
-        """Get or create lock for specific cache key."""
-        async with self._global_lock:
-            if cache_key not in self._locks:
-                self._locks[cache_key] = asyncio.Lock()
-            return self._locks[cache_key]
-
     async def get_configs(
         self,
         db: "AsyncSession | None",
@@ -182,40 +178,41 @@ class AwaitingTypeCache:
             }
         """
         cache_key = self._get_cache_key(organization_id, domain_key)
-        lock = await self._get_lock(cache_key)
-
-        async with lock:
-            # L1: Check memory cache
-            memory_data = self._get_from_memory(cache_key)
-            if memory_data is not None:
-                self._stats["memory_hits"] += 1
-                return memory_data
+        return await self._engine.get(
+            cache_key,
+            lambda: self._load(db, cache_key, organization_id, domain_key),
+            lambda: self._load(None, cache_key, organization_id, domain_key),
+        )
 
-            self._stats["memory_misses"] += 1
+    async def _load(
+        self,
+        db: "AsyncSession | None",
+        cache_key: str,
+        organization_id: UUID | None,
+        domain_key: str,
+    ) -> KeyedConfigs:
+        """L1 miss: L2 (Redis) -> L3 (Database)."""
+        generation = self._engine.generation
 
-            # L2: Check Redis cache
-            redis_data = await self._get_from_redis(cache_key)
-            if redis_data is not None:
-                self._stats["redis_hits"] += 1
-                # Populate L1 from L2
-                self._set_memory(cache_key, redis_data)
-                return redis_data
+        redis_data = await self._get_from_redis(cache_key)
+        if redis_data is not None:
+            self._stats["redis_hits"] += 1
+            return redis_data
 
-            self._stats["redis_misses"] += 1
+        self._stats["redis_misses"] += 1
 
-            # L3: Load from database
-            if db is None:
-                configs = await self._load_from_database_with_session(organization_id, domain_key)
-            else:
-                configs = await self._load_from_database(db, organization_id, domain_key)
+        if db is None:
+            configs = await self._load_from_database_with_session(organization_id, domain_key)
+        else:
+            configs = await self._load_from_database(db, organization_id, domain_key)
 
-            self._stats["db_loads"] += 1
+        self._stats["db_loads"] += 1
 
-            # Populate both caches
+        # Skip L2 if invalidated while loading (the data may predate the change)
+        if self._engine.generation == generation:
             await self._set_redis(cache_key, configs)
-            self._set_memory(cache_key, configs)
 
-            return configs
+        return configs
 
     async def get_by_type(
         self,
@@ -272,43 +269,17 @@ class AwaitingTypeCache:
 
         return keyed_dtos
 
-    def _get_from_memory(self, cache_key: str) -> KeyedConfigs | None:
-        """Get configs from memory cache if not expired."""
-        if cache_key not in self._memory_cache:
-            return None
-
-        cache_entry = self._memory_cache[cache_key]
-        timestamp = cache_entry.get("timestamp")
-
-        if timestamp is None:
-            return None
-
-        elapsed = (datetime.now(UTC) - timestamp).total_seconds()
-        if elapsed >= self.MEMORY_TTL_SECONDS:
-            # Expired
-            del self._memory_cache[cache_key]
-            return None
-
-        return cache_entry.get("configs")
-
-    def _set_memory(self, cache_key: str, configs: KeyedConfigs) -> None:
-        """Store configs in memory cache."""
-        self._memory_cache[cache_key] = {
-            "configs": configs,
-            "timestamp": datetime.now(UTC),
-        }
-
     async def _get_from_redis(self, cache_key: str) -> KeyedConfigs | None:
         """Get configs from Redis cache."""
         try:
-            from app.integrations.databases.redis import get_redis_client
+            from app.integrations.databases.redis import get_shared_async_redis_client
 
-            redis = get_redis_client()
+            redis = await get_shared_async_redis_client()
             if redis is None:
                 return None
 
             key = f"{self.REDIS_KEY_PREFIX}:{cache_key}"
-            data = redis.get(key)
+            data = await redis.get(key)
 
             if data:
                 parsed = json.loads(data)
@@ -321,15 +292,15 @@ class AwaitingTypeCache:
     async def _set_redis(self, cache_key: str, configs: KeyedConfigs) -> None:
         """Store configs in Redis cache."""
         try:
-            from app.integrations.databases.redis import get_redis_client
+            from app.integrations.databases.redis import get_shared_async_redis_client
 
-            redis = get_redis_client()
+            redis = await get_shared_async_redis_client()
             if redis is None:
                 return
 
             key = f"{self.REDIS_KEY_PREFIX}:{cache_key}"
             serializable = {k: v.to_dict() for k, v in configs.items()}
-            redis.setex(key, self.REDIS_TTL_SECONDS, json.dumps(serializable))
+            await redis.setex(key, self.REDIS_TTL_SECONDS, json.dumps(serializable))
 
         except Exception as e:
             logger.warning(f"Redis set failed for {cache_key}: {e}")
@@ -354,59 +325,70 @@ class AwaitingTypeCache:
         if organization_id is not None and domain_key is not None:
             # Specific invalidation
             cache_key = self._get_cache_key(organization_id, domain_key)
-            lock = await self._get_lock(cache_key)
+            if self._engine.invalidate(cache_key):
+                count += 1
 
-            async with lock:
-                if cache_key in self._memory_cache:
-                    del self._memory_cache[cache_key]
-                    count += 1
+            # Clear Redis
+            try:
+                from app.integrations.databases.redis import get_shared_async_redis_client
 
-                # Clear Redis
-                try:
-                    from app.integrations.databases.redis import get_redis_client
-
-                    redis = get_redis_client()
-                    if redis:
-                        key = f"{self.REDIS_KEY_PREFIX}:{cache_key}"
-                        redis.delete(key)
-                except Exception as e:
-                    logger.warning(f"Redis invalidation failed for {cache_key}: {e}")
+                redis = await get_shared_async_redis_client()
+                if redis:
+                    key = f"{self.REDIS_KEY_PREFIX}:{cache_key}"
+                    await redis.delete(key)
+            except Exception as e:
+                logger.warning(f"Redis invalidation failed for {cache_key}: {e}")
 
         else:
             # Bulk invalidation
-            async with self._global_lock:
-                # Find matching cache keys
-                keys_to_delete = []
-                for key in self._memory_cache:
-                    if domain_key is None or key.endswith(f":{domain_key}"):
-                        if organization_id is None or key.startswith(f"{organization_id}:"):
-                            keys_to_delete.append(key)
-
-                for key in keys_to_delete:
-                    del self._memory_cache[key]
-                    count += 1
-
-                # Clear Redis
-                try:
-                    from app.integrations.databases.redis import get_redis_client
-
-                    redis = get_redis_client()
-                    if redis:
-                        pattern = f"{self.REDIS_KEY_PREFIX}:*"
-                        keys = redis.keys(pattern)
-                        if keys:
-                            redis.delete(*keys)
-                            count = max(count, len(keys))
-                except Exception as e:
-                    logger.warning(f"Redis bulk invalidation failed: {e}")
+            count += self._engine.invalidate_where(
+                lambda key: self._key_matches(key, organization_id, domain_key)
+            )
+
+            # Clear Redis
+            try:
+                from app.integrations.databases.redis import get_shared_async_redis_client
+
+                redis = await get_shared_async_redis_client()
+                if redis:
+                    pattern = f"{self.REDIS_KEY_PREFIX}:*"
+                    keys = [key async for key in redis.scan_iter(match=pattern)]
+                    if keys:
+                        await redis.delete(*keys)
+                        count = max(count, len(keys))
+            except Exception as e:
+                logger.warning(f"Redis bulk invalidation failed: {e}")
 
         self._stats["invalidations"] += count
         logger.info(
             f"Awaiting type cache invalidated: {count} entries " f"(org={organization_id}, domain={domain_key})"
         )
 
+        await cache_invalidation_bus.publish(
+            "awaiting_type",
+            organization_id=str(organization_id) if organization_id else None,
+            domain_key=domain_key,
+        )
         return count
 
+    def invalidate_local(self, payload: dict[str, Any]) -> None:
+        """
+        Clear L1 entries invalidated by another instance.
+
+        Args:
+            payload: Bus payload with optional organization_id and domain_key
+        """
+        organization_id = payload.get("organization_id")
+        domain_key = payload.get("domain_key")
+        self._engine.invalidate_where(lambda key: self._key_matches(key, organization_id, domain_key))
+
+    @staticmethod
+    def _key_matches(cache_key: str, organization_id: UUID | str | None, domain_key: str | None) -> bool:
+        """Check a "{org}:{domain}" cache key against an invalidation scope."""
+        if domain_key is not None and not cache_key.endswith(f":{domain_key}"):
+            return False
+        return organization_id is None or cache_key.startswith(f"{organization_id}:")
+
     async def warm(
         self,
         db: "AsyncSession",
@@ -427,18 +409,16 @@ class AwaitingTypeCache:
             Loaded configs
         """
         cache_key = self._get_cache_key(organization_id, domain_key)
-        lock = await self._get_lock(cache_key)
 
-        async with lock:
-            # Force load from database
-            configs = await self._load_from_database(db, organization_id, domain_key)
+        # Force load from database
+        configs = await self._load_from_database(db, organization_id, domain_key)
 
-            # Populate both caches
-            await self._set_redis(cache_key, configs)
-            self._set_memory(cache_key, configs)
+        # Populate both caches
+        await self._set_redis(cache_key, configs)
+        self._engine.set(cache_key, configs)
 
-            logger.info(f"Awaiting type cache warmed for org {organization_id}, domain {domain_key}")
-            return configs
+        logger.info(f"Awaiting type cache warmed for org {organization_id}, domain {domain_key}")
+        return configs
 
     def get_stats(self) -> dict[str, Any]:
         """Get cache statistics.
@@ -446,19 +426,9 @@ class AwaitingTypeCache:
         Returns:
             Dict with hit rates and counts
         """
-        total_memory = self._stats["memory_hits"] + self._stats["memory_misses"]
-        total_redis = self._stats["redis_hits"] + self._stats["redis_misses"]
-
         return {
-            "memory_hits": self._stats["memory_hits"],
-            "memory_misses": self._stats["memory_misses"],
-            "memory_hit_rate": (self._stats["memory_hits"] / total_memory if total_memory > 0 else 0),
-            "redis_hits": self._stats["redis_hits"],
-            "redis_misses": self._stats["redis_misses"],
-            "redis_hit_rate": (self._stats["redis_hits"] / total_redis if total_redis > 0 else 0),
-            "db_loads": self._stats["db_loads"],
-            "invalidations": self._stats["invalidations"],
-            "cached_keys": len(self._memory_cache),
+            **multi_layer_stats(self._engine.get_stats(), self._stats),
+            "cached_keys": len(self._engine),
         }
 
     def get_cached_keys(self) -> list[str]:
@@ -467,8 +437,9 @@ class AwaitingTypeCache:
         Returns:
             List of cache key strings
         """
-        return list(self._memory_cache.keys())
+        return self._engine.keys()
 
 
 # Singleton instance
 awaiting_type_cache = AwaitingTypeCache()
+cache_invalidation_bus.register("awaiting_type", awaiting_type_cache.invalidate_local)
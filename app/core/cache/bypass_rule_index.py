@@ -0,0 +1,422 @@
+# ============================================================================
+# SCOPE: GLOBAL
+# Description: Índice en memoria compilado de reglas de bypass (hash maps por
+#              wa_id/DID + trie de prefijos) con invalidación por versión.
+# Tenant-Aware: Yes - compila reglas de todas las organizaciones activas y un
+#              sub-índice por organización.
+# ============================================================================
+"""
+Compiled Bypass Rule Index.
+
+BypassRoutingService used to join bypass_rules, organizations and
+tenant_configs for every incoming message and test each rule in Python.
+This module compiles the enabled rules once per process into:
+
+- exact: wa_id -> best rule (phone_number without wildcard, phone_number_list)
+- did:   whatsapp_phone_number_id -> best rule
+- trie:  digit trie of "prefix*" patterns, each node holding its best rule
+
+"Best" means first in the original evaluation order (priority DESC,
+rule_name), so a lookup walks at most len(wa_id) trie nodes plus two dict
+lookups and returns the same rule the sequential scan would.
+
+Invalidation:
+- The admin bypass-rule endpoints (and the tenant default_domain updates)
+  call `bypass_rule_index.invalidate()`, which bumps the local version and
+  the shared Redis counter `bypass_rules:version`, and broadcasts on the
+  cache invalidation bus.
+- Other processes bump their local version when the bus message arrives and,
+  as a fallback for missed messages, compare the Redis counter at most every
+  VERSION_CHECK_SECONDS and rebuild when it changed.
+- The index is rebuilt after MAX_AGE_SECONDS regardless, which covers
+  organization status changes and Redis outages.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+from uuid import UUID
+
+from sqlalchemy import select
+
+from app.core.cache.invalidation_bus import cache_invalidation_bus
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CompiledBypassRule:
+    """
+    Bypass rule resolved against its organization and tenant config.
+
+    Attributes:
+        order: Position in evaluation order (lower = evaluated first)
+        organization_id: Organization the rule routes to
+        organization_slug: Organization slug (for logs)
+        organization_active: Whether the organization is active
+        rule_id: Rule UUID
+        rule_name: Rule name (for logs)
+        domain: Rule target_domain, tenant default_domain or "excelencia"
+        target_agent: Agent to route to
+        pharmacy_id: Linked pharmacy, if any
+        isolated_history: Whether the rule isolates conversation history
+    """
+
+    order: int
+    organization_id: UUID
+    organization_slug: str
+    organization_active: bool
+    rule_id: UUID
+    rule_name: str
+    domain: str
+    target_agent: str
+    pharmacy_id: UUID | None
+    isolated_history: bool
+
+
+@dataclass
+class _TrieNode:
+    """Prefix trie node; `best` is the first rule whose prefix ends here."""
+
+    children: dict[str, _TrieNode] = field(default_factory=dict)
+    best: CompiledBypassRule | None = None
+
+
+def _first(current: CompiledBypassRule | None, rule: CompiledBypassRule) -> CompiledBypassRule:
+    """Keep the rule that comes first in evaluation order."""
+    return rule if current is None or rule.order < current.order else current
+
+
+class CompiledBypassRules:
+    """
+    Lookup structures for a set of rules.
+
+    Usage:
+        compiled = CompiledBypassRules()
+        compiled.add(rule, "phone_number", "549264*", None)
+        match = compiled.match("5492641234567", "123456789")
+    """
+
+    def __init__(self) -> None:
+        self.exact: dict[str, CompiledBypassRule] = {}
+        self.did: dict[str, CompiledBypassRule] = {}
+        self.trie = _TrieNode()
+        self.size = 0
+
+    def add(self, rule: CompiledBypassRule, rule_type: str, pattern: str | None, values: list[str] | None) -> None:
+        """
+        Index a rule by its type.
+
+        Args:
+            rule: Compiled rule
+            rule_type: BypassRule.rule_type
+            pattern: BypassRule.pattern or phone_number_id, depending on type
+            values: BypassRule.phone_numbers for phone_number_list rules
+        """
+        if rule_type == "phone_number" and pattern:
+            if pattern.endswith("*"):
+                node = self.trie
+                for char in pattern[:-1]:
+                    node = node.children.setdefault(char, _TrieNode())
+                node.best = _first(node.best, rule)
+            else:
+                self.exact[pattern] = _first(self.exact.get(pattern), rule)
+        elif rule_type == "phone_number_list" and values:
+            for value in values:
+                self.exact[value] = _first(self.exact.get(value), rule)
+        elif rule_type == "whatsapp_phone_number_id" and pattern:
+            self.did[pattern] = _first(self.did.get(pattern), rule)
+        else:
+            return
+        self.size += 1
+
+    def match(self, wa_id: str | None, whatsapp_phone_number_id: str | None = None) -> CompiledBypassRule | None:
+        """
+        Find the first rule (in priority order) matching the identifiers.
+
+        Args:
+            wa_id: Sender WhatsApp ID
+            whatsapp_phone_number_id: WhatsApp Business phone number ID (DID)
+
+        Returns:
+            Matching rule or None
+        """
+        best: CompiledBypassRule | None = None
+
+        if whatsapp_phone_number_id:
+            rule = self.did.get(whatsapp_phone_number_id)
+            if rule is not None:
+                best = rule
+
+        if wa_id:
+            rule = self.exact.get(wa_id)
+            if rule is not None:
+                best = _first(best, rule)
+
+            node: _TrieNode | None = self.trie
+            if node.best is not None:
+                best = _first(best, node.best)
+            for char in wa_id:
+                node = node.children.get(char)
+                if node is None:
+                    break
+                if node.best is not None:
+                    best = _first(best, node.best)
+
+        return best
+
+
+class BypassRuleIndex:
+    """
+    Process-wide compiled bypass rule index with versioned refresh.
+
+    Holds one CompiledBypassRules over the rules of active organizations
+    (used by evaluate_bypass_rules) and one per organization (used by
+    evaluate_bypass_rules_for_org, regardless of organization status).
+    """
+
+    VERSION_KEY = "bypass_rules:version"
+    VERSION_CHECK_SECONDS = 5
+    MAX_AGE_SECONDS = 300
+    REDIS_RETRY_SECONDS = 30
+
+    def __init__(self) -> None:
+        """Initialize an empty, stale index."""
+        self._global: CompiledBypassRules | None = None
+        self._by_org: dict[UUID, CompiledBypassRules] = {}
+        self._built_at = 0.0
+        self._local_version = 0
+        self._built_local_version = -1
+        self._remote_version: int | None = None
+        self._built_remote_version: int | None = None
+        self._remote_checked_at = 0.0
+        self._redis: Any | None = None
+        self._redis_retry_at = 0.0
+        self._lock = asyncio.Lock()
+
+        self._stats: dict[str, int] = {
+            "lookups": 0,
+            "matches": 0,
+            "rebuilds": 0,
+            "rebuild_errors": 0,
+            "invalidations": 0,
+        }
+
+    async def match(
+        self,
+        db: AsyncSession,
+        wa_id: str,
+        whatsapp_phone_number_id: str | None = None,
+    ) -> CompiledBypassRule | None:
+        """
+        Match against the rules of all active organizations.
+
+        Args:
+            db: Session used only if the index must be (re)built
+            wa_id: Sender WhatsApp ID
+            whatsapp_phone_number_id: WhatsApp Business phone number ID
+
+        Returns:
+            First matching rule or None
+        """
+        await self._ensure_fresh(db)
+        self._stats["lookups"] += 1
+        rule = self._global.match(wa_id, whatsapp_phone_number_id) if self._global else None
+        if rule is not None:
+            self._stats["matches"] += 1
+        return rule
+
+    async def match_for_org(
+        self,
+        db: AsyncSession,
+        organization_id: UUID,
+        wa_id: str,
+        whatsapp_phone_number_id: str | None = None,
+    ) -> CompiledBypassRule | None:
+        """
+        Match against the rules of one organization.
+
+        Args:
+            db: Session used only if the index must be (re)built
+            organization_id: Organization UUID
+            wa_id: Sender WhatsApp ID
+            whatsapp_phone_number_id: WhatsApp Business phone number ID
+
+        Returns:
+            First matching rule of the organization or None
+        """
+        await self._ensure_fresh(db)
+        self._stats["lookups"] += 1
+        compiled = self._by_org.get(organization_id)
+        rule = compiled.match(wa_id, whatsapp_phone_number_id) if compiled else None
+        if rule is not None:
+            self._stats["matches"] += 1
+        return rule
+
+    async def invalidate(self) -> None:
+        """Mark the index stale here and, through Redis, in every other process."""
+        self._local_version += 1
+        self._stats["invalidations"] += 1
+
+        redis = await self._get_redis()
+        if redis is not None:
+            try:
+                self._remote_version = int(await redis.incr(self.VERSION_KEY))
+                self._remote_checked_at = time.monotonic()
+            except Exception as e:
+                self._redis_failed(e)
+
+        logger.info(f"Bypass rule index invalidated (local version {self._local_version})")
+        await cache_invalidation_bus.publish("bypass_rules")
+
+    def invalidate_local(self, payload: dict[str, Any]) -> None:
+        """
+        Mark the index stale after an invalidation in another process.
+
+        Args:
+            payload: Bus payload (unused, the index is rebuilt as a whole)
+        """
+        self._local_version += 1
+
+    async def _ensure_fresh(self, db: AsyncSession) -> None:
+        """Rebuild the index if it is missing, invalidated or too old."""
+        if not await self._is_stale():
+            return
+
+        async with self._lock:
+            # Another task may have rebuilt while we waited
+            if not await self._is_stale():
+                return
+
+            if self._remote_version is None:
+                self._remote_version = await self._read_remote_version()
+            # Recorded before loading: changes made during the load trigger another rebuild
+            self._built_local_version = self._local_version
+            self._built_remote_version = self._remote_version
+            try:
+                await self._rebuild(db)
+            except Exception as e:
+                self._stats["rebuild_errors"] += 1
+                if self._global is None:
+                    raise
+                # Keep serving the previous index; retry on the next check
+                self._built_at = time.monotonic() - self.MAX_AGE_SECONDS + self.VERSION_CHECK_SECONDS
+                logger.warning(f"Bypass rule index rebuild failed, serving previous index: {e}")
+                return
+
+    async def _is_stale(self) -> bool:
+        """Check local version, Redis version (rate limited) and age."""
+        if self._global is None or self._built_local_version != self._local_version:
+            return True
+
+        now = time.monotonic()
+        if now - self._built_at >= self.MAX_AGE_SECONDS:
+            return True
+
+        if now - self._remote_checked_at >= self.VERSION_CHECK_SECONDS:
+            self._remote_checked_at = now
+            remote = await self._read_remote_version()
+            if remote is not None:
+                self._remote_version = remote
+
+        return self._remote_version is not None and self._remote_version != self._built_remote_version
+
+    async def _rebuild(self, db: AsyncSession) -> None:
+        """Load enabled rules in evaluation order and compile them."""
+        from app.models.db.tenancy import BypassRule, Organization, TenantConfig
+
+        query = (
+            select(BypassRule, Organization, TenantConfig)
+            .join(Organization, BypassRule.organization_id == Organization.id)
+            .outerjoin(TenantConfig, TenantConfig.organization_id == Organization.id)
+            .where(BypassRule.enabled == True)  # noqa: E712
+            .order_by(BypassRule.priority.desc(), BypassRule.rule_name)  # type: ignore[union-attr]
+        )
+        result = await db.execute(query)
+
+        compiled_global = CompiledBypassRules()
+        by_org: dict[UUID, CompiledBypassRules] = {}
+        for order, (rule, org, tenant_config) in enumerate(result.all()):
+            compiled = CompiledBypassRule(
+                order=order,
+                organization_id=org.id,
+                organization_slug=org.slug,
+                organization_active=org.status == "active",
+                rule_id=rule.id,
+                rule_name=rule.rule_name,
+                domain=(
+                    rule.target_domain
+                    or (tenant_config.default_domain if tenant_config else None)
+                    or "excelencia"
+                ),
+                target_agent=rule.target_agent,
+                pharmacy_id=rule.pharmacy_id,
+                isolated_history=bool(rule.isolated_history),
+            )
+            pattern = rule.phone_number_id if rule.rule_type == "whatsapp_phone_number_id" else rule.pattern
+            by_org.setdefault(org.id, CompiledBypassRules()).add(
+                compiled, rule.rule_type, pattern, rule.phone_numbers
+            )
+            if compiled.organization_active:
+                compiled_global.add(compiled, rule.rule_type, pattern, rule.phone_numbers)
+
+        self._global = compiled_global
+        self._by_org = by_org
+        self._built_at = time.monotonic()
+        self._stats["rebuilds"] += 1
+        logger.info(
+            f"Bypass rule index built: {compiled_global.size} active rules, {len(by_org)} organizations"
+        )
+
+    async def _read_remote_version(self) -> int | None:
+        """Read the shared version counter (None if Redis is unavailable)."""
+        redis = await self._get_redis()
+        if redis is None:
+            return None
+        try:
+            value = await redis.get(self.VERSION_KEY)
+            return int(value) if value is not None else 0
+        except Exception as e:
+            self._redis_failed(e)
+            return None
+
+    async def _get_redis(self) -> Any | None:
+        """Lazy async Redis client, skipped while backing off after an error."""
+        if time.monotonic() < self._redis_retry_at:
+            return None
+        if self._redis is None:
+            try:
+                from app.integrations.databases.redis import get_async_redis_client
+
+                self._redis = await get_async_redis_client()
+            except Exception as e:
+                self._redis_failed(e)
+        return self._redis
+
+    def _redis_failed(self, error: Exception) -> None:
+        """Record a Redis error and back off."""
+        self._redis_retry_at = time.monotonic() + self.REDIS_RETRY_SECONDS
+        logger.warning(f"Bypass rule version check unavailable for {self.REDIS_RETRY_SECONDS}s: {error}")
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get index statistics."""
+        return {
+            **self._stats,
+            "rules": self._global.size if self._global else 0,
+            "organizations": len(self._by_org),
+            "local_version": self._local_version,
+            "remote_version": self._remote_version,
+            "age_seconds": round(time.monotonic() - self._built_at, 1) if self._global else None,
+        }
+
+
+# Singleton instance
+bypass_rule_index = BypassRuleIndex()
+cache_invalidation_bus.register("bypass_rules", bypass_rule_index.invalidate_local)
@@ -0,0 +1,336 @@
+# ============================================================================
+# SCOPE: GLOBAL
+# Description: Motor L1 compartido por los caches de configuración: lecturas
+#              sin lock, single-flight, stale-while-revalidate, TTL con jitter
+#              y cache negativo. Métricas por cache y por tenant.
+# Tenant-Aware: Yes - contadores por tenant (organization_id).
+# ============================================================================
+"""
+Config Cache Engine - Shared L1 layer for the multi-layer config caches.
+
+Each config cache (intent_config, domain_intent, routing_config,
+response_config, awaiting_type, agents) owns one engine per cached data type
+and supplies a loader that goes to L2 (Redis) and then L3 (DB).
+
+Behavior:
+- Fresh L1 hits are served without locks or awaits
+- Concurrent misses for the same key share one load (single-flight)
+- Expired entries are served for up to `stale_seconds` more while one
+  background refresh runs (stale-while-revalidate)
+- TTLs are multiplied by a per-entry random factor in [1 - jitter, 1 + jitter]
+  so entries loaded together do not expire together
+- Empty results (None, {}, [], set()) are cached with a shorter negative TTL
+- The fresh TTL follows cache_invalidation_bus.memory_ttl(): long while the
+  invalidation bus is connected, the cache's own TTL otherwise
+- Invalidation bumps a generation counter: loads that started before it still
+  answer their callers but do not repopulate L1 (nor L2, if the loader checks
+  `generation`)
+
+Usage:
+    engine = ConfigCacheEngine("routing_config", memory_ttl_seconds=60, tenant_of=lambda key: key.split(":")[0])
+
+    configs = await engine.get(cache_key, lambda: self._load(db, cache_key), lambda: self._load(None, cache_key))
+    engine.invalidate(cache_key)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass
+from typing import Any, Generic, TypeVar
+
+from app.core.cache.invalidation_bus import cache_invalidation_bus
+
+logger = logging.getLogger(__name__)
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+Loader = Callable[[], Awaitable[V]]
+
+
+@dataclass
+class _Entry(Generic[V]):
+    """L1 entry; `jitter` scales the TTL that applies at read time."""
+
+    value: V
+    stored_at: float
+    jitter: float
+    negative: bool
+
+
+class ConfigCacheEngine(Generic[K, V]):
+    """
+    L1 cache with single-flight loads and stale-while-revalidate.
+
+    Not thread-safe: meant to be used from a single event loop.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        memory_ttl_seconds: int,
+        *,
+        stale_seconds: int = 300,
+        negative_ttl_seconds: int = 30,
+        jitter: float = 0.1,
+        tenant_of: Callable[[K], str] | None = None,
+    ) -> None:
+        """
+        Initialize engine.
+
+        Args:
+            name: Cache name (for logs and stats)
+            memory_ttl_seconds: Fresh TTL while the invalidation bus is not connected
+            stale_seconds: How long past expiry an entry may be served while refreshing
+            negative_ttl_seconds: Fresh TTL of empty results
+            jitter: Relative TTL jitter (0.1 = +/-10%)
+            tenant_of: Maps a key to its tenant for per-tenant counters
+        """
+        self.name = name
+        self._memory_ttl_seconds = memory_ttl_seconds
+        self._stale_seconds = stale_seconds
+        self._negative_ttl_seconds = negative_ttl_seconds
+        self._jitter = jitter
+        self._tenant_of = tenant_of
+
+        self._entries: dict[K, _Entry[V]] = {}
+        self._inflight: dict[K, asyncio.Task[V]] = {}
+        self._generation = 0
+
+        self._stats: dict[str, int] = {
+            "hits": 0,
+            "misses": 0,
+            "stale_serves": 0,
+            "negative_hits": 0,
+            "loads": 0,
+            "coalesced_loads": 0,
+            "background_refreshes": 0,
+            "load_errors": 0,
+        }
+        self._tenant_stats: dict[str, dict[str, int]] = {}
+
+    @property
+    def generation(self) -> int:
+        """Incremented by every invalidation."""
+        return self._generation
+
+    async def get(self, key: K, loader: Loader[V], refresh_loader: Loader[V] | None = None) -> V:
+        """
+        Get a value, loading it on miss.
+
+        Args:
+            key: Cache key
+            loader: Loads the value for a caller that waits for it
+            refresh_loader: Loads the value in the background after a stale
+                serve; must not depend on the caller (e.g. its DB session).
+                Defaults to `loader`.
+
+        Returns:
+            Cached or freshly loaded value
+
+        Raises:
+            Whatever the loader raises on a miss (stale serves never raise)
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            age = time.monotonic() - entry.stored_at
+            ttl = self._ttl(entry)
+            if age < ttl:
+                self._count(key, "negative_hits" if entry.negative else "hits")
+                return entry.value
+            if age < ttl + self._stale_seconds:
+                self._count(key, "stale_serves")
+                if key not in self._inflight:
+                    self._stats["background_refreshes"] += 1
+                    self._start_load(key, refresh_loader or loader)
+                return entry.value
+            del self._entries[key]
+
+        self._count(key, "misses")
+        task = self._inflight.get(key)
+        if task is None:
+            task = self._start_load(key, loader)
+        else:
+            self._stats["coalesced_loads"] += 1
+
+        # Shielded: a cancelled caller must not cancel the load other callers share
+        return await asyncio.shield(task)
+
+    def peek(self, key: K) -> V | None:
+        """Get the cached value regardless of expiry (None if absent)."""
+        entry = self._entries.get(key)
+        return entry.value if entry is not None else None
+
+    def set(self, key: K, value: V) -> None:
+        """Store a value (e.g. when warming) as fresh."""
+        self._entries[key] = _Entry(
+            value=value,
+            stored_at=time.monotonic(),
+            jitter=random.uniform(1 - self._jitter, 1 + self._jitter),
+            negative=not value,
+        )
+
+    def invalidate(self, key: K) -> bool:
+        """
+        Drop one key.
+
+        Returns:
+            True if an entry was cached
+        """
+        self._generation += 1
+        self._inflight.pop(key, None)
+        return self._entries.pop(key, None) is not None
+
+    def invalidate_where(self, predicate: Callable[[K], bool]) -> int:
+        """
+        Drop every key matching the predicate.
+
+        Returns:
+            Number of cached entries dropped
+        """
+        self._generation += 1
+        for key in [key for key in self._inflight if predicate(key)]:
+            del self._inflight[key]
+        keys = [key for key in self._entries if predicate(key)]
+        for key in keys:
+            del self._entries[key]
+        return len(keys)
+
+    def clear(self) -> int:
+        """
+        Drop everything.
+
+        Returns:
+            Number of cached entries dropped
+        """
+        self._generation += 1
+        self._inflight.clear()
+        count = len(self._entries)
+        self._entries.clear()
+        return count
+
+    def keys(self) -> list[K]:
+        """Keys currently cached (fresh or stale)."""
+        return list(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _ttl(self, entry: _Entry[V]) -> float:
+        """Fresh TTL of an entry as of now."""
+        if entry.negative:
+            base = self._negative_ttl_seconds
+        else:
+            base = cache_invalidation_bus.memory_ttl(self._memory_ttl_seconds)
+        return base * entry.jitter
+
+    def _start_load(self, key: K, loader: Loader[V]) -> asyncio.Task[V]:
+        """Start the single shared load for a key."""
+        task = asyncio.create_task(self._load(key, loader, self._generation))
+        self._inflight[key] = task
+        task.add_done_callback(lambda done: self._load_done(key, done))
+        return task
+
+    async def _load(self, key: K, loader: Loader[V], generation: int) -> V:
+        """Run the loader and store the result unless invalidated meanwhile."""
+        self._stats["loads"] += 1
+        value = await loader()
+        if generation == self._generation:
+            self.set(key, value)
+        return value
+
+    def _load_done(self, key: K, task: asyncio.Task[V]) -> None:
+        """Forget the in-flight load and record its failure."""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error is not None:
+            # Stale entries (if any) keep being served until stale_seconds run out
+            self._stats["load_errors"] += 1
+            logger.warning(f"{self.name} cache load failed for {key}: {error}")
+
+    def _count(self, key: K, counter: str) -> None:
+        """Increment a counter globally and for the key's tenant."""
+        self._stats[counter] += 1
+        if self._tenant_of is None:
+            return
+        tenant = self._tenant_of(key)
+        tenant_stats = self._tenant_stats.get(tenant)
+        if tenant_stats is None:
+            tenant_stats = self._tenant_stats[tenant] = {
+                "hits": 0,
+                "misses": 0,
+                "stale_serves": 0,
+                "negative_hits": 0,
+            }
+        tenant_stats[counter] += 1
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get engine statistics (global and per tenant)."""
+        return {
+            **self._stats,
+            "entries": len(self._entries),
+            "inflight_loads": len(self._inflight),
+            "by_tenant": {tenant: dict(stats) for tenant, stats in self._tenant_stats.items()},
+        }
+
+
+def merge_engine_stats(*engines: ConfigCacheEngine[Any, Any]) -> dict[str, Any]:
+    """
+    Sum the stats of several engines (caches with more than one data type).
+
+    Returns:
+        Same shape as ConfigCacheEngine.get_stats()
+    """
+    merged: dict[str, Any] = {"by_tenant": {}}
+    for engine in engines:
+        for name, value in engine.get_stats().items():
+            if name == "by_tenant":
+                for tenant, stats in value.items():
+                    tenant_stats = merged["by_tenant"].setdefault(tenant, {})
+                    for counter, count in stats.items():
+                        tenant_stats[counter] = tenant_stats.get(counter, 0) + count
+            else:
+                merged[name] = merged.get(name, 0) + value
+    return merged
+
+
+def multi_layer_stats(engine_stats: dict[str, Any], layer_stats: dict[str, int]) -> dict[str, Any]:
+    """
+    Build the stats dict reported by the multi-layer config caches.
+
+    Args:
+        engine_stats: ConfigCacheEngine.get_stats() (or merge_engine_stats())
+        layer_stats: The cache's own redis_hits/redis_misses/db_loads/invalidations
+
+    Returns:
+        Memory (L1), Redis (L2) and DB (L3) counters plus engine counters
+    """
+    memory_hits = engine_stats["hits"] + engine_stats["negative_hits"] + engine_stats["stale_serves"]
+    memory_misses = engine_stats["misses"]
+    total_memory = memory_hits + memory_misses
+    total_redis = layer_stats["redis_hits"] + layer_stats["redis_misses"]
+
+    return {
+        "memory_hits": memory_hits,
+        "memory_misses": memory_misses,
+        "memory_hit_rate": memory_hits / total_memory if total_memory > 0 else 0,
+        "redis_hits": layer_stats["redis_hits"],
+        "redis_misses": layer_stats["redis_misses"],
+        "redis_hit_rate": layer_stats["redis_hits"] / total_redis if total_redis > 0 else 0,
+        "db_loads": layer_stats["db_loads"],
+        "invalidations": layer_stats["invalidations"],
+        "stale_serves": engine_stats["stale_serves"],
+        "negative_hits": engine_stats["negative_hits"],
+        "coalesced_loads": engine_stats["coalesced_loads"],
+        "background_refreshes": engine_stats["background_refreshes"],
+        "load_errors": engine_stats["load_errors"],
+        "by_tenant": engine_stats["by_tenant"],
+    }
@@ -8,11 +8,16 @@
 Domain Intent Cache - Multi-layer caching for unified domain intent patterns.
 
 Features:
-- L1: In-memory cache (60s TTL, per-instance, per-organization, per-domain)
+- L1: In-memory cache (60s TTL, per-instance, per-organization, per-domain;
+  longer while the cache invalidation bus is connected)
 - L2: Redis cache (5min TTL, distributed, per-organization, per-domain)
-- Automatic invalidation on pattern changes
-- Thread-safe with asyncio locks
+- Automatic invalidation on pattern changes, broadcast to all instances
+- Lock-free L1 reads, single-flight loads, stale-while-revalidate (ConfigCacheEngine)
 - Multi-domain support (pharmacy, excelencia, ecommerce, healthcare, etc.)
+- Intent keyword automaton (Aho-Corasick) compiled once per cached patterns
+  version, used by KeywordMatcher
+- Intent similarity index (normalized reference-vector matrix) built once per
+  cached patterns version, used by PharmacyIntentAnalyzer
 
 Usage:
     from app.core.cache.domain_intent_cache import domain_intent_cache
@@ -32,10 +37,15 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
-from datetime import UTC, datetime
+from collections.abc import Callable
 from typing import TYPE_CHECKING, Any
 from uuid import UUID
 
+from app.core.cache.cache_engine import ConfigCacheEngine, multi_layer_stats
+from app.core.cache.intent_similarity import IntentSimilarityIndex, reference_texts_from_patterns
+from app.core.cache.invalidation_bus import cache_invalidation_bus
+from app.core.cache.trigger_matcher import KeywordAutomaton
+
 if TYPE_CHECKING:
     from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -50,7 +60,8 @@ class DomainIntentCache:
     """
     Multi-layer cache for domain intent patterns.
 
-    Thread-safe per-organization, per-domain caching with TTL-based expiration.
+    Per-organization, per-domain caching with jittered TTLs, single-flight
+    loads and stale-while-revalidate (see ConfigCacheEngine).
     L1 (Memory) -> L2 (Redis) -> L3 (Database)
     """
 
@@ -60,20 +71,29 @@ class DomainIntentCache:
 
     def __init__(self) -> None:
         """Initialize cache with per-organization, per-domain storage."""
-        # Per-organization, per-domain memory cache
-        # {(org_id, domain_key): {"patterns": dict, "timestamp": datetime}}
-        self._memory_cache: dict[CacheKey, dict[str, Any]] = {}
-        self._locks: dict[CacheKey, asyncio.Lock] = {}
-        self._global_lock = asyncio.Lock()
+        # L1: {(org_id, domain_key): patterns} with single-flight and stale-while-revalidate
+        self._engine: ConfigCacheEngine[CacheKey, dict[str, Any]] = ConfigCacheEngine(
+            "domain_intent",
+            self.MEMORY_TTL_SECONDS,
+            tenant_of=lambda cache_key: str(cache_key[0]),
+        )
+
+        # Keyword automata: {(org_id, domain_key): (patterns, automaton)}, valid
+        # while `patterns` is the object currently cached for the key
+        self._automata: dict[CacheKey, tuple[dict[str, Any], KeywordAutomaton[str]]] = {}
 
-        # Stats for monitoring
+        # Similarity indexes: {(org_id, domain_key): (patterns, model, build task)}.
+        # Builds parse the reference texts, so concurrent callers share the task
+        self._similarity: dict[CacheKey, tuple[dict[str, Any], str, asyncio.Task[IntentSimilarityIndex]]] = {}
+
+        # Stats for monitoring (L1 counters live in the engine)
         self._stats = {
-            "memory_hits": 0,
-            "memory_misses": 0,
             "redis_hits": 0,
             "redis_misses": 0,
             "db_loads": 0,
             "invalidations": 0,
+            "automaton_compiles": 0,
+            "similarity_builds": 0,
         }
 
     def _make_cache_key(self, organization_id: UUID, domain_key: str) -> CacheKey:
@@ -84,13 +104,6 @@ class DomainIntentCache:
         """Create Redis key string."""
         return f"{self.REDIS_KEY_PREFIX}:{organization_id}:{domain_key}"
 
-    async def _get_lock(self, cache_key: CacheKey) -> asyncio.Lock:
-        """Get or create lock for specific cache key."""
-        async with self._global_lock:
-            if cache_key not in self._locks:
-                self._locks[cache_key] = asyncio.Lock()
-            return self._locks[cache_key]
-
     async def get_patterns(
         self,
         db: "AsyncSession | None",
@@ -111,42 +124,40 @@ class DomainIntentCache:
             Structured patterns dict for IntentAnalyzer
         """
         cache_key = self._make_cache_key(organization_id, domain_key)
-        lock = await self._get_lock(cache_key)
-
-        async with lock:
-            # L1: Check memory cache
-            memory_data = self._get_from_memory(cache_key)
-            if memory_data is not None:
-                self._stats["memory_hits"] += 1
-                return memory_data
-
-            self._stats["memory_misses"] += 1
-
-            # L2: Check Redis cache
-            redis_data = await self._get_from_redis(organization_id, domain_key)
-            if redis_data is not None:
-                self._stats["redis_hits"] += 1
-                # Populate L1 from L2
-                self._set_memory(cache_key, redis_data)
-                return redis_data
-
-            self._stats["redis_misses"] += 1
-
-            # L3: Load from database
-            if db is None:
-                patterns = await self._load_from_database_with_session(
-                    organization_id, domain_key
-                )
-            else:
-                patterns = await self._load_from_database(db, organization_id, domain_key)
+        return await self._engine.get(
+            cache_key,
+            lambda: self._load(db, organization_id, domain_key),
+            lambda: self._load(None, organization_id, domain_key),
+        )
 
-            self._stats["db_loads"] += 1
+    async def _load(
+        self,
+        db: "AsyncSession | None",
+        organization_id: UUID,
+        domain_key: str,
+    ) -> dict[str, Any]:
+        """L1 miss: L2 (Redis) -> L3 (Database)."""
+        generation = self._engine.generation
 
-            # Populate both caches
+        redis_data = await self._get_from_redis(organization_id, domain_key)
+        if redis_data is not None:
+            self._stats["redis_hits"] += 1
+            return redis_data
+
+        self._stats["redis_misses"] += 1
+
+        if db is None:
+            patterns = await self._load_from_database_with_session(organization_id, domain_key)
+        else:
+            patterns = await self._load_from_database(db, organization_id, domain_key)
+
+        self._stats["db_loads"] += 1
+
+        # Skip L2 if invalidated while loading (the data may predate the change)
+        if self._engine.generation == generation:
             await self._set_redis(organization_id, domain_key, patterns)
-            self._set_memory(cache_key, patterns)
 
-            return patterns
+        return patterns
 
     async def _load_from_database_with_session(
         self,
@@ -159,45 +170,19 @@ class DomainIntentCache:
         async with get_async_db_context() as db:
             return await self._load_from_database(db, organization_id, domain_key)
 
-    def _get_from_memory(self, cache_key: CacheKey) -> dict[str, Any] | None:
-        """Get patterns from memory cache if not expired."""
-        if cache_key not in self._memory_cache:
-            return None
-
-        cache_entry = self._memory_cache[cache_key]
-        timestamp = cache_entry.get("timestamp")
-
-        if timestamp is None:
-            return None
-
-        elapsed = (datetime.now(UTC) - timestamp).total_seconds()
-        if elapsed >= self.MEMORY_TTL_SECONDS:
-            # Expired
-            del self._memory_cache[cache_key]
-            return None
-
-        return cache_entry.get("patterns")
-
-    def _set_memory(self, cache_key: CacheKey, patterns: dict[str, Any]) -> None:
-        """Store patterns in memory cache."""
-        self._memory_cache[cache_key] = {
-            "patterns": patterns,
-            "timestamp": datetime.now(UTC),
-        }
-
     async def _get_from_redis(
         self, organization_id: UUID, domain_key: str
     ) -> dict[str, Any] | None:
         """Get patterns from Redis cache."""
         try:
-            from app.integrations.databases.redis import get_redis_client
+            from app.integrations.databases.redis import get_shared_async_redis_client
 
-            redis = get_redis_client()
+            redis = await get_shared_async_redis_client()
             if redis is None:
                 return None
 
             key = self._make_redis_key(organization_id, domain_key)
-            data = redis.get(key)
+            data = await redis.get(key)
 
             if data:
                 return json.loads(data)
@@ -213,9 +198,9 @@ class DomainIntentCache:
     ) -> None:
         """Store patterns in Redis cache."""
         try:
-            from app.integrations.databases.redis import get_redis_client
+            from app.integrations.databases.redis import get_shared_async_redis_client
 
-            redis = get_redis_client()
+            redis = await get_shared_async_redis_client()
             if redis is None:
                 return
 
@@ -223,7 +208,7 @@ class DomainIntentCache:
 
             # Convert sets to lists for JSON serialization
             serializable = self._make_serializable(patterns)
-            redis.setex(key, self.REDIS_TTL_SECONDS, json.dumps(serializable))
+            await redis.setex(key, self.REDIS_TTL_SECONDS, json.dumps(serializable))
 
         except Exception as e:
             logger.warning(
@@ -284,34 +269,34 @@ class DomainIntentCache:
             organization_id: Tenant UUID
             domain_key: Domain to invalidate
         """
-        cache_key = self._make_cache_key(organization_id, domain_key)
-        lock = await self._get_lock(cache_key)
-
-        async with lock:
-            # Clear memory cache
-            if cache_key in self._memory_cache:
-                del self._memory_cache[cache_key]
-
-            # Clear Redis cache
-            try:
-                from app.integrations.databases.redis import get_redis_client
-
-                redis = get_redis_client()
-                if redis:
-                    key = self._make_redis_key(organization_id, domain_key)
-                    redis.delete(key)
-            except Exception as e:
-                logger.warning(
-                    f"Redis invalidation failed for org {organization_id}, "
-                    f"domain {domain_key}: {e}"
-                )
+        # Clear memory cache
+        self._engine.invalidate(self._make_cache_key(organization_id, domain_key))
+        self._forget_compiled(lambda key: key == (organization_id, domain_key))
+
+        # Clear Redis cache
+        try:
+            from app.integrations.databases.redis import get_shared_async_redis_client
 
-            self._stats["invalidations"] += 1
-            logger.info(
-                f"Domain intent cache invalidated for org {organization_id}, "
-                f"domain {domain_key}"
+            redis = await get_shared_async_redis_client()
+            if redis:
+                key = self._make_redis_key(organization_id, domain_key)
+                await redis.delete(key)
+        except Exception as e:
+            logger.warning(
+                f"Redis invalidation failed for org {organization_id}, "
+                f"domain {domain_key}: {e}"
             )
 
+        self._stats["invalidations"] += 1
+        logger.info(
+            f"Domain intent cache invalidated for org {organization_id}, "
+            f"domain {domain_key}"
+        )
+
+        await cache_invalidation_bus.publish(
+            "domain_intent", organization_id=str(organization_id), domain_key=domain_key
+        )
+
     async def invalidate_all_domains(self, organization_id: UUID) -> int:
         """
         Invalidate cache for all domains of an organization.
@@ -322,42 +307,33 @@ class DomainIntentCache:
         Returns:
             Number of domains invalidated
         """
-        count = 0
-
-        async with self._global_lock:
-            # Find all cache keys for this org
-            keys_to_delete = [
-                key for key in self._memory_cache.keys()
-                if key[0] == organization_id
-            ]
-
-            # Clear memory caches
-            for key in keys_to_delete:
-                del self._memory_cache[key]
-                count += 1
-
-            # Clear Redis keys
-            try:
-                from app.integrations.databases.redis import get_redis_client
-
-                redis = get_redis_client()
-                if redis:
-                    pattern = f"{self.REDIS_KEY_PREFIX}:{organization_id}:*"
-                    keys = redis.keys(pattern)
-                    if keys:
-                        redis.delete(*keys)
-                        count = max(count, len(keys))
-            except Exception as e:
-                logger.warning(
-                    f"Redis bulk invalidation failed for org {organization_id}: {e}"
-                )
+        # Clear memory caches
+        count = self._engine.invalidate_where(lambda key: key[0] == organization_id)
+        self._forget_compiled(lambda key: key[0] == organization_id)
 
-            self._stats["invalidations"] += count
-            logger.info(
-                f"Domain intent cache invalidated for all {count} domains of org {organization_id}"
+        # Clear Redis keys
+        try:
+            from app.integrations.databases.redis import get_shared_async_redis_client
+
+            redis = await get_shared_async_redis_client()
+            if redis:
+                pattern = f"{self.REDIS_KEY_PREFIX}:{organization_id}:*"
+                keys = [key async for key in redis.scan_iter(match=pattern)]
+                if keys:
+                    await redis.delete(*keys)
+                    count = max(count, len(keys))
+        except Exception as e:
+            logger.warning(
+                f"Redis bulk invalidation failed for org {organization_id}: {e}"
             )
 
-            return count
+        self._stats["invalidations"] += count
+        logger.info(
+            f"Domain intent cache invalidated for all {count} domains of org {organization_id}"
+        )
+
+        await cache_invalidation_bus.publish("domain_intent", organization_id=str(organization_id))
+        return count
 
     async def invalidate_all(self) -> int:
         """
@@ -368,30 +344,53 @@ class DomainIntentCache:
         Returns:
             Number of cache entries invalidated
         """
-        async with self._global_lock:
-            count = len(self._memory_cache)
+        # Clear all memory caches
+        count = self._engine.clear()
+        self._forget_compiled(lambda key: True)
 
-            # Clear all memory caches
-            self._memory_cache.clear()
+        # Clear all Redis keys
+        try:
+            from app.integrations.databases.redis import get_shared_async_redis_client
+
+            redis = await get_shared_async_redis_client()
+            if redis:
+                pattern = f"{self.REDIS_KEY_PREFIX}:*"
+                keys = [key async for key in redis.scan_iter(match=pattern)]
+                if keys:
+                    await redis.delete(*keys)
+                    count = max(count, len(keys))
+        except Exception as e:
+            logger.warning(f"Redis bulk invalidation failed: {e}")
 
-            # Clear all Redis keys
-            try:
-                from app.integrations.databases.redis import get_redis_client
+        self._stats["invalidations"] += count
+        logger.info(f"Domain intent cache invalidated for all {count} entries")
 
-                redis = get_redis_client()
-                if redis:
-                    pattern = f"{self.REDIS_KEY_PREFIX}:*"
-                    keys = redis.keys(pattern)
-                    if keys:
-                        redis.delete(*keys)
-                        count = max(count, len(keys))
-            except Exception as e:
-                logger.warning(f"Redis bulk invalidation failed: {e}")
+        await cache_invalidation_bus.publish("domain_intent")
+        return count
 
-            self._stats["invalidations"] += count
-            logger.info(f"Domain intent cache invalidated for all {count} entries")
+    def invalidate_local(self, payload: dict[str, Any]) -> None:
+        """
+        Clear L1 entries invalidated by another instance.
 
-            return count
+        Args:
+            payload: Bus payload with optional organization_id and domain_key
+        """
+        organization_id = payload.get("organization_id")
+        if organization_id is None:
+            self._engine.clear()
+            self._forget_compiled(lambda key: True)
+            return
+
+        org_uuid = UUID(organization_id)
+        domain_key = payload.get("domain_key")
+        self._engine.invalidate_where(lambda key: key[0] == org_uuid and domain_key in (None, key[1]))
+        self._forget_compiled(lambda key: key[0] == org_uuid and domain_key in (None, key[1]))
+
+    def _forget_compiled(self, predicate: Callable[[CacheKey], bool]) -> None:
+        """Drop compiled keyword automata and similarity indexes for matching keys."""
+        for compiled in (self._automata, self._similarity):
+            for cache_key in [key for key in compiled if predicate(key)]:
+                del compiled[cache_key]
 
     async def warm(
         self,
@@ -413,23 +412,101 @@ class DomainIntentCache:
             Loaded patterns
         """
         cache_key = self._make_cache_key(organization_id, domain_key)
-        lock = await self._get_lock(cache_key)
 
-        async with lock:
-            # Force load from database
-            patterns = await self._load_from_database(db, organization_id, domain_key)
+        # Force load from database
+        patterns = await self._load_from_database(db, organization_id, domain_key)
 
-            # Populate both caches
-            await self._set_redis(organization_id, domain_key, patterns)
-            self._set_memory(cache_key, patterns)
+        # Populate both caches
+        await self._set_redis(organization_id, domain_key, patterns)
+        self._engine.set(cache_key, patterns)
 
-            logger.info(f"Cache warmed for org {organization_id}, domain {domain_key}")
-            return patterns
+        logger.info(f"Cache warmed for org {organization_id}, domain {domain_key}")
+        return patterns
 
     # =========================================================================
     # HELPER METHODS - Extracted patterns for specific use cases
     # =========================================================================
 
+    async def get_keyword_automaton(
+        self,
+        db: "AsyncSession | None",
+        organization_id: UUID,
+        domain_key: str = "pharmacy",
+    ) -> KeywordAutomaton[str]:
+        """
+        Get the Aho-Corasick automaton over all intent lemmas/keywords.
+
+        Each keyword maps to its intent_key. Compiled on first use after
+        each (re)load of the patterns and reused while they stay cached.
+
+        Args:
+            db: AsyncSession for database access
+            organization_id: Tenant UUID
+            domain_key: Domain scope
+
+        Returns:
+            KeywordAutomaton whose find(message) gives {intent_key: [keywords]}
+        """
+        patterns = await self.get_patterns(db, organization_id, domain_key)
+        cache_key = self._make_cache_key(organization_id, domain_key)
+
+        compiled = self._automata.get(cache_key)
+        if compiled is not None and compiled[0] is patterns:
+            return compiled[1]
+
+        automaton = KeywordAutomaton(
+            (keyword, intent_key)
+            for intent_key, intent_data in patterns.get("intents", {}).items()
+            for keyword in set(intent_data.get("lemmas", [])) | set(intent_data.get("keywords", []))
+        )
+        self._automata[cache_key] = (patterns, automaton)
+        self._stats["automaton_compiles"] += 1
+        return automaton
+
+    async def get_similarity_index(
+        self,
+        db: "AsyncSession | None",
+        organization_id: UUID,
+        domain_key: str = "pharmacy",
+        model: str = "es_core_news_sm",
+    ) -> IntentSimilarityIndex:
+        """
+        Get the intent similarity index over the domain's intents.
+
+        Reference texts come from each intent's phrases, keywords and lemmas
+        (parsed in one batch by the NLP service). Built on first use after
+        each (re)load of the patterns and reused while they stay cached;
+        concurrent callers share one build.
+
+        Args:
+            db: AsyncSession for database access
+            organization_id: Tenant UUID
+            domain_key: Domain scope
+            model: spaCy model producing the vectors
+
+        Returns:
+            IntentSimilarityIndex whose score(vector) gives {intent_key: similarity}
+        """
+        patterns = await self.get_patterns(db, organization_id, domain_key)
+        cache_key = self._make_cache_key(organization_id, domain_key)
+
+        compiled = self._similarity.get(cache_key)
+        task = compiled[2] if compiled is not None and compiled[0] is patterns and compiled[1] == model else None
+        if task is not None and task.done() and (task.cancelled() or task.exception() is not None):
+            task = None  # Failed build: retry
+
+        if task is None:
+            task = asyncio.create_task(
+                IntentSimilarityIndex.build(
+                    reference_texts_from_patterns(patterns), model, disable=("parser",), source=patterns
+                )
+            )
+            self._similarity[cache_key] = (patterns, model, task)
+            self._stats["similarity_builds"] += 1
+
+        # Shielded: a cancelled caller must not cancel the build other callers share
+        return await asyncio.shield(task)
+
     async def get_capability_patterns(
         self,
         db: "AsyncSession | None",
@@ -487,32 +564,23 @@ class DomainIntentCache:
 
     def get_stats(self) -> dict[str, Any]:
         """Get cache statistics."""
-        total_memory = self._stats["memory_hits"] + self._stats["memory_misses"]
-        total_redis = self._stats["redis_hits"] + self._stats["redis_misses"]
-
         return {
-            "memory_hits": self._stats["memory_hits"],
-            "memory_misses": self._stats["memory_misses"],
-            "memory_hit_rate": (
-                self._stats["memory_hits"] / total_memory if total_memory > 0 else 0
-            ),
-            "redis_hits": self._stats["redis_hits"],
-            "redis_misses": self._stats["redis_misses"],
-            "redis_hit_rate": (
-                self._stats["redis_hits"] / total_redis if total_redis > 0 else 0
-            ),
-            "db_loads": self._stats["db_loads"],
-            "invalidations": self._stats["invalidations"],
-            "cached_entries": len(self._memory_cache),
+            **multi_layer_stats(self._engine.get_stats(), self._stats),
+            "cached_entries": len(self._engine),
+            "compiled_automata": len(self._automata),
+            "automaton_compiles": self._stats["automaton_compiles"],
+            "similarity_indexes": len(self._similarity),
+            "similarity_builds": self._stats["similarity_builds"],
         }
 
     def get_cached_entries(self) -> list[dict[str, str]]:
         """Get list of cached org/domain pairs."""
         return [
             {"organization_id": str(org_id), "domain_key": domain_key}
-            for org_id, domain_key in self._memory_cache.keys()
+            for org_id, domain_key in self._engine.keys()
         ]
 
 
 # Singleton instance
 domain_intent_cache = DomainIntentCache()
+cache_invalidation_bus.register("domain_intent", domain_intent_cache.invalidate_local)
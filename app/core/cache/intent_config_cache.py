@@ -13,10 +13,11 @@ Replaces the hardcoded values in intent_validator.py:
 - KEYWORD_TO_AGENT -> get_keyword_mappings()
 
 Features:
-- L1: In-memory cache (60s TTL, per-instance, per-organization)
+- L1: In-memory cache (60s TTL, per-instance, per-organization; longer while
+  the cache invalidation bus is connected)
 - L2: Redis cache (5min TTL, distributed, per-organization)
-- Automatic invalidation on config changes
-- Thread-safe with asyncio locks
+- Automatic invalidation on config changes, broadcast to all instances
+- Lock-free L1 reads, single-flight loads, stale-while-revalidate (ConfigCacheEngine)
 - Multi-tenant isolation
 
 Usage:
@@ -40,10 +41,13 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
-from datetime import UTC, datetime
+from collections.abc import Awaitable, Callable
 from typing import TYPE_CHECKING, Any
 from uuid import UUID
 
+from app.core.cache.cache_engine import ConfigCacheEngine, merge_engine_stats, multi_layer_stats
+from app.core.cache.invalidation_bus import cache_invalidation_bus
+
 if TYPE_CHECKING:
     from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -54,7 +58,8 @@ class IntentConfigCache:
     """
     Multi-layer cache for intent routing configurations.
 
-    Thread-safe per-organization caching with TTL-based expiration.
+    Per-organization caching with jittered TTLs, single-flight loads and
+    stale-while-revalidate (see ConfigCacheEngine).
     L1 (Memory) -> L2 (Redis) -> L3 (Database)
 
     Caches three types of data:
@@ -69,35 +74,75 @@ class IntentConfigCache:
 
     def __init__(self) -> None:
         """Initialize cache with per-organization storage."""
-        # Per-organization memory caches
-        # {org_id: {"data": dict, "timestamp": datetime}}
-        self._intent_mappings_cache: dict[UUID, dict[str, Any]] = {}
-        self._flow_agents_cache: dict[UUID, dict[str, Any]] = {}
-        self._keyword_mappings_cache: dict[UUID, dict[str, Any]] = {}
-
-        self._locks: dict[UUID, asyncio.Lock] = {}
-        self._global_lock = asyncio.Lock()
+        # One L1 engine per data type: {org_id: data}
+        self._intent_mappings_engine: ConfigCacheEngine[UUID, dict[str, Any]] = ConfigCacheEngine(
+            "intent_config:mappings", self.MEMORY_TTL_SECONDS, tenant_of=str
+        )
+        self._flow_agents_engine: ConfigCacheEngine[UUID, dict[str, Any]] = ConfigCacheEngine(
+            "intent_config:flow_agents", self.MEMORY_TTL_SECONDS, tenant_of=str
+        )
+        self._keyword_mappings_engine: ConfigCacheEngine[UUID, dict[str, Any]] = ConfigCacheEngine(
+            "intent_config:keywords", self.MEMORY_TTL_SECONDS, tenant_of=str
+        )
 
-        # Stats for monitoring
+        # Stats for monitoring (L1 counters live in the engines)
         self._stats = {
-            "memory_hits": 0,
-            "memory_misses": 0,
             "redis_hits": 0,
             "redis_misses": 0,
             "db_loads": 0,
             "invalidations": 0,
         }
 
+    @property
+    def _engines(self) -> tuple[ConfigCacheEngine[UUID, dict[str, Any]], ...]:
+        """All L1 engines (mappings, flow agents, keywords)."""
+        return (self._intent_mappings_engine, self._flow_agents_engine, self._keyword_mappings_engine)
+
     def _make_redis_key(self, cache_type: str, organization_id: UUID) -> str:
         """Create Redis key string."""
         return f"{self.REDIS_KEY_PREFIX}:{cache_type}:{organization_id}"
 
-    async def _get_lock(self, organization_id: UUID) -> asyncio.Lock:
-        """Get or create lock for specific organization."""
-        async with self._global_lock:
-            if organization_id not in self._locks:
-                self._locks[organization_id] = asyncio.Lock()
-            return self._locks[organization_id]
+    async def _load(
+        self,
+        engine: ConfigCacheEngine[UUID, dict[str, Any]],
+        cache_type: str,
+        organization_id: UUID,
+        load_from_db: Callable[[], Awaitable[dict[str, Any]]],
+    ) -> dict[str, Any]:
+        """L1 miss: L2 (Redis) -> L3 (Database)."""
+        generation = engine.generation
+
+        redis_data = await self._get_from_redis(cache_type, organization_id)
+        if redis_data is not None:
+            self._stats["redis_hits"] += 1
+            return redis_data
+
+        self._stats["redis_misses"] += 1
+
+        data = await load_from_db()
+        self._stats["db_loads"] += 1
+
+        # Skip L2 if invalidated while loading (the data may predate the change)
+        if engine.generation == generation:
+            await self._set_redis(cache_type, organization_id, data)
+
+        return data
+
+    def _get(
+        self,
+        engine: ConfigCacheEngine[UUID, dict[str, Any]],
+        cache_type: str,
+        db: "AsyncSession | None",
+        organization_id: UUID,
+        load_from_db: Callable[["AsyncSession | None"], Awaitable[dict[str, Any]]],
+    ) -> Awaitable[dict[str, Any]]:
+        """Read one data type through its engine."""
+        return engine.get(
+            organization_id,
+            lambda: self._load(engine, cache_type, organization_id, lambda: load_from_db(db)),
+            # Background refreshes open their own session
+            lambda: self._load(engine, cache_type, organization_id, lambda: load_from_db(None)),
+        )
 
     # =========================================================================
     # INTENT MAPPINGS (replaces AGENT_TO_INTENT_MAPPING)
@@ -120,53 +165,21 @@ class IntentConfigCache:
         Returns:
             Dict mapping intent_key -> agent_key
         """
-        lock = await self._get_lock(organization_id)
+        mappings = await self._get(
+            self._intent_mappings_engine,
+            "mappings",
+            db,
+            organization_id,
+            lambda session: self._load_intent_mappings_from_db(session, organization_id),
+        )
 
-        async with lock:
-            # L1: Check memory cache
-            memory_data = self._get_from_memory(
-                self._intent_mappings_cache, organization_id
-            )
-            if memory_data is not None:
-                self._stats["memory_hits"] += 1
-                # Filter by domain if specified
-                if domain_key:
-                    return {
-                        k: v for k, v in memory_data.items()
-                        if memory_data.get(f"_domain_{k}") in (None, domain_key)
-                    }
-                return memory_data
-
-            self._stats["memory_misses"] += 1
-
-            # L2: Check Redis cache
-            redis_data = await self._get_from_redis("mappings", organization_id)
-            if redis_data is not None:
-                self._stats["redis_hits"] += 1
-                self._set_memory(self._intent_mappings_cache, organization_id, redis_data)
-                if domain_key:
-                    return {
-                        k: v for k, v in redis_data.items()
-                        if redis_data.get(f"_domain_{k}") in (None, domain_key)
-                    }
-                return redis_data
-
-            self._stats["redis_misses"] += 1
-
-            # L3: Load from database
-            mappings = await self._load_intent_mappings_from_db(db, organization_id)
-            self._stats["db_loads"] += 1
-
-            # Populate both caches
-            await self._set_redis("mappings", organization_id, mappings)
-            self._set_memory(self._intent_mappings_cache, organization_id, mappings)
-
-            if domain_key:
-                return {
-                    k: v for k, v in mappings.items()
-                    if mappings.get(f"_domain_{k}") in (None, domain_key)
-                }
-            return mappings
+        # Filter by domain if specified
+        if domain_key:
+            return {
+                k: v for k, v in mappings.items()
+                if mappings.get(f"_domain_{k}") in (None, domain_key)
+            }
+        return mappings
 
     async def _load_intent_mappings_from_db(
         self,
@@ -224,40 +237,22 @@ class IntentConfigCache:
         Returns:
             Set of agent_keys that have multi-turn flows
         """
-        lock = await self._get_lock(organization_id)
-
-        async with lock:
-            # L1: Check memory cache
-            memory_data = self._get_from_memory(
-                self._flow_agents_cache, organization_id
-            )
-            if memory_data is not None:
-                self._stats["memory_hits"] += 1
-                return set(memory_data.get("agents", []))
-
-            self._stats["memory_misses"] += 1
-
-            # L2: Check Redis cache
-            redis_data = await self._get_from_redis("flow_agents", organization_id)
-            if redis_data is not None:
-                self._stats["redis_hits"] += 1
-                self._set_memory(self._flow_agents_cache, organization_id, redis_data)
-                return set(redis_data.get("agents", []))
-
-            self._stats["redis_misses"] += 1
-
-            # L3: Load from database
-            flow_agents = await self._load_flow_agents_from_db(db, organization_id)
-            self._stats["db_loads"] += 1
-
-            # Store as dict for JSON serialization
-            data = {"agents": list(flow_agents)}
-
-            # Populate both caches
-            await self._set_redis("flow_agents", organization_id, data)
-            self._set_memory(self._flow_agents_cache, organization_id, data)
+        data = await self._get(
+            self._flow_agents_engine,
+            "flow_agents",
+            db,
+            organization_id,
+            lambda session: self._load_flow_agents_data(session, organization_id),
+        )
+        return set(data.get("agents", []))
 
-            return flow_agents
+    async def _load_flow_agents_data(
+        self,
+        db: "AsyncSession | None",
+        organization_id: UUID,
+    ) -> dict[str, Any]:
+        """Load flow agents as a dict for JSON serialization."""
+        return {"agents": list(await self._load_flow_agents_from_db(db, organization_id))}
 
     async def _load_flow_agents_from_db(
         self,
@@ -307,37 +302,13 @@ class IntentConfigCache:
         Returns:
             Dict mapping agent_key -> list of keywords
         """
-        lock = await self._get_lock(organization_id)
-
-        async with lock:
-            # L1: Check memory cache
-            memory_data = self._get_from_memory(
-                self._keyword_mappings_cache, organization_id
-            )
-            if memory_data is not None:
-                self._stats["memory_hits"] += 1
-                return memory_data
-
-            self._stats["memory_misses"] += 1
-
-            # L2: Check Redis cache
-            redis_data = await self._get_from_redis("keywords", organization_id)
-            if redis_data is not None:
-                self._stats["redis_hits"] += 1
-                self._set_memory(self._keyword_mappings_cache, organization_id, redis_data)
-                return redis_data
-
-            self._stats["redis_misses"] += 1
-
-            # L3: Load from database
-            keywords = await self._load_keyword_mappings_from_db(db, organization_id)
-            self._stats["db_loads"] += 1
-
-            # Populate both caches
-            await self._set_redis("keywords", organization_id, keywords)
-            self._set_memory(self._keyword_mappings_cache, organization_id, keywords)
-
-            return keywords
+        return await self._get(
+            self._keyword_mappings_engine,
+            "keywords",
+            db,
+            organization_id,
+            lambda session: self._load_keyword_mappings_from_db(session, organization_id),
+        )
 
     async def _load_keyword_mappings_from_db(
         self,
@@ -410,41 +381,6 @@ class IntentConfigCache:
     # CACHE INFRASTRUCTURE
     # =========================================================================
 
-    def _get_from_memory(
-        self,
-        cache: dict[UUID, dict[str, Any]],
-        organization_id: UUID,
-    ) -> dict[str, Any] | None:
-        """Get data from memory cache if not expired."""
-        if organization_id not in cache:
-            return None
-
-        cache_entry = cache[organization_id]
-        timestamp = cache_entry.get("timestamp")
-
-        if timestamp is None:
-            return None
-
-        elapsed = (datetime.now(UTC) - timestamp).total_seconds()
-        if elapsed >= self.MEMORY_TTL_SECONDS:
-            # Expired
-            del cache[organization_id]
-            return None
-
-        return cache_entry.get("data")
-
-    def _set_memory(
-        self,
-        cache: dict[UUID, dict[str, Any]],
-        organization_id: UUID,
-        data: dict[str, Any],
-    ) -> None:
-        """Store data in memory cache."""
-        cache[organization_id] = {
-            "data": data,
-            "timestamp": datetime.now(UTC),
-        }
-
     async def _get_from_redis(
         self,
         cache_type: str,
@@ -452,14 +388,14 @@ class IntentConfigCache:
     ) -> dict[str, Any] | None:
         """Get data from Redis cache."""
         try:
-            from app.integrations.databases.redis import get_redis_client
+            from app.integrations.databases.redis import get_shared_async_redis_client
 
-            redis = get_redis_client()
+            redis = await get_shared_async_redis_client()
             if redis is None:
                 return None
 
             key = self._make_redis_key(cache_type, organization_id)
-            data = redis.get(key)
+            data = await redis.get(key)
 
             if data:
                 return json.loads(data)
@@ -478,14 +414,14 @@ class IntentConfigCache:
     ) -> None:
         """Store data in Redis cache."""
         try:
-            from app.integrations.databases.redis import get_redis_client
+            from app.integrations.databases.redis import get_shared_async_redis_client
 
-            redis = get_redis_client()
+            redis = await get_shared_async_redis_client()
             if redis is None:
                 return
 
             key = self._make_redis_key(cache_type, organization_id)
-            redis.setex(key, self.REDIS_TTL_SECONDS, json.dumps(data))
+            await redis.setex(key, self.REDIS_TTL_SECONDS, json.dumps(data))
 
         except Exception as e:
             logger.warning(
@@ -501,33 +437,28 @@ class IntentConfigCache:
         Args:
             organization_id: Tenant UUID
         """
-        lock = await self._get_lock(organization_id)
-
-        async with lock:
-            # Clear memory caches
-            if organization_id in self._intent_mappings_cache:
-                del self._intent_mappings_cache[organization_id]
-            if organization_id in self._flow_agents_cache:
-                del self._flow_agents_cache[organization_id]
-            if organization_id in self._keyword_mappings_cache:
-                del self._keyword_mappings_cache[organization_id]
-
-            # Clear Redis caches
-            try:
-                from app.integrations.databases.redis import get_redis_client
-
-                redis = get_redis_client()
-                if redis:
-                    for cache_type in ["mappings", "flow_agents", "keywords"]:
-                        key = self._make_redis_key(cache_type, organization_id)
-                        redis.delete(key)
-            except Exception as e:
-                logger.warning(
-                    f"Redis invalidation failed for org {organization_id}: {e}"
-                )
-
-            self._stats["invalidations"] += 1
-            logger.info(f"Intent config cache invalidated for org {organization_id}")
+        # Clear memory caches
+        for engine in self._engines:
+            engine.invalidate(organization_id)
+
+        # Clear Redis caches
+        try:
+            from app.integrations.databases.redis import get_shared_async_redis_client
+
+            redis = await get_shared_async_redis_client()
+            if redis:
+                for cache_type in ["mappings", "flow_agents", "keywords"]:
+                    key = self._make_redis_key(cache_type, organization_id)
+                    await redis.delete(key)
+        except Exception as e:
+            logger.warning(
+                f"Redis invalidation failed for org {organization_id}: {e}"
+            )
+
+        self._stats["invalidations"] += 1
+        logger.info(f"Intent config cache invalidated for org {organization_id}")
+
+        await cache_invalidation_bus.publish("intent_config", organization_id=str(organization_id))
 
     async def invalidate_all(self) -> int:
         """
@@ -536,54 +467,51 @@ class IntentConfigCache:
         Returns:
             Number of organizations invalidated
         """
-        async with self._global_lock:
-            count = len(self._intent_mappings_cache)
+        # Clear all memory caches
+        count = max(engine.clear() for engine in self._engines)
 
-            # Clear all memory caches
-            self._intent_mappings_cache.clear()
-            self._flow_agents_cache.clear()
-            self._keyword_mappings_cache.clear()
+        # Clear all Redis keys
+        try:
+            from app.integrations.databases.redis import get_shared_async_redis_client
+
+            redis = await get_shared_async_redis_client()
+            if redis:
+                pattern = f"{self.REDIS_KEY_PREFIX}:*"
+                keys = [key async for key in redis.scan_iter(match=pattern)]
+                if keys:
+                    await redis.delete(*keys)
+                    count = max(count, len(keys) // 3)  # 3 types per org
+        except Exception as e:
+            logger.warning(f"Redis bulk invalidation failed: {e}")
 
-            # Clear all Redis keys
-            try:
-                from app.integrations.databases.redis import get_redis_client
+        self._stats["invalidations"] += count
+        logger.info(f"Intent config cache invalidated for all {count} organizations")
 
-                redis = get_redis_client()
-                if redis:
-                    pattern = f"{self.REDIS_KEY_PREFIX}:*"
-                    keys = redis.keys(pattern)
-                    if keys:
-                        redis.delete(*keys)
-                        count = max(count, len(keys) // 3)  # 3 types per org
-            except Exception as e:
-                logger.warning(f"Redis bulk invalidation failed: {e}")
+        await cache_invalidation_bus.publish("intent_config")
+        return count
 
-            self._stats["invalidations"] += count
-            logger.info(f"Intent config cache invalidated for all {count} organizations")
+    def invalidate_local(self, payload: dict[str, Any]) -> None:
+        """
+        Clear L1 entries invalidated by another instance.
 
-            return count
+        Args:
+            payload: Bus payload; without organization_id every entry is cleared
+        """
+        organization_id = payload.get("organization_id")
+        for engine in self._engines:
+            if organization_id is None:
+                engine.clear()
+            else:
+                engine.invalidate(UUID(organization_id))
 
     def get_stats(self) -> dict[str, Any]:
         """Get cache statistics."""
-        total_memory = self._stats["memory_hits"] + self._stats["memory_misses"]
-        total_redis = self._stats["redis_hits"] + self._stats["redis_misses"]
-
         return {
-            "memory_hits": self._stats["memory_hits"],
-            "memory_misses": self._stats["memory_misses"],
-            "memory_hit_rate": (
-                self._stats["memory_hits"] / total_memory if total_memory > 0 else 0
-            ),
-            "redis_hits": self._stats["redis_hits"],
-            "redis_misses": self._stats["redis_misses"],
-            "redis_hit_rate": (
-                self._stats["redis_hits"] / total_redis if total_redis > 0 else 0
-            ),
-            "db_loads": self._stats["db_loads"],
-            "invalidations": self._stats["invalidations"],
-            "cached_organizations": len(self._intent_mappings_cache),
+            **multi_layer_stats(merge_engine_stats(*self._engines), self._stats),
+            "cached_organizations": len(self._intent_mappings_engine),
         }
 
 
 # Singleton instance
 intent_config_cache = IntentConfigCache()
+cache_invalidation_bus.register("intent_config", intent_config_cache.invalidate_local)
@@ -0,0 +1,211 @@
+# ============================================================================
+# SCOPE: MULTI-TENANT + MULTI-DOMAIN
+# Description: Índice de similitud semántica por intent: matriz de vectores
+#              de referencia normalizados, compilada una vez por versión de
+#              patrones. Un producto matriz-vector puntúa todos los intents.
+# Tenant-Aware: Yes - domain_intent_cache compila un índice por
+#               (organization_id, domain_key).
+# Domain-Aware: Yes - cada domain_key tiene su propio índice.
+# ============================================================================
+"""
+Intent Similarity Index.
+
+Semantic similarity between a message and each intent used to be computed
+one intent at a time (Doc.similarity per reference sentence). The index
+stacks one L2-normalized reference vector per intent into a matrix, so:
+
+- score(vector): cosine similarity against every intent in one
+  matrix-vector product
+- score_batch(vectors): the same for many messages in one matrix product
+  (offline evaluation)
+
+Reference vectors are spaCy document vectors (SpacyNLPService) of a
+reference text per intent. For tenant patterns the text is built from the
+intent's phrases, keywords and lemmas (reference_texts_from_patterns).
+domain_intent_cache compiles the index once per cached patterns version,
+like the keyword automaton.
+
+Usage:
+    index = await IntentSimilarityIndex.build({"greeting": "hola buenos días", ...}, "es_core_news_sm")
+    scores = index.score(doc.vector)  # {"greeting": 0.82, ...}
+
+    index = await domain_intent_cache.get_similarity_index(db, org_id, "pharmacy")
+    rows = await index.score_texts(["quiero pagar", "hola"])  # [{intent: score}, ...]
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping, Sequence
+from typing import Any
+
+import numpy as np
+
+
+def reference_texts_from_patterns(patterns: dict[str, Any]) -> dict[str, str]:
+    """
+    Build one reference text per intent from domain intent patterns.
+
+    Args:
+        patterns: DomainIntentCache patterns ({"intents": {intent_key: {...}}})
+
+    Returns:
+        {intent_key: phrases + keywords + lemmas joined by spaces}; intents
+        without any text are left out
+    """
+    texts: dict[str, str] = {}
+    for intent_key, intent_data in patterns.get("intents", {}).items():
+        parts: list[str] = []
+        for phrase_data in intent_data.get("phrases", []):
+            phrase = phrase_data.get("phrase", "") if isinstance(phrase_data, dict) else phrase_data
+            if phrase:
+                parts.append(phrase)
+        parts.extend(intent_data.get("keywords", []))
+        parts.extend(intent_data.get("lemmas", []))
+        # Keep the first occurrence of each term, in order
+        text = " ".join(dict.fromkeys(part.lower() for part in parts if part))
+        if text:
+            texts[intent_key] = text
+    return texts
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """L2-normalize rows; all-zero rows stay zero (similarity 0)."""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+
+
+class IntentSimilarityIndex:
+    """
+    Normalized reference-vector matrix for a set of intents.
+
+    Immutable once built; `source` is the object it was compiled from (the
+    cached patterns dict, for domain_intent_cache's identity check).
+    """
+
+    def __init__(
+        self,
+        intents: Sequence[str],
+        vectors: np.ndarray | Sequence[Sequence[float]],
+        *,
+        model: str | None = None,
+        source: Any = None,
+    ) -> None:
+        """
+        Build the index.
+
+        Args:
+            intents: Intent keys, one per row
+            vectors: Reference vectors (n_intents x dim); empty rows mean
+                "no vector" and always score 0
+            model: spaCy model that produced the vectors (for score_texts)
+            source: Object the index was compiled from
+        """
+        self.intents = tuple(intents)
+        self.model = model
+        self.source = source
+
+        matrix = np.asarray(vectors, dtype=np.float32)
+        if matrix.ndim != 2 or matrix.shape[0] != len(self.intents):
+            matrix = np.zeros((len(self.intents), 0), dtype=np.float32)
+        self._matrix = _normalize_rows(matrix)
+
+    @classmethod
+    async def build(
+        cls,
+        reference_texts: Mapping[str, str],
+        model: str,
+        *,
+        disable: Sequence[str] = (),
+        source: Any = None,
+    ) -> IntentSimilarityIndex:
+        """
+        Parse the reference texts (one nlp.pipe batch) and build the index.
+
+        Args:
+            reference_texts: {intent_key: reference text}
+            model: spaCy model
+            disable: Pipeline components to skip while parsing
+            source: Object the index is compiled from
+
+        Returns:
+            Index over the intents whose reference text has a vector
+        """
+        from app.integrations.nlp import get_nlp_service
+
+        intents = list(reference_texts)
+        docs = await get_nlp_service().parse_many([reference_texts[intent] for intent in intents], model, disable)
+
+        dim = max((len(doc.vector) for doc in docs), default=0)
+        vectors = np.zeros((len(intents), dim), dtype=np.float32)
+        for row, doc in enumerate(docs):
+            if doc.has_vector and len(doc.vector) == dim:
+                vectors[row] = doc.vector
+        return cls(intents, vectors, model=model, source=source)
+
+    @property
+    def size(self) -> int:
+        """Number of intents."""
+        return len(self.intents)
+
+    @property
+    def dimension(self) -> int:
+        """Vector dimension (0 if the model produced no vectors)."""
+        return self._matrix.shape[1]
+
+    def score(self, vector: Sequence[float] | np.ndarray) -> dict[str, float]:
+        """
+        Cosine similarity of a message vector against every intent.
+
+        Args:
+            vector: Message vector (e.g. ParsedDoc.vector)
+
+        Returns:
+            {intent_key: similarity}; all 0.0 for an empty or mismatched vector
+        """
+        query = np.asarray(vector, dtype=np.float32)
+        norm = float(np.linalg.norm(query)) if query.size else 0.0
+        if norm == 0 or query.shape != (self.dimension,):
+            return dict.fromkeys(self.intents, 0.0)
+        similarities = self._matrix @ (query / norm)
+        return dict(zip(self.intents, similarities.tolist(), strict=True))
+
+    def score_batch(self, vectors: np.ndarray | Sequence[Sequence[float]]) -> np.ndarray:
+        """
+        Cosine similarity of many message vectors against every intent.
+
+        Args:
+            vectors: Message vectors (n_messages x dim)
+
+        Returns:
+            Similarity matrix (n_messages x n_intents), columns in `intents` order
+        """
+        queries = np.asarray(vectors, dtype=np.float32)
+        if queries.ndim != 2 or queries.shape[1] != self.dimension:
+            return np.zeros((len(queries), self.size), dtype=np.float32)
+        return _normalize_rows(queries) @ self._matrix.T
+
+    async def score_texts(self, texts: Sequence[str], disable: Sequence[str] = ()) -> list[dict[str, float]]:
+        """
+        Parse and score many messages (offline evaluation).
+
+        Args:
+            texts: Messages
+            disable: Pipeline components to skip while parsing
+
+        Returns:
+            One {intent_key: similarity} dict per message
+        """
+        if self.model is None:
+            raise ValueError("Index was built from raw vectors; no model to parse texts with")
+
+        from app.integrations.nlp import get_nlp_service
+
+        docs = await get_nlp_service().parse_many([text.lower() for text in texts], self.model, disable)
+        vectors = np.zeros((len(docs), self.dimension), dtype=np.float32)
+        for row, doc in enumerate(docs):
+            if len(doc.vector) == self.dimension:
+                vectors[row] = doc.vector
+        return [dict(zip(self.intents, row, strict=True)) for row in self.score_batch(vectors).tolist()]
+
+
+__all__ = ["IntentSimilarityIndex", "reference_texts_from_patterns"]
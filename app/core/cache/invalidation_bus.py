@@ -0,0 +1,297 @@
+# ============================================================================
+# SCOPE: GLOBAL
+# Description: Bus de invalidación de caches vía Redis pub/sub. Propaga las
+#              invalidaciones de configuración a todos los workers.
+# Tenant-Aware: Yes - los mensajes llevan organization_id/domain_key.
+# ============================================================================
+"""
+Cache Invalidation Bus - Cluster-wide L1 invalidation over Redis pub/sub.
+
+The config caches (intent_config, domain_intent, routing_config,
+response_config, awaiting_type, agents, bypass_rules) keep an L1 dict per
+process. Their invalidate() clears the local L1 and the shared Redis keys,
+then publishes a message here so every other process drops its L1 entry too.
+
+Features:
+- One subscriber task per process (started by BackgroundServiceManager)
+- Messages from the publishing process are ignored (already cleared)
+- On (re)subscribe every registered L1 is cleared, covering missed messages
+- memory_ttl(): long L1 TTL while subscribed, each cache's short TTL otherwise
+- Listeners: derived caches (e.g. the semantic classification cache) can
+  follow another cache's invalidations, local (publish) and remote alike
+
+Usage:
+    from app.core.cache.invalidation_bus import cache_invalidation_bus
+
+    # Register the local (L1-only) invalidation of a cache
+    cache_invalidation_bus.register("intent_config", intent_config_cache.invalidate_local)
+
+    # Broadcast after clearing L1/L2
+    await cache_invalidation_bus.publish("intent_config", organization_id=str(org_id))
+
+    # Follow another cache's invalidations
+    cache_invalidation_bus.add_listener("intent_config", semantic_cache.invalidate_local)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from collections.abc import Callable
+from typing import Any
+from uuid import uuid4
+
+from app.config.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Clears the local L1 entries described by a message payload
+InvalidationHandler = Callable[[dict[str, Any]], None]
+
+
+class CacheInvalidationBus:
+    """
+    Redis pub/sub fan-out of cache invalidations.
+
+    Handlers are synchronous: they only drop in-memory entries.
+    """
+
+    RECONNECT_DELAY_SECONDS = 1.0
+    MAX_RECONNECT_DELAY_SECONDS = 30.0
+
+    def __init__(self) -> None:
+        """Initialize bus (not subscribed until start())."""
+        settings = get_settings()
+        self._enabled = settings.CACHE_INVALIDATION_BUS_ENABLED
+        self._channel = settings.CACHE_INVALIDATION_CHANNEL
+        self._l1_ttl_seconds = settings.CACHE_L1_TTL_SECONDS
+        self._instance_id = uuid4().hex
+        self._handlers: dict[str, InvalidationHandler] = {}
+        self._listeners: dict[str, list[InvalidationHandler]] = {}
+        self._task: asyncio.Task[None] | None = None
+        self._connected = False
+        self._pending_publishes: set[asyncio.Task[None]] = set()
+
+        self._stats: dict[str, int] = {
+            "published": 0,
+            "publish_errors": 0,
+            "received": 0,
+            "applied": 0,
+            "handler_errors": 0,
+            "reconnects": 0,
+        }
+
+    @property
+    def is_connected(self) -> bool:
+        """Whether this process is currently subscribed."""
+        return self._connected
+
+    def register(self, cache_name: str, handler: InvalidationHandler) -> None:
+        """
+        Register the local invalidation of a cache.
+
+        Args:
+            cache_name: Name used in published messages
+            handler: Called with the message payload to clear local L1 entries
+        """
+        self._handlers[cache_name] = handler
+
+    def add_listener(self, cache_name: str, handler: InvalidationHandler) -> None:
+        """
+        Follow the invalidations of another cache.
+
+        Unlike register(), listeners also run for invalidations published by
+        this process, and a cache can have several of them.
+
+        Args:
+            cache_name: Name of the cache to follow
+            handler: Called with the invalidation payload
+        """
+        self._listeners.setdefault(cache_name, []).append(handler)
+
+    def _notify_listeners(self, cache_name: str, payload: dict[str, Any]) -> None:
+        """Run the listeners of a cache; errors are logged, never raised."""
+        for listener in self._listeners.get(cache_name, ()):
+            try:
+                listener(payload)
+            except Exception as e:
+                self._stats["handler_errors"] += 1
+                logger.warning(f"Cache invalidation listener failed for {cache_name}: {e}")
+
+    def memory_ttl(self, default_seconds: int) -> int:
+        """
+        L1 TTL to apply right now.
+
+        Args:
+            default_seconds: The cache's own TTL, used while not subscribed
+
+        Returns:
+            CACHE_L1_TTL_SECONDS while subscribed, default_seconds otherwise
+        """
+        if self._connected:
+            return max(default_seconds, self._l1_ttl_seconds)
+        return default_seconds
+
+    async def publish(self, cache_name: str, **payload: Any) -> None:
+        """
+        Broadcast an invalidation to the other processes.
+
+        Never raises: a failed publish only delays other processes until
+        their L1 TTL (the short one, since they are not subscribed either if
+        Redis is down).
+
+        Args:
+            cache_name: Registered cache name
+            **payload: JSON-serializable scope (organization_id, domain_key, ...)
+        """
+        self._notify_listeners(cache_name, payload)
+        await self._broadcast(cache_name, payload)
+
+    async def _broadcast(self, cache_name: str, payload: dict[str, Any]) -> None:
+        """Send an invalidation to Redis (no-op when the bus is disabled)."""
+        if not self._enabled:
+            return
+
+        message = json.dumps({"cache": cache_name, "origin": self._instance_id, "payload": payload})
+        try:
+            from app.integrations.databases.redis import get_shared_async_redis_client
+
+            redis = await get_shared_async_redis_client()
+            await redis.publish(self._channel, message)
+            self._stats["published"] += 1
+        except Exception as e:
+            self._stats["publish_errors"] += 1
+            logger.warning(f"Cache invalidation publish failed for {cache_name}: {e}")
+
+    def publish_nowait(self, cache_name: str, **payload: Any) -> None:
+        """
+        Schedule publish() from synchronous code.
+
+        Listeners run immediately; the broadcast is skipped outside a
+        running event loop.
+        """
+        self._notify_listeners(cache_name, payload)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+
+        task = loop.create_task(self._broadcast(cache_name, payload))
+        self._pending_publishes.add(task)
+        task.add_done_callback(self._pending_publishes.discard)
+
+    async def start(self) -> None:
+        """Start the subscriber task."""
+        if not self._enabled:
+            logger.info("Cache invalidation bus disabled")
+            return
+        if self._task is not None and not self._task.done():
+            return
+
+        self._task = asyncio.create_task(self._run(), name="cache_invalidation_bus")
+        logger.info(f"Cache invalidation bus subscribing to '{self._channel}'")
+
+    async def stop(self) -> None:
+        """Stop the subscriber task."""
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._connected = False
+        logger.info("Cache invalidation bus stopped")
+
+    async def _run(self) -> None:
+        """Subscribe and dispatch messages, reconnecting with backoff."""
+        delay = self.RECONNECT_DELAY_SECONDS
+
+        while True:
+            redis = None
+            pubsub = None
+            try:
+                from app.integrations.databases.redis import get_async_redis_client
+
+                # Dedicated client: a subscribed connection cannot run other commands
+                redis = await get_async_redis_client()
+                pubsub = redis.pubsub()
+                await pubsub.subscribe(self._channel)
+
+                # Messages may have been missed while not subscribed
+                self._clear_all()
+                self._connected = True
+                delay = self.RECONNECT_DELAY_SECONDS
+                logger.info("Cache invalidation bus connected")
+
+                async for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        self._dispatch(message.get("data"))
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._stats["reconnects"] += 1
+                logger.warning(f"Cache invalidation bus disconnected, retrying in {delay:.0f}s: {e}")
+            finally:
+                self._connected = False
+                for resource in (pubsub, redis):
+                    if resource is not None:
+                        try:
+                            await resource.aclose()
+                        except Exception:
+                            pass
+
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.MAX_RECONNECT_DELAY_SECONDS)
+
+    def _dispatch(self, data: Any) -> None:
+        """Apply one received message to the matching local cache."""
+        try:
+            message = json.loads(data)
+        except (TypeError, ValueError):
+            logger.warning(f"Ignoring malformed cache invalidation message: {data!r}")
+            return
+
+        self._stats["received"] += 1
+        if message.get("origin") == self._instance_id:
+            return
+
+        cache_name = message.get("cache", "")
+        payload = message.get("payload") or {}
+        handler = self._handlers.get(cache_name)
+        if handler is not None:
+            try:
+                handler(payload)
+                self._stats["applied"] += 1
+            except Exception as e:
+                self._stats["handler_errors"] += 1
+                logger.warning(f"Cache invalidation handler failed for {cache_name}: {e}")
+        self._notify_listeners(cache_name, payload)
+
+    def _clear_all(self) -> None:
+        """Clear every registered L1 (empty payload = everything)."""
+        for cache_name, handler in self._handlers.items():
+            try:
+                handler({})
+            except Exception as e:
+                logger.warning(f"Cache invalidation handler failed for {cache_name}: {e}")
+        for cache_name in self._listeners:
+            self._notify_listeners(cache_name, {})
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get bus statistics."""
+        return {
+            **self._stats,
+            "enabled": self._enabled,
+            "connected": self._connected,
+            "registered_caches": sorted(self._handlers),
+            "l1_ttl_seconds": self._l1_ttl_seconds,
+        }
+
+
+# Singleton instance
+cache_invalidation_bus = CacheInvalidationBus()
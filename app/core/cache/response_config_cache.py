@@ -9,10 +9,11 @@
 Response Config Cache - Multi-layer caching for multi-domain response configurations.
 
 Features:
-- L1: In-memory cache (60s TTL, per-instance, per-organization)
+- L1: In-memory cache (60s TTL, per-instance, per-organization; longer while
+  the cache invalidation bus is connected)
 - L2: Redis cache (5min TTL, distributed, per-organization)
-- Automatic invalidation on config changes
-- Thread-safe with asyncio locks
+- Automatic invalidation on config changes, broadcast to all instances
+- Lock-free L1 reads, single-flight loads, stale-while-revalidate (ConfigCacheEngine)
 
 Usage:
     from app.core.cache.response_config_cache import response_config_cache
@@ -29,14 +30,15 @@ Usage:
 
 from __future__ import annotations
 
-import asyncio
 import json
 import logging
 from dataclasses import dataclass
-from datetime import UTC, datetime
 from typing import TYPE_CHECKING, Any
 from uuid import UUID
 
+from app.core.cache.cache_engine import ConfigCacheEngine, multi_layer_stats
+from app.core.cache.invalidation_bus import cache_invalidation_bus
+
 if TYPE_CHECKING:
     from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -83,7 +85,8 @@ class ResponseConfigCache:
     """
     Multi-layer cache for pharmacy response configurations.
 
-    Thread-safe per-organization caching with TTL-based expiration.
+    Per-organization caching with jittered TTLs, single-flight loads and
+    stale-while-revalidate (see ConfigCacheEngine).
     L1 (Memory) → L2 (Redis) → L3 (Database)
     """
 
@@ -93,28 +96,21 @@ class ResponseConfigCache:
 
     def __init__(self) -> None:
         """Initialize cache with per-organization storage."""
-        # Per-organization memory cache: {org_id: {"configs": dict, "timestamp": datetime}}
-        self._memory_cache: dict[UUID, dict[str, Any]] = {}
-        self._locks: dict[UUID, asyncio.Lock] = {}
-        self._global_lock = asyncio.Lock()
+        # L1: {org_id: configs} with single-flight and stale-while-revalidate
+        self._engine: ConfigCacheEngine[UUID, dict[str, ResponseConfigDTO]] = ConfigCacheEngine(
+            "response_config",
+            self.MEMORY_TTL_SECONDS,
+            tenant_of=str,
+        )
 
-        # Stats for monitoring
+        # Stats for monitoring (L1 counters live in the engine)
         self._stats: dict[str, int] = {
-            "memory_hits": 0,
-            "memory_misses": 0,
             "redis_hits": 0,
             "redis_misses": 0,
             "db_loads": 0,
             "invalidations": 0,
         }
 
-    async def _get_lock(self, organization_id: UUID) -> asyncio.Lock:
-        """Get or create lock for specific organization."""
-        async with self._global_lock:
-            if organization_id not in self._locks:
-                self._locks[organization_id] = asyncio.Lock()
-            return self._locks[organization_id]
-
     async def get_all_configs(
         self,
         db: "AsyncSession | None",
@@ -134,42 +130,40 @@ class ResponseConfigCache:
         Returns:
             Dict mapping intent_key to ResponseConfigDTO
         """
-        lock = await self._get_lock(organization_id)
-
-        async with lock:
-            # L1: Check memory cache
-            memory_data = self._get_from_memory(organization_id)
-            if memory_data is not None:
-                self._stats["memory_hits"] += 1
-                return memory_data
-
-            self._stats["memory_misses"] += 1
-
-            # L2: Check Redis cache
-            redis_data = await self._get_from_redis(organization_id)
-            if redis_data is not None:
-                self._stats["redis_hits"] += 1
-                # Populate L1 from L2
-                self._set_memory(organization_id, redis_data)
-                return redis_data
-
-            self._stats["redis_misses"] += 1
-
-            # L3: Load from database
-            if db is None:
-                configs = await self._load_from_database_with_session(
-                    organization_id, domain_key
-                )
-            else:
-                configs = await self._load_from_database(db, organization_id, domain_key)
-
-            self._stats["db_loads"] += 1
-
-            # Populate both caches
+        return await self._engine.get(
+            organization_id,
+            lambda: self._load(db, organization_id, domain_key),
+            lambda: self._load(None, organization_id, domain_key),
+        )
+
+    async def _load(
+        self,
+        db: "AsyncSession | None",
+        organization_id: UUID,
+        domain_key: str,
+    ) -> dict[str, ResponseConfigDTO]:
+        """L1 miss: L2 (Redis) -> L3 (Database)."""
+        generation = self._engine.generation
+
+        redis_data = await self._get_from_redis(organization_id)
+        if redis_data is not None:
+            self._stats["redis_hits"] += 1
+            return redis_data
+
+        self._stats["redis_misses"] += 1
+
+        if db is None:
+            configs = await self._load_from_database_with_session(organization_id, domain_key)
+        else:
+            configs = await self._load_from_database(db, organization_id, domain_key)
+
+        self._stats["db_loads"] += 1
+
+        # Skip L2 if invalidated while loading (the data may predate the change)
+        if self._engine.generation == generation:
             await self._set_redis(organization_id, configs)
-            self._set_memory(organization_id, configs)
 
-            return configs
+        return configs
 
     async def get_config(
         self,
@@ -251,47 +245,19 @@ class ResponseConfigCache:
 
         return configs
 
-    def _get_from_memory(self, organization_id: UUID) -> dict[str, ResponseConfigDTO] | None:
-        """Get configs from memory cache if not expired."""
-        if organization_id not in self._memory_cache:
-            return None
-
-        cache_entry = self._memory_cache[organization_id]
-        timestamp = cache_entry.get("timestamp")
-
-        if timestamp is None:
-            return None
-
-        elapsed = (datetime.now(UTC) - timestamp).total_seconds()
-        if elapsed >= self.MEMORY_TTL_SECONDS:
-            # Expired
-            del self._memory_cache[organization_id]
-            return None
-
-        return cache_entry.get("configs")
-
-    def _set_memory(
-        self, organization_id: UUID, configs: dict[str, ResponseConfigDTO]
-    ) -> None:
-        """Store configs in memory cache."""
-        self._memory_cache[organization_id] = {
-            "configs": configs,
-            "timestamp": datetime.now(UTC),
-        }
-
     async def _get_from_redis(
         self, organization_id: UUID
     ) -> dict[str, ResponseConfigDTO] | None:
         """Get configs from Redis cache."""
         try:
-            from app.integrations.databases.redis import get_redis_client
+            from app.integrations.databases.redis import get_shared_async_redis_client
 
-            redis = get_redis_client()
+            redis = await get_shared_async_redis_client()
             if redis is None:
                 return None
 
             key = f"{self.REDIS_KEY_PREFIX}:{organization_id}"
-            data = redis.get(key)
+            data = await redis.get(key)
 
             if data:
                 parsed = json.loads(data)
@@ -309,15 +275,15 @@ class ResponseConfigCache:
     ) -> None:
         """Store configs in Redis cache."""
         try:
-            from app.integrations.databases.redis import get_redis_client
+            from app.integrations.databases.redis import get_shared_async_redis_client
 
-            redis = get_redis_client()
+            redis = await get_shared_async_redis_client()
             if redis is None:
                 return
 
             key = f"{self.REDIS_KEY_PREFIX}:{organization_id}"
             serializable = {k: v.to_dict() for k, v in configs.items()}
-            redis.setex(key, self.REDIS_TTL_SECONDS, json.dumps(serializable))
+            await redis.setex(key, self.REDIS_TTL_SECONDS, json.dumps(serializable))
 
         except Exception as e:
             logger.warning(f"Redis set failed for org {organization_id}: {e}")
@@ -331,26 +297,24 @@ class ResponseConfigCache:
         Args:
             organization_id: Tenant UUID to invalidate
         """
-        lock = await self._get_lock(organization_id)
+        # Clear memory cache
+        self._engine.invalidate(organization_id)
 
-        async with lock:
-            # Clear memory cache
-            if organization_id in self._memory_cache:
-                del self._memory_cache[organization_id]
+        # Clear Redis cache
+        try:
+            from app.integrations.databases.redis import get_shared_async_redis_client
 
-            # Clear Redis cache
-            try:
-                from app.integrations.databases.redis import get_redis_client
+            redis = await get_shared_async_redis_client()
+            if redis:
+                key = f"{self.REDIS_KEY_PREFIX}:{organization_id}"
+                await redis.delete(key)
+        except Exception as e:
+            logger.warning(f"Redis invalidation failed for org {organization_id}: {e}")
 
-                redis = get_redis_client()
-                if redis:
-                    key = f"{self.REDIS_KEY_PREFIX}:{organization_id}"
-                    redis.delete(key)
-            except Exception as e:
-                logger.warning(f"Redis invalidation failed for org {organization_id}: {e}")
+        self._stats["invalidations"] += 1
+        logger.info(f"Response config cache invalidated for org {organization_id}")
 
-            self._stats["invalidations"] += 1
-            logger.info(f"Response config cache invalidated for org {organization_id}")
+        await cache_invalidation_bus.publish("response_config", organization_id=str(organization_id))
 
     async def invalidate_all(self) -> int:
         """
@@ -361,30 +325,41 @@ class ResponseConfigCache:
         Returns:
             Number of organizations invalidated
         """
-        async with self._global_lock:
-            count = len(self._memory_cache)
+        # Clear all memory caches
+        count = self._engine.clear()
 
-            # Clear all memory caches
-            self._memory_cache.clear()
+        # Clear all Redis keys
+        try:
+            from app.integrations.databases.redis import get_shared_async_redis_client
+
+            redis = await get_shared_async_redis_client()
+            if redis:
+                pattern = f"{self.REDIS_KEY_PREFIX}:*"
+                keys = [key async for key in redis.scan_iter(match=pattern)]
+                if keys:
+                    await redis.delete(*keys)
+                    count = max(count, len(keys))
+        except Exception as e:
+            logger.warning(f"Redis bulk invalidation failed: {e}")
 
-            # Clear all Redis keys
-            try:
-                from app.integrations.databases.redis import get_redis_client
+        self._stats["invalidations"] += count
+        logger.info(f"Response config cache invalidated for all {count} organizations")
 
-                redis = get_redis_client()
-                if redis:
-                    pattern = f"{self.REDIS_KEY_PREFIX}:*"
-                    keys = redis.keys(pattern)
-                    if keys:
-                        redis.delete(*keys)
-                        count = max(count, len(keys))
-            except Exception as e:
-                logger.warning(f"Redis bulk invalidation failed: {e}")
+        await cache_invalidation_bus.publish("response_config")
+        return count
 
-            self._stats["invalidations"] += count
-            logger.info(f"Response config cache invalidated for all {count} organizations")
+    def invalidate_local(self, payload: dict[str, Any]) -> None:
+        """
+        Clear L1 entries invalidated by another instance.
 
-            return count
+        Args:
+            payload: Bus payload; without organization_id every entry is cleared
+        """
+        organization_id = payload.get("organization_id")
+        if organization_id is None:
+            self._engine.clear()
+        else:
+            self._engine.invalidate(UUID(organization_id))
 
     async def warm(
         self,
@@ -405,18 +380,15 @@ class ResponseConfigCache:
         Returns:
             Loaded configs
         """
-        lock = await self._get_lock(organization_id)
+        # Force load from database
+        configs = await self._load_from_database(db, organization_id, domain_key)
 
-        async with lock:
-            # Force load from database
-            configs = await self._load_from_database(db, organization_id, domain_key)
+        # Populate both caches
+        await self._set_redis(organization_id, configs)
+        self._engine.set(organization_id, configs)
 
-            # Populate both caches
-            await self._set_redis(organization_id, configs)
-            self._set_memory(organization_id, configs)
-
-            logger.info(f"Response config cache warmed for org {organization_id}")
-            return configs
+        logger.info(f"Response config cache warmed for org {organization_id}")
+        return configs
 
     def get_stats(self) -> dict[str, Any]:
         """Get cache statistics.
@@ -424,23 +396,9 @@ class ResponseConfigCache:
         Returns:
             Dict with hit rates and counts
         """
-        total_memory = self._stats["memory_hits"] + self._stats["memory_misses"]
-        total_redis = self._stats["redis_hits"] + self._stats["redis_misses"]
-
         return {
-            "memory_hits": self._stats["memory_hits"],
-            "memory_misses": self._stats["memory_misses"],
-            "memory_hit_rate": (
-                self._stats["memory_hits"] / total_memory if total_memory > 0 else 0
-            ),
-            "redis_hits": self._stats["redis_hits"],
-            "redis_misses": self._stats["redis_misses"],
-            "redis_hit_rate": (
-                self._stats["redis_hits"] / total_redis if total_redis > 0 else 0
-            ),
-            "db_loads": self._stats["db_loads"],
-            "invalidations": self._stats["invalidations"],
-            "cached_organizations": len(self._memory_cache),
+            **multi_layer_stats(self._engine.get_stats(), self._stats),
+            "cached_organizations": len(self._engine),
         }
 
     def get_cached_organizations(self) -> list[str]:
@@ -449,8 +407,9 @@ class ResponseConfigCache:
         Returns:
             List of organization UUID strings
         """
-        return [str(org_id) for org_id in self._memory_cache.keys()]
+        return [str(org_id) for org_id in self._engine.keys()]
 
 
 # Singleton instance
 response_config_cache = ResponseConfigCache()
+cache_invalidation_bus.register("response_config", response_config_cache.invalidate_local)
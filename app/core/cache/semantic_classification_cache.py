@@ -0,0 +1,494 @@
+# ============================================================================
+# SCOPE: MULTI-TENANT
+# Description: Cache semántico de clasificaciones LLM (intent y dominio).
+#              Busca por vecino más cercano del embedding del mensaje, por
+#              tenant y por analizador, con LRU, antigüedad máxima e
+#              invalidación cuando cambian las configuraciones de intents.
+# Tenant-Aware: Yes - cada organización tiene sus propios buckets.
+# ============================================================================
+"""
+Semantic Classification Cache - Reuse LLM classifications of similar messages.
+
+LLMIntentAnalyzer, DomainClassifier, SuperOrchestrator, PharmacyIntentAnalyzer
+and MedicalIntentDetector call the LLM to classify messages that are usually
+phrasings already classified many times ("quiero pagar", "quiero pagar mi
+deuda", "necesito pagar"). IntentCache only matches the exact text.
+
+Entries live in buckets per (analyzer, tenant). Each bucket keeps the
+L2-normalized message embeddings in one matrix, so a lookup is:
+
+1. Exact normalized text + context fingerprint -> hit without embedding
+2. Embed the message (TEI, with the embedding cache and batcher)
+3. One matrix-vector product against the bucket; the best entry with the
+   same context fingerprint, younger than `ttl_seconds` and at least
+   `similarity_threshold` similar is a hit
+
+Only the classification (value dict and confidence) is cached: callers keep
+the entities extracted from the current message. Buckets evict the least
+recently used entry when full. Invalidations of intent_config,
+domain_intent, routing_config and agents (local or from other instances, via
+cache_invalidation_bus listeners) drop the tenant's buckets and the global
+ones (entries stored without a tenant may come from any organization).
+
+Callers pass the organization explicitly (`tenant=state["organization_id"]`):
+the tenant context is only set by the HTTP middleware, not by webhook queue
+consumers.
+
+Lookups never raise: embedding errors or timeouts count as misses.
+
+Usage:
+    from app.core.cache.semantic_classification_cache import context_fingerprint, semantic_classification_cache
+
+    fingerprint = context_fingerprint(language="es", previous_agent=None)
+    cached = await semantic_classification_cache.get("intent_router", message, fingerprint=fingerprint)
+    if cached is None:
+        result = await call_llm(...)
+        await semantic_classification_cache.set(
+            "intent_router", message, {"intent": result["intent"]}, result["confidence"], fingerprint=fingerprint
+        )
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
+from uuid import UUID
+
+import numpy as np
+
+from app.config.settings import get_settings
+from app.core.cache.invalidation_bus import cache_invalidation_bus
+
+logger = logging.getLogger(__name__)
+
+EmbedFn = Callable[[str], Awaitable[list[float]]]
+
+# Bucket key: (analyzer, tenant)
+BucketKey = tuple[str, str]
+
+GLOBAL_TENANT = "global"
+
+# Config caches whose invalidation makes cached classifications stale
+FOLLOWED_CACHES = ("intent_config", "domain_intent", "routing_config", "agents")
+
+
+def context_fingerprint(**context: Any) -> str:
+    """
+    Fingerprint of the context a classification depends on.
+
+    Args:
+        **context: JSON-serializable values (language, awaiting flags, ...)
+
+    Returns:
+        Short stable hash; equal contexts give equal fingerprints
+    """
+    encoded = json.dumps(context, sort_keys=True, default=str)
+    return hashlib.md5(encoded.encode()).hexdigest()[:16]
+
+
+@dataclass(frozen=True)
+class CachedClassification:
+    """A cache hit."""
+
+    value: dict[str, Any]
+    confidence: float
+    similarity: float  # 1.0 for exact text matches
+    age_seconds: float
+
+
+@dataclass
+class _Entry:
+    """Cached classification stored in a bucket slot."""
+
+    text: str
+    fingerprint: str
+    value: dict[str, Any]
+    confidence: float
+    stored_at: float
+
+
+class _Bucket:
+    """
+    Entries of one (analyzer, tenant).
+
+    Slot i of `vectors`, `fingerprint_codes` and `stored_at` belongs to
+    `entries[i]`; free slots have fingerprint code -1 and never match.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self.clear()
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        self.vectors = np.zeros((0, 0), dtype=np.float32)
+        self.fingerprint_codes = np.zeros(0, dtype=np.int32)
+        self.stored_at = np.zeros(0, dtype=np.float64)
+        self.entries: list[_Entry | None] = []
+        self.free: list[int] = []
+        self.lru: OrderedDict[int, None] = OrderedDict()
+        self.exact: dict[tuple[str, str], int] = {}
+        self.codes: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.lru)
+
+    def find_exact(self, text: str, fingerprint: str) -> int | None:
+        """Slot of an entry with the same text and fingerprint."""
+        return self.exact.get((text, fingerprint))
+
+    def find_nearest(self, vector: np.ndarray, fingerprint: str, min_stored_at: float) -> tuple[int, float] | None:
+        """Most similar live entry with the fingerprint: (slot, similarity)."""
+        code = self.codes.get(fingerprint)
+        if code is None or not self.lru or self.vectors.shape[1] != vector.shape[0]:
+            return None
+        similarities = self.vectors @ vector
+        eligible = (self.fingerprint_codes == code) & (self.stored_at >= min_stored_at)
+        similarities = np.where(eligible, similarities, -1.0)
+        slot = int(np.argmax(similarities))
+        if not eligible[slot]:
+            return None
+        return slot, float(similarities[slot])
+
+    def touch(self, slot: int) -> None:
+        """Mark a slot as most recently used."""
+        self.lru.move_to_end(slot)
+
+    def put(self, vector: np.ndarray, entry: _Entry) -> bool:
+        """
+        Store an entry (replacing one with the same text and fingerprint).
+
+        Returns:
+            True if another entry had to be evicted
+        """
+        evicted = False
+        slot = self.exact.get((entry.text, entry.fingerprint))
+        if slot is None:
+            if self.free:
+                slot = self.free.pop()
+            elif len(self.entries) < self.capacity:
+                slot = self._grow(vector.shape[0])
+            else:
+                slot = next(iter(self.lru))
+                self.remove(slot)
+                self.free.remove(slot)
+                evicted = True
+
+        if self.vectors.shape[1] != vector.shape[0]:
+            # Embedding model changed: old vectors are not comparable
+            self.clear()
+            slot = self._grow(vector.shape[0])
+
+        self.vectors[slot] = vector
+        self.fingerprint_codes[slot] = self.codes.setdefault(entry.fingerprint, len(self.codes))
+        self.stored_at[slot] = entry.stored_at
+        self.entries[slot] = entry
+        self.exact[(entry.text, entry.fingerprint)] = slot
+        self.lru[slot] = None
+        self.lru.move_to_end(slot)
+        return evicted
+
+    def remove(self, slot: int) -> None:
+        """Free a slot."""
+        entry = self.entries[slot]
+        if entry is None:
+            return
+        self.exact.pop((entry.text, entry.fingerprint), None)
+        self.entries[slot] = None
+        self.fingerprint_codes[slot] = -1
+        self.lru.pop(slot, None)
+        self.free.append(slot)
+
+    def _grow(self, dimension: int) -> int:
+        """Append a slot (doubling the arrays when full) and return it."""
+        slot = len(self.entries)
+        if self.vectors.shape[1] != dimension:
+            self.vectors = np.zeros((0, dimension), dtype=np.float32)
+        if slot >= self.vectors.shape[0]:
+            size = min(max(16, slot * 2), self.capacity)
+            vectors = np.zeros((size, dimension), dtype=np.float32)
+            vectors[:slot] = self.vectors[:slot]
+            codes = np.full(size, -1, dtype=np.int32)
+            codes[:slot] = self.fingerprint_codes[:slot]
+            stored_at = np.zeros(size, dtype=np.float64)
+            stored_at[:slot] = self.stored_at[:slot]
+            self.vectors, self.fingerprint_codes, self.stored_at = vectors, codes, stored_at
+        self.entries.append(None)
+        return slot
+
+
+class SemanticClassificationCache:
+    """
+    Nearest-neighbour cache of LLM classifications per analyzer and tenant.
+
+    Not thread-safe: meant to be used from a single event loop.
+    """
+
+    def __init__(
+        self,
+        *,
+        enabled: bool = True,
+        similarity_threshold: float = 0.92,
+        max_entries: int = 2000,
+        ttl_seconds: int = 86400,
+        min_confidence: float = 0.7,
+        embed_timeout: float = 0.3,
+        embed_fn: EmbedFn | None = None,
+    ) -> None:
+        """
+        Initialize cache.
+
+        Args:
+            enabled: When False, get() always misses and set() is a no-op
+            similarity_threshold: Min cosine similarity for a semantic hit
+            max_entries: Max entries per (analyzer, tenant) bucket
+            ttl_seconds: Max age of a cached classification
+            min_confidence: Results below this confidence are not cached
+            embed_timeout: Max seconds a lookup waits for its embedding
+            embed_fn: Embeds one text (defaults to the TEI embedder)
+        """
+        self.enabled = enabled
+        self.similarity_threshold = similarity_threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.min_confidence = min_confidence
+        self.embed_timeout = embed_timeout
+        self._embed_fn = embed_fn
+
+        self._buckets: dict[BucketKey, _Bucket] = {}
+        self._stats: dict[str, int] = {
+            "exact_hits": 0,
+            "semantic_hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "evictions": 0,
+            "embed_errors": 0,
+            "invalidations": 0,
+        }
+        self._analyzer_stats: dict[str, dict[str, int]] = {}
+
+    @classmethod
+    def from_settings(cls) -> SemanticClassificationCache:
+        """Create the cache configured by SEMANTIC_CACHE_* settings."""
+        settings = get_settings()
+        return cls(
+            enabled=settings.SEMANTIC_CACHE_ENABLED,
+            similarity_threshold=settings.SEMANTIC_CACHE_SIMILARITY_THRESHOLD,
+            max_entries=settings.SEMANTIC_CACHE_MAX_ENTRIES,
+            ttl_seconds=settings.SEMANTIC_CACHE_TTL_SECONDS,
+            min_confidence=settings.SEMANTIC_CACHE_MIN_CONFIDENCE,
+            embed_timeout=settings.SEMANTIC_CACHE_EMBED_TIMEOUT_MS / 1000,
+        )
+
+    async def get(
+        self,
+        analyzer: str,
+        message: str,
+        *,
+        tenant: UUID | str | None = None,
+        fingerprint: str = "",
+    ) -> CachedClassification | None:
+        """
+        Look up the classification of a message or a similar one.
+
+        Args:
+            analyzer: Analyzer name (entries are never shared across analyzers)
+            message: User message
+            tenant: Organization (defaults to the request's tenant context)
+            fingerprint: context_fingerprint() of the inputs besides the message
+
+        Returns:
+            Cached classification or None
+        """
+        if not self.enabled:
+            return None
+
+        bucket = self._buckets.get((analyzer, self._tenant_key(tenant)))
+        if bucket is None or not len(bucket):
+            self._count(analyzer, "misses")
+            return None
+
+        now = time.time()
+        min_stored_at = now - self.ttl_seconds
+        text = self._normalize(message)
+
+        slot = bucket.find_exact(text, fingerprint)
+        if slot is not None and bucket.stored_at[slot] >= min_stored_at:
+            self._count(analyzer, "exact_hits")
+            return self._hit(bucket, slot, 1.0, now)
+
+        vector = await self._embed(text)
+        if vector is None:
+            self._count(analyzer, "misses")
+            return None
+
+        nearest = bucket.find_nearest(vector, fingerprint, min_stored_at)
+        if nearest is None or nearest[1] < self.similarity_threshold:
+            self._count(analyzer, "misses")
+            return None
+
+        self._count(analyzer, "semantic_hits")
+        return self._hit(bucket, nearest[0], nearest[1], now)
+
+    async def set(
+        self,
+        analyzer: str,
+        message: str,
+        value: dict[str, Any],
+        confidence: float,
+        *,
+        tenant: UUID | str | None = None,
+        fingerprint: str = "",
+    ) -> bool:
+        """
+        Store the classification of a message.
+
+        Args:
+            analyzer: Analyzer name
+            message: User message
+            value: Classification to return on hits (no message-specific data)
+            confidence: Classification confidence
+            tenant: Organization (defaults to the request's tenant context)
+            fingerprint: context_fingerprint() of the inputs besides the message
+
+        Returns:
+            True if stored (enabled, confident enough and embeddable)
+        """
+        if not self.enabled or confidence < self.min_confidence:
+            return False
+
+        text = self._normalize(message)
+        vector = await self._embed(text)
+        if vector is None:
+            return False
+
+        key = (analyzer, self._tenant_key(tenant))
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = _Bucket(self.max_entries)
+
+        entry = _Entry(
+            text=text, fingerprint=fingerprint, value=dict(value), confidence=confidence, stored_at=time.time()
+        )
+        if bucket.put(vector, entry):
+            self._stats["evictions"] += 1
+        self._count(analyzer, "stores")
+        return True
+
+    def invalidate_tenant(self, tenant: UUID | str | None) -> int:
+        """
+        Drop every analyzer's entries of a tenant (None = all tenants).
+
+        Global buckets are dropped too: their entries were stored without a
+        tenant and may belong to the invalidated organization.
+
+        Returns:
+            Number of entries dropped
+        """
+        tenant_keys = None if tenant is None else {str(tenant), GLOBAL_TENANT}
+        count = 0
+        for key in [key for key in self._buckets if tenant_keys is None or key[1] in tenant_keys]:
+            count += len(self._buckets.pop(key))
+        self._stats["invalidations"] += 1
+        return count
+
+    def invalidate_local(self, payload: dict[str, Any]) -> None:
+        """
+        Drop entries made stale by a config cache invalidation.
+
+        Args:
+            payload: Bus payload with optional organization_id
+        """
+        self.invalidate_tenant(payload.get("organization_id"))
+
+    def clear(self) -> int:
+        """Drop everything."""
+        return self.invalidate_tenant(None)
+
+    def _hit(self, bucket: _Bucket, slot: int, similarity: float, now: float) -> CachedClassification:
+        """Build a hit and refresh the entry's LRU position."""
+        bucket.touch(slot)
+        entry = bucket.entries[slot]
+        assert entry is not None
+        return CachedClassification(
+            value=dict(entry.value),
+            confidence=entry.confidence,
+            similarity=similarity,
+            age_seconds=now - entry.stored_at,
+        )
+
+    async def _embed(self, text: str) -> np.ndarray | None:
+        """L2-normalized embedding of a text, None on error or timeout."""
+        try:
+            if self._embed_fn is None:
+                from app.integrations.llm import create_embedder
+
+                self._embed_fn = create_embedder().embed_text
+            raw = await asyncio.wait_for(self._embed_fn(text), timeout=self.embed_timeout)
+        except Exception as e:
+            self._stats["embed_errors"] += 1
+            logger.debug(f"Semantic cache embedding failed: {e!r}")
+            return None
+
+        vector = np.asarray(raw, dtype=np.float32)
+        norm = float(np.linalg.norm(vector))
+        if vector.ndim != 1 or norm == 0:
+            return None
+        return vector / norm
+
+    @staticmethod
+    def _normalize(message: str) -> str:
+        """Case- and whitespace-insensitive form of a message."""
+        return " ".join(message.lower().split())
+
+    @staticmethod
+    def _tenant_key(tenant: UUID | str | None) -> str:
+        """Bucket tenant: explicit, else the request's tenant context, else global."""
+        if tenant is None:
+            from app.core.tenancy.context import get_current_tenant
+
+            tenant = get_current_tenant()
+        return str(tenant) if tenant is not None else GLOBAL_TENANT
+
+    def _count(self, analyzer: str, counter: str) -> None:
+        """Increment a counter globally and for the analyzer."""
+        self._stats[counter] += 1
+        analyzer_stats = self._analyzer_stats.setdefault(
+            analyzer, {"exact_hits": 0, "semantic_hits": 0, "misses": 0, "stores": 0}
+        )
+        analyzer_stats[counter] += 1
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get cache statistics (global and per analyzer)."""
+        hits = self._stats["exact_hits"] + self._stats["semantic_hits"]
+        lookups = hits + self._stats["misses"]
+        return {
+            **self._stats,
+            "enabled": self.enabled,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "entries": sum(len(bucket) for bucket in self._buckets.values()),
+            "buckets": len(self._buckets),
+            "similarity_threshold": self.similarity_threshold,
+            "by_analyzer": {analyzer: dict(stats) for analyzer, stats in self._analyzer_stats.items()},
+        }
+
+
+# Singleton instance
+semantic_classification_cache = SemanticClassificationCache.from_settings()
+for _cache_name in FOLLOWED_CACHES:
+    cache_invalidation_bus.add_listener(_cache_name, semantic_classification_cache.invalidate_local)
+
+
+__all__ = [
+    "CachedClassification",
+    "SemanticClassificationCache",
+    "context_fingerprint",
+    "semantic_classification_cache",
+]
@@ -0,0 +1,292 @@
+# ============================================================================
+# SCOPE: MULTI-TENANT + MULTI-DOMAIN
+# Description: Matchers compilados de triggers de routing (hash exacto + trie
+#              de prefijos con prioridad) y automata Aho-Corasick de keywords.
+#              Se compilan una vez por versión de configuración cacheada.
+# Tenant-Aware: Yes - se compila un matcher por (organization_id, domain_key).
+# Domain-Aware: Yes - cada domain_key tiene su propio matcher.
+# ============================================================================
+"""
+Compiled Trigger Matchers.
+
+Routing configs and intent keywords used to be matched by scanning every
+configured trigger (lowercasing it each time) for every message. These
+structures are compiled once per cached config object and answer in time
+proportional to the message length, not the number of triggers:
+
+- CompiledRoutingMatcher: per config_type exact-match hash tables, the button
+  text-alias table and a character trie of global keyword triggers/aliases.
+  Each trie node keeps the configs ending there with their position in the
+  original priority order, so the sequential scan's "first match wins" is
+  preserved.
+- KeywordAutomaton: Aho-Corasick automaton over intent keywords/lemmas
+  (substring matching, as KeywordMatcher does).
+
+The caches that own the data (routing_config_cache, domain_intent_cache)
+compile these lazily and reuse them until the cached object is replaced
+(reload, refresh or invalidation), i.e. once per config version.
+
+Usage:
+    matcher = CompiledRoutingMatcher(grouped_configs)
+    config = matcher.find("menu")  # RoutingConfigCache.find_matching_config semantics
+    keywords = matcher.global_keywords("pagar deuda")  # word-boundary matches, in priority order
+
+    automaton = KeywordAutomaton([("agregar", "account_add_new"), ("nueva persona", "account_add_new")])
+    automaton.find("quiero agregar a alguien")  # {"account_add_new": ["agregar"]}
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Generic, TypeVar
+
+if TYPE_CHECKING:
+    from app.core.cache.routing_config_cache import GroupedConfigs, RoutingConfigDTO
+
+T = TypeVar("T")
+
+
+@dataclass
+class _KeywordNode:
+    """Global keyword trie node; entries are (order, config) ending here."""
+
+    children: dict[str, _KeywordNode] = field(default_factory=dict)
+    triggers: list[tuple[int, RoutingConfigDTO]] = field(default_factory=list)
+    aliases: list[tuple[int, RoutingConfigDTO]] = field(default_factory=list)
+
+
+class CompiledRoutingMatcher:
+    """
+    Lookup structures for one organization/domain's routing configs.
+
+    Immutable once built; `source` is the GroupedConfigs it was compiled from.
+    """
+
+    # Config types checked by find(), in priority order
+    TYPE_PRIORITY = ("global_keyword", "button_mapping", "list_selection", "menu_option")
+
+    def __init__(self, configs: GroupedConfigs) -> None:
+        """
+        Compile grouped routing configs.
+
+        Args:
+            configs: Configs grouped by config_type, each list in priority order
+        """
+        self.source = configs
+        self.size = 0
+
+        # {config_type: {trigger_value: first config}}
+        self._exact: dict[str, dict[str, RoutingConfigDTO]] = {}
+        # {config_type: {trigger_value.lower(): first config}}
+        self._exact_lower: dict[str, dict[str, RoutingConfigDTO]] = {}
+        # Button/list text alias (lowercase) -> button trigger_value
+        self._text_aliases: dict[str, str] = {}
+        self._keywords = _KeywordNode()
+
+        for config_type, type_configs in configs.items():
+            exact = self._exact.setdefault(config_type, {})
+            exact_lower = self._exact_lower.setdefault(config_type, {})
+            for config in type_configs:
+                exact.setdefault(config.trigger_value, config)
+                exact_lower.setdefault(config.trigger_value.lower(), config)
+                self.size += 1
+
+        for order, config in enumerate(configs.get("global_keyword", [])):
+            self._keyword_node(config.trigger_value.lower()).triggers.append((order, config))
+            if config.metadata and "aliases" in config.metadata:
+                for alias in config.metadata["aliases"]:
+                    self._keyword_node(alias.lower()).aliases.append((order, config))
+
+        for config in configs.get("button_mapping", []):
+            if not config.metadata:
+                continue
+            # Later configs override earlier ones, as the dict built per message did
+            for alias in config.metadata.get("text_aliases", []):
+                if isinstance(alias, str):
+                    self._text_aliases[alias.lower()] = config.trigger_value
+            single_alias = config.metadata.get("text_alias")
+            if isinstance(single_alias, str):
+                self._text_aliases[single_alias.lower()] = config.trigger_value
+
+    def _keyword_node(self, text: str) -> _KeywordNode:
+        """Get or create the trie node for a keyword."""
+        node = self._keywords
+        for char in text:
+            node = node.children.setdefault(char, _KeywordNode())
+        return node
+
+    def _walk(self, message: str) -> Iterable[tuple[int, _KeywordNode]]:
+        """Yield (consumed length, node) for every trie node on the message's path."""
+        node: _KeywordNode | None = self._keywords
+        yield 0, node
+        for position, char in enumerate(message, start=1):
+            node = node.children.get(char)
+            if node is None:
+                return
+            yield position, node
+
+    def global_keywords(self, message_lower: str) -> list[RoutingConfigDTO]:
+        """
+        Global keywords matching the message, in priority order.
+
+        A trigger or alias matches when it equals the message or is followed
+        by a space in it (GlobalKeywordMatcher semantics).
+
+        Args:
+            message_lower: Lowercase, stripped message
+
+        Returns:
+            Matching configs, first = highest priority
+        """
+        matched: dict[int, RoutingConfigDTO] = {}
+        for position, node in self._walk(message_lower):
+            if position == len(message_lower) or message_lower[position] == " ":
+                for order, config in node.triggers:
+                    matched.setdefault(order, config)
+                for order, config in node.aliases:
+                    matched.setdefault(order, config)
+        return [matched[order] for order in sorted(matched)]
+
+    def exact(self, config_type: str, trigger_value: str) -> RoutingConfigDTO | None:
+        """
+        First config of a type whose trigger_value equals the value (case-sensitive).
+
+        Args:
+            config_type: Configuration type (button_mapping, menu_option, ...)
+            trigger_value: Value to look up
+
+        Returns:
+            Matching config or None
+        """
+        return self._exact.get(config_type, {}).get(trigger_value)
+
+    def button_id_for_text(self, message_lower: str) -> str | None:
+        """
+        Button trigger_value mapped from a list item text (metadata.text_aliases).
+
+        Args:
+            message_lower: Lowercase, stripped message
+
+        Returns:
+            Button ID or None
+        """
+        return self._text_aliases.get(message_lower)
+
+    def find(self, message: str) -> RoutingConfigDTO | None:
+        """
+        First matching config across TYPE_PRIORITY.
+
+        Global keywords match when the message starts with the trigger or
+        equals an alias; other types match the trigger exactly
+        (case-insensitive). Same result as the former sequential scan in
+        RoutingConfigCache.find_matching_config.
+
+        Args:
+            message: User message or button ID
+
+        Returns:
+            Matching config or None
+        """
+        message_lower = message.strip().lower()
+
+        best: tuple[int, RoutingConfigDTO] | None = None
+        for position, node in self._walk(message_lower):
+            candidates = node.triggers + (node.aliases if position == len(message_lower) else [])
+            for candidate in candidates:
+                if best is None or candidate[0] < best[0]:
+                    best = candidate
+        if best is not None:
+            return best[1]
+
+        for config_type in self.TYPE_PRIORITY[1:]:
+            config = self._exact_lower.get(config_type, {}).get(message_lower)
+            if config is not None:
+                return config
+
+        return None
+
+
+class KeywordAutomaton(Generic[T]):
+    """
+    Aho-Corasick automaton for "which keywords occur in this text".
+
+    Each keyword carries a value (e.g. its intent key); find() reports the
+    matched keywords grouped by value in a single pass over the text.
+    """
+
+    def __init__(self, keywords: Iterable[tuple[str, T]]) -> None:
+        """
+        Build the automaton.
+
+        Args:
+            keywords: (keyword, value) pairs; matching is case-sensitive
+        """
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._output: list[list[tuple[str, T]]] = [[]]
+        # Empty keywords occur in every text
+        self._always: list[tuple[str, T]] = []
+        self.size = 0
+
+        for keyword, value in keywords:
+            self.size += 1
+            if not keyword:
+                self._always.append((keyword, value))
+                continue
+            state = 0
+            for char in keyword:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                    self._goto[state][char] = next_state
+                state = next_state
+            self._output[state].append((keyword, value))
+
+        # Breadth-first failure links; outputs inherit their failure state's
+        queue = deque(self._goto[0].values())  # depth 1: fail to root
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._output[next_state].extend(self._output[self._fail[next_state]])
+
+    def find(self, text: str) -> dict[T, list[str]]:
+        """
+        Keywords occurring in the text, grouped by value.
+
+        Args:
+            text: Text to search
+
+        Returns:
+            {value: [matched keywords]} (each keyword once)
+        """
+        found: dict[T, list[str]] = {}
+        seen: set[tuple[str, T]] = set()
+
+        def record(matches: list[tuple[str, T]]) -> None:
+            for match in matches:
+                if match not in seen:
+                    seen.add(match)
+                    found.setdefault(match[1], []).append(match[0])
+
+        record(self._always)
+        state = 0
+        for char in text:
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            if self._output[state]:
+                record(self._output[state])
+        return found
+
+
+__all__ = ["CompiledRoutingMatcher", "KeywordAutomaton"]
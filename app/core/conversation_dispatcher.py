@@ -0,0 +1,265 @@
+"""
+Per-conversation ordered, concurrent dispatcher for message processing.
+
+Builds on the grouping idea of WhatsAppMessageBatcher (messages are grouped
+by user to preserve context) but, instead of processing fixed batches, it
+schedules work continuously:
+
+- Strict FIFO within a conversation: at most one job per session_id runs at
+  a time, so two messages from the same wa_id never race on the same
+  LangGraph checkpoint thread.
+- Bounded parallelism across conversations: at most `max_concurrency` jobs
+  run at once in the process.
+- Per-tenant fairness: tenants with ready work are served round-robin and
+  each tenant is capped at `max_per_tenant` running jobs, so one noisy
+  organization cannot starve the others.
+
+Ordering is guaranteed per process. With the Redis Streams ingest queue and
+several workers, messages of one conversation may still be consumed by
+different processes; the dispatcher removes the intra-process races, which
+are the common case for bursts delivered to a single worker.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import Counter, deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+JobFactory = Callable[[], Awaitable[Any]]
+
+
+@dataclass
+class _DispatchJob:
+    """A unit of work waiting for its conversation slot."""
+
+    session_id: str
+    tenant_id: str
+    factory: JobFactory
+    future: asyncio.Future[Any]
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+class ConversationDispatcher:
+    """
+    Shards work by session_id with per-tenant round-robin scheduling.
+
+    Usage:
+        dispatcher = ConversationDispatcher(max_concurrency=32, max_per_tenant=8)
+        result = await dispatcher.submit(
+            session_id="whatsapp_5492641234567",
+            tenant_id="5492644710400",
+            factory=lambda: service.process(...),
+        )
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 32,
+        max_per_tenant: int = 8,
+        max_pending: int = 10000,
+    ):
+        if max_concurrency < 1 or max_per_tenant < 1:
+            raise ValueError("max_concurrency and max_per_tenant must be at least 1")
+
+        self.max_concurrency = max_concurrency
+        self.max_per_tenant = max_per_tenant
+        self.max_pending = max_pending
+
+        # Pending jobs per conversation (FIFO)
+        self._sessions: dict[str, deque[_DispatchJob]] = {}
+        # Conversations with a running job
+        self._busy_sessions: set[str] = set()
+        # Conversations with pending work and no running job, per tenant
+        self._tenant_ready: dict[str, deque[str]] = {}
+        self._ready_sessions: set[str] = set()
+        # Round-robin order of tenants with ready conversations
+        self._tenant_rr: deque[str] = deque()
+
+        self._tenant_running: Counter[str] = Counter()
+        self._running = 0
+        self._pending = 0
+        self._tasks: set[asyncio.Task[None]] = set()
+
+        self._stats: dict[str, float] = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "rejected": 0,
+            "total_wait_time": 0.0,
+            "max_wait_time": 0.0,
+        }
+
+    def submit(self, session_id: str, tenant_id: str, factory: JobFactory) -> asyncio.Future[Any]:
+        """
+        Schedule a job for a conversation.
+
+        Args:
+            session_id: Conversation key (e.g. "whatsapp_{wa_id}")
+            tenant_id: Tenant key used for fairness (organization or DID)
+            factory: Zero-arg callable returning the awaitable to run
+
+        Returns:
+            Future resolved with the job result (or its exception)
+
+        Raises:
+            asyncio.QueueFull: If max_pending jobs are already waiting
+        """
+        if self._pending >= self.max_pending:
+            self._stats["rejected"] += 1
+            raise asyncio.QueueFull(f"Conversation dispatcher full ({self._pending} pending)")
+
+        job = _DispatchJob(
+            session_id=session_id,
+            tenant_id=tenant_id,
+            factory=factory,
+            future=asyncio.get_running_loop().create_future(),
+        )
+        self._sessions.setdefault(session_id, deque()).append(job)
+        self._pending += 1
+        self._stats["submitted"] += 1
+
+        if session_id not in self._busy_sessions:
+            self._mark_ready(session_id, tenant_id)
+
+        self._pump()
+        return job.future
+
+    def _mark_ready(self, session_id: str, tenant_id: str) -> None:
+        """Register a conversation as ready to run its next job."""
+        if session_id in self._ready_sessions:
+            return
+        self._ready_sessions.add(session_id)
+        if tenant_id not in self._tenant_ready:
+            self._tenant_ready[tenant_id] = deque()
+            self._tenant_rr.append(tenant_id)
+        self._tenant_ready[tenant_id].append(session_id)
+
+    def _pump(self) -> None:
+        """Start as many ready jobs as limits allow, round-robin over tenants."""
+        saturated = 0
+        while self._running < self.max_concurrency and self._tenant_rr:
+            if saturated >= len(self._tenant_rr):
+                break  # Every tenant with ready work is at its cap
+
+            tenant_id = self._tenant_rr.popleft()
+            if self._tenant_running[tenant_id] >= self.max_per_tenant:
+                self._tenant_rr.append(tenant_id)
+                saturated += 1
+                continue
+            saturated = 0
+
+            ready = self._tenant_ready[tenant_id]
+            session_id = ready.popleft()
+            self._ready_sessions.discard(session_id)
+            if ready:
+                self._tenant_rr.append(tenant_id)
+            else:
+                del self._tenant_ready[tenant_id]
+
+            job = self._sessions[session_id].popleft()
+            self._start(job)
+
+    def _start(self, job: _DispatchJob) -> None:
+        """Run a job in its own task."""
+        self._busy_sessions.add(job.session_id)
+        self._tenant_running[job.tenant_id] += 1
+        self._running += 1
+        self._pending -= 1
+
+        wait_time = time.monotonic() - job.enqueued_at
+        self._stats["total_wait_time"] += wait_time
+        self._stats["max_wait_time"] = max(self._stats["max_wait_time"], wait_time)
+
+        task = asyncio.create_task(self._run(job), name=f"dispatch_{job.session_id}")
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, job: _DispatchJob) -> None:
+        """Execute a job and release its conversation slot."""
+        try:
+            result = await job.factory()
+            if not job.future.done():
+                job.future.set_result(result)
+            self._stats["completed"] += 1
+        except asyncio.CancelledError:
+            job.future.cancel()
+            raise
+        except Exception as e:
+            self._stats["failed"] += 1
+            if not job.future.done():
+                job.future.set_exception(e)
+        finally:
+            self._finish(job)
+
+    def _finish(self, job: _DispatchJob) -> None:
+        """Release slots and schedule the conversation's next job."""
+        self._busy_sessions.discard(job.session_id)
+        self._tenant_running[job.tenant_id] -= 1
+        if self._tenant_running[job.tenant_id] <= 0:
+            del self._tenant_running[job.tenant_id]
+        self._running -= 1
+
+        remaining = self._sessions.get(job.session_id)
+        if remaining:
+            self._mark_ready(job.session_id, remaining[0].tenant_id)
+        else:
+            self._sessions.pop(job.session_id, None)
+
+        self._pump()
+
+    async def drain(self, timeout: float | None = None) -> None:
+        """Wait for running jobs to finish (used on shutdown)."""
+        if self._tasks:
+            await asyncio.wait(set(self._tasks), timeout=timeout)
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get dispatcher statistics."""
+        started = self._stats["submitted"] - self._pending
+        return {
+            "configuration": {
+                "max_concurrency": self.max_concurrency,
+                "max_per_tenant": self.max_per_tenant,
+                "max_pending": self.max_pending,
+            },
+            "status": {
+                "running": self._running,
+                "pending": self._pending,
+                "active_conversations": len(self._sessions),
+                "tenants_waiting": len(self._tenant_rr),
+                "running_per_tenant": dict(self._tenant_running),
+            },
+            "performance": {
+                "submitted": int(self._stats["submitted"]),
+                "completed": int(self._stats["completed"]),
+                "failed": int(self._stats["failed"]),
+                "rejected": int(self._stats["rejected"]),
+                "avg_wait_time": f"{(self._stats['total_wait_time'] / started if started else 0.0):.3f}s",
+                "max_wait_time": f"{self._stats['max_wait_time']:.3f}s",
+            },
+        }
+
+
+# Global instance for singleton pattern
+_conversation_dispatcher: ConversationDispatcher | None = None
+
+
+def get_conversation_dispatcher() -> ConversationDispatcher:
+    """Get or create the global conversation dispatcher."""
+    global _conversation_dispatcher
+    if _conversation_dispatcher is None:
+        from app.config.settings import get_settings
+
+        settings = get_settings()
+        _conversation_dispatcher = ConversationDispatcher(
+            max_concurrency=settings.WEBHOOK_DISPATCH_MAX_CONCURRENCY,
+            max_per_tenant=settings.WEBHOOK_DISPATCH_MAX_PER_TENANT,
+            max_pending=settings.WEBHOOK_DISPATCH_MAX_PENDING,
+        )
+    return _conversation_dispatcher
@@ -144,7 +144,10 @@ class OrchestratorAgent(BaseAgent):
 
             # Analizar el intent del mensaje
             intent_result = await self.intent_router.determine_intent(
-                message=message, customer_data=customer_data, conversation_data=conversation_data
+                message=message,
+                customer_data=customer_data,
+                conversation_data=conversation_data,
+                organization_id=state_dict.get("organization_id"),
             )
 
             # Extraer información del análisis
@@ -10,12 +10,14 @@ Components:
 - LLMResponseAnalyzer: Deep semantic analysis with LLM (deepseek-r1)
 - ConversationFlowController: Manages conversation flow decisions
 - ResponseEnhancer: Enhances responses using LLM
+- QualityAuditor: Sampled background LLM analysis written to metrics
 """
 
 from app.core.graph.agents.supervisor.conversation_flow_controller import (
     ConversationFlowController,
 )
 from app.core.graph.agents.supervisor.llm_response_analyzer import LLMResponseAnalyzer
+from app.core.graph.agents.supervisor.quality_auditor import QualityAuditor
 from app.core.graph.agents.supervisor.response_enhancer import ResponseEnhancer
 from app.core.graph.agents.supervisor.response_quality_evaluator import (
     ResponseQualityEvaluator,
@@ -28,4 +30,5 @@ __all__ = [
     "LLMResponseAnalyzer",
     "ConversationFlowController",
     "ResponseEnhancer",
+    "QualityAuditor",
 ]
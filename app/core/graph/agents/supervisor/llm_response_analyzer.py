@@ -58,6 +58,8 @@ class LLMResponseAnalyzer:
 
     DEFAULT_TIMEOUT_SECONDS = 60
     SKIP_LLM_THRESHOLD = 0.75
+    # Pharmacy responses come from DB templates: trust heuristics from this score
+    PHARMACY_SKIP_THRESHOLD = 0.65
 
     def __init__(
         self,
@@ -134,7 +136,7 @@ class LLMResponseAnalyzer:
         # Pharmacy agents use database templates (not RAG), so LLM falsely flags them
         # as "hallucinations". Trust heuristic evaluation for pharmacy responses.
         if self._is_pharmacy_agent(agent_name) and heuristic_score is not None:
-            if heuristic_score >= 0.65:
+            if heuristic_score >= self.PHARMACY_SKIP_THRESHOLD:
                 logger.info(
                     f"[SKIP_LLM_PHARMACY] Skipping LLM for pharmacy agent '{agent_name}' - "
                     f"heuristic={heuristic_score:.2f} (pharmacy uses DB templates, not RAG)"
@@ -471,6 +473,28 @@ class LLMResponseAnalyzer:
             confidence=0.9,
         )
 
+    def should_call_llm(self, agent_name: str, heuristic_score: float | None) -> bool:
+        """Check whether analyze() would call the LLM for this response.
+
+        False when analysis is disabled, no LLM is available, or the
+        heuristic score is high enough to skip it (analyze() then returns a
+        fallback or a synthetic high-quality result).
+
+        Args:
+            agent_name: Name of the agent that responded
+            heuristic_score: Heuristic score from ResponseQualityEvaluator
+
+        Returns:
+            True if an LLM call would be made
+        """
+        if not self.enabled or not self.llm:
+            return False
+        if heuristic_score is None:
+            return True
+        if self._is_pharmacy_agent(agent_name) and heuristic_score >= self.PHARMACY_SKIP_THRESHOLD:
+            return False
+        return heuristic_score < self.skip_threshold
+
     def _is_pharmacy_agent(self, agent_name: str) -> bool:
         """Check if agent belongs to pharmacy domain.
 
@@ -0,0 +1,231 @@
+"""
+Quality Auditor.
+
+Runs LLMResponseAnalyzer out-of-band on a sample of supervised turns and
+writes the results to metrics, so the LLM analysis stays off the critical
+path of the reply.
+
+- Sampling: each turn whose heuristic score would trigger an LLM call
+  (LLMResponseAnalyzer.should_call_llm) is audited with probability
+  `sample_rate`
+- Backpressure: at most `max_pending` audits run at once; extra samples
+  are dropped (and counted) instead of queueing behind a slow LLM
+- Metrics (app.core.infrastructure.monitoring.metrics_collector):
+  supervisor_llm_audits_total{agent, quality, action},
+  supervisor_llm_audit_score{agent}, supervisor_llm_audit_score_gap{agent}
+  (LLM minus heuristic), supervisor_llm_audit_hallucinations_total{agent, risk},
+  supervisor_llm_audit_fallbacks_total{agent} and
+  supervisor_llm_audit_duration_seconds
+- Shutdown: drain_quality_auditors() (called by BackgroundServiceManager)
+  lets pending audits finish and cancels the ones still running
+"""
+
+import asyncio
+import logging
+import random
+import time
+import weakref
+from typing import Any
+
+from app.core.graph.agents.supervisor.llm_response_analyzer import LLMResponseAnalyzer
+from app.core.graph.agents.supervisor.schemas.analyzer_schemas import (
+    AnalyzerFallbackResult,
+    HallucinationRisk,
+    LLMResponseAnalysis,
+)
+from app.core.infrastructure.monitoring import MetricsCollector, metrics_collector
+from app.integrations.llm.gateway import LLMPriority, llm_priority
+
+logger = logging.getLogger(__name__)
+
+
+class QualityAuditor:
+    """
+    Sampled background LLM analysis of agent responses.
+
+    Responsibilities:
+    - Decide which turns are audited (sample rate, heuristic skip rules)
+    - Run the analysis as a background task with bounded concurrency
+    - Record audit results as metrics
+    """
+
+    DEFAULT_SAMPLE_RATE = 0.1
+    DEFAULT_MAX_PENDING = 16
+
+    def __init__(
+        self,
+        analyzer: LLMResponseAnalyzer,
+        sample_rate: float = DEFAULT_SAMPLE_RATE,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        metrics: MetricsCollector | None = None,
+    ):
+        """
+        Initialize the quality auditor.
+
+        Args:
+            analyzer: LLM analyzer used for the audits
+            sample_rate: Fraction of eligible turns to audit (0.0-1.0)
+            max_pending: Max audits running at once
+            metrics: Metrics collector (defaults to the global one)
+        """
+        self.analyzer = analyzer
+        self.sample_rate = sample_rate
+        self.max_pending = max_pending
+        self.metrics = metrics or metrics_collector
+        self._pending: set[asyncio.Task[None]] = set()
+        self._stats = {
+            "submitted": 0,
+            "not_sampled": 0,
+            "not_eligible": 0,
+            "dropped": 0,
+            "completed": 0,
+            "fallbacks": 0,
+            "errors": 0,
+        }
+        _auditors.add(self)
+
+    def submit(
+        self,
+        user_message: str,
+        agent_response: str,
+        agent_name: str,
+        conversation_context: dict[str, Any],
+        heuristic_score: float,
+    ) -> bool:
+        """
+        Schedule an audit of a response if it is sampled.
+
+        Never blocks and never raises.
+
+        Args:
+            user_message: User's message
+            agent_response: Agent's response to audit
+            agent_name: Name of the agent that responded
+            conversation_context: Conversation state (copied shallowly)
+            heuristic_score: Heuristic score already computed inline
+
+        Returns:
+            True if an audit was scheduled
+        """
+        if not self.analyzer.should_call_llm(agent_name, heuristic_score):
+            self._stats["not_eligible"] += 1
+            return False
+        if random.random() >= self.sample_rate:
+            self._stats["not_sampled"] += 1
+            return False
+        if len(self._pending) >= self.max_pending:
+            self._stats["dropped"] += 1
+            logger.debug(f"Quality audit dropped: {len(self._pending)} audits pending")
+            return False
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+
+        task = loop.create_task(
+            self._audit(user_message, agent_response, agent_name, dict(conversation_context), heuristic_score)
+        )
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+        self._stats["submitted"] += 1
+        return True
+
+    async def _audit(
+        self,
+        user_message: str,
+        agent_response: str,
+        agent_name: str,
+        conversation_context: dict[str, Any],
+        heuristic_score: float,
+    ) -> None:
+        """Run one audit and record its result."""
+        start = time.perf_counter()
+        try:
+            with llm_priority(LLMPriority.BACKGROUND):
+                analysis = await self.analyzer.analyze(
+                    user_message=user_message,
+                    agent_response=agent_response,
+                    agent_name=agent_name,
+                    conversation_context=conversation_context,
+                    heuristic_score=heuristic_score,
+                )
+        except Exception as e:
+            self._stats["errors"] += 1
+            logger.warning(f"Quality audit failed for {agent_name}: {e}")
+            return
+        finally:
+            self.metrics.observe("supervisor_llm_audit_duration_seconds", time.perf_counter() - start)
+
+        self._record(analysis, agent_name, heuristic_score)
+
+    def _record(
+        self,
+        analysis: LLMResponseAnalysis | AnalyzerFallbackResult,
+        agent_name: str,
+        heuristic_score: float,
+    ) -> None:
+        """Write an audit result to metrics."""
+        labels = {"agent": agent_name}
+
+        if isinstance(analysis, AnalyzerFallbackResult):
+            self._stats["fallbacks"] += 1
+            self.metrics.increment("supervisor_llm_audit_fallbacks_total", labels=labels)
+            return
+
+        self._stats["completed"] += 1
+        self.metrics.increment(
+            "supervisor_llm_audits_total",
+            labels={**labels, "quality": analysis.quality.value, "action": analysis.recommended_action.value},
+        )
+        self.metrics.observe("supervisor_llm_audit_score", analysis.overall_score, labels)
+        self.metrics.observe("supervisor_llm_audit_score_gap", analysis.overall_score - heuristic_score, labels)
+
+        risk = analysis.hallucination.risk_level
+        if risk != HallucinationRisk.NONE:
+            self.metrics.increment(
+                "supervisor_llm_audit_hallucinations_total", labels={**labels, "risk": risk.value}
+            )
+            if risk in (HallucinationRisk.MEDIUM, HallucinationRisk.HIGH):
+                logger.warning(
+                    f"Quality audit: {risk.value} hallucination risk in {agent_name} response "
+                    f"(llm={analysis.overall_score:.2f}, heuristic={heuristic_score:.2f}): "
+                    f"{analysis.hallucination.suspicious_claims}"
+                )
+
+    async def drain(self, timeout: float = 5.0) -> None:
+        """
+        Wait for pending audits, cancelling those still running after timeout.
+
+        Args:
+            timeout: Max seconds to wait
+        """
+        if not self._pending:
+            return
+        _, still_running = await asyncio.wait(set(self._pending), timeout=timeout)
+        for task in still_running:
+            task.cancel()
+        await asyncio.gather(*still_running, return_exceptions=True)
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get auditor statistics."""
+        return {
+            **self._stats,
+            "pending": len(self._pending),
+            "sample_rate": self.sample_rate,
+            "max_pending": self.max_pending,
+        }
+
+
+# Live auditors (one per SupervisorAgent), drained on shutdown
+_auditors: weakref.WeakSet[QualityAuditor] = weakref.WeakSet()
+
+
+async def drain_quality_auditors(timeout: float = 5.0) -> None:
+    """
+    Drain the pending audits of every auditor (used on shutdown).
+
+    Args:
+        timeout: Max seconds to wait before cancelling running audits
+    """
+    await asyncio.gather(*(auditor.drain(timeout) for auditor in list(_auditors)))
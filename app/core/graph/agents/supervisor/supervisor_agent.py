@@ -9,6 +9,7 @@ Components:
 - LLMResponseAnalyzer: Deep semantic analysis with LLM (deepseek-r1)
 - ConversationFlowController: Flow decision logic
 - ResponseEnhancer: Optional response enhancement
+- QualityAuditor: Sampled background LLM analysis (sampled mode)
 """
 
 import logging
@@ -20,6 +21,7 @@ from app.core.graph.agents.supervisor.conversation_flow_controller import (
     ConversationFlowController,
 )
 from app.core.graph.agents.supervisor.llm_response_analyzer import LLMResponseAnalyzer
+from app.core.graph.agents.supervisor.quality_auditor import QualityAuditor
 from app.core.graph.agents.supervisor.response_enhancer import ResponseEnhancer
 from app.core.graph.agents.supervisor.response_quality_evaluator import (
     ResponseQualityEvaluator,
@@ -44,12 +46,15 @@ class SupervisorAgent(BaseAgent):
     - LLMResponseAnalyzer: Deep semantic analysis with LLM (deepseek-r1)
     - ConversationFlowController: Manages flow decisions
     - ResponseEnhancer: Enhances responses with LLM
+    - QualityAuditor: Runs LLM analysis in the background on a sample of turns
 
     The evaluation flow is:
     1. Heuristic evaluation (fast, ~5ms)
     2. LLM analysis if score < 0.90 (fast COMPLEX model, ~10-15s)
-    3. Combine scores (50% heuristic, 50% LLM)
-    4. Flow decision based on combined evaluation
+       - "inline" mode: awaited, scores combined (50% heuristic, 50% LLM)
+       - "sampled" mode: scheduled out-of-band for a sample of turns and
+         written to metrics; the flow uses the heuristic score only
+    3. Flow decision based on the evaluation
 
     Follows SRP: Orchestration responsibility only.
     """
@@ -70,6 +75,10 @@ class SupervisorAgent(BaseAgent):
                 - llm_analysis_timeout: LLM timeout in seconds (default: 15)
                 - skip_llm_threshold: Skip LLM if heuristic >= this (default: 0.90)
                 - llm_weight: Weight of LLM score in combined (default: 0.5)
+                - llm_analysis_mode: "sampled" (background, default) or "inline"
+                - llm_analysis_sample_rate: Fraction of turns audited in sampled mode (default: 0.1)
+                - llm_analysis_max_pending: Max background audits at once (default: 16)
+                - enhancement_score_floor: In sampled mode, enhance only below this score (default: 0.4)
         """
         super().__init__("supervisor", config or {}, llm=llm)
 
@@ -89,6 +98,15 @@ class SupervisorAgent(BaseAgent):
         self.skip_llm_threshold = self.config.get("skip_llm_threshold", 0.75)
         self.llm_weight = self.config.get("llm_weight", self.LLM_WEIGHT)
         self.heuristic_weight = 1.0 - self.llm_weight
+        # "sampled": LLM analysis runs out-of-band on a sample of turns
+        self.llm_analysis_mode = self.config.get("llm_analysis_mode", "sampled")
+        self.llm_analysis_sample_rate = self.config.get(
+            "llm_analysis_sample_rate", QualityAuditor.DEFAULT_SAMPLE_RATE
+        )
+        self.llm_analysis_max_pending = self.config.get(
+            "llm_analysis_max_pending", QualityAuditor.DEFAULT_MAX_PENDING
+        )
+        self.enhancement_score_floor = self.config.get("enhancement_score_floor", 0.4)
 
         # Quality thresholds
         self.quality_thresholds = {
@@ -117,6 +135,12 @@ class SupervisorAgent(BaseAgent):
             },
         )
 
+        self.quality_auditor = QualityAuditor(
+            self.llm_analyzer,
+            sample_rate=self.llm_analysis_sample_rate,
+            max_pending=self.llm_analysis_max_pending,
+        )
+
         # Language detector
         self.language_detector = LanguageDetector(
             config={"default_language": "es", "supported_languages": ["es", "en", "pt"]}
@@ -127,6 +151,7 @@ class SupervisorAgent(BaseAgent):
 
         logger.info(
             f"SupervisorAgent initialized (llm_analysis={self.enable_llm_analysis}, "
+            f"mode={self.llm_analysis_mode}, sample_rate={self.llm_analysis_sample_rate}, "
             f"threshold={self.skip_llm_threshold}, weight={self.llm_weight})"
         )
 
@@ -146,9 +171,9 @@ class SupervisorAgent(BaseAgent):
 
         Evaluation flow:
         1. Heuristic evaluation (fast, ~5ms)
-        2. LLM analysis if heuristic score < 0.90 (COMPLEX model, ~10-15s)
-        3. Combine scores (50% heuristic, 50% LLM)
-        4. Flow decision based on combined evaluation
+        2. LLM analysis if heuristic score < 0.90 (COMPLEX model, ~10-15s):
+           awaited and combined (inline mode) or sampled in the background
+        3. Flow decision based on the evaluation
 
         Args:
             message: User message (for context)
@@ -185,7 +210,18 @@ class SupervisorAgent(BaseAgent):
 
             # Step 2: LLM analysis (if enabled and score suggests it's needed)
             llm_analysis = None
-            if self.enable_llm_analysis:
+            llm_audit_scheduled = False
+            sampled_mode = self.llm_analysis_mode == "sampled"
+            if self.enable_llm_analysis and sampled_mode:
+                # Off the critical path: results only reach metrics
+                llm_audit_scheduled = self.quality_auditor.submit(
+                    user_message=message,
+                    agent_response=last_response,
+                    agent_name=current_agent or "unknown",
+                    conversation_context=state_dict,
+                    heuristic_score=heuristic_score,
+                )
+            elif self.enable_llm_analysis:
                 llm_analysis = await self.llm_analyzer.analyze(
                     user_message=message,
                     agent_response=last_response,
@@ -198,6 +234,8 @@ class SupervisorAgent(BaseAgent):
             combined_evaluation = self._combine_evaluations(
                 quality_evaluation, llm_analysis
             )
+            if self.enable_llm_analysis and sampled_mode:
+                combined_evaluation["llm_analysis_status"] = "sampled" if llm_audit_scheduled else "not_sampled"
 
             # Step 4: Determine conversation flow using combined evaluation
             flow_decision = self.flow_controller.determine_flow(combined_evaluation, state_dict)
@@ -210,7 +248,9 @@ class SupervisorAgent(BaseAgent):
             # Enhance response if needed (use combined score)
             enhanced_response = None
             combined_score = combined_evaluation.get("overall_score", 0.0)
-            should_enhance = combined_score < 0.8
+            # Sampled mode keeps the extra LLM call for clearly poor responses only
+            enhance_below = self.enhancement_score_floor if sampled_mode else 0.8
+            should_enhance = combined_score < enhance_below
 
             if (
                 (flow_decision.get("should_end") or should_provide_final)
@@ -218,7 +258,7 @@ class SupervisorAgent(BaseAgent):
             ):
                 if self.enable_response_enhancement and self.llm and should_enhance:
                     # Detect user language
-                    language_info = self.language_detector.detect_language(message)
+                    language_info = await self.language_detector.adetect_language(message)
                     detected_language = language_info.get("language", "es")
 
                     logger.info(
@@ -277,6 +317,8 @@ class SupervisorAgent(BaseAgent):
                     "llm_analysis_used": llm_analysis is not None and not isinstance(
                         llm_analysis, AnalyzerFallbackResult
                     ),
+                    "llm_analysis_mode": self.llm_analysis_mode,
+                    "llm_audit_scheduled": llm_audit_scheduled,
                     "evaluation_timestamp": self._get_current_timestamp(),
                     "flow_decision": flow_decision["decision_type"],
                     "response_enhanced": enhanced_response is not None,
@@ -531,5 +573,8 @@ class SupervisorAgent(BaseAgent):
                 "skip_llm_threshold": self.skip_llm_threshold,
                 "llm_weight": self.llm_weight,
                 "heuristic_weight": self.heuristic_weight,
+                "llm_analysis_mode": self.llm_analysis_mode,
+                "enhancement_score_floor": self.enhancement_score_floor,
+                "quality_audits": self.quality_auditor.get_stats(),
             },
         }
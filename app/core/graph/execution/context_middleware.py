@@ -23,7 +23,8 @@ class ConversationContextMiddleware:
     - Database session injection for persistence
     - Context loading from storage
     - Initial state building for graph execution
-    - Context updates after execution
+    - Context updates after execution (write-behind when
+      CONVERSATION_WRITE_BEHIND_ENABLED, inline otherwise)
     """
 
     def __init__(self, history_agent: "HistoryAgent") -> None:
@@ -33,7 +34,10 @@ class ConversationContextMiddleware:
         Args:
             history_agent: Agent responsible for context persistence
         """
+        from app.config.settings import get_settings
+
         self._history_agent = history_agent
+        self._write_behind = get_settings().CONVERSATION_WRITE_BEHIND_ENABLED
 
     def prepare_db_session(self, db_session: AsyncSession | None) -> None:
         """
@@ -163,7 +167,12 @@ class ConversationContextMiddleware:
             specialized_agent = self.extract_specialized_agent(
                 result.get("agent_history", [])
             )
-            await self._history_agent.update_context(
+            update = (
+                self._history_agent.enqueue_update
+                if self._write_behind
+                else self._history_agent.update_context
+            )
+            await update(
                 conversation_id=conv_id,
                 user_message=message,
                 bot_response=bot_response,
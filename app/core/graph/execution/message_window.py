@@ -0,0 +1,36 @@
+"""
+Message window for checkpointed conversation state.
+
+LangGraphState.messages uses the add_messages reducer and WhatsApp threads
+are keyed by phone number, so without trimming every checkpoint carries the
+whole history of a returning customer. Older turns are already condensed by
+HistoryAgent into conversation_summary, which is injected into the state on
+every turn, so the graph only needs the most recent messages.
+"""
+
+from collections.abc import Sequence
+
+from langchain_core.messages import BaseMessage, RemoveMessage
+
+
+def trim_message_window(
+    messages: Sequence[BaseMessage], max_messages: int, slack: int = 0
+) -> list[RemoveMessage]:
+    """
+    Build removals that cut the message history down to the last max_messages.
+
+    Trimming only starts once the history exceeds max_messages + slack, so the
+    extra checkpoint write happens once every `slack` messages instead of on
+    every turn.
+
+    Args:
+        messages: Current state messages (oldest first)
+        max_messages: Messages to keep (0 disables trimming)
+        slack: Extra messages tolerated before trimming
+
+    Returns:
+        RemoveMessage updates for the add_messages reducer (empty if no trim)
+    """
+    if max_messages <= 0 or len(messages) <= max_messages + slack:
+        return []
+    return [RemoveMessage(id=message.id) for message in messages[:-max_messages] if message.id]
@@ -3,10 +3,11 @@ Executor for managing node operations and agent execution
 """
 
 import logging
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional
 
 from langchain_core.messages import AIMessage, HumanMessage
 
+from app.core.graph.execution.message_window import trim_message_window
 from app.core.graph.state_schema import LangGraphState
 from app.core.schemas import AgentType
 from app.core.utils.tracing import trace_async_method
@@ -17,9 +18,28 @@ logger = logging.getLogger(__name__)
 class NodeExecutor:
     """Handles node execution and state transformations"""
 
-    def __init__(self, agents: Dict[str, Any], conversation_tracers: Dict[str, Any]):
+    def __init__(
+        self,
+        agents: Dict[str, Any],
+        conversation_tracers: Dict[str, Any],
+        agent_resolver: Optional[Callable[[], Dict[str, Any]]] = None,
+    ):
         self.agents = agents
         self.conversation_tracers = conversation_tracers
+        # Returns the agents of the current request (tenant views in multi-tenant mode)
+        self._agent_resolver = agent_resolver
+
+        from app.config.settings import get_settings
+
+        settings = get_settings()
+        self.message_window = settings.CHECKPOINT_MESSAGE_WINDOW
+        self.message_window_slack = settings.CHECKPOINT_MESSAGE_WINDOW_SLACK
+
+    def _get_agents(self) -> Dict[str, Any]:
+        """Get the agents to use for the current request."""
+        if self._agent_resolver is not None:
+            return self._agent_resolver()
+        return self.agents
 
     @trace_async_method(
         name="execute_orchestrator",
@@ -45,7 +65,7 @@ class NodeExecutor:
             state_dict = self._prepare_state_dict(state, messages)
 
             # Process with orchestrator
-            orchestrator = self.agents.get("orchestrator")
+            orchestrator = self._get_agents().get("orchestrator")
             if not orchestrator:
                 logger.error("Orchestrator agent not found")
                 return {"next_agent": "fallback_agent", "error": "Orchestrator not available"}
@@ -53,7 +73,7 @@ class NodeExecutor:
             result = await orchestrator._process_internal(message=user_message, state_dict=state_dict)
 
             # Update state with orchestrator decision
-            return {
+            update: Dict[str, Any] = {
                 "current_agent": "orchestrator",
                 "next_agent": result.get("next_agent", "fallback_agent"),
                 "routing_decision": result.get("routing_decision", {}),
@@ -62,6 +82,15 @@ class NodeExecutor:
                 "agent_history": ["orchestrator"],  # Reducer will concatenate
             }
 
+            # COMPACTION: Keep only the recent message window in the checkpoint
+            # (older turns live in conversation_summary from HistoryAgent)
+            removals = trim_message_window(messages, self.message_window, self.message_window_slack)
+            if removals:
+                update["messages"] = removals
+                logger.debug(f"Trimming {len(removals)} messages from checkpointed state")
+
+            return update
+
         except Exception as e:
             logger.error(f"Error in orchestrator node: {str(e)}")
             return {"next_agent": "fallback_agent", "error": str(e), "error_count": state.get("error_count", 0) + 1}
@@ -90,7 +119,7 @@ class NodeExecutor:
             state_dict = self._prepare_supervisor_state(state, messages)
 
             # Process with supervisor
-            supervisor = self.agents.get("supervisor")
+            supervisor = self._get_agents().get("supervisor")
             if not supervisor:
                 logger.error("Supervisor agent not found")
                 return {"is_complete": True, "error": "Supervisor not available"}
@@ -164,9 +193,10 @@ class NodeExecutor:
             state_dict = self._prepare_state_dict(state, messages)
 
             # Execute agent
-            agent = self.agents.get(agent_name)
+            agents = self._get_agents()
+            agent = agents.get(agent_name)
             if not agent:
-                logger.error(f"Agent '{agent_name}' not found. Available agents: {list(self.agents.keys())}")
+                logger.error(f"Agent '{agent_name}' not found. Available agents: {list(agents.keys())}")
                 raise ValueError(f"Agent '{agent_name}' not found")
 
             # Support both legacy agents with _process_internal and new agents with process
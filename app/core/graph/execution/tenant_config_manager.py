@@ -1,6 +1,15 @@
-"""Tenant configuration management for graph execution."""
+"""
+Tenant configuration management for graph execution.
+
+The tenant registry of the request being processed is held in a context
+variable, so it follows the request across the graph run (LangGraph nodes run
+in tasks that copy the caller's context) and never leaks into requests of
+other tenants processed concurrently by the same graph. Shared agents are not
+mutated: nodes resolve per-tenant agent views from the AgentFactory.
+"""
 
 import logging
+from contextvars import ContextVar
 from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
@@ -9,6 +18,14 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# Request-scoped tenant registry - async-safe, isolated per task
+_request_registry: ContextVar["TenantAgentRegistry | None"] = ContextVar("tenant_agent_registry", default=None)
+
+
+def get_request_tenant_registry() -> "TenantAgentRegistry | None":
+    """Get the tenant registry of the current request, if any."""
+    return _request_registry.get()
+
 
 class TenantConfigManager:
     """
@@ -17,6 +34,7 @@ class TenantConfigManager:
     Handles:
     - Setting tenant registry for per-request configuration
     - Resetting to global defaults after request
+    - Resolving the agents to use for the current request
     - Mode information reporting
     """
 
@@ -25,16 +43,17 @@ class TenantConfigManager:
         Initialize tenant config manager.
 
         Args:
-            agent_factory: Factory that holds and applies tenant config to agents
+            agent_factory: Factory that holds the agents and builds tenant views
         """
         self._agent_factory = agent_factory
 
     def set_tenant_registry(self, registry: "TenantAgentRegistry | None") -> None:
         """
-        Set tenant registry and apply configuration to all agents.
+        Set the tenant registry for the current request.
 
-        Called per-request in multi-tenant mode to configure agents
-        with tenant-specific settings from database.
+        Called per-request in multi-tenant mode. The registry is stored in a
+        context variable, so concurrent requests of different tenants each
+        see their own configuration.
 
         Args:
             registry: TenantAgentRegistry loaded from database
@@ -49,24 +68,31 @@ class TenantConfigManager:
             logger.debug("No tenant registry provided, using global defaults")
             return
 
-        # Update factory's registry
-        self._agent_factory.set_tenant_registry(registry)
-
-        # Apply tenant config to all agents
-        self._agent_factory.apply_tenant_config_to_agents(registry)
-
+        _request_registry.set(registry)
         logger.info(f"Graph configured for tenant: {registry.organization_id}")
 
     def reset_tenant_config(self) -> None:
         """
-        Reset all agents to global default configuration.
+        Clear the tenant registry of the current request.
 
-        Called after request processing to clean up tenant-specific
-        configuration and prepare for next request.
+        Called after request processing so the next request handled in the
+        same context starts from global defaults.
         """
-        self._agent_factory.reset_agents_to_defaults()
+        _request_registry.set(None)
         logger.debug("Graph reset to global defaults")
 
+    def get_request_agents(self) -> dict[str, Any]:
+        """
+        Get the agents to use for the current request.
+
+        Returns:
+            Tenant agent views when a registry is set, else the shared agents
+        """
+        registry = _request_registry.get()
+        if registry is None:
+            return self._agent_factory.agents
+        return self._agent_factory.get_tenant_agents(registry)
+
     def get_mode_info(
         self, app_initialized: bool, enabled_agents: list[str]
     ) -> dict[str, Any]:
@@ -81,9 +107,11 @@ class TenantConfigManager:
             Dict with mode info (global vs multi-tenant) and configuration state
         """
         factory_info = self._agent_factory.get_mode_info()
+        registry = _request_registry.get()
 
         return {
             **factory_info,
             "graph_initialized": app_initialized,
             "enabled_agents_config": enabled_agents,
+            "request_organization_id": str(registry.organization_id) if registry else None,
         }
@@ -12,7 +12,7 @@ Supports DUAL-MODE operation:
    - Uses TenantAgentRegistry loaded from database
    - Agent configurations (model, temperature, keywords, priority) from DB
    - Supports custom agent classes loaded dynamically
-   - Applied per-request via apply_tenant_config_to_agents()
+   - Applied per-request via get_tenant_agents() (immutable per-tenant views)
 
 Usage:
     # Global mode initialization (no tenant)
@@ -23,14 +23,18 @@ Usage:
     factory = AgentFactory(llm, postgres, config, tenant_registry=registry)
     agents = factory.initialize_all_agents()
 
-    # Apply tenant config per-request (runtime)
-    factory.apply_tenant_config_to_agents(registry)
+    # Resolve tenant-configured agents per-request (runtime, no shared mutation)
+    agents = factory.get_tenant_agents(registry)
 """
 
 from __future__ import annotations
 
+import copy
+import hashlib
 import importlib
+import json
 import logging
+from collections import OrderedDict
 from typing import TYPE_CHECKING, Any, Callable
 
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -112,6 +116,9 @@ class AgentFactory:
         tenant_registry: Optional TenantAgentRegistry for tenant-specific config
     """
 
+    # Max cached per-tenant agent views (LRU)
+    MAX_TENANT_VIEWS = 256
+
     def __init__(
         self,
         llm,
@@ -124,6 +131,8 @@ class AgentFactory:
         self.config = config
         self.agents: dict[str, Any] = {}
         self._tenant_registry = tenant_registry
+        # Per-tenant agent views keyed by (organization_id, registry version)
+        self._tenant_views: OrderedDict[tuple[str, str], dict[str, Any]] = OrderedDict()
 
         # Determine enabled agents and domains from registry or config
         if tenant_registry is not None:
@@ -188,6 +197,8 @@ class AgentFactory:
         When tenant_registry is set, uses registry config for agent initialization.
         """
         try:
+            self._tenant_views.clear()
+
             # Use self.enabled_agents which respects tenant_registry if set
             enabled_agents = self.enabled_agents
             agent_configs = self.config.get("agents", {})
@@ -395,6 +406,61 @@ class AgentFactory:
 
         logger.info(f"Applied tenant config to {applied_count} agents " f"for org {registry.organization_id}")
 
+    def get_tenant_agents(self, registry: TenantAgentRegistry) -> dict[str, Any]:
+        """
+        Get agents configured for a tenant without mutating the shared agents.
+
+        Agents with tenant configuration are replaced by shallow copies with
+        the tenant config applied; all other agents are shared. Views are
+        cached by organization and registry version, so concurrent requests
+        of the same tenant reuse them and config changes build new ones.
+
+        Args:
+            registry: TenantAgentRegistry of the current request
+
+        Returns:
+            Dictionary of agent name -> agent instance for this tenant
+        """
+        key = (str(registry.organization_id), self._registry_version(registry))
+        views = self._tenant_views.get(key)
+        if views is not None:
+            self._tenant_views.move_to_end(key)
+            return views
+
+        views = dict(self.agents)
+        for agent_key, agent in self.agents.items():
+            # Skip orchestrator and supervisor (system agents)
+            if agent_key in ("orchestrator", "supervisor"):
+                continue
+
+            agent_config = registry.get_agent(agent_key)
+            if agent_config and hasattr(agent, "apply_tenant_config"):
+                views[agent_key] = self._build_tenant_view(agent, agent_config)
+
+        self._tenant_views[key] = views
+        while len(self._tenant_views) > self.MAX_TENANT_VIEWS:
+            self._tenant_views.popitem(last=False)
+
+        logger.info(f"Built tenant agent views for org {registry.organization_id}")
+        return views
+
+    @staticmethod
+    def _build_tenant_view(agent: Any, agent_config: AgentConfig) -> Any:
+        """Copy an agent and apply tenant config to the copy only."""
+        view = copy.copy(agent)
+        if isinstance(getattr(agent, "config", None), dict):
+            # apply_tenant_config merges into config, which must not be shared
+            view.config = dict(agent.config)
+        view.apply_tenant_config(agent_config)
+        return view
+
+    @staticmethod
+    def _registry_version(registry: TenantAgentRegistry) -> str:
+        """Fingerprint of the agent configs that tenant views depend on."""
+        configs = {key: agent.config for key, agent in registry.agents.items()}
+        payload = json.dumps(configs, sort_keys=True, default=str)
+        return hashlib.sha1(payload.encode()).hexdigest()
+
     def reset_agents_to_defaults(self) -> None:
         """
         Reset all agents to their global default configuration.
@@ -642,6 +708,7 @@ class AgentFactory:
             enabled_configs = await service.get_enabled_configs()
 
             logger.info(f"Loading {len(enabled_configs)} enabled agents from database")
+            self._tenant_views.clear()
 
             # Always create orchestrator and supervisor (required for system)
             self.agents["orchestrator"] = OrchestratorAgent(llm=self.llm, config={})
@@ -5,7 +5,9 @@ Supports DUAL-MODE operation:
 - Global mode (no tenant): Agents use Python defaults
 - Multi-tenant mode (with token): Agents configured from database per-request
 
-The set_tenant_registry() method propagates tenant configuration to all agents.
+The set_tenant_registry() method scopes tenant configuration to the current
+request; nodes resolve per-tenant agent views, so shared agents are never
+mutated and several tenants can be processed concurrently.
 """
 
 import logging
@@ -28,6 +30,7 @@ from app.core.utils.tracing import trace_async_method, trace_context
 from app.domains.shared.agents.history_agent import HistoryAgent
 from app.integrations.databases import PostgreSQLIntegration
 from app.integrations.llm import VllmLLM
+from app.integrations.llm.streaming import STREAM_TOKENS_KEY, TOKEN_EVENT
 
 if TYPE_CHECKING:
     from app.core.schemas.tenant_agent_config import TenantAgentRegistry
@@ -90,7 +93,10 @@ class AynuxGraph:
 
         # Initialize router with enabled agents configuration
         self.router = GraphRouter(enabled_agents=self.enabled_agents)
-        self.executor = NodeExecutor(self.agents, self.conversation_tracers)
+        self.tenant_manager = TenantConfigManager(self.agent_factory)
+        self.executor = NodeExecutor(
+            self.agents, self.conversation_tracers, agent_resolver=self.tenant_manager.get_request_agents
+        )
 
         # Initialize extracted components
         self.context_middleware = ConversationContextMiddleware(self.history_agent)
@@ -100,7 +106,6 @@ class AynuxGraph:
             agents=self.agents,
             agent_factory=self.agent_factory,
         )
-        self.tenant_manager = TenantConfigManager(self.agent_factory)
 
     async def initialize(self, db_url: Optional[str] = None) -> None:
         """Initialize and compile the graph with PostgreSQL async checkpointer.
@@ -158,7 +163,9 @@ class AynuxGraph:
                 self.enabled_agents = self.agent_factory.enabled_agents
 
                 # Update executor with new agents
-                self.executor = NodeExecutor(self.agents, self.conversation_tracers)
+                self.executor = NodeExecutor(
+                    self.agents, self.conversation_tracers, agent_resolver=self.tenant_manager.get_request_agents
+                )
 
                 # Update router with new enabled agents
                 self.router = GraphRouter(enabled_agents=self.enabled_agents)
@@ -297,7 +304,8 @@ class AynuxGraph:
             **kwargs: Additional parameters
 
         Yields:
-            Dict containing streaming events and final result
+            Dict containing streaming events ("stream_event" per node, "token"
+            per response delta) and the final result
         """
         app = self.app
         if not app:
@@ -321,14 +329,39 @@ class AynuxGraph:
             context = await self.context_middleware.load_context(conv_id, **kwargs)
             initial_state = self.context_middleware.build_initial_state(message, conv_id, user_id, context, **kwargs)
             config = self.context_middleware.build_checkpointer_config(conv_id)
+            # Agents publish token deltas only in runs that forward them
+            config["configurable"] = {**config.get("configurable", {}), STREAM_TOKENS_KEY: True}
 
             # Execute graph with streaming
             final_result = None
             step_count = 0
 
             try:
-                # Stream through the graph execution
-                async for chunk in app.astream(initial_state, cast(RunnableConfig, config)):
+                # Stream through the graph execution. "updates" yields node
+                # outputs; "custom" carries token deltas published by agents
+                # (app.integrations.llm.streaming), also from nested graphs.
+                async for namespace, mode, chunk in app.astream(
+                    initial_state,
+                    cast(RunnableConfig, config),
+                    stream_mode=["updates", "custom"],
+                    subgraphs=True,
+                ):
+                    if mode == "custom":
+                        if isinstance(chunk, dict) and chunk.get("type") == TOKEN_EVENT:
+                            yield {
+                                "type": "token",
+                                "data": {
+                                    "delta": chunk.get("delta", ""),
+                                    "agent": chunk.get("agent"),
+                                    "timestamp": datetime.now().isoformat(),
+                                },
+                            }
+                        continue
+
+                    # Node updates of nested graphs are internal to their agent
+                    if namespace:
+                        continue
+
                     step_count += 1
 
                     # Emit progress events based on graph steps
@@ -418,10 +451,10 @@ class AynuxGraph:
 
     def set_tenant_registry(self, registry: "TenantAgentRegistry") -> None:
         """
-        Set tenant registry and apply configuration to all agents.
+        Set tenant registry for the current request.
 
-        Called per-request in multi-tenant mode to configure agents
-        with tenant-specific settings from database.
+        Called per-request in multi-tenant mode. The registry is request-scoped,
+        so agents use tenant-specific settings only within this request.
 
         Args:
             registry: TenantAgentRegistry loaded from database
@@ -429,7 +462,7 @@ class AynuxGraph:
         self.tenant_manager.set_tenant_registry(registry)
 
     def reset_tenant_config(self) -> None:
-        """Reset all agents to global default configuration."""
+        """Clear the tenant registry of the current request."""
         self.tenant_manager.reset_tenant_config()
 
     def get_mode_info(self) -> Dict[str, Any]:
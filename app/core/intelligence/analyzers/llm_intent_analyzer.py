@@ -10,6 +10,7 @@ import logging
 import os
 from typing import Any
 
+from app.core.cache.semantic_classification_cache import context_fingerprint, semantic_classification_cache
 from app.core.intelligence.cache.intent_cache import IntentCache
 from app.core.intelligence.metrics.router_metrics import RouterMetrics
 from app.core.intelligence.validators.intent_validator import IntentValidator
@@ -21,6 +22,7 @@ from app.utils import extract_json_from_text
 logger = logging.getLogger(__name__)
 
 # Configuration constants
+SEMANTIC_CACHE_ANALYZER = "llm_intent"
 INTENT_LLM_TIMEOUT = float(os.getenv("INTENT_LLM_TIMEOUT", "60.0"))
 INTENT_LLM_TEMPERATURE = 0.3
 
@@ -33,7 +35,7 @@ class LLMIntentAnalyzer:
 
     Features:
     - VllmLLM LLM integration
-    - Response caching
+    - Response caching (exact message and semantically similar messages)
     - Intent validation and mapping
     - Timeout handling
     """
@@ -68,6 +70,7 @@ class LLMIntentAnalyzer:
         Args:
             message: User message to analyze
             context: Optional context with customer_data, conversation_data
+                and organization_id
 
         Returns:
             Intent result dict
@@ -82,6 +85,29 @@ class LLMIntentAnalyzer:
             logger.info(f"Intent cache hit: {cached_result['primary_intent']}")
             return cached_result
 
+        # Similar message already classified in the same context
+        fingerprint = self._context_fingerprint(state_dict)
+        org_id = state_dict.get("organization_id")
+        semantic_hit = await semantic_classification_cache.get(
+            SEMANTIC_CACHE_ANALYZER, message, tenant=org_id, fingerprint=fingerprint
+        )
+        if semantic_hit is not None:
+            intent = semantic_hit.value["intent"]
+            logger.info(f"Intent semantic cache hit: {intent} (similarity: {semantic_hit.similarity:.2f})")
+            final_result = {
+                "primary_intent": intent,
+                "intent": intent,
+                "confidence": semantic_hit.confidence,
+                # Entities belong to the cached message, not this one
+                "entities": {},
+                "requires_handoff": False,
+                "target_agent": self._resolve_target_agent(intent, state_dict),
+                "method": self.get_method_name(),
+                "reasoning": semantic_hit.value.get("reasoning", "LLM analysis"),
+            }
+            self._cache.set(cache_key, final_result)
+            return final_result
+
         # Cache miss - call LLM
         self._metrics.increment_llm_calls()
 
@@ -131,12 +157,7 @@ class LLMIntentAnalyzer:
                     result["confidence"] = 0.4
                     result["reasoning"] = validation_reason
 
-            # Handle follow_up intent
-            conversation_data = state_dict.get("conversation_data", {})
-            if result["intent"] == "follow_up":
-                target_agent = self._validator.handle_follow_up_intent(conversation_data)
-            else:
-                target_agent = self._validator.map_intent_to_agent(result["intent"])
+            target_agent = self._resolve_target_agent(result["intent"], state_dict)
 
             # Create final result
             final_result = {
@@ -152,6 +173,14 @@ class LLMIntentAnalyzer:
 
             # Cache result
             self._cache.set(cache_key, final_result)
+            await semantic_classification_cache.set(
+                SEMANTIC_CACHE_ANALYZER,
+                message,
+                {"intent": final_result["intent"], "reasoning": final_result["reasoning"]},
+                final_result["confidence"],
+                tenant=org_id,
+                fingerprint=fingerprint,
+            )
 
             logger.info(
                 f"LLM Intent: {result['intent']} "
@@ -178,6 +207,38 @@ class LLMIntentAnalyzer:
             )
             return self._create_fallback_result(error_msg)
 
+    def _resolve_target_agent(self, intent: str, state_dict: dict[str, Any]) -> str:
+        """Map an intent to its agent (follow_up depends on the conversation).
+
+        Args:
+            intent: Validated intent
+            state_dict: Analysis context
+
+        Returns:
+            Target agent name
+        """
+        if intent == "follow_up":
+            return self._validator.handle_follow_up_intent(state_dict.get("conversation_data", {}))
+        return self._validator.map_intent_to_agent(intent)
+
+    @staticmethod
+    def _context_fingerprint(state_dict: dict[str, Any]) -> str:
+        """Fingerprint of the context the LLM prompt depends on (as IntentCache.get_key).
+
+        Args:
+            state_dict: Analysis context
+
+        Returns:
+            Context fingerprint for the semantic cache
+        """
+        conversation_data = state_dict.get("conversation_data") or {}
+        customer_data = state_dict.get("customer_data") or {}
+        return context_fingerprint(
+            language=state_dict.get("language", "es"),
+            user_tier=customer_data.get("tier", "basic"),
+            previous_agent=conversation_data.get("previous_agent"),
+        )
+
     def _create_fallback_result(self, reason: str) -> dict[str, Any]:
         """Create fallback result for error cases.
 
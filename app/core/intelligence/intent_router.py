@@ -90,6 +90,7 @@ class IntentRouter:
         message: str,
         customer_data: dict[str, Any] | None = None,
         conversation_data: dict[str, Any] | None = None,
+        organization_id: str | None = None,
     ) -> dict[str, Any]:
         """Determine user intent using three-tier fallback.
 
@@ -103,6 +104,7 @@ class IntentRouter:
             message: User message to analyze
             customer_data: Optional customer context
             conversation_data: Optional conversation context
+            organization_id: Tenant of the conversation (scopes the semantic cache)
 
         Returns:
             Intent result dict with keys:
@@ -118,6 +120,7 @@ class IntentRouter:
         context = {
             "customer_data": customer_data,
             "conversation_data": conversation_data,
+            "organization_id": organization_id,
         }
 
         # 0. Check for active multi-turn flows
@@ -142,7 +145,7 @@ class IntentRouter:
             try:
                 logger.debug("Trying SpaCy analysis...")
                 self._metrics.increment_spacy_calls()
-                spacy_result = self._spacy_analyzer.analyze_intent(message)
+                spacy_result = await self._spacy_analyzer.analyze_intent(message)
 
                 if spacy_result["confidence"] >= 0.4:
                     result = self._format_spacy_result(spacy_result)
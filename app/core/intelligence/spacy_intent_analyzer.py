@@ -2,12 +2,16 @@
 SpaCy Intent Analyzer - Fallback inteligente para análisis de intents sin LLM
 """
 
+import asyncio
+import importlib.util
 import logging
 import subprocess
 import sys
 from typing import Any, Dict, List, Tuple
 
+from app.core.cache.intent_similarity import IntentSimilarityIndex
 from app.core.schemas import get_intent_to_agent_mapping
+from app.integrations.nlp import ParsedDoc, get_nlp_service, is_model_installed
 
 logger = logging.getLogger(__name__)
 
@@ -22,12 +26,32 @@ class SpacyIntentAnalyzer:
     - Detección de patrones específicos del dominio e-commerce
     - Análisis de sentiment para casos de soporte
 
-    Implementado como Singleton para evitar cargar el modelo múltiples veces.
+    El parsing corre en el servicio NLP (procesos worker con nlp.pipe), fuera
+    del event loop. Implementado como Singleton para compartir el índice de
+    similitud de los textos de referencia.
     """
 
-    # Singleton instance and shared NLP model
+    # Componentes del pipeline que el análisis no usa
+    DISABLED_PIPES = ("parser",)
+
+    # Textos de referencia para similitud semántica por intent
+    REFERENCE_TEXTS = {
+        "saludo": "hola buenos días buenas tardes saludos qué tal cómo estás",
+        "producto": "ver productos disponibles precio stock catálogo",
+        "promociones": "ofertas descuentos promociones cupones rebajas pedido compra",
+        "seguimiento": "pedido envío tracking seguimiento entrega orden",
+        "soporte": "problema ayuda error soporte técnico reclamo incidencia",
+        "facturacion": "factura pago recibo cobro reembolso pedido orden",
+        "categoria": "categoría tipo clase tecnología ropa",
+        "despedida": "adiós gracias chau bye hasta luego",
+        "excelencia": "excelencia digital erp demo módulos software historia clínica turnos médicos healthcare hotel",
+        # NEW: Excelencia-specific intents
+        "excelencia_facturacion": "factura cliente estado cuenta cobranza deuda pago cliente",
+        "excelencia_promociones": "promoción software descuento módulo oferta implementación capacitación",
+    }
+
+    # Singleton instance
     _instance: "SpacyIntentAnalyzer | None" = None
-    _nlp_model = None  # Class-level shared model
 
     def __new__(cls, model_name: str = "es_core_news_sm"):
         """Singleton pattern - only create one instance"""
@@ -42,52 +66,37 @@ class SpacyIntentAnalyzer:
             return
 
         self.model_name = model_name
-        self.nlp = None
-        self._load_model()
+        self._spacy_available = self._check_model()
 
         # Patrones específicos del dominio
         self._init_domain_patterns()
 
-        # Cache para mejorar performance
-        self._similarity_cache = {}
+        # Índice de similitud de los textos de referencia (se construye una vez)
+        self._reference_index: IntentSimilarityIndex | None = None
 
         self._initialized = True
         logger.info("SpacyIntentAnalyzer singleton initialized")
 
-    def _load_model(self):
-        """Carga el modelo de spaCy, descargándolo si es necesario. Uses class-level cache."""
-        # Use cached model if available
-        if SpacyIntentAnalyzer._nlp_model is not None:
-            self.nlp = SpacyIntentAnalyzer._nlp_model
-            logger.info(f"Using cached spaCy model: {self.model_name}")
-            return
+    def _check_model(self) -> bool:
+        """
+        Verifica que spaCy y el modelo estén instalados, descargándolo si es necesario.
 
-        try:
-            import spacy
+        El modelo se carga en los workers del servicio NLP, no en este proceso.
+        Si no se puede descargar, los workers usan un pipeline base sin vectores.
+        """
+        if importlib.util.find_spec("spacy") is None:
+            logger.error("spaCy no está instalado. Usando fallback básico.")
+            return False
 
-            # Intentar cargar el modelo
+        if not is_model_installed(self.model_name):
+            logger.warning(f"Modelo {self.model_name} no encontrado, intentando descarga...")
             try:
-                SpacyIntentAnalyzer._nlp_model = spacy.load(self.model_name)
-                self.nlp = SpacyIntentAnalyzer._nlp_model
-                logger.info(f"Modelo spaCy {self.model_name} cargado exitosamente")
-            except OSError:
-                logger.warning(f"Modelo {self.model_name} no encontrado, intentando descarga...")
-                # Intentar descargar el modelo
-                try:
-                    subprocess.check_call([sys.executable, "-m", "spacy", "download", self.model_name])
-                    SpacyIntentAnalyzer._nlp_model = spacy.load(self.model_name)
-                    self.nlp = SpacyIntentAnalyzer._nlp_model
-                    logger.info(f"Modelo {self.model_name} descargado y cargado")
-                except Exception as e:
-                    logger.error(f"No se pudo descargar el modelo {self.model_name}: {e}")
-                    # Fallback a modelo base sin vectores
-                    logger.warning("Usando modelo base sin vectores...")
-                    SpacyIntentAnalyzer._nlp_model = spacy.blank("es")
-                    self.nlp = SpacyIntentAnalyzer._nlp_model
-
-        except ImportError:
-            logger.error("spaCy no está instalado. Usando fallback básico.")
-            self.nlp = None
+                subprocess.check_call([sys.executable, "-m", "spacy", "download", self.model_name])
+                logger.info(f"Modelo {self.model_name} descargado")
+            except Exception as e:
+                logger.error(f"No se pudo descargar el modelo {self.model_name}: {e}")
+                logger.warning("Usando modelo base sin vectores...")
+        return True
 
     def _init_domain_patterns(self):
         """Inicializa patrones específicos del dominio e-commerce"""
@@ -188,7 +197,7 @@ class SpacyIntentAnalyzer:
         # Patrones de negación
         self.negation_patterns = ["no", "nunca", "jamás", "sin", "nada", "ningún", "ninguna"]
 
-    def analyze_intent(self, message: str) -> Dict[str, Any]:
+    async def analyze_intent(self, message: str) -> Dict[str, Any]:
         """
         Analiza un mensaje y determina el intent más probable
 
@@ -198,17 +207,21 @@ class SpacyIntentAnalyzer:
         Returns:
             Diccionario con intent, confianza y análisis detallado
         """
-        if not self.nlp:
+        if not self._spacy_available:
             return self._keyword_fallback(message)
 
         try:
-            # Procesar mensaje con spaCy
-            doc = self.nlp(message.lower())
+            # Procesar mensaje con spaCy (servicio NLP, fuera del event loop)
+            service = get_nlp_service()
+            doc, reference_index = await asyncio.gather(
+                service.parse(message.lower(), self.model_name, disable=self.DISABLED_PIPES),
+                self._get_reference_index(),
+            )
 
             # Análisis multi-dimensional
             keyword_scores = self._analyze_keywords(doc)
             entity_scores = self._analyze_entities(doc)
-            similarity_scores = self._analyze_similarity(doc)
+            similarity_scores = self._analyze_similarity(doc, reference_index)
             pattern_scores = self._analyze_patterns(doc)
 
             # Combinar scores con pesos
@@ -240,7 +253,15 @@ class SpacyIntentAnalyzer:
             logger.error(f"Error en análisis spaCy: {e}")
             return self._keyword_fallback(message)
 
-    def _analyze_keywords(self, doc) -> Dict[str, float]:
+    async def _get_reference_index(self) -> IntentSimilarityIndex:
+        """Construye el índice de los textos de referencia una sola vez (un único batch)"""
+        if self._reference_index is None:
+            self._reference_index = await IntentSimilarityIndex.build(
+                self.REFERENCE_TEXTS, self.model_name, disable=self.DISABLED_PIPES
+            )
+        return self._reference_index
+
+    def _analyze_keywords(self, doc: ParsedDoc) -> Dict[str, float]:
         """Analiza keywords en el documento"""
         scores = {}
         text = doc.text.lower()
@@ -280,7 +301,7 @@ class SpacyIntentAnalyzer:
         """
         return list(self.intent_keywords.keys())
 
-    def _analyze_entities(self, doc) -> Dict[str, float]:
+    def _analyze_entities(self, doc: ParsedDoc) -> Dict[str, float]:
         """Analiza entidades nombradas relevantes"""
         scores = {intent: 0.0 for intent in self.intent_keywords.keys()}
 
@@ -291,39 +312,19 @@ class SpacyIntentAnalyzer:
 
         return scores
 
-    def _analyze_similarity(self, doc) -> Dict[str, float]:
-        """Analiza similitud semántica (si el modelo tiene vectores)"""
+    def _analyze_similarity(self, doc: ParsedDoc, reference_index: IntentSimilarityIndex) -> Dict[str, float]:
+        """Analiza similitud semántica (si el modelo tiene vectores), todos los intents a la vez"""
         scores = {intent: 0.0 for intent in self.intent_keywords.keys()}
 
         if not doc.has_vector:
             return scores
 
-        # Crear textos de referencia para cada intent
-        reference_texts = {
-            "saludo": "hola buenos días buenas tardes saludos qué tal cómo estás",
-            "producto": "ver productos disponibles precio stock catálogo",
-            "promociones": "ofertas descuentos promociones cupones rebajas pedido compra",
-            "seguimiento": "pedido envío tracking seguimiento entrega orden",
-            "soporte": "problema ayuda error soporte técnico reclamo incidencia",
-            "facturacion": "factura pago recibo cobro reembolso pedido orden",
-            "categoria": "categoría tipo clase tecnología ropa",
-            "despedida": "adiós gracias chau bye hasta luego",
-            "excelencia": "excelencia digital erp demo módulos software historia clínica turnos médicos healthcare hotel",
-            # NEW: Excelencia-specific intents
-            "excelencia_facturacion": "factura cliente estado cuenta cobranza deuda pago cliente",
-            "excelencia_promociones": "promoción software descuento módulo oferta implementación capacitación",
-        }
-
-        for intent, ref_text in reference_texts.items():
-            if self.nlp:
-                ref_doc = self.nlp(ref_text)
-                if ref_doc.has_vector:
-                    similarity = doc.similarity(ref_doc)
-                    scores[intent] = max(similarity, 0.0)
+        for intent, similarity in reference_index.score(doc.vector).items():
+            scores[intent] = max(similarity, 0.0)
 
         return scores
 
-    def _analyze_patterns(self, doc) -> Dict[str, float]:
+    def _analyze_patterns(self, doc: ParsedDoc) -> Dict[str, float]:
         """Analiza patrones específicos del dominio"""
         scores = {intent: 0.0 for intent in self.intent_keywords.keys()}
         text = doc.text.lower()
@@ -383,7 +384,7 @@ class SpacyIntentAnalyzer:
 
         return intent_name, confidence
 
-    def _extract_entities(self, doc) -> List[Dict[str, str]]:
+    def _extract_entities(self, doc: ParsedDoc) -> List[Dict[str, str]]:
         """Extrae entidades relevantes del documento"""
         entities = []
 
@@ -404,7 +405,7 @@ class SpacyIntentAnalyzer:
 
         return entities
 
-    def _analyze_sentiment(self, doc) -> str:
+    def _analyze_sentiment(self, doc: ParsedDoc) -> str:
         """Análisis básico de sentiment"""
         negative_words = [
             "malo",
@@ -446,7 +447,7 @@ class SpacyIntentAnalyzer:
         else:
             return "neutral"
 
-    def _detect_urgency(self, doc) -> str:
+    def _detect_urgency(self, doc: ParsedDoc) -> str:
         """Detecta nivel de urgencia en el mensaje"""
         text = doc.text.lower()
 
@@ -500,18 +501,17 @@ class SpacyIntentAnalyzer:
 
     def is_available(self) -> bool:
         """Verifica si spaCy está disponible y funcionando"""
-        return self.nlp is not None
+        return self._spacy_available
 
     def get_model_info(self) -> Dict[str, Any]:
-        """Obtiene información sobre el modelo cargado"""
-        if not self.nlp:
-            return {"available": False, "reason": "spaCy not loaded"}
+        """Obtiene información sobre el modelo usado"""
+        if not self._spacy_available:
+            return {"available": False, "reason": "spaCy not installed"}
 
         return {
             "available": True,
             "model_name": self.model_name,
-            "has_vectors": self.nlp.has_pipe("vectors"),
-            "has_ner": self.nlp.has_pipe("ner"),
-            "lang": self.nlp.lang,
-            "vocab_size": len(self.nlp.vocab),
+            "model_installed": is_model_installed(self.model_name),
+            "disabled_pipes": list(self.DISABLED_PIPES),
+            "nlp_service": get_nlp_service().get_stats(),
         }
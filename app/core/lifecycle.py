@@ -81,6 +81,11 @@ class LifecycleManager:
         # Stop background services
         await self._background_service_manager.stop()
 
+        # Close pooled keep-alive connections
+        from app.integrations.http_pool import close_shared_http_client
+
+        await close_shared_http_client()
+
         self._initialized = False
         logger.info("Application lifecycle shutdown completed")
 
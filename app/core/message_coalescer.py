@@ -0,0 +1,201 @@
+"""
+Debounce/coalesce stage for rapid-fire user messages.
+
+WhatsApp users often split one intent across several short messages sent
+within a second ("hola", "quiero", "pagar mi deuda"). Processing each one
+triggers a full graph run (orchestrator, agent and supervisor LLM calls).
+
+MessageCoalescer buffers messages per conversation, reusing the
+BatchMessage model of WhatsAppMessageBatcher, and flushes the buffer once
+the conversation has been quiet for `window` seconds (debounce), when
+`max_wait` seconds have passed since the first message, or when
+`max_messages` are buffered. The handler runs once per flush and every
+submitter of the batch receives the same result.
+
+Messages that must not be delayed (buttons, attachments) are submitted with
+flush=True: they join the open buffer, if any, and close it immediately, so
+the handler still sees the conversation's messages in arrival order.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from app.core.message_batcher import BatchMessage
+
+logger = logging.getLogger(__name__)
+
+CoalesceHandler = Callable[[str, list[BatchMessage]], Awaitable[Any]]
+
+
+@dataclass
+class _CoalesceBuffer:
+    """Messages buffered for one conversation window."""
+
+    first_at: float
+    last_at: float
+    window: float
+    future: asyncio.Future[Any]
+    messages: list[BatchMessage] = field(default_factory=list)
+    wakeup: asyncio.Event = field(default_factory=asyncio.Event)
+    flush_now: bool = False
+    closed: bool = False
+
+
+class MessageCoalescer:
+    """
+    Per-conversation debounce buffer in front of message processing.
+
+    Usage:
+        coalescer = MessageCoalescer(default_window=1.0, max_wait=4.0)
+        result = await coalescer.submit(
+            key="whatsapp_5492641234567",
+            message=BatchMessage(user_id=..., message_id=..., content="hola", timestamp=time.time()),
+            handler=process_batch,  # async def process_batch(key, messages) -> Any
+            window=0.8,             # per-tenant override, 0 disables coalescing
+        )
+    """
+
+    def __init__(self, default_window: float = 1.0, max_wait: float = 4.0, max_messages: int = 10):
+        self.default_window = default_window
+        self.max_wait = max_wait
+        self.max_messages = max_messages
+
+        self._buffers: dict[str, _CoalesceBuffer] = {}
+        self._tasks: set[asyncio.Task[None]] = set()
+        self._stats = {
+            "messages": 0,
+            "flushes": 0,
+            "coalesced_messages": 0,
+        }
+
+    async def submit(
+        self,
+        key: str,
+        message: BatchMessage,
+        handler: CoalesceHandler,
+        window: float | None = None,
+        flush: bool = False,
+    ) -> Any:
+        """
+        Add a message to its conversation buffer and wait for the flush.
+
+        Args:
+            key: Conversation key
+            message: Message to buffer
+            handler: Async callable invoked once per flush with (key, messages)
+            window: Quiet period in seconds (None uses default, <= 0 disables)
+            flush: Close the open buffer with this message instead of waiting
+
+        Returns:
+            The handler result for the batch containing this message
+        """
+        self._stats["messages"] += 1
+        window = self.default_window if window is None else window
+        buffer = self._buffers.get(key)
+        has_open_buffer = buffer is not None and not buffer.closed
+
+        if (window <= 0 or flush) and not has_open_buffer:
+            self._stats["flushes"] += 1
+            return await handler(key, [message])
+
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+
+        if buffer is None or buffer.closed:
+            buffer = _CoalesceBuffer(first_at=now, last_at=now, window=window, future=loop.create_future())
+            self._buffers[key] = buffer
+            task = asyncio.create_task(self._flush_when_quiet(key, buffer, handler), name=f"coalesce_{key}")
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+        buffer.messages.append(message)
+        buffer.last_at = now
+        buffer.flush_now = buffer.flush_now or flush
+        buffer.wakeup.set()
+
+        # Shield so a cancelled submitter does not cancel the shared batch
+        return await asyncio.shield(buffer.future)
+
+    async def _flush_when_quiet(self, key: str, buffer: _CoalesceBuffer, handler: CoalesceHandler) -> None:
+        """Wait for the debounce window to close, then run the handler once."""
+        loop = asyncio.get_running_loop()
+
+        try:
+            while len(buffer.messages) < self.max_messages and not buffer.flush_now:
+                now = loop.time()
+                delay = min(buffer.last_at + buffer.window, buffer.first_at + self.max_wait) - now
+                if delay <= 0:
+                    break
+                buffer.wakeup.clear()
+                try:
+                    await asyncio.wait_for(buffer.wakeup.wait(), timeout=delay)
+                except TimeoutError:
+                    pass
+
+            self._close(key, buffer)
+            messages = sorted(buffer.messages, key=lambda m: m.timestamp)
+            self._stats["flushes"] += 1
+            if len(messages) > 1:
+                self._stats["coalesced_messages"] += len(messages)
+                logger.info(f"Coalesced {len(messages)} messages for {key}")
+
+            result = await handler(key, messages)
+        except Exception as e:
+            buffer.future.set_exception(e)
+        except BaseException as e:
+            # Cancelled (e.g. shutdown): submitters are shielded from it and
+            # would otherwise wait on the batch forever
+            error = RuntimeError(f"Coalesced batch for {key} aborted ({type(e).__name__})")
+            error.__cause__ = e
+            buffer.future.set_exception(error)
+            raise
+        else:
+            buffer.future.set_result(result)
+        finally:
+            self._close(key, buffer)
+
+    def _close(self, key: str, buffer: _CoalesceBuffer) -> None:
+        """Stop accepting messages into a buffer (new ones open another)."""
+        buffer.closed = True
+        if self._buffers.get(key) is buffer:
+            del self._buffers[key]
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get coalescer statistics."""
+        flushes = self._stats["flushes"]
+        return {
+            "configuration": {
+                "default_window": self.default_window,
+                "max_wait": self.max_wait,
+                "max_messages": self.max_messages,
+            },
+            "status": {"open_buffers": len(self._buffers)},
+            "performance": {
+                **self._stats,
+                "avg_messages_per_flush": f"{(self._stats['messages'] / flushes if flushes else 0.0):.2f}",
+            },
+        }
+
+
+# Global instance for singleton pattern
+_message_coalescer: MessageCoalescer | None = None
+
+
+def get_message_coalescer() -> MessageCoalescer:
+    """Get or create the global message coalescer."""
+    global _message_coalescer
+    if _message_coalescer is None:
+        from app.config.settings import get_settings
+
+        settings = get_settings()
+        _message_coalescer = MessageCoalescer(
+            default_window=settings.WEBHOOK_COALESCE_WINDOW_MS / 1000,
+            max_wait=settings.WEBHOOK_COALESCE_MAX_WAIT_MS / 1000,
+            max_messages=settings.WEBHOOK_COALESCE_MAX_MESSAGES,
+        )
+    return _message_coalescer
@@ -12,6 +12,7 @@ This module provides the core infrastructure for multi-tenant operations:
 - TenantResolver: Resolves tenant from JWT token or other sources
 - TenantMiddleware: FastAPI middleware for automatic tenant resolution
 - TenantVectorStore: Multi-tenant aware vector store for RAG
+- TenantIndexManager: Per-tenant partial HNSW indexes for tenant documents
 - TenantPromptManager: Multi-tenant prompt resolution with scope hierarchy
 - TenantAgentFactory: Multi-tenant agent filtering based on TenantConfig
 """
@@ -83,6 +84,7 @@ from .schemas import (
 )
 from .prompt_manager import PromptNotFoundError, PromptScope, TenantPromptManager
 from .resolver import TenantResolutionError, TenantResolver
+from .vector_index_manager import TenantIndexManager
 from .vector_store import TenantVectorStore
 
 __all__ = [
@@ -101,6 +103,7 @@ __all__ = [
     "TenantResolver",
     # Vector Store
     "TenantVectorStore",
+    "TenantIndexManager",
     # Prompt Manager
     "TenantPromptManager",
     "PromptScope",
@@ -0,0 +1,234 @@
+# ============================================================================
+# SCOPE: MULTI-TENANT
+# Description: Gestión de índices HNSW parciales por organización sobre
+#              tenant_documents y ajuste de hnsw.ef_search por consulta.
+# Tenant-Aware: Yes - un índice por organization_id.
+# ============================================================================
+"""
+TenantIndexManager - per-tenant partial HNSW indexes for tenant_documents.
+
+A single HNSW index over all tenants would return the global nearest
+neighbours and filter by organization afterwards, so a small tenant could
+get fewer than top_k results. Each tenant with enough documents gets its own
+partial index instead:
+
+    CREATE INDEX CONCURRENTLY idx_tenant_docs_hnsw_{org_hex}
+    ON core.tenant_documents USING hnsw (embedding vector_cosine_ops)
+    WHERE organization_id = '{org_id}' AND active = true AND embedding IS NOT NULL
+
+The planner only matches a partial index when the query repeats its
+predicate with the same constant, so KNN queries embed the organization id
+as a literal (see knn_predicate()). Tenants below `min_documents` are
+served by an exact scan, which is fast at that size.
+
+Recall is tuned per query with `SET LOCAL hnsw.ef_search`; it must be at
+least the number of candidates requested, since HNSW returns at most
+ef_search rows.
+"""
+
+from __future__ import annotations
+
+import logging
+import uuid
+from typing import Any
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
+
+from app.models.db.schemas import CORE_SCHEMA
+
+logger = logging.getLogger(__name__)
+
+INDEX_PREFIX = "idx_tenant_docs_hnsw_"
+
+
+def index_name(organization_id: uuid.UUID) -> str:
+    """Name of the partial HNSW index for an organization."""
+    return f"{INDEX_PREFIX}{organization_id.hex}"
+
+
+def knn_predicate(organization_id: uuid.UUID) -> str:
+    """
+    WHERE clause matching the partial index predicate of an organization.
+
+    The organization id is rendered as a literal (a validated UUID), so the
+    planner can match the partial index even for generic prepared plans.
+    """
+    org_literal = str(uuid.UUID(str(organization_id)))
+    return f"organization_id = '{org_literal}'::uuid AND active = true AND embedding IS NOT NULL"
+
+
+async def set_ef_search(db: AsyncSession | AsyncConnection, ef_search: int) -> None:
+    """Set hnsw.ef_search for the current transaction."""
+    await db.execute(text(f"SET LOCAL hnsw.ef_search = {int(ef_search)}"))
+
+
+class TenantIndexManager:
+    """
+    Creates, drops and lists per-tenant partial HNSW indexes.
+
+    Usage:
+        manager = TenantIndexManager()
+        await manager.ensure_index(org_id)          # if the tenant has enough documents
+        await manager.ensure_indexes()              # sweep all tenants
+        indexes = await manager.list_indexes()
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine | None = None,
+        m: int | None = None,
+        ef_construction: int | None = None,
+        min_documents: int | None = None,
+    ):
+        from app.config.settings import get_settings
+
+        settings = get_settings()
+        self._engine = engine
+        self.m = m or settings.RAG_HNSW_M
+        self.ef_construction = ef_construction or settings.RAG_HNSW_EF_CONSTRUCTION
+        self.min_documents = settings.RAG_HNSW_MIN_DOCUMENTS if min_documents is None else min_documents
+
+    @property
+    def engine(self) -> AsyncEngine:
+        """Engine used for DDL (CREATE INDEX CONCURRENTLY needs autocommit)."""
+        if self._engine is None:
+            from app.database.async_db import async_engine
+
+            self._engine = async_engine
+        return self._engine
+
+    def create_index_sql(self, organization_id: uuid.UUID) -> str:
+        """Build the CREATE INDEX statement for an organization."""
+        return (
+            f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {index_name(organization_id)} "
+            f"ON {CORE_SCHEMA}.tenant_documents "
+            f"USING hnsw (embedding vector_cosine_ops) "
+            f"WITH (m = {int(self.m)}, ef_construction = {int(self.ef_construction)}) "
+            f"WHERE {knn_predicate(organization_id)}"
+        )
+
+    async def count_embedded(self, organization_id: uuid.UUID) -> int:
+        """Count active documents with embeddings for an organization."""
+        async with self.engine.connect() as conn:
+            result = await conn.execute(
+                text(f"SELECT count(*) FROM {CORE_SCHEMA}.tenant_documents WHERE {knn_predicate(organization_id)}")
+            )
+            return int(result.scalar() or 0)
+
+    async def ensure_index(self, organization_id: uuid.UUID, force: bool = False) -> bool:
+        """
+        Create the partial HNSW index of an organization if it is worth it.
+
+        Args:
+            organization_id: Organization UUID
+            force: Create the index even below min_documents
+
+        Returns:
+            True if the index exists after the call
+        """
+        if not force and await self.count_embedded(organization_id) < self.min_documents:
+            return await self.index_exists(organization_id)
+
+        async with self.engine.connect() as conn:
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            await conn.execute(text(self.create_index_sql(organization_id)))
+
+        # A failed CONCURRENTLY build leaves an INVALID index behind
+        if not await self.index_exists(organization_id):
+            logger.warning(f"HNSW index build for tenant {organization_id} left an invalid index, dropping it")
+            await self.drop_index(organization_id)
+            return False
+
+        logger.info(f"HNSW index {index_name(organization_id)} ready for tenant {organization_id}")
+        return True
+
+    async def drop_index(self, organization_id: uuid.UUID) -> None:
+        """Drop the partial HNSW index of an organization."""
+        async with self.engine.connect() as conn:
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            await conn.execute(
+                text(f"DROP INDEX CONCURRENTLY IF EXISTS {CORE_SCHEMA}.{index_name(organization_id)}")
+            )
+
+    async def index_exists(self, organization_id: uuid.UUID) -> bool:
+        """Check if a valid partial index exists for an organization."""
+        async with self.engine.connect() as conn:
+            result = await conn.execute(
+                text(
+                    """
+                    SELECT i.indisvalid
+                    FROM pg_index i
+                    JOIN pg_class c ON c.oid = i.indexrelid
+                    JOIN pg_namespace n ON n.oid = c.relnamespace
+                    WHERE n.nspname = :schema AND c.relname = :name
+                    """
+                ),
+                {"schema": CORE_SCHEMA, "name": index_name(organization_id)},
+            )
+            return bool(result.scalar())
+
+    async def ensure_indexes(self) -> dict[str, bool]:
+        """
+        Create missing indexes for every organization above min_documents.
+
+        Returns:
+            Mapping of organization id to index availability
+        """
+        async with self.engine.connect() as conn:
+            result = await conn.execute(
+                text(
+                    f"""
+                    SELECT organization_id
+                    FROM {CORE_SCHEMA}.tenant_documents
+                    WHERE active = true AND embedding IS NOT NULL
+                    GROUP BY organization_id
+                    HAVING count(*) >= :min_documents
+                    """
+                ),
+                {"min_documents": self.min_documents},
+            )
+            organization_ids = [row[0] for row in result.all()]
+
+        status: dict[str, bool] = {}
+        for organization_id in organization_ids:
+            try:
+                status[str(organization_id)] = await self.ensure_index(organization_id, force=True)
+            except Exception as e:
+                logger.error(f"Error creating HNSW index for tenant {organization_id}: {e}")
+                status[str(organization_id)] = False
+        return status
+
+    async def list_indexes(self) -> list[dict[str, Any]]:
+        """List per-tenant HNSW indexes with size and validity."""
+        async with self.engine.connect() as conn:
+            result = await conn.execute(
+                text(
+                    """
+                    SELECT c.relname, i.indisvalid, pg_relation_size(c.oid)
+                    FROM pg_index i
+                    JOIN pg_class c ON c.oid = i.indexrelid
+                    JOIN pg_namespace n ON n.oid = c.relnamespace
+                    WHERE n.nspname = :schema AND c.relname LIKE :prefix
+                    ORDER BY pg_relation_size(c.oid) DESC
+                    """
+                ),
+                {"schema": CORE_SCHEMA, "prefix": f"{INDEX_PREFIX}%"},
+            )
+            return [
+                {
+                    "index_name": name,
+                    "organization_id": _organization_from_index(name),
+                    "valid": bool(valid),
+                    "size_bytes": int(size),
+                }
+                for name, valid, size in result.all()
+            ]
+
+
+def _organization_from_index(name: str) -> str | None:
+    """Organization id encoded in an index name (None for legacy short names)."""
+    try:
+        return str(uuid.UUID(name.removeprefix(INDEX_PREFIX)))
+    except ValueError:
+        return None
@@ -14,7 +14,9 @@ Features:
 - Automatic tenant filtering based on TenantContext
 - Support for both shared products and tenant-specific documents
 - Configurable similarity threshold per tenant
-- Index management per tenant (partial HNSW indexes)
+- Index management per tenant (partial HNSW indexes, TenantIndexManager)
+- Hybrid search as separate vector KNN / full-text top-K retrieval fused
+  with Reciprocal Rank Fusion
 
 Usage:
     tenant_store = TenantVectorStore(organization_id=org_id)
@@ -31,6 +33,7 @@ from typing import TYPE_CHECKING, Any
 from sqlalchemy import func, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config.settings import get_settings
 from app.core.interfaces.vector_store import (
     Document,
     IHybridSearch,
@@ -44,12 +47,32 @@ from app.database.async_db import get_async_db_context
 from app.models.db.tenancy import TenantDocument
 
 from .context import get_tenant_context
+from .vector_index_manager import TenantIndexManager, knn_predicate, set_ef_search
 
 if TYPE_CHECKING:
     pass
 
 logger = logging.getLogger(__name__)
 
+# Fuses the vector_hits / text_hits rankings with weighted Reciprocal Rank
+# Fusion. row_number() is bigint, so the weights and k are cast explicitly:
+# otherwise Postgres types the quotient as bigint and every score truncates to 0.
+RRF_FUSED_CTE = """
+    fused AS (
+        SELECT
+            COALESCE(v.id, t.id) AS id,
+            COALESCE(CAST(:vector_weight AS double precision) / (CAST(:rrf_k AS double precision) + v.rank), 0)
+              + COALESCE(CAST(:keyword_weight AS double precision) / (CAST(:rrf_k AS double precision) + t.rank), 0)
+              AS rrf_score,
+            v.vector_score,
+            t.text_score
+        FROM vector_hits v
+        FULL OUTER JOIN text_hits t ON v.id = t.id
+        ORDER BY rrf_score DESC
+        LIMIT :limit
+    )
+"""
+
 
 class TenantVectorStore(IVectorStore, IHybridSearch):
     """
@@ -97,6 +120,11 @@ class TenantVectorStore(IVectorStore, IHybridSearch):
         self._custom_similarity_threshold = similarity_threshold
         self._custom_max_results = max_results
 
+        settings = get_settings()
+        self._ef_search = settings.RAG_HNSW_EF_SEARCH
+        self._hybrid_candidates = settings.RAG_HYBRID_CANDIDATES
+        self._rrf_k = settings.RAG_HYBRID_RRF_K
+
         logger.info(
             f"Initialized TenantVectorStore: org_id={organization_id}, "
             f"dimension={embedding_dimension}"
@@ -296,9 +324,13 @@ class TenantVectorStore(IVectorStore, IHybridSearch):
                 # Build vector string for pgvector
                 vector_str = "[" + ",".join(str(x) for x in embedding) + "]"
 
-                # Base query with tenant filter
+                # Base query with tenant filter (literal org id matches the partial HNSW index)
                 # Note: Use CAST() instead of :: to avoid asyncpg parameter confusion
-                base_query = """
+                params: dict[str, Any] = {
+                    "query_vector": vector_str,
+                    "limit": top_k,
+                }
+                base_query = f"""
                     SELECT
                         id,
                         title,
@@ -309,56 +341,17 @@ class TenantVectorStore(IVectorStore, IHybridSearch):
                         meta_data,
                         1 - (embedding <=> CAST(:query_vector AS vector)) as similarity
                     FROM tenant_documents
-                    WHERE organization_id = :org_id
-                      AND active = true
-                      AND embedding IS NOT NULL
-                """
-
-                params: dict[str, Any] = {
-                    "query_vector": vector_str,
-                    "org_id": str(org_id),
-                }
-
-                # Add filters
-                if "document_type" in filter_metadata:
-                    base_query += " AND document_type = :doc_type"
-                    params["doc_type"] = filter_metadata["document_type"]
-
-                if "category" in filter_metadata:
-                    base_query += " AND category = :category"
-                    params["category"] = filter_metadata["category"]
-
-                if "tags" in filter_metadata:
-                    # Array overlap check
-                    base_query += " AND tags && :tags"
-                    params["tags"] = filter_metadata["tags"]
-
-                # Order and limit
-                base_query += """
-                    ORDER BY similarity DESC
+                    WHERE {knn_predicate(org_id)}
+                      {self._filter_clause(filter_metadata, params)}
+                    ORDER BY embedding <=> CAST(:query_vector AS vector)
                     LIMIT :limit
                 """
-                params["limit"] = top_k
 
+                await set_ef_search(db, max(self._ef_search, top_k))
                 result = await db.execute(text(base_query), params)
                 rows = result.fetchall()
 
-                results = []
-                for row in rows:
-                    results.append(
-                        VectorSearchResult(
-                            id=str(row.id),
-                            content=row.content,
-                            score=float(row.similarity),
-                            metadata={
-                                "title": row.title,
-                                "document_type": row.document_type,
-                                "category": row.category,
-                                "tags": row.tags or [],
-                                **(row.meta_data or {}),
-                            },
-                        )
-                    )
+                results = [self._to_result(row, float(row.similarity)) for row in rows]
 
                 return results
 
@@ -377,6 +370,15 @@ class TenantVectorStore(IVectorStore, IHybridSearch):
         """
         Hybrid search combining vector similarity and full-text search.
 
+        Retrieves the top candidates of each method separately (vector KNN
+        through the tenant's HNSW index, full-text through the GIN index)
+        and fuses both rankings with weighted Reciprocal Rank Fusion:
+
+            score(d) = vector_weight / (k + rank_vector(d))
+                     + keyword_weight / (k + rank_text(d))
+
+        Scores are normalized to 0-1 by the best possible score.
+
         Args:
             query: Search query text.
             top_k: Maximum results.
@@ -389,83 +391,90 @@ class TenantVectorStore(IVectorStore, IHybridSearch):
         """
         org_id = self.organization_id
         filter_metadata = filter_metadata or {}
+        candidates = max(self._hybrid_candidates, top_k)
 
         try:
             query_embedding = await self._get_embedding(query)
             vector_str = "[" + ",".join(str(x) for x in query_embedding) + "]"
 
             async with get_async_db_context() as db:
-                # Hybrid query combining vector and text search
+                params: dict[str, Any] = {
+                    "query_vector": vector_str,
+                    "query": query,
+                    "vector_weight": vector_weight,
+                    "keyword_weight": keyword_weight,
+                    "rrf_k": self._rrf_k,
+                    "candidates": candidates,
+                    "limit": top_k,
+                }
+                filters = self._filter_clause(filter_metadata, params)
+
+                # Each CTE is an independent top-K retrieval; the vector one
+                # orders by the distance operator so the HNSW index is used.
                 # Note: Use CAST() instead of :: to avoid asyncpg parameter confusion
-                hybrid_query = """
-                    WITH vector_results AS (
+                hybrid_query = f"""
+                    WITH vector_hits AS MATERIALIZED (
                         SELECT
                             id,
-                            title,
-                            content,
-                            document_type,
-                            category,
-                            tags,
-                            meta_data,
-                            1 - (embedding <=> CAST(:query_vector AS vector)) as vector_score
-                        FROM tenant_documents
-                        WHERE organization_id = :org_id
-                          AND active = true
-                          AND embedding IS NOT NULL
+                            row_number() OVER (ORDER BY distance) AS rank,
+                            1 - distance AS vector_score
+                        FROM (
+                            SELECT id, embedding <=> CAST(:query_vector AS vector) AS distance
+                            FROM tenant_documents
+                            WHERE {knn_predicate(org_id)}
+                              {filters}
+                            ORDER BY embedding <=> CAST(:query_vector AS vector)
+                            LIMIT :candidates
+                        ) knn
                     ),
-                    text_results AS (
+                    text_hits AS MATERIALIZED (
                         SELECT
                             id,
-                            ts_rank(search_vector, plainto_tsquery('spanish', :query)) as text_score
-                        FROM tenant_documents
-                        WHERE organization_id = :org_id
-                          AND active = true
-                          AND search_vector @@ plainto_tsquery('spanish', :query)
-                    )
+                            row_number() OVER (ORDER BY text_score DESC) AS rank,
+                            text_score
+                        FROM (
+                            SELECT id, ts_rank(search_vector, plainto_tsquery('spanish', :query)) AS text_score
+                            FROM tenant_documents
+                            WHERE organization_id = CAST(:org_id AS uuid)
+                              AND active = true
+                              AND search_vector @@ plainto_tsquery('spanish', :query)
+                              {filters}
+                            ORDER BY text_score DESC
+                            LIMIT :candidates
+                        ) fts
+                    ),
+                    {RRF_FUSED_CTE}
                     SELECT
-                        v.id,
-                        v.title,
-                        v.content,
-                        v.document_type,
-                        v.category,
-                        v.tags,
-                        v.meta_data,
-                        (v.vector_score * :vector_weight +
-                         COALESCE(t.text_score, 0) * :keyword_weight) as combined_score
-                    FROM vector_results v
-                    LEFT JOIN text_results t ON v.id = t.id
-                    ORDER BY combined_score DESC
-                    LIMIT :limit
+                        d.id,
+                        d.title,
+                        d.content,
+                        d.document_type,
+                        d.category,
+                        d.tags,
+                        d.meta_data,
+                        f.rrf_score,
+                        f.vector_score,
+                        f.text_score
+                    FROM fused f
+                    JOIN tenant_documents d ON d.id = f.id
+                    ORDER BY f.rrf_score DESC
                 """
+                params["org_id"] = str(org_id)
 
-                params = {
-                    "query_vector": vector_str,
-                    "org_id": str(org_id),
-                    "query": query,
-                    "vector_weight": vector_weight,
-                    "keyword_weight": keyword_weight,
-                    "limit": top_k,
-                }
-
+                await set_ef_search(db, max(self._ef_search, candidates))
                 result = await db.execute(text(hybrid_query), params)
                 rows = result.fetchall()
 
-                results = []
-                for row in rows:
-                    results.append(
-                        VectorSearchResult(
-                            id=str(row.id),
-                            content=row.content,
-                            score=float(row.combined_score),
-                            metadata={
-                                "title": row.title,
-                                "document_type": row.document_type,
-                                "category": row.category,
-                                "tags": row.tags or [],
-                                **(row.meta_data or {}),
-                            },
-                        )
+                max_score = (vector_weight + keyword_weight) / (self._rrf_k + 1) or 1.0
+                results = [
+                    self._to_result(
+                        row,
+                        float(row.rrf_score) / max_score,
+                        vector_score=float(row.vector_score) if row.vector_score is not None else None,
+                        text_score=float(row.text_score) if row.text_score is not None else None,
                     )
+                    for row in rows
+                ]
 
                 logger.info(
                     f"Tenant hybrid search: org={org_id}, query='{query[:30]}...', "
@@ -479,6 +488,43 @@ class TenantVectorStore(IVectorStore, IHybridSearch):
             # Fall back to vector-only search
             return await self.search(query, top_k, filter_metadata)
 
+    @staticmethod
+    def _to_result(row: Any, score: float, **extra_metadata: Any) -> VectorSearchResult:
+        """Build a search result from a tenant_documents row."""
+        document = Document(
+            id=str(row.id),
+            content=row.content,
+            metadata={
+                "title": row.title,
+                "document_type": row.document_type,
+                "category": row.category,
+                "tags": row.tags or [],
+                **(row.meta_data or {}),
+                **extra_metadata,
+            },
+            score=score,
+        )
+        return VectorSearchResult(document=document, score=score, distance=1.0 - score)
+
+    @staticmethod
+    def _filter_clause(filter_metadata: dict[str, Any], params: dict[str, Any]) -> str:
+        """Build extra WHERE conditions for metadata filters, adding their params."""
+        clause = ""
+        if "document_type" in filter_metadata:
+            clause += " AND document_type = :doc_type"
+            params["doc_type"] = filter_metadata["document_type"]
+
+        if "category" in filter_metadata:
+            clause += " AND category = :category"
+            params["category"] = filter_metadata["category"]
+
+        if "tags" in filter_metadata:
+            # Array overlap check
+            clause += " AND tags && :tags"
+            params["tags"] = filter_metadata["tags"]
+
+        return clause
+
     async def get_by_id(self, document_id: str) -> Document | None:
         """Get document by ID (tenant-scoped)."""
         org_id = self.organization_id
@@ -597,28 +643,12 @@ class TenantVectorStore(IVectorStore, IHybridSearch):
         Create partial HNSW index for this tenant.
 
         Creates a partial index on tenant_documents for this organization
-        to improve search performance.
+        to improve search performance (see TenantIndexManager).
         """
         org_id = self.organization_id
 
         try:
-            async with get_async_db_context() as db:
-                # Create partial HNSW index for this tenant
-                index_name = f"idx_tenant_docs_hnsw_{org_id.hex[:8]}"
-
-                index_query = text(f"""
-                    CREATE INDEX IF NOT EXISTS {index_name}
-                    ON tenant_documents
-                    USING hnsw (embedding vector_cosine_ops)
-                    WHERE organization_id = :org_id
-                """)
-
-                await db.execute(index_query, {"org_id": str(org_id)})
-                await db.commit()
-
-                logger.info(f"Created HNSW index {index_name} for tenant {org_id}")
-                return True
-
+            return await TenantIndexManager().ensure_index(org_id, force=True)
         except Exception as e:
             logger.error(f"Error creating tenant index: {e}")
             return False
@@ -16,6 +16,7 @@ from app.domains.ecommerce.infrastructure.services import (
     DuxSyncService,
     create_dux_rag_sync_service,
 )
+from app.integrations.llm.gateway import LLMPriority, llm_priority
 from app.models.db import Product
 
 logger = logging.getLogger(__name__)
@@ -169,8 +170,9 @@ class ScheduledSyncService:
             self._sync_progress["start_time"] = datetime.now()
             self._sync_progress["error_message"] = None
 
-            # Crear y ejecutar task de sincronización
-            self._current_sync_task = asyncio.create_task(self._execute_sync())
+            # Crear y ejecutar task de sincronización (sus llamadas LLM van en clase BATCH)
+            with llm_priority(LLMPriority.BATCH):
+                self._current_sync_task = asyncio.create_task(self._execute_sync())
             await self._current_sync_task
 
             # Marcar como completado
@@ -9,6 +9,7 @@ from typing import Any
 
 from app.integrations.llm import VllmLLM
 from app.integrations.llm.model_provider import ModelComplexity
+from app.integrations.llm.streaming import astream_response
 from app.prompts.manager import PromptManager
 from app.prompts.registry import PromptRegistry
 
@@ -19,6 +20,9 @@ logger = logging.getLogger(__name__)
 # Temperature for response generation
 RESPONSE_TEMPERATURE = 0.6
 
+# Agent name attached to streamed token deltas
+STREAM_AGENT_NAME = "excelencia_support_agent"
+
 
 class SupportResponseGenerator:
     """Generates support responses using RAG and LLM."""
@@ -79,10 +83,7 @@ class SupportResponseGenerator:
                 complexity=ModelComplexity.COMPLEX,
                 temperature=RESPONSE_TEMPERATURE,
             )
-            response = await llm.ainvoke(prompt)
-
-            content = self._extract_content(response)
-            return VllmLLM.clean_deepseek_response(content)
+            return await astream_response(llm, prompt, agent=STREAM_AGENT_NAME)
 
         except Exception as e:
             logger.error(f"Error generating response: {e}")
@@ -137,18 +138,6 @@ class SupportResponseGenerator:
 
         return ""
 
-    def _extract_content(self, response: Any) -> str:
-        """Extract content from LLM response."""
-        if hasattr(response, "content"):
-            content = response.content
-            if isinstance(content, str):
-                return content.strip()
-            elif isinstance(content, list):
-                return " ".join(str(item) for item in content).strip()
-            else:
-                return str(content).strip()
-        return str(response).strip()
-
     async def generate_fallback(self, query_type: str, module: str | None = None) -> str:
         """Generate fallback response using prompts or hardcoded fallback."""
         try:
@@ -4,6 +4,7 @@ from .graph import (
     MedicalAppointmentsGraph,
     NodeType,
 )
+from .graph_pool import MedicalGraphPool
 from .medical_appointments_agent import MedicalAppointmentsAgent
 from .workflow_engine import ConfigurableWorkflowEngine, DefaultWorkflowEngine
 
@@ -14,6 +15,7 @@ __all__ = [
     "MedicalAppointmentsGraph",
     "ConfigurableMedicalAppointmentsGraph",
     "NodeType",
+    "MedicalGraphPool",
     # Workflow Engine
     "ConfigurableWorkflowEngine",
     "DefaultWorkflowEngine",
@@ -0,0 +1,215 @@
+"""Compiled graph pool for MedicalAppointmentsAgent.
+
+Keeps compiled MedicalAppointmentsGraph instances keyed by institution and
+configuration version, so alternating between institutions costs a dict
+lookup instead of a graph build and compile per message.
+
+- Bounded LRU: at most `max_size` graphs; the least recently used one is
+  evicted when a new graph is added
+- Lazy, concurrent-safe construction: concurrent requests for a missing key
+  share a single build; a failed build is retried by the next request
+- Leases: graphs are used through `lease()`. An evicted graph is closed
+  (SOAP client, notification service) when its last lease ends, never
+  while an invocation is still using it
+
+Usage:
+    pool = MedicalGraphPool(max_size=8)
+    async with pool.lease(institution_config) as graph:
+        result = await graph.invoke(state)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any
+
+from .graph import MedicalAppointmentsGraph
+
+logger = logging.getLogger(__name__)
+
+GraphFactory = Callable[[dict[str, Any]], Awaitable[MedicalAppointmentsGraph]]
+EvictionHook = Callable[[MedicalAppointmentsGraph], Awaitable[None]]
+
+DEFAULT_POOL_SIZE = 8
+
+
+def config_version(config: dict[str, Any]) -> str:
+    """Stable short hash of a normalized institution config.
+
+    Any change in the config (URL, timezone, custom settings) yields a new
+    version, so the graph built from the old config is no longer used.
+    """
+    payload = json.dumps(config, sort_keys=True, default=str)
+    return hashlib.md5(payload.encode("utf-8")).hexdigest()[:12]
+
+
+async def build_graph(config: dict[str, Any]) -> MedicalAppointmentsGraph:
+    """Default factory: build and compile the graph for an institution."""
+    graph = MedicalAppointmentsGraph(config=config)
+    graph.initialize()
+    return graph
+
+
+async def close_graph(graph: MedicalAppointmentsGraph) -> None:
+    """Default eviction hook: release the graph's clients."""
+    await graph.close()
+
+
+@dataclass
+class _PooledGraph:
+    """A pooled graph and its lease count."""
+
+    graph: MedicalAppointmentsGraph
+    institution: str
+    leases: int = 0
+    evicted: bool = False
+
+
+class MedicalGraphPool:
+    """Bounded LRU pool of compiled graphs keyed by (institution, config version)."""
+
+    def __init__(
+        self,
+        max_size: int = DEFAULT_POOL_SIZE,
+        factory: GraphFactory = build_graph,
+        on_evict: EvictionHook = close_graph,
+    ):
+        """Initialize the pool.
+
+        Args:
+            max_size: Max graphs kept (minimum 1).
+            factory: Async builder of a compiled graph from an institution config.
+            on_evict: Async hook releasing an evicted graph's resources.
+        """
+        self.max_size = max(1, max_size)
+        self._factory = factory
+        self._on_evict = on_evict
+        self._entries: OrderedDict[tuple[str, str], _PooledGraph] = OrderedDict()
+        self._building: dict[tuple[str, str], asyncio.Future[None]] = {}
+        self._stats = {"hits": 0, "builds": 0, "build_errors": 0, "evictions": 0}
+
+    @staticmethod
+    def key_for(config: dict[str, Any]) -> tuple[str, str]:
+        """Pool key of an institution config."""
+        return str(config.get("institution", "")), config_version(config)
+
+    @asynccontextmanager
+    async def lease(self, config: dict[str, Any]) -> AsyncIterator[MedicalAppointmentsGraph]:
+        """Use the compiled graph of an institution config, building it if needed.
+
+        Args:
+            config: Normalized institution config (must contain "institution").
+
+        Yields:
+            Compiled MedicalAppointmentsGraph.
+        """
+        entry = await self._acquire(self.key_for(config), config)
+        try:
+            yield entry.graph
+        finally:
+            entry.leases -= 1
+            if entry.evicted and entry.leases == 0:
+                await self._close(entry)
+
+    async def _acquire(self, key: tuple[str, str], config: dict[str, Any]) -> _PooledGraph:
+        """Get a leased entry, waiting for or starting its build."""
+        while True:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                entry.leases += 1
+                self._stats["hits"] += 1
+                return entry
+
+            building = self._building.get(key)
+            if building is None:
+                return await self._build(key, config)
+            # Another request is building this graph: wait and look again
+            await asyncio.shield(building)
+
+    async def _build(self, key: tuple[str, str], config: dict[str, Any]) -> _PooledGraph:
+        """Build a graph, add it to the pool and lease it."""
+        building: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._building[key] = building
+        try:
+            graph = await self._factory(config)
+        except BaseException as e:
+            del self._building[key]
+            self._stats["build_errors"] += 1
+            if isinstance(e, Exception):
+                building.set_exception(e)
+                # Waiters re-raise it; avoid "exception never retrieved" without waiters
+                building.exception()
+            else:
+                building.cancel()
+            raise
+
+        entry = _PooledGraph(graph=graph, institution=key[0], leases=1)
+        self._entries[key] = entry
+        del self._building[key]
+        building.set_result(None)
+        self._stats["builds"] += 1
+        logger.debug(f"Compiled medical appointments graph for {key[0]} (version {key[1]})")
+
+        await self._evict_overflow()
+        return entry
+
+    async def _evict_overflow(self) -> None:
+        """Evict least recently used graphs beyond max_size."""
+        while len(self._entries) > self.max_size:
+            _, entry = self._entries.popitem(last=False)
+            await self._evict(entry)
+
+    async def _evict(self, entry: _PooledGraph) -> None:
+        """Remove an entry; close it now if unused, else when its last lease ends."""
+        entry.evicted = True
+        self._stats["evictions"] += 1
+        if entry.leases == 0:
+            await self._close(entry)
+
+    async def _close(self, entry: _PooledGraph) -> None:
+        """Run the eviction hook, never raising."""
+        try:
+            await self._on_evict(entry.graph)
+        except Exception as e:
+            logger.warning(f"Error closing medical appointments graph for {entry.institution}: {e}")
+
+    async def invalidate(self, institution: str | None = None) -> int:
+        """Evict the graphs of an institution, or all graphs.
+
+        Args:
+            institution: Institution key (None for all).
+
+        Returns:
+            Number of graphs evicted.
+        """
+        keys = [key for key in self._entries if institution is None or key[0] == institution]
+        evicted = 0
+        for key in keys:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                await self._evict(entry)
+                evicted += 1
+        return evicted
+
+    async def close(self) -> None:
+        """Evict and close every graph."""
+        await self.invalidate()
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get pool statistics."""
+        return {
+            **self._stats,
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "building": len(self._building),
+            "leased": sum(entry.leases for entry in self._entries.values()),
+            "institutions": sorted({key[0] for key in self._entries}),
+        }
@@ -19,7 +19,7 @@ from langchain_core.messages import HumanMessage
 
 from app.core.agents.base_agent import BaseAgent
 
-from .graph import MedicalAppointmentsGraph
+from .graph_pool import DEFAULT_POOL_SIZE, MedicalGraphPool
 from .state import get_initial_state
 
 if TYPE_CHECKING:
@@ -60,6 +60,7 @@ class MedicalAppointmentsAgent(BaseAgent):
                 - connection_type: "soap" or "rest"
                 - timeout_seconds: Request timeout
                 - timezone: Timezone for scheduling
+                - graph_pool_size: Max compiled graphs kept (one per institution/config)
             **integrations: Additional integrations (vLLM, postgres, etc.).
 
         NOTE: If config is not provided, institution_config MUST be injected
@@ -67,7 +68,10 @@ class MedicalAppointmentsAgent(BaseAgent):
         """
         super().__init__(name=name, config=config or {}, **integrations)
 
-        self._graph: MedicalAppointmentsGraph | None = None
+        # Compiled graphs per institution and config version (LRU)
+        self._graph_pool = MedicalGraphPool(
+            max_size=self.config.get("graph_pool_size", DEFAULT_POOL_SIZE),
+        )
         self._cached_db_config: "InstitutionConfig | None" = None
 
         # Check if constructor config was provided (from container)
@@ -235,45 +239,6 @@ class MedicalAppointmentsAgent(BaseAgent):
         self.logger.info(f"Loaded DB config for institution: {self._cached_db_config.institution_key}")
         return self._cached_db_config
 
-    async def _ensure_graph_initialized(
-        self,
-        institution_config: dict[str, Any],
-    ) -> MedicalAppointmentsGraph:
-        """Lazy initialization of the LangGraph.
-
-        Args:
-            institution_config: Configuration dict from _get_institution_config.
-                               This is REQUIRED - no defaults.
-
-        Returns:
-            Initialized MedicalAppointmentsGraph.
-
-        Raises:
-            ValueError: If institution_config is not provided.
-        """
-        if not institution_config:
-            raise ValueError(
-                "institution_config is required for graph initialization. " "Call _get_institution_config first."
-            )
-
-        # Reinitialize if config changed
-        if self._graph is not None:
-            current_institution = getattr(self._graph, "_institution", None)
-            if current_institution != institution_config.get("institution"):
-                new_institution = institution_config.get("institution")
-                self.logger.debug(
-                    f"Institution changed from {current_institution} to {new_institution}, " "reinitializing graph"
-                )
-                await self._graph.close()
-                self._graph = None
-
-        if self._graph is None:
-            self._graph = MedicalAppointmentsGraph(config=institution_config)
-            self._graph.initialize()
-            self.logger.debug(f"MedicalAppointmentsGraph initialized for {institution_config.get('institution')}")
-
-        return self._graph
-
     async def _process_internal(self, message: str, state_dict: dict[str, Any]) -> dict[str, Any]:
         """Process message through the appointment graph.
 
@@ -287,14 +252,12 @@ class MedicalAppointmentsAgent(BaseAgent):
         # Get institution config (from state, cached DB, or defaults)
         institution_config = self._get_institution_config(state_dict)
 
-        # Initialize graph with config
-        graph = await self._ensure_graph_initialized(institution_config)
-
         # Merge existing state with new message
         graph_state = self._prepare_graph_state(message, state_dict, institution_config)
 
-        # Invoke graph
-        result = await graph.invoke(graph_state)
+        # Invoke the institution's compiled graph (built on first use)
+        async with self._graph_pool.lease(institution_config) as graph:
+            result = await graph.invoke(graph_state)
 
         # Format response for agent framework
         return self._format_response(result, institution_config)
@@ -462,10 +425,8 @@ class MedicalAppointmentsAgent(BaseAgent):
 
     async def cleanup(self) -> None:
         """Cleanup resources."""
-        if self._graph:
-            await self._graph.close()
-            self._graph = None
-            self.logger.debug("MedicalAppointmentsAgent cleaned up")
+        await self._graph_pool.close()
+        self.logger.debug("MedicalAppointmentsAgent cleaned up")
 
     def __repr__(self) -> str:
         cached_inst = self._cached_db_config.institution_key if self._cached_db_config else "none"
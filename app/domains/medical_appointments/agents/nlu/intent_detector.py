@@ -39,6 +39,7 @@ from typing import TYPE_CHECKING, Any
 
 import yaml
 
+from app.core.cache.semantic_classification_cache import context_fingerprint, semantic_classification_cache
 from app.integrations.llm import ModelComplexity, get_llm_for_task
 from app.utils import extract_json_from_text
 
@@ -78,6 +79,10 @@ CONFIDENCE_LLM_HIGH = 0.90
 CONFIDENCE_LLM_MEDIUM = 0.75
 CONFIDENCE_THRESHOLD = 0.65
 
+SEMANTIC_CACHE_ANALYZER = "medical_intent"
+# Longer context strings (history, summaries) are left out of the fingerprint
+FINGERPRINT_MAX_STR_LENGTH = 64
+
 
 # =============================================================================
 # Data Classes
@@ -527,7 +532,30 @@ class MedicalIntentDetector:
         Returns:
             MedicalIntentResult from LLM analysis.
         """
+        fingerprint = context_fingerprint(
+            **{
+                key: value
+                for key, value in context.items()
+                if value is None
+                or isinstance(value, bool | int | float)
+                or (isinstance(value, str) and len(value) <= FINGERPRINT_MAX_STR_LENGTH)
+            }
+        )
+        org_id = context.get("organization_id")
         try:
+            cached = await semantic_classification_cache.get(
+                SEMANTIC_CACHE_ANALYZER, message, tenant=org_id, fingerprint=fingerprint
+            )
+            if cached is not None:
+                # Entities belong to the cached message; keep the pattern ones
+                return MedicalIntentResult(
+                    intent=cached.value["intent"],
+                    confidence=cached.confidence,
+                    method="llm",
+                    entities=dict(pattern_result.entities),
+                    analysis={"semantic_cache_similarity": cached.similarity},
+                )
+
             await self._ensure_template_loaded()
             prompt = self._build_llm_prompt(message, context)
 
@@ -542,7 +570,17 @@ class MedicalIntentDetector:
                 else str(response.content)
             )
 
-            return self._parse_llm_response(response_text, pattern_result)
+            result = self._parse_llm_response(response_text, pattern_result)
+            if result.method == "llm" and result.intent != "unknown":
+                await semantic_classification_cache.set(
+                    SEMANTIC_CACHE_ANALYZER,
+                    message,
+                    {"intent": result.intent},
+                    result.confidence,
+                    tenant=org_id,
+                    fingerprint=fingerprint,
+                )
+            return result
 
         except Exception as e:
             logger.error(f"LLM intent detection failed: {e}", exc_info=True)
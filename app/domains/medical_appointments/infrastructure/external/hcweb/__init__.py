@@ -11,6 +11,7 @@ Components:
 - SoapRequestBuilder: Builds SOAP XML envelopes
 - SoapResponseParser: Parses SOAP XML responses
 - MethodRegistry: Extensible method configuration (OCP)
+- HCWebCatalog: Per-institution cache of catalog and availability responses
 
 Usage:
     from app.domains.medical_appointments.infrastructure.external.hcweb import (
@@ -34,6 +35,7 @@ OCP Extension:
     registry.register("nuevo_metodo", "NuevoMetodoSOAP", ["param1"])
 """
 
+from .catalog import CatalogCacheConfig, HCWebCatalog, get_hcweb_catalog
 from .client import HCWebSOAPClient
 from .method_registry import MethodConfig, MethodRegistry, get_default_registry
 from .response_parser import SoapResponseParser
@@ -41,6 +43,9 @@ from .soap_builder import SoapRequestBuilder
 
 __all__ = [
     "HCWebSOAPClient",
+    "HCWebCatalog",
+    "CatalogCacheConfig",
+    "get_hcweb_catalog",
     "SoapRequestBuilder",
     "SoapResponseParser",
     "MethodRegistry",
@@ -0,0 +1,364 @@
+# ============================================================================
+# SCOPE: INFRASTRUCTURE LAYER (Medical Appointments)
+# Description: Per-institution cache of HCWeb catalog and availability data.
+# ============================================================================
+"""HCWeb Catalog Cache.
+
+Keeps HCWeb responses that do not change on every conversation step, per
+institution, so the appointment flow only calls SOAP for dynamic data.
+
+- Catalog (specialties, providers, institution info): long TTL
+- Availability (days, hours, next slot): short TTL, refreshed ahead of
+  expiry by a background prefetch while users keep asking for it
+- Bookings, cancellations and reschedules invalidate availability
+- Identical concurrent lookups share one SOAP call; only successful
+  responses are cached
+
+Usage:
+    catalog = get_hcweb_catalog(base_url, institution_id)
+    response = await catalog.get("obtener_prestadores", client._call, idEspecialidad="12")
+"""
+
+import asyncio
+import copy
+import functools
+import logging
+import time
+import weakref
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
+
+from ....application.ports import ExternalResponse
+
+logger = logging.getLogger(__name__)
+
+Fetcher = Callable[..., Awaitable[ExternalResponse]]
+
+CATALOG = "catalog"
+AVAILABILITY = "availability"
+
+# Registered method names cached by kind
+CACHED_METHODS: dict[str, str] = {
+    "obtener_especialidades": CATALOG,
+    "obtener_especialidades_bot": CATALOG,
+    "obtener_prestadores": CATALOG,
+    "obtener_especialidades_con_prestadores": CATALOG,
+    "obtener_informacion_institucion": CATALOG,
+    "obtener_dias_disponibles": AVAILABILITY,
+    "obtener_horarios_disponibles": AVAILABILITY,
+    "get_proximo_turno_disponible": AVAILABILITY,
+    "get_proximo_turno_disponible_especialidad": AVAILABILITY,
+    "get_fechas_disponibles_prestador": AVAILABILITY,
+}
+
+
+@dataclass
+class CatalogCacheConfig:
+    """Configuration for the catalog cache.
+
+    Attributes:
+        catalog_ttl: Seconds specialties and providers are reused.
+        availability_ttl: Seconds availability is reused.
+        prefetch_interval: Seconds between availability prefetch rounds.
+        hot_window: Availability asked for within this many seconds is prefetched.
+        max_entries: Max cached responses per institution.
+    """
+
+    catalog_ttl: float = 3600.0
+    availability_ttl: float = 120.0
+    prefetch_interval: float = 30.0
+    hot_window: float = 600.0
+    max_entries: int = 2048
+
+
+@dataclass
+class _CatalogEntry:
+    """A cached response and the call that produced it."""
+
+    method_name: str
+    params: dict[str, Any]
+    kind: str
+    response: ExternalResponse
+    expires_at: float
+    last_access: float
+
+
+class HCWebCatalog:
+    """TTL cache of catalog and availability responses for one institution.
+
+    SOAP clients of the institution attach their fetcher (the bound `_call`
+    method, held weakly); the background prefetch uses an attached fetcher
+    and stops when none is left.
+    """
+
+    def __init__(self, institution_key: str, config: CatalogCacheConfig | None = None) -> None:
+        """Initialize the catalog.
+
+        Args:
+            institution_key: Institution identity (SOAP URL and institution ID).
+            config: Optional configuration. Uses defaults if not provided.
+        """
+        self.institution_key = institution_key
+        self.config = config or CatalogCacheConfig()
+        self._entries: dict[tuple[Any, ...], _CatalogEntry] = {}
+        self._inflight: dict[tuple[Any, ...], asyncio.Task[ExternalResponse]] = {}
+        # Bumped on invalidation, so availability fetched before is not cached
+        self._availability_generation = 0
+        self._fetchers: list[weakref.WeakMethod] = []
+        self._prefetch_task: asyncio.Task[None] | None = None
+        self._stats = {"hits": 0, "misses": 0, "coalesced": 0, "prefetched": 0, "invalidations": 0}
+
+    @staticmethod
+    def kind_of(method_name: str) -> str | None:
+        """Cache kind of a registered method (None if not cached)."""
+        return CACHED_METHODS.get(method_name)
+
+    async def get(self, method_name: str, fetch: Fetcher, **params: Any) -> ExternalResponse:
+        """Get a cached response, calling `fetch(method_name, **params)` on a miss.
+
+        Args:
+            method_name: Registered method name.
+            fetch: Uncached SOAP call.
+            **params: Method parameters.
+
+        Returns:
+            ExternalResponse (a copy; callers may modify it).
+        """
+        kind = self.kind_of(method_name)
+        if kind is None:
+            return await fetch(method_name, **params)
+
+        key = (method_name, tuple(sorted(params.items())))
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at > now:
+            entry.last_access = now
+            self._stats["hits"] += 1
+            return copy.deepcopy(entry.response)
+        self._stats["misses"] += 1
+
+        generation = self._availability_generation
+        response = await self._coalesce((*key, generation), lambda: fetch(method_name, **params))
+        if response.success and (kind == CATALOG or generation == self._availability_generation):
+            self._store(key, method_name, params, kind, response)
+            if kind == AVAILABILITY:
+                self._ensure_prefetch()
+        return copy.deepcopy(response)
+
+    def invalidate_availability(self, provider_id: str | None = None) -> int:
+        """Drop availability after a booking change.
+
+        Args:
+            provider_id: Provider whose agenda changed (None for all providers).
+                Specialty-level availability is always dropped.
+
+        Returns:
+            Number of entries dropped.
+        """
+        self._availability_generation += 1
+        self._stats["invalidations"] += 1
+        keys = [
+            key
+            for key, entry in self._entries.items()
+            if entry.kind == AVAILABILITY
+            and (provider_id is None or entry.params.get("idPrestador") in (None, provider_id))
+        ]
+        for key in keys:
+            del self._entries[key]
+        return len(keys)
+
+    def invalidate(self) -> None:
+        """Drop every cached response of the institution."""
+        self._availability_generation += 1
+        self._stats["invalidations"] += 1
+        self._entries.clear()
+
+    # =========================================================================
+    # Background prefetch
+    # =========================================================================
+
+    def attach(self, fetch: Fetcher) -> None:
+        """Register a SOAP client's bound fetcher for background prefetch."""
+        if fetch not in self._live_fetchers():
+            self._fetchers.append(weakref.WeakMethod(fetch))
+
+    def detach(self, fetch: Fetcher) -> None:
+        """Unregister a fetcher; prefetch stops when none is left."""
+        self._fetchers = [ref for ref in self._fetchers if ref() not in (None, fetch)]
+        if not self._fetchers and self._prefetch_task is not None:
+            self._prefetch_task.cancel()
+            self._prefetch_task = None
+
+    def _live_fetchers(self) -> list[Fetcher]:
+        """Attached fetchers whose client still exists."""
+        self._fetchers = [ref for ref in self._fetchers if ref() is not None]
+        return [fetch for ref in self._fetchers if (fetch := ref()) is not None]
+
+    async def prefetch(self) -> int:
+        """Refresh hot availability entries that expire before the next round.
+
+        Entries nobody asked for within `hot_window` are left to expire.
+
+        Returns:
+            Number of entries refreshed.
+        """
+        if not self._live_fetchers():
+            return 0
+
+        now = time.monotonic()
+        due = [
+            (key, entry)
+            for key, entry in self._entries.items()
+            if entry.kind == AVAILABILITY
+            and now - entry.last_access <= self.config.hot_window
+            and entry.expires_at - now <= self.config.prefetch_interval
+        ]
+
+        refreshed = 0
+        for key, entry in due:
+            fetchers = self._live_fetchers()
+            if not fetchers:
+                break
+            fetch = fetchers[-1]
+            generation = self._availability_generation
+            refresh = functools.partial(fetch, entry.method_name, **entry.params)
+            response = await self._coalesce((*key, generation), refresh)
+            if response.success and generation == self._availability_generation and key in self._entries:
+                entry.response = response
+                entry.expires_at = time.monotonic() + self.config.availability_ttl
+                refreshed += 1
+
+        self._stats["prefetched"] += refreshed
+        return refreshed
+
+    def _ensure_prefetch(self) -> None:
+        """Start the prefetch loop if a fetcher is attached."""
+        if self._live_fetchers() and (self._prefetch_task is None or self._prefetch_task.done()):
+            self._prefetch_task = asyncio.create_task(self._prefetch_loop())
+
+    async def _prefetch_loop(self) -> None:
+        """Run prefetch rounds while fetchers are attached."""
+        while self._live_fetchers():
+            await asyncio.sleep(self.config.prefetch_interval)
+            try:
+                refreshed = await self.prefetch()
+                if refreshed:
+                    logger.debug(f"Prefetched {refreshed} HCWeb availability entries for {self.institution_key}")
+            except Exception as e:
+                logger.warning(f"HCWeb availability prefetch failed for {self.institution_key}: {e}")
+
+    async def close(self) -> None:
+        """Stop the prefetch loop and drop cached responses."""
+        task, self._prefetch_task = self._prefetch_task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._entries.clear()
+
+    # =========================================================================
+    # Internals
+    # =========================================================================
+
+    async def _coalesce(
+        self,
+        key: tuple[Any, ...],
+        fetch: Callable[[], Awaitable[ExternalResponse]],
+    ) -> ExternalResponse:
+        """Share one in-flight SOAP call between identical lookups."""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fetch())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish_inflight(key, done))
+        else:
+            self._stats["coalesced"] += 1
+        return await asyncio.shield(task)
+
+    def _finish_inflight(self, key: tuple[Any, ...], task: asyncio.Task[ExternalResponse]) -> None:
+        """Forget a finished call, marking its error as retrieved."""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()
+
+    def _store(
+        self,
+        key: tuple[Any, ...],
+        method_name: str,
+        params: dict[str, Any],
+        kind: str,
+        response: ExternalResponse,
+    ) -> None:
+        """Cache a response, pruning expired and then least used entries when full."""
+        now = time.monotonic()
+        if len(self._entries) >= self.config.max_entries:
+            for expired in [k for k, entry in self._entries.items() if entry.expires_at <= now]:
+                del self._entries[expired]
+            while len(self._entries) >= self.config.max_entries:
+                oldest = min(self._entries, key=lambda k: self._entries[k].last_access)
+                del self._entries[oldest]
+
+        ttl = self.config.catalog_ttl if kind == CATALOG else self.config.availability_ttl
+        self._entries[key] = _CatalogEntry(
+            method_name=method_name,
+            params=dict(params),
+            kind=kind,
+            response=copy.deepcopy(response),
+            expires_at=now + ttl,
+            last_access=now,
+        )
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get catalog statistics."""
+        return {
+            **self._stats,
+            "institution": self.institution_key,
+            "catalog_entries": sum(1 for entry in self._entries.values() if entry.kind == CATALOG),
+            "availability_entries": sum(1 for entry in self._entries.values() if entry.kind == AVAILABILITY),
+            "in_flight": len(self._inflight),
+            "clients": len(self._live_fetchers()),
+            "prefetching": self._prefetch_task is not None and not self._prefetch_task.done(),
+        }
+
+
+# Catalogs keyed by "<soap url>|<institution id>"
+_catalogs: dict[str, HCWebCatalog] = {}
+
+
+def get_hcweb_catalog(
+    base_url: str,
+    institution_id: str,
+    config: CatalogCacheConfig | None = None,
+) -> HCWebCatalog:
+    """Get the shared catalog of an institution.
+
+    Args:
+        base_url: SOAP service URL.
+        institution_id: Institution ID in HCWeb.
+        config: Configuration used when the catalog is created.
+
+    Returns:
+        HCWebCatalog shared by all clients of the institution.
+    """
+    key = f"{base_url}|{institution_id}"
+    catalog = _catalogs.get(key)
+    if catalog is None:
+        catalog = _catalogs[key] = HCWebCatalog(key, config)
+    return catalog
+
+
+def get_hcweb_catalog_stats() -> list[dict[str, Any]]:
+    """Get statistics of all institution catalogs."""
+    return [catalog.get_stats() for catalog in _catalogs.values()]
+
+
+async def close_hcweb_catalogs() -> None:
+    """Stop prefetching and forget all catalogs."""
+    catalogs = list(_catalogs.values())
+    _catalogs.clear()
+    for catalog in catalogs:
+        await catalog.close()
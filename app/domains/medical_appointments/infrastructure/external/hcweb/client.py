@@ -12,6 +12,7 @@ Components:
 - SoapResponseParser: Parses SOAP responses
 - MethodRegistry: Extensible method configuration
 - CircuitBreaker: Resilience pattern for API failures
+- HCWebCatalog: Per-institution cache of catalog and availability responses
 """
 
 import logging
@@ -20,6 +21,7 @@ from typing import Any
 import httpx
 
 from ....application.ports import ExternalResponse, IMedicalSystemClient
+from .catalog import HCWebCatalog, get_hcweb_catalog
 from .method_registry import MethodRegistry, get_default_registry
 from .resilience import (
     CircuitBreaker,
@@ -53,6 +55,8 @@ class HCWebSOAPClient(IMedicalSystemClient):
         response_parser: SoapResponseParser | None = None,
         method_registry: MethodRegistry | None = None,
         circuit_breaker_config: CircuitBreakerConfig | None = None,
+        catalog: HCWebCatalog | None = None,
+        use_catalog: bool = True,
     ):
         """Initialize SOAP client.
 
@@ -64,6 +68,8 @@ class HCWebSOAPClient(IMedicalSystemClient):
             response_parser: Optional custom response parser.
             method_registry: Optional custom method registry.
             circuit_breaker_config: Optional circuit breaker configuration.
+            catalog: Optional catalog cache (defaults to the institution's shared one).
+            use_catalog: Set False to always call SOAP for catalog and availability.
         """
         self.base_url = base_url
         self.institution_id = institution_id
@@ -75,6 +81,10 @@ class HCWebSOAPClient(IMedicalSystemClient):
         self._circuit_breaker = CircuitBreaker(circuit_breaker_config)
         self._client: httpx.AsyncClient | None = None
 
+        if catalog is None and use_catalog:
+            catalog = get_hcweb_catalog(base_url, institution_id)
+        self._catalog = catalog
+
     async def _get_client(self) -> httpx.AsyncClient:
         """Get or create HTTP client."""
         if self._client is None or self._client.is_closed:
@@ -85,7 +95,9 @@ class HCWebSOAPClient(IMedicalSystemClient):
         return self._client
 
     async def close(self) -> None:
-        """Close HTTP client."""
+        """Close HTTP client and stop taking part in catalog prefetch."""
+        if self._catalog is not None:
+            self._catalog.detach(self._call)
         if self._client and not self._client.is_closed:
             await self._client.aclose()
             self._client = None
@@ -104,6 +116,27 @@ class HCWebSOAPClient(IMedicalSystemClient):
         params = config.build_params(self.institution_id, **kwargs)
         return await self._call_raw(config.soap_action, params)
 
+    async def _cached_call(self, method_name: str, **kwargs: Any) -> ExternalResponse:
+        """Call a registered SOAP method through the catalog cache.
+
+        Args:
+            method_name: Registered method name (catalog or availability).
+            **kwargs: Method parameters.
+
+        Returns:
+            ExternalResponse with result or error.
+        """
+        if self._catalog is None:
+            return await self._call(method_name, **kwargs)
+        # Clients that read the catalog keep its availability prefetched
+        self._catalog.attach(self._call)
+        return await self._catalog.get(method_name, self._call, **kwargs)
+
+    def _invalidate_availability(self, provider_id: str | None = None) -> None:
+        """Drop cached availability after a booking change."""
+        if self._catalog is not None:
+            self._catalog.invalidate_availability(provider_id)
+
     async def _call_raw(self, soap_action: str, params: dict[str, Any]) -> ExternalResponse:
         """Call SOAP method with raw parameters.
 
@@ -150,13 +183,18 @@ class HCWebSOAPClient(IMedicalSystemClient):
         envelope = self._builder.build_envelope(soap_action, params)
 
         try:
-            response = await client.post(
+            async with client.stream(
+                "POST",
                 self.base_url,
                 content=envelope,
                 headers={"SOAPAction": f"http://tempuri.org/{soap_action}"},
-            )
-            response.raise_for_status()
-            return self._parser.parse(response.text, soap_action)
+            ) as response:
+                response.raise_for_status()
+                # Parse while receiving; the rest of the body is only drained
+                parse = self._parser.start(soap_action)
+                async for chunk in response.aiter_bytes():
+                    parse.feed(chunk)
+                return parse.result()
 
         except httpx.HTTPStatusError as e:
             logger.error(f"HTTP error calling {soap_action}: {e.response.status_code}")
@@ -266,12 +304,15 @@ class HCWebSOAPClient(IMedicalSystemClient):
         fecha_hora: str,
     ) -> ExternalResponse:
         """Create new appointment."""
-        return await self._call(
-            "crear_turno",
-            idPaciente=id_paciente,
-            idPrestador=id_prestador,
-            fechaHora=fecha_hora,
-        )
+        try:
+            return await self._call(
+                "crear_turno",
+                idPaciente=id_paciente,
+                idPrestador=id_prestador,
+                fechaHora=fecha_hora,
+            )
+        finally:
+            self._invalidate_availability(id_prestador)
 
     async def confirmar_turno(self, id_turno: str) -> ExternalResponse:
         """Confirm appointment."""
@@ -279,7 +320,10 @@ class HCWebSOAPClient(IMedicalSystemClient):
 
     async def cancelar_turno(self, id_turno: str, motivo: str = "") -> ExternalResponse:
         """Cancel appointment."""
-        return await self._call("cancelar_turno", idTurno=id_turno, motivoAnulacion=motivo)
+        try:
+            return await self._call("cancelar_turno", idTurno=id_turno, motivoAnulacion=motivo)
+        finally:
+            self._invalidate_availability()
 
     async def reprogramar_turno(
         self,
@@ -288,12 +332,15 @@ class HCWebSOAPClient(IMedicalSystemClient):
         frecuencia: str = "",
     ) -> ExternalResponse:
         """Reschedule appointment."""
-        return await self._call(
-            "reprogramar_turno",
-            idTurno=id_turno,
-            fechaturno=fecha_hora,
-            frecuencia=frecuencia,
-        )
+        try:
+            return await self._call(
+                "reprogramar_turno",
+                idTurno=id_turno,
+                fechaturno=fecha_hora,
+                frecuencia=frecuencia,
+            )
+        finally:
+            self._invalidate_availability()
 
     async def obtener_turnos_paciente(self, id_paciente: str) -> ExternalResponse:
         """Get patient appointments."""
@@ -332,15 +379,18 @@ class HCWebSOAPClient(IMedicalSystemClient):
         except ValidationError as e:
             return ExternalResponse.error("VALIDATION_ERROR", e.message)
 
-        return await self._call(
-            "crear_turno_whatsapp",
-            idpaciente=id_paciente,
-            idprestador=id_prestador,
-            fechahora=fecha_hora,
-            especialidad=especialidad,
-            celular=celular,
-            frecuencia=frecuencia,
-        )
+        try:
+            return await self._call(
+                "crear_turno_whatsapp",
+                idpaciente=id_paciente,
+                idprestador=id_prestador,
+                fechahora=fecha_hora,
+                especialidad=especialidad,
+                celular=celular,
+                frecuencia=frecuencia,
+            )
+        finally:
+            self._invalidate_availability(id_prestador)
 
     # =========================================================================
     # IAvailabilityChecker implementation
@@ -348,15 +398,15 @@ class HCWebSOAPClient(IMedicalSystemClient):
 
     async def obtener_especialidades(self) -> ExternalResponse:
         """Get available specialties."""
-        return await self._call("obtener_especialidades")
+        return await self._cached_call("obtener_especialidades")
 
     async def obtener_especialidades_bot(self) -> ExternalResponse:
         """Get bot specialties."""
-        return await self._call("obtener_especialidades_bot")
+        return await self._cached_call("obtener_especialidades_bot")
 
     async def obtener_prestadores(self, id_especialidad: str) -> ExternalResponse:
         """Get providers for specialty."""
-        return await self._call("obtener_prestadores", idEspecialidad=id_especialidad)
+        return await self._cached_call("obtener_prestadores", idEspecialidad=id_especialidad)
 
     async def obtener_dias_disponibles(
         self,
@@ -364,7 +414,7 @@ class HCWebSOAPClient(IMedicalSystemClient):
         id_especialidad: str,
     ) -> ExternalResponse:
         """Get available days."""
-        return await self._call(
+        return await self._cached_call(
             "obtener_dias_disponibles",
             idPrestador=id_prestador,
             idEspecialidad=id_especialidad,
@@ -376,7 +426,7 @@ class HCWebSOAPClient(IMedicalSystemClient):
         fecha: str,
     ) -> ExternalResponse:
         """Get available times."""
-        return await self._call(
+        return await self._cached_call(
             "obtener_horarios_disponibles",
             idPrestador=id_prestador,
             fecha=fecha,
@@ -384,25 +434,25 @@ class HCWebSOAPClient(IMedicalSystemClient):
 
     async def get_proximo_turno_disponible(self, id_prestador: str) -> ExternalResponse:
         """Get next available slot."""
-        return await self._call("get_proximo_turno_disponible", idPrestador=id_prestador)
+        return await self._cached_call("get_proximo_turno_disponible", idPrestador=id_prestador)
 
     async def get_proximo_turno_disponible_especialidad(
         self,
         id_especialidad: str,
     ) -> ExternalResponse:
         """Get next available slot for specialty."""
-        return await self._call(
+        return await self._cached_call(
             "get_proximo_turno_disponible_especialidad",
             IdEspecialidad=id_especialidad,
         )
 
     async def get_fechas_disponibles_prestador(self, id_prestador: str) -> ExternalResponse:
         """Get available dates for provider."""
-        return await self._call("get_fechas_disponibles_prestador", idPrestador=id_prestador)
+        return await self._cached_call("get_fechas_disponibles_prestador", idPrestador=id_prestador)
 
     async def obtener_especialidades_con_prestadores(self) -> ExternalResponse:
         """Get specialties with providers."""
-        return await self._call("obtener_especialidades_con_prestadores")
+        return await self._cached_call("obtener_especialidades_con_prestadores")
 
     async def obtener_dias_turno(self, id_turno: str) -> ExternalResponse:
         """Get available days for rescheduling."""
@@ -460,7 +510,7 @@ class HCWebSOAPClient(IMedicalSystemClient):
 
     async def obtener_informacion_institucion(self) -> ExternalResponse:
         """Get institution information."""
-        return await self._call("obtener_informacion_institucion")
+        return await self._cached_call("obtener_informacion_institucion")
 
     async def obtener_instituciones_activas(self) -> ExternalResponse:
         """Get active institutions."""
@@ -6,16 +6,36 @@
 
 Parses SOAP XML responses from HCWeb API.
 Single responsibility: XML response parsing.
+
+Parsing is incremental (pull parser): chunks are fed as they arrive, only
+the `<Method>Result` subtree is kept, elements outside it are cleared as
+soon as they end, and parsing stops once the result element is complete.
 """
 
 import logging
-from typing import Any
+from collections.abc import Iterator
+from typing import Any, cast
 from xml.etree import ElementTree
 
 from ....application.ports import ExternalResponse
 
 logger = logging.getLogger(__name__)
 
+# Pull parser events requested by IncrementalSoapParse
+PullEvents = Iterator[tuple[str, ElementTree.Element]]
+
+
+def local_tag(tag: str) -> str:
+    """Get local name from qualified XML tag.
+
+    Args:
+        tag: Qualified tag name.
+
+    Returns:
+        Local tag name without namespace.
+    """
+    return tag.split("}")[-1] if "}" in tag else tag
+
 
 class SoapResponseParser:
     """Parses SOAP XML responses.
@@ -35,7 +55,7 @@ class SoapResponseParser:
         """
         self.max_depth = max_depth
 
-    def parse(self, xml_text: str, method: str) -> ExternalResponse:
+    def parse(self, xml_text: str | bytes, method: str) -> ExternalResponse:
         """Parse a SOAP response.
 
         Args:
@@ -45,68 +65,36 @@ class SoapResponseParser:
         Returns:
             ExternalResponse with parsed data or error.
         """
-        try:
-            root = ElementTree.fromstring(xml_text)
-            result_elem = self._find_result_element(root, method)
-
-            if result_elem is None:
-                fault = self._extract_soap_fault(root)
-                if fault:
-                    return ExternalResponse.error("SOAP_FAULT", fault)
-                return ExternalResponse.error(
-                    "PARSE_ERROR",
-                    "No se encontró resultado en respuesta SOAP",
-                )
+        parse = self.start(method)
+        parse.feed(xml_text)
+        return parse.result()
 
-            error = self._check_result_errors(result_elem)
-            if error:
-                return error
-
-            data = self._element_to_dict(result_elem)
-            return ExternalResponse.ok(data)
-
-        except ElementTree.ParseError as e:
-            logger.error(f"Error parsing SOAP XML: {e}")
-            return ExternalResponse.error("XML_PARSE_ERROR", str(e))
-
-    def _find_result_element(
-        self,
-        root: ElementTree.Element,
-        method: str,
-    ) -> ElementTree.Element | None:
-        """Find the result element in SOAP response.
+    def start(self, method: str) -> "IncrementalSoapParse":
+        """Start an incremental parse of a SOAP response.
 
         Args:
-            root: XML root element.
-            method: Method name.
+            method: SOAP method name (used to find result element).
 
         Returns:
-            Result element or None.
+            IncrementalSoapParse to feed response chunks into.
         """
-        result_tag = f"{method}Result"
-        for elem in root.iter():
-            tag_name = self._get_local_tag(elem.tag)
-            if tag_name == result_tag:
-                return elem
-        return None
+        return IncrementalSoapParse(self, method)
 
-    def _extract_soap_fault(self, root: ElementTree.Element) -> str | None:
-        """Extract SOAP fault message if present.
+    def build_response(self, result_elem: ElementTree.Element) -> ExternalResponse:
+        """Build the response from a complete result element.
 
         Args:
-            root: XML root element.
+            result_elem: `<Method>Result` XML element.
 
         Returns:
-            Fault message or None.
+            ExternalResponse with parsed data or error.
         """
-        for elem in root.iter():
-            tag_name = self._get_local_tag(elem.tag)
-            if tag_name == "Fault":
-                for child in elem:
-                    child_tag = self._get_local_tag(child.tag)
-                    if child_tag == "faultstring":
-                        return child.text or ""
-        return None
+        error = self._check_result_errors(result_elem)
+        if error:
+            return error
+
+        data = self._element_to_dict(result_elem)
+        return ExternalResponse.ok(data)
 
     def _check_result_errors(
         self,
@@ -192,12 +180,97 @@ class SoapResponseParser:
 
     @staticmethod
     def _get_local_tag(tag: str) -> str:
-        """Get local name from qualified XML tag.
+        """Get local name from qualified XML tag (see `local_tag`)."""
+        return local_tag(tag)
+
+
+class IncrementalSoapParse:
+    """Incremental parse of one SOAP response.
+
+    Feeds chunks into an XMLPullParser. Elements outside the result are
+    cleared when they end; the first SOAP fault string is remembered in
+    case no result element is found.
+    """
+
+    def __init__(self, parser: SoapResponseParser, method: str) -> None:
+        """Initialize the parse.
 
         Args:
-            tag: Qualified tag name.
+            parser: Parser that builds the final response.
+            method: SOAP method name.
+        """
+        self._parser = parser
+        self._method = method
+        self._result_tag = f"{method}Result"
+        self._pull = ElementTree.XMLPullParser(events=("start", "end"))
+        self._path: list[str] = []
+        self._result_elem: ElementTree.Element | None = None
+        self._fault: str | None = None
+        self._response: ExternalResponse | None = None
+
+    @property
+    def done(self) -> bool:
+        """Whether the response is known and further chunks can be skipped."""
+        return self._response is not None
+
+    def feed(self, data: str | bytes) -> None:
+        """Feed the next chunk of the response.
+
+        Args:
+            data: Response chunk (text or bytes).
+        """
+        if self._response is not None or not data:
+            return
+        try:
+            self._pull.feed(data)
+            self._process_events()
+        except ElementTree.ParseError as e:
+            logger.error(f"Error parsing SOAP XML: {e}")
+            self._response = ExternalResponse.error("XML_PARSE_ERROR", str(e))
+
+    def result(self) -> ExternalResponse:
+        """Finish the parse and build the response.
 
         Returns:
-            Local tag name without namespace.
+            ExternalResponse with parsed data or error.
         """
-        return tag.split("}")[-1] if "}" in tag else tag
+        if self._response is not None:
+            return self._response
+        try:
+            self._pull.close()
+            self._process_events()
+        except ElementTree.ParseError as e:
+            logger.error(f"Error parsing SOAP XML: {e}")
+            self._response = ExternalResponse.error("XML_PARSE_ERROR", str(e))
+            return self._response
+
+        if self._response is None:
+            if self._fault:
+                self._response = ExternalResponse.error("SOAP_FAULT", self._fault)
+            else:
+                self._response = ExternalResponse.error(
+                    "PARSE_ERROR",
+                    "No se encontró resultado en respuesta SOAP",
+                )
+        return self._response
+
+    def _process_events(self) -> None:
+        """Consume pending parser events."""
+        # Only "start"/"end" events are requested: items are (event, element)
+        for event, elem in cast(PullEvents, self._pull.read_events()):
+            if event == "start":
+                self._path.append(local_tag(elem.tag))
+                if self._result_elem is None and self._path[-1] == self._result_tag:
+                    self._result_elem = elem
+                continue
+
+            tag = self._path.pop()
+            if elem is self._result_elem:
+                self._response = self._parser.build_response(elem)
+                return
+            if self._result_elem is not None:
+                # Inside the result subtree: keep it for build_response
+                continue
+            if tag == "faultstring" and self._fault is None and self._path and self._path[-1] == "Fault":
+                self._fault = elem.text or ""
+            elem.clear()
@@ -13,6 +13,9 @@ For new implementations, use ConfigurableReminderScheduler which supports:
 - Dynamic schedule loading from database
 - Configurable message templates
 - Interactive WhatsApp buttons
+
+ReminderDispatcher fans reminders out with bounded concurrency, per-DID
+rate limiting, retries and resumable progress.
 """
 
 from .configurable_reminder_scheduler import (
@@ -20,6 +23,11 @@ from .configurable_reminder_scheduler import (
     get_configurable_reminder_scheduler,
     shutdown_configurable_scheduler,
 )
+from .reminder_dispatcher import (
+    DispatchResult,
+    ReminderDispatcher,
+    ReminderProgress,
+)
 from .reminder_scheduler import (
     ReminderScheduler,
     get_reminder_scheduler,
@@ -35,4 +43,8 @@ __all__ = [
     "ConfigurableReminderScheduler",
     "get_configurable_reminder_scheduler",
     "shutdown_configurable_scheduler",
+    # Reminder dispatch
+    "ReminderDispatcher",
+    "ReminderProgress",
+    "DispatchResult",
 ]
@@ -15,12 +15,15 @@ Features:
 - Configurable message templates with placeholders
 - Interactive WhatsApp buttons support
 - Hot-reload capability for schedule changes
+- Bounded-concurrency sends through the institution's Chattigo DID,
+  rate limited per DID, retried with backoff and resumable per run
+  (see ReminderDispatcher)
 """
 
 from __future__ import annotations
 
-import asyncio
 import logging
+from datetime import datetime
 from typing import TYPE_CHECKING, Any
 from uuid import UUID
 
@@ -31,10 +34,15 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from .reminder_dispatcher import DispatchResult, ReminderDispatcher, ReminderProgress
+
 if TYPE_CHECKING:
     from app.models.db.tenancy import TenantInstitutionConfig
     from app.models.db.workflow import ReminderSchedule
 
+    from ..external import HCWebSOAPClient
+    from ..services import AppointmentNotificationService
+
 logger = logging.getLogger(__name__)
 
 
@@ -49,24 +57,32 @@ class ConfigurableReminderScheduler:
         _is_running: Whether scheduler is currently running.
         _db_session_factory: Async session factory for database access.
         _loaded_schedules: Cache of loaded schedule IDs.
+        _soap_clients: SOAP clients shared by the jobs of each institution.
     """
 
     def __init__(
         self,
         db_session_factory: Any,
         enabled: bool = True,
+        dispatch_concurrency: int = 8,
+        max_send_attempts: int = 3,
     ):
         """Initialize the configurable scheduler.
 
         Args:
             db_session_factory: Async SQLAlchemy session factory.
             enabled: Whether the scheduler is enabled.
+            dispatch_concurrency: Max reminder sends in flight per job.
+            max_send_attempts: Attempts per reminder before it counts as failed.
         """
         self._db_session_factory = db_session_factory
         self._enabled = enabled
+        self._dispatch_concurrency = dispatch_concurrency
+        self._max_send_attempts = max_send_attempts
         self._scheduler: AsyncIOScheduler | None = None
         self._is_running = False
         self._loaded_schedules: set[str] = set()
+        self._soap_clients: dict[tuple[str, str], HCWebSOAPClient] = {}
 
     async def start(self) -> None:
         """Start the scheduler and load all schedules from database."""
@@ -96,6 +112,14 @@ class ConfigurableReminderScheduler:
             self._loaded_schedules.clear()
             logger.info("ConfigurableReminderScheduler stopped")
 
+        soap_clients = list(self._soap_clients.values())
+        self._soap_clients.clear()
+        for soap in soap_clients:
+            try:
+                await soap.close()
+            except Exception as e:
+                logger.warning(f"Error closing reminder SOAP client: {e}")
+
     async def reload_schedules(self) -> None:
         """Reload all schedules from database (hot-reload)."""
         if not self._scheduler or not self._is_running:
@@ -313,29 +337,68 @@ class ConfigurableReminderScheduler:
                     f"reminder {schedule.schedule_key}"
                 )
 
-                # Send reminders
-                sent_count = 0
-                for appointment in appointments:
-                    try:
-                        await self._send_reminder(
-                            appointment=appointment,
-                            schedule=schedule,
-                            institution=institution,
-                        )
-                        sent_count += 1
-                        # Rate limiting
-                        await asyncio.sleep(0.5)
-                    except Exception as e:
-                        logger.error(f"Failed to send reminder: {e}")
+                result = await self._dispatch_reminders(session, schedule, institution, appointments)
 
                 logger.info(
-                    f"Sent {sent_count}/{len(appointments)} reminders for "
-                    f"{schedule.schedule_key}"
+                    f"Sent {result.sent}/{result.total} reminders for {schedule.schedule_key} "
+                    f"(skipped={result.skipped}, failed={result.failed}, deferred={result.deferred})"
                 )
 
         except Exception as e:
             logger.error(f"Error executing reminder job {schedule_id}: {e}", exc_info=True)
 
+    async def _dispatch_reminders(
+        self,
+        session: AsyncSession,
+        schedule: "ReminderSchedule",
+        institution: "TenantInstitutionConfig",
+        appointments: list[dict[str, Any]],
+    ) -> DispatchResult:
+        """Send the reminders of a schedule run through the dispatcher.
+
+        Sends go through the institution's Chattigo DID and share its rate
+        limiter with every other job of the DID. Progress is tracked per
+        schedule and local run date, so a rerun on the same day resumes.
+
+        Args:
+            session: Database session (Chattigo credential lookup).
+            schedule: ReminderSchedule configuration.
+            institution: Institution configuration.
+            appointments: Appointments due for the reminder.
+
+        Returns:
+            DispatchResult of the run.
+        """
+        from app.integrations.chattigo import get_did_rate_limiter
+
+        from ..services import AppointmentNotificationService
+
+        did = institution.whatsapp_phone_number_id
+        notifier = AppointmentNotificationService(db=session, did=did) if did else None
+        run_date = datetime.now(timezone(schedule.timezone)).date().isoformat()
+
+        async def send(appointment: dict[str, Any]) -> bool:
+            return await self._send_reminder(
+                appointment=appointment,
+                schedule=schedule,
+                institution=institution,
+                notifier=notifier,
+            )
+
+        dispatcher = ReminderDispatcher(
+            send=send,
+            rate_limiter=get_did_rate_limiter(did or "default"),
+            progress=ReminderProgress(f"{schedule.id}:{run_date}"),
+            concurrency=self._dispatch_concurrency,
+            max_attempts=self._max_send_attempts,
+            label=schedule.schedule_key,
+        )
+        try:
+            return await dispatcher.dispatch(appointments)
+        finally:
+            if notifier is not None:
+                await notifier.close()
+
     async def _get_schedule_by_id(
         self,
         session: AsyncSession,
@@ -368,81 +431,99 @@ class ConfigurableReminderScheduler:
         Returns:
             List of appointment dictionaries.
         """
+        soap = self._get_soap_client(institution)
+        if soap is None:
+            return []
+
+        # Determine which method to call based on trigger
+        if trigger_type == "days_before":
+            if trigger_value == 0:
+                # Today's appointments
+                response = await soap.obtener_turnos_hoy()
+            elif trigger_value == 1:
+                # Tomorrow's appointments
+                response = await soap.obtener_turnos_manana()
+            else:
+                # Future appointments - use dias_anticipacion parameter
+                response = await soap.obtener_turnos_para_recordatorio(
+                    dias_anticipacion=trigger_value
+                )
+        elif trigger_type == "hours_before":
+            # For hours-based triggers, we need same-day appointments
+            if trigger_value <= 24:
+                response = await soap.obtener_turnos_hoy()
+            else:
+                response = await soap.obtener_turnos_manana()
+        else:
+            logger.warning(f"Unknown trigger type: {trigger_type}")
+            return []
+
+        if not response.success:
+            logger.warning(
+                f"Failed to fetch appointments for {institution.institution_key}: "
+                f"{response.error_message}"
+            )
+            return []
+
+        # Parse response data
+        raw_data = response.data
+        turnos: list = []
+        if isinstance(raw_data, dict):
+            turnos = raw_data.get("turnos", [])
+        elif isinstance(raw_data, list):
+            turnos = raw_data
+        if isinstance(turnos, dict):
+            turnos = [turnos]
+
+        return turnos
+
+    def _get_soap_client(self, institution: "TenantInstitutionConfig") -> "HCWebSOAPClient | None":
+        """Get the SOAP client shared by the reminder jobs of an institution.
+
+        Args:
+            institution: Institution configuration.
+
+        Returns:
+            HCWebSOAPClient, or None if the institution has no SOAP URL.
+        """
         from ..external import HCWebSOAPClient
 
         soap_url = institution.base_url
         if not soap_url:
             logger.warning(f"No SOAP URL for institution {institution.institution_key}")
-            return []
+            return None
 
         # Get institution_id from custom settings
         institution_id = institution.get_custom_value("institution_id", "")
         if not institution_id:
             institution_id = institution.get_setting_value("custom.hcweb_institution_id", "")
 
-        soap = HCWebSOAPClient(
-            base_url=soap_url,
-            institution_id=str(institution_id),
-        )
-
-        try:
-            # Determine which method to call based on trigger
-            if trigger_type == "days_before":
-                if trigger_value == 0:
-                    # Today's appointments
-                    response = await soap.obtener_turnos_hoy()
-                elif trigger_value == 1:
-                    # Tomorrow's appointments
-                    response = await soap.obtener_turnos_manana()
-                else:
-                    # Future appointments - use dias_anticipacion parameter
-                    response = await soap.obtener_turnos_para_recordatorio(
-                        dias_anticipacion=trigger_value
-                    )
-            elif trigger_type == "hours_before":
-                # For hours-based triggers, we need same-day appointments
-                if trigger_value <= 24:
-                    response = await soap.obtener_turnos_hoy()
-                else:
-                    response = await soap.obtener_turnos_manana()
-            else:
-                logger.warning(f"Unknown trigger type: {trigger_type}")
-                return []
-
-            if not response.success:
-                logger.warning(
-                    f"Failed to fetch appointments for {institution.institution_key}: "
-                    f"{response.error_message}"
-                )
-                return []
-
-            # Parse response data
-            raw_data = response.data
-            turnos: list = []
-            if isinstance(raw_data, dict):
-                turnos = raw_data.get("turnos", [])
-            elif isinstance(raw_data, list):
-                turnos = raw_data
-            if isinstance(turnos, dict):
-                turnos = [turnos]
-
-            return turnos
-
-        finally:
-            await soap.close()
+        key = (soap_url, str(institution_id))
+        soap = self._soap_clients.get(key)
+        if soap is None:
+            soap = self._soap_clients[key] = HCWebSOAPClient(
+                base_url=soap_url,
+                institution_id=str(institution_id),
+            )
+        return soap
 
     async def _send_reminder(
         self,
         appointment: dict[str, Any],
         schedule: "ReminderSchedule",
         institution: "TenantInstitutionConfig",
-    ) -> None:
+        notifier: "AppointmentNotificationService | None" = None,
+    ) -> bool:
         """Send a reminder to a patient.
 
         Args:
             appointment: Appointment data from HCWeb.
             schedule: ReminderSchedule configuration.
             institution: Institution configuration.
+            notifier: Chattigo notification service of the institution's DID.
+
+        Returns:
+            True if sent, False if the appointment has no phone number.
         """
         phone = appointment.get("telefono") or appointment.get("celular")
         patient_name = appointment.get("paciente") or appointment.get("nombrePaciente")
@@ -454,7 +535,7 @@ class ConfigurableReminderScheduler:
 
         if not phone:
             logger.warning(f"No phone number for appointment {id_turno}, skipping")
-            return
+            return False
 
         # Format message using schedule's template
         message = schedule.format_message(
@@ -478,18 +559,21 @@ class ConfigurableReminderScheduler:
                     message=message,
                     buttons=buttons,
                     institution=institution,
+                    notifier=notifier,
                 )
             else:
                 await self._send_whatsapp_message(
                     phone=phone,
                     message=message,
                     institution=institution,
+                    notifier=notifier,
                 )
 
             logger.debug(
                 f"Reminder sent to {phone} for appointment {id_turno} "
                 f"({schedule.schedule_key})"
             )
+            return True
 
         except Exception as e:
             logger.error(f"Failed to send reminder to {phone}: {e}")
@@ -499,26 +583,32 @@ class ConfigurableReminderScheduler:
         self,
         phone: str,
         message: str,
-        institution: "TenantInstitutionConfig",  # Reserved for future DID-based routing
+        institution: "TenantInstitutionConfig",
+        notifier: "AppointmentNotificationService | None" = None,
     ) -> None:
         """Send a text message via WhatsApp.
 
         Args:
             phone: Recipient phone number.
             message: Message text.
-            institution: Institution configuration (for future DID-based routing).
+            institution: Institution configuration.
+            notifier: Chattigo notification service of the institution's DID
+                (legacy WhatsApp client if not provided).
         """
-        # Note: institution param reserved for future WhatsApp Business API DID routing
-        _ = institution  # Suppress unused warning
+        _ = institution  # Routing is by the notifier's DID
+
+        # Normalize phone number
+        normalized_phone = "".join(c for c in phone if c.isdigit())
+        if not normalized_phone.startswith("54"):
+            normalized_phone = "54" + normalized_phone
+
+        if notifier is not None:
+            await notifier.send_message(normalized_phone, message)
+            return
 
         try:
             from app.integrations.whatsapp import WhatsAppClient  # type: ignore[attr-defined]
 
-            # Normalize phone number
-            normalized_phone = "".join(c for c in phone if c.isdigit())
-            if not normalized_phone.startswith("54"):
-                normalized_phone = "54" + normalized_phone
-
             # Get WhatsApp client
             client = WhatsAppClient()
             await client.send_text_message(
@@ -538,6 +628,7 @@ class ConfigurableReminderScheduler:
         message: str,
         buttons: list[dict[str, str]],
         institution: "TenantInstitutionConfig",
+        notifier: "AppointmentNotificationService | None" = None,
     ) -> None:
         """Send an interactive message with buttons via WhatsApp.
 
@@ -546,24 +637,30 @@ class ConfigurableReminderScheduler:
             message: Message text.
             buttons: List of button configurations [{id, title}].
             institution: Institution configuration.
+            notifier: Chattigo notification service of the institution's DID
+                (legacy WhatsApp client if not provided).
         """
+        # Normalize phone number
+        normalized_phone = "".join(c for c in phone if c.isdigit())
+        if not normalized_phone.startswith("54"):
+            normalized_phone = "54" + normalized_phone
+
+        # Format buttons for WhatsApp (max 3 buttons, 20 char titles)
+        formatted_buttons = [
+            {
+                "id": btn.get("id", f"btn_{i}"),
+                "title": btn.get("title", f"Option {i + 1}")[:20],
+            }
+            for i, btn in enumerate(buttons[:3])
+        ]
+
+        if notifier is not None:
+            await notifier.send_interactive_buttons(normalized_phone, message, formatted_buttons)
+            return
+
         try:
             from app.integrations.whatsapp import WhatsAppClient  # type: ignore[attr-defined]
 
-            # Normalize phone number
-            normalized_phone = "".join(c for c in phone if c.isdigit())
-            if not normalized_phone.startswith("54"):
-                normalized_phone = "54" + normalized_phone
-
-            # Format buttons for WhatsApp (max 3 buttons, 20 char titles)
-            formatted_buttons = [
-                {
-                    "id": btn.get("id", f"btn_{i}"),
-                    "title": btn.get("title", f"Option {i + 1}")[:20],
-                }
-                for i, btn in enumerate(buttons[:3])
-            ]
-
             # Get WhatsApp client
             client = WhatsAppClient()
             await client.send_interactive_buttons(
@@ -611,20 +708,11 @@ class ConfigurableReminderScheduler:
                 trigger_value=schedule.trigger_value,
             )
 
-            count = 0
-            for appointment in appointments:
-                try:
-                    await self._send_reminder(
-                        appointment=appointment,
-                        schedule=schedule,
-                        institution=institution,
-                    )
-                    count += 1
-                    await asyncio.sleep(0.5)
-                except Exception as e:
-                    logger.error(f"Error sending manual reminder: {e}")
+            if not appointments:
+                return 0
 
-            return count
+            result = await self._dispatch_reminders(session, schedule, institution, appointments)
+            return result.sent
 
     @property
     def is_running(self) -> bool:
@@ -0,0 +1,261 @@
+# ============================================================================
+# SCOPE: INFRASTRUCTURE LAYER (Medical Appointments)
+# Description: Bounded-concurrency fan-out of appointment reminders.
+# Tenant-Aware: Yes - rate limited per Chattigo DID, progress per schedule run.
+# ============================================================================
+"""Reminder Dispatcher.
+
+Sends the reminders of one schedule run through a bounded pool of workers:
+
+- Concurrency: at most `concurrency` sends in flight
+- Rate limiting: every send takes a slot of the DID's token buckets
+  (throughput and WhatsApp messaging tier); sends that cannot get one within
+  `max_rate_wait` are deferred to the next run
+- Retries: sends that never reached Chattigo (connect errors, pool
+  timeouts) are retried with exponential backoff and jitter; a 429 pauses
+  every sender of the DID for the Retry-After period and is retried. Any
+  other error (read timeout, 5xx already retried by the HTTP client) counts
+  as failed, since the reminder may have been delivered
+- Resumable: appointments already reminded are recorded per run in Redis,
+  so a rerun (crash, manual trigger) does not send them twice
+
+Usage:
+    dispatcher = ReminderDispatcher(
+        send=send_reminder,
+        rate_limiter=get_did_rate_limiter(did),
+        progress=ReminderProgress(f"{schedule_id}:{run_date}"),
+    )
+    result = await dispatcher.dispatch(appointments)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, Any
+
+from app.core.infrastructure.monitoring import metrics_collector
+from app.integrations.chattigo.exceptions import UNSENT_REQUEST_ERRORS, ChattigoRateLimitError
+
+if TYPE_CHECKING:
+    from app.integrations.chattigo.rate_limiter import DIDRateLimiter
+
+logger = logging.getLogger(__name__)
+
+# Returns False when the appointment cannot be reminded (e.g. no phone)
+SendReminder = Callable[[dict[str, Any]], Awaitable[bool]]
+
+PROGRESS_KEY_PREFIX = "reminders:sent:"
+PROGRESS_TTL_SECONDS = 48 * 3600
+# Pause after a 429 without Retry-After
+RATE_LIMITED_DELAY = 60.0
+
+
+def appointment_key(appointment: dict[str, Any]) -> str:
+    """Identity of an appointment for progress tracking."""
+    id_turno = appointment.get("idTurno")
+    if id_turno:
+        return str(id_turno)
+    phone = appointment.get("telefono") or appointment.get("celular") or ""
+    return f"{phone}|{appointment.get('fecha', '')}|{appointment.get('hora', '')}"
+
+
+@dataclass
+class DispatchResult:
+    """Outcome of a dispatch run.
+
+    Attributes:
+        total: Appointments received.
+        sent: Reminders sent in this run.
+        skipped: Already reminded in an earlier run, duplicated or not sendable.
+        failed: Sends that failed after all attempts.
+        deferred: Sends left for a later run (rate limit budget exhausted).
+    """
+
+    total: int = 0
+    sent: int = 0
+    skipped: int = 0
+    failed: int = 0
+    deferred: int = 0
+
+    def to_dict(self) -> dict[str, int]:
+        """Convert to dictionary."""
+        return asdict(self)
+
+
+class ReminderProgress:
+    """Appointments already reminded in a schedule run.
+
+    Kept as a Redis set that expires after PROGRESS_TTL_SECONDS. When Redis
+    is unavailable progress is only kept in memory for the current run.
+    """
+
+    def __init__(self, run_key: str, redis: Any | None = None, ttl: int = PROGRESS_TTL_SECONDS) -> None:
+        """Initialize progress tracking.
+
+        Args:
+            run_key: Identity of the run (schedule ID and run date).
+            redis: Async Redis client (shared client if not provided).
+            ttl: Seconds the progress is kept.
+        """
+        self.key = f"{PROGRESS_KEY_PREFIX}{run_key}"
+        self.ttl = ttl
+        self._redis = redis
+        self._redis_available = True
+        self._sent: set[str] = set()
+
+    async def _get_redis(self) -> Any | None:
+        if self._redis is None and self._redis_available:
+            try:
+                from app.integrations.databases.redis import get_shared_async_redis_client
+
+                self._redis = await get_shared_async_redis_client()
+            except Exception as e:
+                logger.warning(f"Redis unavailable, reminder progress not persisted: {e}")
+                self._redis_available = False
+        return self._redis
+
+    async def load(self) -> set[str]:
+        """Get the appointments already reminded."""
+        redis = await self._get_redis()
+        if redis is not None:
+            try:
+                members = await redis.smembers(self.key)
+                self._sent.update(m.decode() if isinstance(m, bytes) else str(m) for m in members)
+            except Exception as e:
+                logger.warning(f"Could not load reminder progress {self.key}: {e}")
+        return set(self._sent)
+
+    async def mark_sent(self, appointment_id: str) -> None:
+        """Record a sent reminder."""
+        self._sent.add(appointment_id)
+        redis = await self._get_redis()
+        if redis is None:
+            return
+        try:
+            await redis.sadd(self.key, appointment_id)
+            await redis.expire(self.key, self.ttl)
+        except Exception as e:
+            logger.warning(f"Could not save reminder progress {self.key}: {e}")
+
+
+class ReminderDispatcher:
+    """Sends reminders with a bounded worker pool, per-DID rate limit and retries."""
+
+    def __init__(
+        self,
+        send: SendReminder,
+        rate_limiter: DIDRateLimiter,
+        progress: ReminderProgress,
+        concurrency: int = 8,
+        max_attempts: int = 3,
+        retry_base_delay: float = 2.0,
+        max_rate_wait: float | None = 300.0,
+        label: str = "",
+    ) -> None:
+        """Initialize the dispatcher.
+
+        Args:
+            send: Sends one reminder.
+            rate_limiter: Token buckets of the sending DID.
+            progress: Progress of the run.
+            concurrency: Max sends in flight.
+            max_attempts: Attempts per reminder (first send included) for retryable errors.
+            retry_base_delay: Backoff of the first retry in seconds (doubles per attempt).
+            max_rate_wait: Max seconds a send waits for a rate limit slot before
+                it is deferred (None waits as long as needed).
+            label: Name used in logs (e.g. schedule key).
+        """
+        self._send = send
+        self.rate_limiter = rate_limiter
+        self.progress = progress
+        self.concurrency = max(1, concurrency)
+        self.max_attempts = max(1, max_attempts)
+        self.retry_base_delay = retry_base_delay
+        self.max_rate_wait = max_rate_wait
+        self.label = label
+
+    async def dispatch(self, appointments: list[dict[str, Any]]) -> DispatchResult:
+        """Send the reminders of the run.
+
+        Args:
+            appointments: Appointments due for a reminder.
+
+        Returns:
+            DispatchResult with the counts of the run.
+        """
+        result = DispatchResult(total=len(appointments))
+        done = await self.progress.load()
+
+        queue: asyncio.Queue[tuple[str, dict[str, Any]]] = asyncio.Queue()
+        for appointment in appointments:
+            key = appointment_key(appointment)
+            if key in done:
+                result.skipped += 1
+                continue
+            done.add(key)
+            queue.put_nowait((key, appointment))
+
+        worker_count = min(self.concurrency, queue.qsize())
+        workers = [asyncio.create_task(self._worker(queue, result)) for _ in range(worker_count)]
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            for worker in workers:
+                worker.cancel()
+
+        for outcome in ("sent", "skipped", "failed", "deferred"):
+            count = getattr(result, outcome)
+            if count:
+                metrics_collector.increment("reminders_dispatched_total", count, {"outcome": outcome})
+        return result
+
+    async def _worker(self, queue: asyncio.Queue[tuple[str, dict[str, Any]]], result: DispatchResult) -> None:
+        while True:
+            try:
+                key, appointment = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            await self._deliver(key, appointment, result)
+
+    async def _deliver(self, key: str, appointment: dict[str, Any], result: DispatchResult) -> None:
+        """Send one reminder, retrying 429s and errors raised before the request was sent."""
+        for attempt in range(1, self.max_attempts + 1):
+            if not await self.rate_limiter.acquire(self.max_rate_wait):
+                result.deferred += 1
+                return
+
+            try:
+                sent = await self._send(appointment)
+            except (ChattigoRateLimitError, *UNSENT_REQUEST_ERRORS) as e:
+                if attempt == self.max_attempts:
+                    logger.error(f"Reminder {key} ({self.label}) failed after {attempt} attempts: {e}")
+                    result.failed += 1
+                    return
+                delay = self._retry_delay(attempt, e)
+                logger.warning(f"Reminder {key} ({self.label}) failed, retrying in {delay:.1f}s: {e}")
+                await asyncio.sleep(delay)
+                continue
+            except Exception as e:
+                logger.error(f"Reminder {key} ({self.label}) failed: {e}")
+                result.failed += 1
+                return
+
+            if not sent:
+                result.skipped += 1
+                return
+            await self.progress.mark_sent(key)
+            result.sent += 1
+            return
+
+    def _retry_delay(self, attempt: int, error: Exception) -> float:
+        """Backoff before the next attempt; a 429 pauses the whole DID."""
+        if isinstance(error, ChattigoRateLimitError):
+            # The next acquire() waits out the pause in the DID's bucket
+            self.rate_limiter.penalize(RATE_LIMITED_DELAY if error.retry_after is None else error.retry_after)
+            return 0.0
+        base = self.retry_base_delay * 2 ** (attempt - 1)
+        return base + random.uniform(0, self.retry_base_delay)
@@ -18,6 +18,7 @@ Usage:
     await service.send_appointment_confirmation(appointment, patient)
 """
 
+import asyncio
 import logging
 from datetime import datetime
 from typing import TYPE_CHECKING
@@ -58,13 +59,18 @@ class AppointmentNotificationService:
         self._db = db
         self._did = did
         self._adapter: "ChattigoMultiDIDAdapter | None" = None
+        # Concurrent sends (e.g. reminder workers) share one adapter and DB lookup
+        self._adapter_lock = asyncio.Lock()
 
     async def _get_adapter(self) -> "ChattigoMultiDIDAdapter":
         """Get or create Chattigo adapter for configured DID."""
         if self._adapter is None:
-            factory = get_chattigo_adapter_factory()
-            self._adapter = await factory.get_adapter(self._db, did=self._did)
-            await self._adapter.initialize()
+            async with self._adapter_lock:
+                if self._adapter is None:
+                    factory = get_chattigo_adapter_factory()
+                    adapter = await factory.get_adapter(self._db, did=self._did)
+                    await adapter.initialize()
+                    self._adapter = adapter
         return self._adapter
 
     async def close(self) -> None:
@@ -28,12 +28,12 @@ from pathlib import Path
 from typing import TYPE_CHECKING, Any
 from uuid import UUID
 
-import spacy
 import yaml
-from spacy.language import Language
 
 # Use domain_intent_cache for multi-domain support (replaces intent_pattern_cache)
+from app.config.settings import get_settings
 from app.core.cache.domain_intent_cache import domain_intent_cache
+from app.core.cache.semantic_classification_cache import context_fingerprint, semantic_classification_cache
 from app.domains.pharmacy.agents.entity_extractor import PharmacyEntityExtractor
 from app.domains.pharmacy.agents.intent_patterns import (
     CONFIDENCE_CONTAINS,
@@ -46,6 +46,7 @@ from app.domains.pharmacy.agents.intent_patterns import (
 from app.domains.pharmacy.agents.intent_result import PharmacyIntentResult
 from app.domains.pharmacy.agents.pattern_matchers import is_payment_intent_from_patterns
 from app.integrations.llm import ModelComplexity, get_llm_for_task
+from app.integrations.nlp import ParsedDoc, get_nlp_service, is_model_installed
 from app.utils import extract_json_from_text
 
 if TYPE_CHECKING:
@@ -53,6 +54,17 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# Pipeline components whose output the analyzer does not read
+SPACY_DISABLED_PIPES = ("parser",)
+
+# Semantic similarity to the intent's reference text (phrases + keywords +
+# lemmas) adds up to SIMILARITY_WEIGHT to its score, from SIMILARITY_MIN on.
+# Off unless PHARMACY_INTENT_SIMILARITY_ENABLED is set.
+SIMILARITY_WEIGHT = 0.3
+SIMILARITY_MIN = 0.5
+
+SEMANTIC_CACHE_ANALYZER = "pharmacy_intent"
+
 
 class PharmacyIntentAnalyzer:
     """
@@ -72,8 +84,6 @@ class PharmacyIntentAnalyzer:
     - Single-tenant: Pass db/organization_id at construction time
     """
 
-    _nlp_model: Language | None = None
-
     LLM_TEMPERATURE = 0.2
 
     # YAML template path (relative to prompts/templates)
@@ -89,6 +99,7 @@ class PharmacyIntentAnalyzer:
         templates_dir: Path | str | None = None,
         use_llm_fallback: bool = True,
         model_name: str = "es_core_news_sm",
+        use_similarity: bool | None = None,
     ):
         """Initialize pharmacy intent analyzer.
 
@@ -98,11 +109,16 @@ class PharmacyIntentAnalyzer:
             templates_dir: Path to prompts/templates directory
             use_llm_fallback: Enable LLM fallback for low confidence
             model_name: spaCy model to use
+            use_similarity: Add intent similarity to scores
+                (defaults to PHARMACY_INTENT_SIMILARITY_ENABLED)
         """
         self._db = db
         self._organization_id = organization_id
         self.use_llm_fallback = use_llm_fallback
         self.model_name = model_name
+        if use_similarity is None:
+            use_similarity = get_settings().PHARMACY_INTENT_SIMILARITY_ENABLED
+        self.use_similarity = use_similarity
         self._entity_extractor = PharmacyEntityExtractor()
         self._patterns: dict[str, Any] | None = None
         self._current_org_id: UUID | None = None
@@ -115,7 +131,6 @@ class PharmacyIntentAnalyzer:
         self._prompt_templates: dict[str, str] = {}
         self._templates_loaded = False
 
-        self._load_spacy_model()
         if organization_id:
             logger.info(f"PharmacyIntentAnalyzer initialized for org {organization_id}")
         else:
@@ -145,22 +160,6 @@ class PharmacyIntentAnalyzer:
 
         self._templates_loaded = True
 
-    @property
-    def nlp(self) -> Language | None:
-        """Get shared spaCy model."""
-        return PharmacyIntentAnalyzer._nlp_model
-
-    def _load_spacy_model(self) -> None:
-        """Load spaCy model (shared across instances)."""
-        if PharmacyIntentAnalyzer._nlp_model is not None:
-            return
-        try:
-            PharmacyIntentAnalyzer._nlp_model = spacy.load(self.model_name)
-            logger.info(f"spaCy model '{self.model_name}' loaded")
-        except OSError:
-            logger.warning(f"spaCy model '{self.model_name}' not found, using blank")
-            PharmacyIntentAnalyzer._nlp_model = spacy.blank("es")
-
     async def _ensure_patterns_loaded(
         self,
         db: "AsyncSession | None" = None,
@@ -244,11 +243,13 @@ class PharmacyIntentAnalyzer:
 
     async def _analyze_with_spacy(self, message: str, context: dict[str, Any]) -> PharmacyIntentResult:
         """Analyze message using spaCy NLU with database patterns."""
-        if self.nlp is None:
-            return await self._keyword_fallback(message, context)
-
         text_lower = message.lower().strip()
-        doc = self.nlp(text_lower)
+        try:
+            # Parsed in the NLP service workers; the dependency parser is not used here
+            doc = await get_nlp_service().parse(text_lower, self.model_name, disable=SPACY_DISABLED_PIPES)
+        except Exception as e:
+            logger.warning(f"spaCy parsing failed, using keyword fallback: {e}")
+            return await self._keyword_fallback(message, context)
 
         # Priority 1: Check confirmation context first
         if context.get("awaiting_confirmation"):
@@ -311,8 +312,9 @@ class PharmacyIntentAnalyzer:
 
         # Score all intents from database patterns
         lemmas = {token.lemma_.lower() for token in doc if not token.is_stop and not token.is_punct}
+        similarities = await self._score_similarity(doc) if self.use_similarity else {}
         scores = {
-            intent: self._calculate_intent_score(text_lower, lemmas, patterns, doc)
+            intent: self._calculate_intent_score(text_lower, lemmas, patterns, similarities.get(intent, 0.0))
             for intent, patterns in intent_patterns.items()
         }
 
@@ -397,15 +399,27 @@ class PharmacyIntentAnalyzer:
 
         return None
 
+    async def _score_similarity(self, doc: ParsedDoc) -> dict[str, float]:
+        """Similarity of the message to every intent (one matrix-vector product)."""
+        if not doc.has_vector or self._current_org_id is None:
+            return {}
+        try:
+            index = await domain_intent_cache.get_similarity_index(
+                self._db, self._current_org_id, "pharmacy", self.model_name
+            )
+        except Exception as e:
+            logger.warning(f"Intent similarity index unavailable: {e}")
+            return {}
+        return index.score(doc.vector)
+
     def _calculate_intent_score(
         self,
         text_lower: str,
         lemmas: set[str],
         patterns: dict[str, Any],
-        _doc: Any,  # Unused, kept for future POS tag analysis
+        similarity: float = 0.0,
     ) -> float:
         """Calculate score for a single intent based on database patterns."""
-        del _doc  # Explicitly mark as unused (reserved for future POS tag analysis)
         score = 0.0
         weight = patterns.get("weight", 1.0)
         exact_match = patterns.get("exact_match", False)
@@ -430,6 +444,10 @@ class PharmacyIntentAnalyzer:
             elif phrase in text_lower:  # contains
                 score += 0.5
 
+        # Semantic similarity to the intent's reference text
+        if similarity >= SIMILARITY_MIN:
+            score += similarity * SIMILARITY_WEIGHT
+
         return min(score * weight, 1.0)
 
     def _is_capability_question(self, text: str) -> bool:
@@ -504,12 +522,45 @@ class PharmacyIntentAnalyzer:
         spacy_result: PharmacyIntentResult,
     ) -> PharmacyIntentResult:
         """Fallback to LLM for semantic understanding."""
+        org_id = self._current_org_id or self._organization_id
+        # Conversation history is left out: it would make every fingerprint unique
+        fingerprint = context_fingerprint(
+            customer_identified=context.get("customer_identified", False),
+            awaiting_confirmation=context.get("awaiting_confirmation", False),
+            awaiting_document_input=context.get("awaiting_document_input", False),
+            debt_status=context.get("debt_status", "none"),
+        )
         try:
+            cached = await semantic_classification_cache.get(
+                SEMANTIC_CACHE_ANALYZER, message, tenant=org_id, fingerprint=fingerprint
+            )
+            if cached is not None:
+                # Entities and suggested response belong to the cached message
+                return PharmacyIntentResult(
+                    intent=cached.value["intent"],
+                    confidence=cached.confidence,
+                    is_out_of_scope=False,
+                    entities=dict(spacy_result.entities),
+                    method="llm",
+                    analysis={"semantic_cache_similarity": cached.similarity},
+                )
+
             prompt = await self._build_llm_prompt(message, context)
             llm = get_llm_for_task(complexity=ModelComplexity.SIMPLE, temperature=self.LLM_TEMPERATURE)
             response = await llm.ainvoke(prompt)
             response_text = response.content if isinstance(response.content, str) else str(response.content)
-            return self._parse_llm_response(response_text, spacy_result)
+            result = self._parse_llm_response(response_text, spacy_result)
+            # Out-of-scope results carry a suggested response written for this message
+            if result.method == "llm" and result.intent != "unknown" and not result.is_out_of_scope:
+                await semantic_classification_cache.set(
+                    SEMANTIC_CACHE_ANALYZER,
+                    message,
+                    {"intent": result.intent},
+                    result.confidence,
+                    tenant=org_id,
+                    fingerprint=fingerprint,
+                )
+            return result
         except Exception as e:
             logger.error(f"LLM analysis failed: {e}", exc_info=True)
             spacy_result.analysis["llm_error"] = str(e)
@@ -588,7 +639,7 @@ Responde con JSON: intent, confidence, is_out_of_scope"""
 
     def is_available(self) -> bool:
         """Check if analyzer is properly initialized."""
-        return self.nlp is not None
+        return True
 
     def get_model_info(self) -> dict[str, Any]:
         """Get information about the loaded models."""
@@ -599,7 +650,7 @@ Responde con JSON: intent, confidence, is_out_of_scope"""
         org_id = self._current_org_id or self._organization_id
 
         return {
-            "spacy_available": self.nlp is not None,
+            "spacy_available": is_model_installed(self.model_name),
             "spacy_model": self.model_name,
             "llm_fallback_enabled": self.use_llm_fallback,
             "confidence_threshold": CONFIDENCE_THRESHOLD,
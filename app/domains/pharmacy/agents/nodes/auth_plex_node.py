@@ -47,11 +47,11 @@ class AuthPlexService:
         self._plex_client = plex_client
 
     def _get_plex_client(self) -> "PlexClient":
-        """Get or create Plex client."""
+        """Get the injected or pooled Plex client."""
         if self._plex_client is None:
-            from app.clients.plex_client import PlexClient
+            from app.clients.plex_client import get_pooled_plex_client
 
-            self._plex_client = PlexClient()
+            self._plex_client = get_pooled_plex_client()
         return self._plex_client
 
     def normalize_dni(self, value: str) -> str | None:
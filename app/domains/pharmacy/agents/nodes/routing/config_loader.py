@@ -16,6 +16,7 @@ Usage:
     await loader.load(org_id, "pharmacy")
 
     configs = loader.routing_configs
+    matcher = loader.matcher  # compiled trigger lookups
     awaiting = loader.awaiting_configs
     escape_intents = loader.escape_intents
 """
@@ -28,6 +29,7 @@ from uuid import UUID
 
 from app.core.cache.awaiting_type_cache import AwaitingTypeConfigDTO, awaiting_type_cache
 from app.core.cache.routing_config_cache import RoutingConfigDTO, routing_config_cache
+from app.core.cache.trigger_matcher import CompiledRoutingMatcher
 
 if TYPE_CHECKING:
     from sqlalchemy.ext.asyncio import AsyncSession
@@ -57,6 +59,7 @@ class RoutingConfigLoader:
         """
         self._db = db
         self._routing_configs: dict[str, list[RoutingConfigDTO]] | None = None
+        self._matcher: CompiledRoutingMatcher | None = None
         self._awaiting_configs: dict[str, AwaitingTypeConfigDTO] | None = None
         self._escape_intents: frozenset[str] | None = None
         self._loaded = False
@@ -78,6 +81,18 @@ class RoutingConfigLoader:
             return {}
         return self._routing_configs
 
+    @property
+    def matcher(self) -> CompiledRoutingMatcher:
+        """
+        Get the compiled trigger matcher for the loaded routing configs.
+
+        Returns:
+            CompiledRoutingMatcher (empty if not loaded)
+        """
+        if self._matcher is None:
+            self._matcher = CompiledRoutingMatcher(self.routing_configs)
+        return self._matcher
+
     @property
     def awaiting_configs(self) -> dict[str, AwaitingTypeConfigDTO]:
         """
@@ -120,10 +135,9 @@ class RoutingConfigLoader:
         if self._loaded:
             return
 
-        # Load routing configs
-        self._routing_configs = await routing_config_cache.get_configs(
-            self._db, organization_id, domain_key
-        )
+        # Load routing configs with their compiled matcher
+        self._matcher = await routing_config_cache.get_matcher(self._db, organization_id, domain_key)
+        self._routing_configs = self._matcher.source
         config_count = sum(len(v) for v in self._routing_configs.values())
         logger.debug(f"Loaded routing configs for org {organization_id}: {config_count} total")
 
@@ -177,10 +191,9 @@ class RoutingConfigLoader:
         Returns:
             Node name to route to (defaults to "main_menu_node")
         """
-        if self._routing_configs:
-            for config in self._routing_configs.get("intent_node_mapping", []):
-                if config.trigger_value == intent:
-                    return config.target_node or "main_menu_node"
+        config = self.matcher.exact("intent_node_mapping", intent)
+        if config is not None:
+            return config.target_node or "main_menu_node"
         return "main_menu_node"
 
     def intent_requires_auth(self, intent: str) -> bool:
@@ -193,10 +206,9 @@ class RoutingConfigLoader:
         Returns:
             True if intent requires authentication
         """
-        if self._routing_configs:
-            for config in self._routing_configs.get("intent_node_mapping", []):
-                if config.trigger_value == intent:
-                    return config.requires_auth
+        config = self.matcher.exact("intent_node_mapping", intent)
+        if config is not None:
+            return config.requires_auth
         return False
 
     def get_awaiting_config(self, awaiting_type: str) -> AwaitingTypeConfigDTO | None:
@@ -242,25 +242,11 @@ class AwaitedInputMatcher:
         if not escape_intents:
             return False
 
-        # Check global keywords that are escape intents
-        for config in ctx.config_loader.get_configs_by_type("global_keyword"):
-            if config.target_intent not in escape_intents:
-                continue
-
-            trigger = config.trigger_value.lower()
-
-            # Check direct match (same logic as GlobalKeywordMatcher)
-            if ctx.message_lower == trigger or ctx.message_lower.startswith(trigger + " "):
-                return True
-
-            # Check aliases
-            if config.metadata and "aliases" in config.metadata:
-                for alias in config.metadata["aliases"]:
-                    alias_lower = alias.lower()
-                    if ctx.message_lower == alias_lower or ctx.message_lower.startswith(alias_lower + " "):
-                        return True
-
-        return False
+        # Check global keywords that are escape intents (same trie lookup as GlobalKeywordMatcher)
+        return any(
+            config.target_intent in escape_intents
+            for config in ctx.config_loader.matcher.global_keywords(ctx.message_lower)
+        )
 
     async def _check_intent_override(
         self,
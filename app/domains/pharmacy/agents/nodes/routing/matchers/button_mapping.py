@@ -42,6 +42,7 @@ class ButtonMappingMatcher:
     Button mappings:
     - Match exact button IDs from WhatsApp interactive messages
     - Handle text-to-ID mappings via metadata.text_aliases
+    - Both lookups use the compiled matcher's hash tables
     """
 
     priority = 50
@@ -56,66 +57,28 @@ class ButtonMappingMatcher:
         Returns:
             MatchResult if matched, None otherwise
         """
-        configs = ctx.config_loader.get_configs_by_type("button_mapping")
-        if not configs:
-            return None
+        matcher = ctx.config_loader.matcher
 
         # Clean message for matching
         message_clean = ctx.message.strip()
-        message_lower = ctx.message_lower
-
-        # Build text-to-ID mapping from config metadata
-        text_to_id = self._build_text_mapping(configs)
-
-        # Check if message is a known list item text and convert to ID
-        if message_lower in text_to_id:
-            original = message_lower
-            message_clean = text_to_id[message_lower]
-            logger.info(f"[MATCHER] Mapped list item text '{original}' to ID '{message_clean}'")
-
-        # Find matching config
-        for config in configs:
-            if config.trigger_value == message_clean:
-                logger.info(f"[MATCHER] Button mapping matched: {config.trigger_value}")
-                return MatchResult(
-                    config=config,
-                    match_type="button_mapping",
-                    handler_key="button_selection",
-                )
 
-        return None
-
-    def _build_text_mapping(self, configs: list) -> dict[str, str]:
-        """
-        Build text-to-ID mapping from config metadata.
-
-        Looks for metadata.text_aliases or metadata.text_alias in configs.
-        This replaces the hardcoded list_item_text_mapping dict.
-
-        Args:
-            configs: List of RoutingConfigDTO
-
-        Returns:
-            Dict mapping lowercase text to button ID
-        """
-        mapping: dict[str, str] = {}
-
-        for config in configs:
-            if not config.metadata:
-                continue
-
-            # Handle text_aliases (list of texts that map to this ID)
-            aliases = config.metadata.get("text_aliases", [])
-            for alias in aliases:
-                if isinstance(alias, str):
-                    mapping[alias.lower()] = config.trigger_value
+        # Check if message is a known list item text (metadata.text_aliases) and convert to ID
+        button_id = matcher.button_id_for_text(ctx.message_lower)
+        if button_id is not None:
+            logger.info(f"[MATCHER] Mapped list item text '{ctx.message_lower}' to ID '{button_id}'")
+            message_clean = button_id
 
-            # Handle single text_alias
-            single_alias = config.metadata.get("text_alias")
-            if isinstance(single_alias, str):
-                mapping[single_alias.lower()] = config.trigger_value
+        # Find matching config (exact-match table)
+        config = matcher.exact("button_mapping", message_clean)
+        if config is not None:
+            logger.info(f"[MATCHER] Button mapping matched: {config.trigger_value}")
+            return MatchResult(
+                config=config,
+                match_type="button_mapping",
+                handler_key="button_selection",
+            )
 
-        return mapping
+        return None
 
 
 class KnownListItemMatcher:
@@ -63,47 +63,43 @@ class GlobalKeywordMatcher:
         Returns:
             MatchResult if matched, None otherwise
         """
-        configs = ctx.config_loader.get_configs_by_type("global_keyword")
-        if not configs:
-            return None
-
-        for config in configs:
-            if self._matches_config(ctx.message_lower, config):
-                # If awaiting input, only allow escape intents
-                if ctx.awaiting:
-                    if config.target_intent not in ctx.config_loader.escape_intents:
-                        logger.info(
-                            f"[MATCHER] Global keyword '{config.trigger_value}' ignored "
-                            f"while awaiting '{ctx.awaiting}' (not escape: {config.target_intent})"
-                        )
-                        continue
-
-                # Check for amount in payment-related messages
-                # "Pagar 1111 pesos" should route to pay_partial with amount
-                if config.target_intent in PAYMENT_INTENTS_WITH_AMOUNT:
-                    amount = self._extract_amount(ctx.message)
-                    if amount is not None and amount > 0:
-                        logger.info(
-                            f"[MATCHER] Payment with amount detected: {amount} -> pay_partial"
-                        )
-                        return MatchResult(
-                            config=config,
-                            match_type="global_keyword_with_amount",
-                            handler_key="global_keyword_amount",
-                            metadata={
-                                "amount": amount,
-                                "original_intent": config.target_intent,
-                                "target_intent": "pay_partial",
-                                "target_node": "payment_processor",
-                            },
-                        )
-
-                logger.info(f"[MATCHER] Global keyword matched: {config.trigger_value}")
-                return MatchResult(
-                    config=config,
-                    match_type="global_keyword",
-                    handler_key="global_keyword",
-                )
+        # Compiled trie lookup: only configs whose trigger/alias matches, in priority order
+        for config in ctx.config_loader.matcher.global_keywords(ctx.message_lower):
+            # If awaiting input, only allow escape intents
+            if ctx.awaiting:
+                if config.target_intent not in ctx.config_loader.escape_intents:
+                    logger.info(
+                        f"[MATCHER] Global keyword '{config.trigger_value}' ignored "
+                        f"while awaiting '{ctx.awaiting}' (not escape: {config.target_intent})"
+                    )
+                    continue
+
+            # Check for amount in payment-related messages
+            # "Pagar 1111 pesos" should route to pay_partial with amount
+            if config.target_intent in PAYMENT_INTENTS_WITH_AMOUNT:
+                amount = self._extract_amount(ctx.message)
+                if amount is not None and amount > 0:
+                    logger.info(
+                        f"[MATCHER] Payment with amount detected: {amount} -> pay_partial"
+                    )
+                    return MatchResult(
+                        config=config,
+                        match_type="global_keyword_with_amount",
+                        handler_key="global_keyword_amount",
+                        metadata={
+                            "amount": amount,
+                            "original_intent": config.target_intent,
+                            "target_intent": "pay_partial",
+                            "target_node": "payment_processor",
+                        },
+                    )
+
+            logger.info(f"[MATCHER] Global keyword matched: {config.trigger_value}")
+            return MatchResult(
+                config=config,
+                match_type="global_keyword",
+                handler_key="global_keyword",
+            )
 
         return None
 
@@ -125,36 +121,5 @@ class GlobalKeywordMatcher:
             logger.warning(f"Error extracting amount: {e}")
             return None
 
-    def _matches_config(self, message: str, config) -> bool:
-        """
-        Check if message matches a specific config.
-
-        Matches:
-        - Exact match with trigger_value
-        - Message starts with trigger_value + space
-        - Any alias match (from metadata.aliases)
-
-        Args:
-            message: Lowercase, stripped message
-            config: RoutingConfigDTO to check
-
-        Returns:
-            True if message matches
-        """
-        trigger = config.trigger_value.lower()
-
-        # Check direct match
-        if message == trigger or message.startswith(trigger + " "):
-            return True
-
-        # Check aliases
-        if config.metadata and "aliases" in config.metadata:
-            for alias in config.metadata["aliases"]:
-                alias_lower = alias.lower()
-                if message == alias_lower or message.startswith(alias_lower + " "):
-                    return True
-
-        return False
-
 
 __all__ = ["GlobalKeywordMatcher"]
@@ -75,23 +75,19 @@ class MenuOptionMatcher:
         if ctx.awaiting != "menu_selection":
             return None
 
-        configs = ctx.config_loader.get_configs_by_type("menu_option")
-        if not configs:
-            return None
-
         # Normalize message (handle emoji numbers)
         message_clean = ctx.message.strip()
         message_clean = EMOJI_MAP.get(message_clean, message_clean)
 
-        # Find matching config
-        for config in configs:
-            if config.trigger_value == message_clean:
-                logger.info(f"[MATCHER] Menu option matched: {config.trigger_value}")
-                return MatchResult(
-                    config=config,
-                    match_type="menu_option",
-                    handler_key="menu_option",
-                )
+        # Find matching config (exact-match table)
+        config = ctx.config_loader.matcher.exact("menu_option", message_clean)
+        if config is not None:
+            logger.info(f"[MATCHER] Menu option matched: {config.trigger_value}")
+            return MatchResult(
+                config=config,
+                match_type="menu_option",
+                handler_key="menu_option",
+            )
 
         return None
 
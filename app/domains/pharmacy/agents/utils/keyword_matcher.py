@@ -40,7 +40,9 @@ class KeywordMatcher:
     Matches user input against database-stored keywords/lemmas.
 
     Uses the domain_intent_cache to load patterns from the database
-    with multi-layer caching (Memory → Redis → DB).
+    with multi-layer caching (Memory → Redis → DB), and its compiled
+    Aho-Corasick automaton to find every intent keyword in one pass over
+    the message.
 
     All methods are static for easy usage without instantiation.
     """
@@ -74,23 +76,8 @@ class KeywordMatcher:
             return False
 
         try:
-            patterns = await domain_intent_cache.get_patterns(db, organization_id, domain_key)
-            intent_data = patterns.get("intents", {}).get(intent_key)
-
-            if not intent_data:
-                logger.debug(f"Intent '{intent_key}' not found in patterns for org {organization_id}")
-                return False
-
-            # Get lemmas and keywords from intent
-            lemmas = intent_data.get("lemmas", [])
-            keywords = intent_data.get("keywords", [])
-            all_keywords = set(lemmas) | set(keywords)
-
-            if not all_keywords:
-                return False
-
-            message_lower = message.lower().strip()
-            return any(kw in message_lower for kw in all_keywords)
+            automaton = await domain_intent_cache.get_keyword_automaton(db, organization_id, domain_key)
+            return intent_key in automaton.find(message.lower().strip())
 
         except Exception as e:
             logger.warning(f"Error checking intent match for '{intent_key}': {e}")
@@ -121,18 +108,8 @@ class KeywordMatcher:
             return []
 
         try:
-            patterns = await domain_intent_cache.get_patterns(db, organization_id, domain_key)
-            intent_data = patterns.get("intents", {}).get(intent_key)
-
-            if not intent_data:
-                return []
-
-            lemmas = intent_data.get("lemmas", [])
-            keywords = intent_data.get("keywords", [])
-            all_keywords = set(lemmas) | set(keywords)
-
-            message_lower = message.lower().strip()
-            return [kw for kw in all_keywords if kw in message_lower]
+            automaton = await domain_intent_cache.get_keyword_automaton(db, organization_id, domain_key)
+            return automaton.find(message.lower().strip()).get(intent_key, [])
 
         except Exception as e:
             logger.warning(f"Error getting matched keywords for '{intent_key}': {e}")
@@ -159,10 +136,18 @@ class KeywordMatcher:
         Returns:
             First matching intent_key, or None if no match
         """
-        for intent_key in intent_keys:
-            if await KeywordMatcher.matches_intent(db, organization_id, message, intent_key, domain_key):
-                return intent_key
-        return None
+        if not message:
+            return None
+
+        try:
+            automaton = await domain_intent_cache.get_keyword_automaton(db, organization_id, domain_key)
+            matched = automaton.find(message.lower().strip())
+        except Exception as e:
+            logger.warning(f"Error checking intent matches for {intent_keys}: {e}")
+            return None
+
+        # One automaton pass for all intents; first listed intent wins
+        return next((intent_key for intent_key in intent_keys if intent_key in matched), None)
 
 
 __all__ = ["KeywordMatcher"]
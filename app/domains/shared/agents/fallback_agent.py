@@ -30,6 +30,7 @@ from app.domains.excelencia.application.services.support_response import (
 )
 from app.integrations.llm import VllmLLM
 from app.integrations.llm.model_provider import ModelComplexity
+from app.integrations.llm.streaming import astream_response
 from app.prompts.manager import PromptManager
 from app.prompts.registry import PromptRegistry
 
@@ -180,8 +181,7 @@ class FallbackAgent(BaseAgent):
         try:
             # Use configured model for user-facing responses
             llm = self.llm.get_llm(complexity=ModelComplexity.SIMPLE, temperature=0.7)
-            response = await llm.ainvoke(prompt)
-            return response.content  # type: ignore
+            return await astream_response(llm, prompt, agent=self.name)
         except Exception as e:
             logger.error(f"Error generating fallback response: {str(e)}")
             return await self._get_default_response(language)
@@ -10,6 +10,7 @@ from app.core.agents import BaseAgent
 from app.core.utils.tracing import trace_async_method
 from app.integrations.llm import VllmLLM
 from app.integrations.llm.model_provider import ModelComplexity
+from app.integrations.llm.streaming import astream_response
 from app.prompts.manager import PromptManager
 from app.prompts.registry import PromptRegistry
 
@@ -89,8 +90,7 @@ class FarewellAgent(BaseAgent):
 
             # Use configured model for user-facing responses
             llm = self.llm.get_llm(complexity=ModelComplexity.SIMPLE, temperature=0.8)
-            response = await llm.ainvoke(prompt)
-            return response.content  # type: ignore
+            return await astream_response(llm, prompt, agent=self.name)
         except Exception as e:
             logger.error(f"Error generating farewell: {str(e)}")
             return await self._get_default_farewell(has_interacted)
@@ -24,6 +24,7 @@ from app.core.agents import BaseAgent
 from app.core.utils.tracing import trace_async_method
 from app.integrations.llm import VllmLLM
 from app.integrations.llm.model_provider import ModelComplexity
+from app.integrations.llm.streaming import astream_response
 from app.prompts.manager import PromptManager
 from app.prompts.registry import PromptRegistry
 from app.utils.language_detector import LanguageDetector
@@ -166,7 +167,7 @@ class GreetingAgent(BaseAgent):
         """
         # Detectar idioma usando LanguageDetector
         try:
-            detection_result = self.language_detector.detect_language(message)
+            detection_result = await self.language_detector.adetect_language(message)
             detected_language = detection_result["language"]
             confidence = detection_result["confidence"]
 
@@ -240,21 +241,7 @@ class GreetingAgent(BaseAgent):
 
             # Generar respuesta con LLM
             llm = self.llm.get_llm(complexity=ModelComplexity.SIMPLE, temperature=self.temperature)
-            response = await llm.ainvoke(full_prompt)
-
-            # Extraer el contenido de la respuesta
-            if hasattr(response, "content"):
-                content = response.content
-                # Manejar content que puede ser string o lista
-                if isinstance(content, str):
-                    return content.strip()
-                elif isinstance(content, list):
-                    # Si es lista, unir todos los elementos como texto
-                    return " ".join(str(item) for item in content).strip()
-                else:
-                    return str(content).strip()
-            else:
-                return str(response).strip()
+            return await astream_response(llm, full_prompt, agent=self.name)
 
         except Exception as e:
             logger.error(f"Error generating greeting with YAML prompt: {str(e)}")
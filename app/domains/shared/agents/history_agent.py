@@ -10,7 +10,9 @@ History Agent - Conversation History Management
 This agent manages conversation context by:
 1. Loading existing context at conversation start
 2. Generating LLM-based rolling summaries
-3. Updating context after each conversation turn
+3. Updating context after each conversation turn, either inline or through
+   the write-behind pipeline (enqueue_update), which persists the turn and
+   regenerates the summary after the response has been sent
 
 NOTE: This is NOT a graph node. It's used by the middleware pattern in graph.py
 """
@@ -21,11 +23,15 @@ from typing import Any
 from app.core.agents import BaseAgent
 from app.core.utils.tracing import trace_async_method
 from app.integrations.llm import VllmLLM
+from app.integrations.llm.gateway import LLMPriority, llm_priority
 from app.integrations.llm.model_provider import ModelComplexity
 from app.models.conversation_context import ConversationContextModel
 from app.prompts.manager import PromptManager
 from app.prompts.registry import PromptRegistry
-from app.services.conversation_context_service import ConversationContextService
+from app.services.conversation_context_service import (
+    SUMMARY_TURN_KEY,
+    ConversationContextService,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -158,23 +164,8 @@ class HistoryAgent(BaseAgent):
         Returns:
             Updated ConversationContextModel
         """
-        # Get current context if not provided
-        if current_context is None:
-            current_context = await self.context_service.get_or_create_context(
-                conversation_id
-            )
-
-        # Update basic fields
-        current_context.update_from_exchange(user_message, bot_response)
-
-        # Save the agent that processed this message for flow continuity
-        if agent_name:
-            current_context.last_agent = agent_name
-
-        # Check if we should regenerate summary
-        should_summarize = (
-            current_context.total_turns % self.summary_interval == 0
-            and current_context.total_turns > 0
+        current_context, should_summarize = await self._apply_exchange(
+            conversation_id, user_message, bot_response, current_context, agent_name
         )
 
         if should_summarize:
@@ -188,6 +179,7 @@ class HistoryAgent(BaseAgent):
                     bot_response=bot_response,
                 )
                 current_context.rolling_summary = new_summary
+                current_context.metadata[SUMMARY_TURN_KEY] = current_context.total_turns
                 logger.debug(f"Summary updated: {new_summary[:100]}...")
             except Exception as e:
                 logger.error(f"Error generating summary: {e}")
@@ -214,6 +206,60 @@ class HistoryAgent(BaseAgent):
 
         return current_context
 
+    @trace_async_method(
+        name="history_agent_enqueue_update",
+        run_type="chain",
+        metadata={"agent_type": "history", "operation": "enqueue_update"},
+    )
+    async def enqueue_update(
+        self,
+        conversation_id: str,
+        user_message: str,
+        bot_response: str,
+        current_context: ConversationContextModel | None = None,
+        agent_name: str | None = None,
+    ) -> ConversationContextModel:
+        """
+        Update the cached context now and persist the exchange write-behind.
+
+        Only the Redis context cache is written on the response path; the
+        summary, PostgreSQL context and messages are handled by
+        ConversationWriteBehind.
+
+        Args:
+            conversation_id: Unique conversation identifier
+            user_message: The user's message
+            bot_response: The assistant's response
+            current_context: Optional existing context (avoids extra lookup)
+            agent_name: Name of the agent that generated the response
+
+        Returns:
+            Updated ConversationContextModel (summary not yet regenerated)
+        """
+        from app.services.conversation_write_behind import (
+            ContextWriteJob,
+            get_conversation_write_behind,
+        )
+
+        current_context, should_summarize = await self._apply_exchange(
+            conversation_id, user_message, bot_response, current_context, agent_name
+        )
+        await self.context_service.cache_context(conversation_id, current_context)
+
+        write_behind = get_conversation_write_behind()
+        write_behind.set_summarizer(self.summarize)
+        await write_behind.submit(
+            ContextWriteJob(
+                conversation_id=conversation_id,
+                context=current_context.model_copy(deep=True),
+                user_message=user_message,
+                bot_response=bot_response,
+                agent_name=agent_name,
+                summarize=should_summarize,
+            )
+        )
+        return current_context
+
     @trace_async_method(
         name="history_agent_summarize",
         run_type="llm",
@@ -270,6 +316,35 @@ class HistoryAgent(BaseAgent):
     # Private Helper Methods
     # =========================================================================
 
+    async def _apply_exchange(
+        self,
+        conversation_id: str,
+        user_message: str,
+        bot_response: str,
+        current_context: ConversationContextModel | None,
+        agent_name: str | None,
+    ) -> tuple[ConversationContextModel, bool]:
+        """Apply an exchange to the context and decide whether to summarize."""
+        # Get current context if not provided
+        if current_context is None:
+            current_context = await self.context_service.get_or_create_context(
+                conversation_id
+            )
+
+        # Update basic fields
+        current_context.update_from_exchange(user_message, bot_response)
+
+        # Save the agent that processed this message for flow continuity
+        if agent_name:
+            current_context.last_agent = agent_name
+
+        # Check if we should regenerate summary
+        should_summarize = (
+            current_context.total_turns % self.summary_interval == 0
+            and current_context.total_turns > 0
+        )
+        return current_context, should_summarize
+
     async def _generate_summary(
         self,
         previous_summary: str,
@@ -301,7 +376,9 @@ class HistoryAgent(BaseAgent):
             temperature=DEFAULT_SUMMARY_TEMPERATURE,
         )
 
-        result = await llm.ainvoke(prompt)
+        # Summaries are not on the reply's path: yield vLLM to user-facing calls
+        with llm_priority(LLMPriority.BACKGROUND):
+            result = await llm.ainvoke(prompt)
         summary = result.content.strip()
 
         # Truncate if too long
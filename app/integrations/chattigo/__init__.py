@@ -50,6 +50,8 @@ from .models import (
     ChattigoWebhookPayload,
 )
 from .payload_builder import ChattigoPayloadBuilder
+from .rate_limiter import DIDRateLimiter, TokenBucket, get_did_rate_limiter, get_did_rate_limiter_stats
+from .send_queue import ChattigoSendQueue, get_chattigo_send_queue
 from .token_models import ChattigoTokenData
 
 __all__ = [
@@ -77,4 +79,12 @@ __all__ = [
     "ChattigoLoginResponse",
     # Token Storage (Redis)
     "ChattigoTokenData",
+    # Outbound rate limiting per DID
+    "DIDRateLimiter",
+    "TokenBucket",
+    "get_did_rate_limiter",
+    "get_did_rate_limiter_stats",
+    # Outbound send queue
+    "ChattigoSendQueue",
+    "get_chattigo_send_queue",
 ]
@@ -20,10 +20,18 @@ Components (extracted to separate modules for SRP):
 - http_client.py: ChattigoHttpClient (with retry 401)
 - payload_builder.py: ChattigoPayloadBuilder
 - multi_did_adapter.py: ChattigoMultiDIDAdapter
+
+Adapters are pooled per DID: credentials are looked up and decrypted once
+and every adapter sends through the shared HTTP pool, so replies do not pay
+a DB lookup and a new TLS connection each. invalidate() drops a DID's
+adapter in every process via the cache invalidation bus; pooled adapters
+also expire like the L1 config caches (bus memory_ttl()).
 """
 
-from typing import TYPE_CHECKING
+import time
+from typing import TYPE_CHECKING, Any
 
+from app.core.cache.invalidation_bus import cache_invalidation_bus
 from app.core.tenancy import (
     ChattigoCredentialService,
     get_chattigo_credential_service,
@@ -57,6 +65,9 @@ class ChattigoAdapterFactory:
     for efficient token management.
     """
 
+    # Seconds a pooled adapter is reused while the invalidation bus is down
+    ADAPTER_TTL_SECONDS = 300
+
     def __init__(
         self,
         credential_service: ChattigoCredentialService | None = None,
@@ -71,6 +82,8 @@ class ChattigoAdapterFactory:
         """
         self._credential_service = credential_service or get_chattigo_credential_service()
         self._token_cache = token_cache or ChattigoTokenCache()
+        # Pooled adapters per DID with their creation time
+        self._adapters: dict[str, tuple[ChattigoMultiDIDAdapter, float]] = {}
 
     @property
     def token_cache(self) -> ChattigoTokenCache:
@@ -81,24 +94,60 @@ class ChattigoAdapterFactory:
         self, db: "AsyncSession", did: str
     ) -> ChattigoMultiDIDAdapter:
         """
-        Get adapter configured for a specific DID.
+        Get the pooled adapter of a DID.
 
         Args:
-            db: Database session
+            db: Database session (used when credentials must be read)
             did: WhatsApp Business phone number (DID)
 
         Returns:
-            ChattigoMultiDIDAdapter configured for the DID
+            ChattigoMultiDIDAdapter configured for the DID, shared by callers
 
         Raises:
             CredentialNotFoundError: If no credentials exist for DID
         """
-        credentials = await self._credential_service.get_credentials_by_did(db, did)
+        pooled = self._adapters.get(did)
+        max_age = cache_invalidation_bus.memory_ttl(self.ADAPTER_TTL_SECONDS)
+        if pooled is not None and time.monotonic() - pooled[1] < max_age:
+            return pooled[0]
 
-        return ChattigoMultiDIDAdapter(
+        credentials = await self._credential_service.get_credentials_by_did(db, did)
+        adapter = ChattigoMultiDIDAdapter(
             credentials=credentials,
             token_cache=self._token_cache,
+            pooled=True,
         )
+        self._adapters[did] = (adapter, time.monotonic())
+        return adapter
+
+    async def invalidate(self, did: str) -> None:
+        """
+        Drop the pooled adapter and cached token of a DID in every process.
+
+        Call after its credentials are updated or deleted.
+
+        Args:
+            did: WhatsApp Business phone number (DID)
+        """
+        self.invalidate_local({"did": did})
+        await self._token_cache.invalidate(did)
+        await cache_invalidation_bus.publish("chattigo_adapters", did=did)
+
+    def invalidate_local(self, payload: dict[str, Any]) -> None:
+        """
+        Drop pooled adapters of this process (bus handler).
+
+        Pooled adapters hold no connections of their own, so dropping them
+        is enough; in-flight sends finish with the old credentials.
+
+        Args:
+            payload: {"did": ...}, or empty for all DIDs
+        """
+        did = payload.get("did")
+        if did:
+            self._adapters.pop(did, None)
+        else:
+            self._adapters.clear()
 
     async def get_adapter_for_webhook(
         self, db: "AsyncSession", chattigo_context: dict
@@ -123,8 +172,20 @@ class ChattigoAdapterFactory:
 
         return await self.get_adapter(db, did)
 
+    def get_stats(self) -> dict[str, Any]:
+        """Get pooled adapter statistics."""
+        now = time.monotonic()
+        return {
+            "pooled_adapters": len(self._adapters),
+            "dids": {did: {"age_seconds": round(now - created, 1)} for did, (_, created) in self._adapters.items()},
+        }
+
     async def close(self) -> None:
-        """Close factory resources."""
+        """Close pooled adapters and factory resources."""
+        adapters = [adapter for adapter, _ in self._adapters.values()]
+        self._adapters.clear()
+        for adapter in adapters:
+            await adapter.aclose()
         await self._token_cache.close()
 
 
@@ -137,4 +198,5 @@ def get_chattigo_adapter_factory() -> ChattigoAdapterFactory:
     global _adapter_factory
     if _adapter_factory is None:
         _adapter_factory = ChattigoAdapterFactory()
+        cache_invalidation_bus.register("chattigo_adapters", _adapter_factory.invalidate_local)
     return _adapter_factory
@@ -8,6 +8,8 @@ Chattigo Integration Exceptions.
 Single Responsibility: Define exception types for Chattigo operations.
 """
 
+import httpx
+
 
 class ChattigoTokenError(Exception):
     """Error obtaining or refreshing Chattigo token."""
@@ -43,4 +45,16 @@ class ChattigoRateLimitError(ChattigoSendError):
     respecting the Retry-After header if provided.
     """
 
-    pass
+    def __init__(self, message: str, retry_after: float | None = None) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+# httpx errors raised before the request reached Chattigo, so resending
+# cannot deliver the message twice. Read timeouts and protocol errors happen
+# after the POST was sent and must not be retried by callers.
+UNSENT_REQUEST_ERRORS: tuple[type[httpx.TransportError], ...] = (
+    httpx.ConnectError,
+    httpx.ConnectTimeout,
+    httpx.PoolTimeout,
+)
@@ -30,6 +30,8 @@ from tenacity import (
     wait_exponential_jitter,
 )
 
+from app.integrations.http_pool import get_shared_http_client
+
 from .exceptions import ChattigoRateLimitError, ChattigoRetryableError, ChattigoSendError
 
 logger = logging.getLogger(__name__)
@@ -51,6 +53,8 @@ class ChattigoHttpClient:
     - 4xx: Fail immediately (client error, needs code fix)
 
     Uses persistent AsyncClient for better performance (connection reuse).
+    Pooled clients send through the process-wide shared HTTP pool instead,
+    so every DID reuses the same keep-alive connections to Chattigo.
     """
 
     DEFAULT_TIMEOUT = 30.0
@@ -66,6 +70,7 @@ class ChattigoHttpClient:
         token_provider: Callable[[], Awaitable[str]],
         token_invalidator: Callable[[], Any],  # May return coroutine or None
         timeout: float = DEFAULT_TIMEOUT,
+        pooled: bool = False,
     ) -> None:
         """
         Initialize HTTP client.
@@ -75,10 +80,12 @@ class ChattigoHttpClient:
             token_invalidator: Callable to invalidate current token (on 401).
                               May be sync (returns None) or return a coroutine.
             timeout: Request timeout in seconds
+            pooled: Use the shared HTTP pool instead of an own AsyncClient
         """
         self._get_token = token_provider
         self._token_invalidator = token_invalidator
         self._timeout = timeout
+        self._pooled = pooled
         self._client: httpx.AsyncClient | None = None
 
     async def _invalidate_token(self) -> None:
@@ -96,8 +103,8 @@ class ChattigoHttpClient:
                 await result
 
     async def initialize(self) -> None:
-        """Initialize persistent HTTP client."""
-        if self._client is None:
+        """Initialize persistent HTTP client (no-op when pooled)."""
+        if self._client is None and not self._pooled:
             self._client = httpx.AsyncClient(timeout=self._timeout)
 
     async def close(self) -> None:
@@ -117,6 +124,8 @@ class ChattigoHttpClient:
 
     async def _ensure_client(self) -> httpx.AsyncClient:
         """Ensure HTTP client is initialized."""
+        if self._pooled:
+            return get_shared_http_client()
         if self._client is None:
             await self.initialize()
         return self._client  # type: ignore
@@ -202,6 +211,7 @@ class ChattigoHttpClient:
             url,
             headers=self._get_headers(token),
             json=payload,
+            timeout=self._timeout,
         )
 
         # 401: Token expired - refresh and retry once (inline)
@@ -215,6 +225,7 @@ class ChattigoHttpClient:
                 url,
                 headers=self._get_headers(token),
                 json=payload,
+                timeout=self._timeout,
             )
 
             # If still 401, fail
@@ -228,7 +239,8 @@ class ChattigoHttpClient:
             retry_after = response.headers.get("Retry-After", "60")
             logger.warning(f"Rate limited (429), Retry-After: {retry_after}s")
             raise ChattigoRateLimitError(
-                f"Rate limited by Chattigo API. Retry after {retry_after}s"
+                f"Rate limited by Chattigo API. Retry after {retry_after}s",
+                retry_after=float(retry_after) if retry_after.isdigit() else None,
             )
 
         # 5xx: Server error - raise retryable error (tenacity will retry)
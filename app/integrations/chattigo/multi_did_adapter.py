@@ -34,12 +34,17 @@ class ChattigoMultiDIDAdapter:
     - ChattigoHttpClient: HTTP communication with retry
     - ChattigoPayloadBuilder: WhatsApp Cloud API payload construction
     - ChattigoTokenCache: Token management (via http_client)
+
+    Pooled adapters (kept by ChattigoAdapterFactory, one per DID) send through
+    the shared HTTP pool and survive `close()`/`async with`; `aclose()` or
+    the factory releases them.
     """
 
     def __init__(
         self,
         credentials: ChattigoCredentials,
         token_cache: ChattigoTokenCache,
+        pooled: bool = False,
     ) -> None:
         """
         Initialize adapter with credentials and token cache.
@@ -47,9 +52,11 @@ class ChattigoMultiDIDAdapter:
         Args:
             credentials: Decrypted Chattigo credentials for this DID
             token_cache: Shared token cache
+            pooled: Shared by callers (close() keeps it usable)
         """
         self._credentials = credentials
         self._token_cache = token_cache
+        self._pooled = pooled
         self._payload_builder = ChattigoPayloadBuilder()
         self._http_client: ChattigoHttpClient | None = None
 
@@ -85,6 +92,7 @@ class ChattigoMultiDIDAdapter:
                 token_invalidator=lambda: self._token_cache.invalidate(
                     self._credentials.did
                 ),
+                pooled=self._pooled,
             )
         return self._http_client
 
@@ -94,7 +102,12 @@ class ChattigoMultiDIDAdapter:
         await client.initialize()
 
     async def close(self) -> None:
-        """Close HTTP client."""
+        """Close HTTP client (pooled adapters stay open)."""
+        if not self._pooled:
+            await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close HTTP client, also of a pooled adapter."""
         if self._http_client:
             await self._http_client.close()
             self._http_client = None
@@ -0,0 +1,212 @@
+# ============================================================================
+# SCOPE: MULTI-TENANT
+# Description: Token-bucket rate limiting of outbound messages per Chattigo DID.
+# Tenant-Aware: Yes - one limiter per DID (WhatsApp Business number).
+# ============================================================================
+"""
+Chattigo DID Rate Limiter.
+
+Outbound sends of one WhatsApp Business number (DID) share two token buckets:
+
+- Throughput: messages per second the number may send (burst of one second)
+- Daily: business-initiated messages per rolling 24h, matched to the
+  WhatsApp messaging tier of the number (1K / 10K / 100K / unlimited)
+
+Callers reserve a slot with `acquire()`; reservations are served in order, so
+concurrent senders of the same DID are spread out instead of bursting.
+A 429 from Chattigo pauses every sender of the DID via `penalize()`.
+
+Usage:
+    limiter = get_did_rate_limiter(did)
+    if await limiter.acquire(max_wait=60):
+        await adapter.send_message(msisdn, message)
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Callable
+from typing import Any
+
+from app.config.settings import get_settings
+from app.core.infrastructure.monitoring import metrics_collector
+
+logger = logging.getLogger(__name__)
+
+DAY_SECONDS = 86400.0
+
+# Business-initiated messages per 24h allowed by each WhatsApp messaging tier
+WHATSAPP_TIER_LIMITS: dict[str, int | None] = {
+    "tier_1k": 1_000,
+    "tier_10k": 10_000,
+    "tier_100k": 100_000,
+    "unlimited": None,
+}
+
+
+class TokenBucket:
+    """Token bucket with ordered reservations.
+
+    Tokens refill at `rate` per second up to `capacity`. A reservation takes
+    one token even when none is left; the balance then goes negative and the
+    caller waits until it is paid back, so waiters are served in order.
+    """
+
+    def __init__(self, rate: float, capacity: float, clock: Callable[[], float] = time.monotonic) -> None:
+        """Initialize a full bucket.
+
+        Args:
+            rate: Tokens added per second.
+            capacity: Max tokens held (burst size).
+            clock: Monotonic clock (injectable for tests).
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._tokens = capacity
+        self._updated = clock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    @property
+    def tokens(self) -> float:
+        """Current balance (negative while reservations are pending)."""
+        self._refill()
+        return self._tokens
+
+    def wait_time(self) -> float:
+        """Seconds a reservation made now would wait."""
+        deficit = 1 - self.tokens
+        return max(0.0, deficit / self.rate)
+
+    def reserve(self) -> float:
+        """Take one token.
+
+        Returns:
+            Seconds to wait before using it.
+        """
+        wait = self.wait_time()
+        self._tokens -= 1
+        return wait
+
+    def drain(self, seconds: float) -> None:
+        """Empty the bucket so the next token is available in `seconds`."""
+        self._refill()
+        self._tokens = min(self._tokens, 1 - seconds * self.rate)
+
+
+class DIDRateLimiter:
+    """Throughput and daily token buckets of one Chattigo DID."""
+
+    def __init__(
+        self,
+        did: str,
+        messages_per_second: float = 20.0,
+        tier: str = "tier_1k",
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the limiter.
+
+        Args:
+            did: WhatsApp Business number.
+            messages_per_second: Sustained send rate of the number.
+            tier: WhatsApp messaging tier (key of WHATSAPP_TIER_LIMITS).
+            clock: Monotonic clock (injectable for tests).
+        """
+        if tier not in WHATSAPP_TIER_LIMITS:
+            logger.warning(f"Unknown WhatsApp messaging tier '{tier}' for DID {did}, using tier_1k")
+            tier = "tier_1k"
+
+        self.did = did
+        self.tier = tier
+        self._throughput = TokenBucket(messages_per_second, max(1.0, messages_per_second), clock)
+        daily_limit = WHATSAPP_TIER_LIMITS[tier]
+        self._daily = TokenBucket(daily_limit / DAY_SECONDS, daily_limit, clock) if daily_limit else None
+        self._stats = {"acquired": 0, "rejected": 0, "penalties": 0, "waited_seconds": 0.0}
+
+    def wait_time(self, daily: bool = True) -> float:
+        """Seconds the next send would wait."""
+        wait = self._throughput.wait_time()
+        if daily and self._daily is not None:
+            wait = max(wait, self._daily.wait_time())
+        return wait
+
+    async def acquire(self, max_wait: float | None = None, daily: bool = True) -> bool:
+        """Reserve a send slot and wait for it.
+
+        Args:
+            max_wait: Max seconds to wait (None waits as long as needed).
+            daily: Count against the daily tier budget. Replies inside a
+                conversation the user opened only take throughput.
+
+        Returns:
+            True when the caller may send, False if the wait would exceed
+            max_wait (nothing is reserved; e.g. daily tier limit reached).
+        """
+        if max_wait is not None and self.wait_time(daily) > max_wait:
+            self._stats["rejected"] += 1
+            metrics_collector.increment("chattigo_rate_limit_rejected_total", labels={"did": self.did})
+            return False
+
+        wait = self._throughput.reserve()
+        if daily and self._daily is not None:
+            wait = max(wait, self._daily.reserve())
+
+        self._stats["acquired"] += 1
+        if wait > 0:
+            self._stats["waited_seconds"] += wait
+            metrics_collector.observe("chattigo_rate_limit_wait_seconds", wait, {"did": self.did})
+            await asyncio.sleep(wait)
+        return True
+
+    def penalize(self, seconds: float) -> None:
+        """Pause all sends of the DID after Chattigo answered 429.
+
+        Args:
+            seconds: Pause length (Retry-After).
+        """
+        self._throughput.drain(seconds)
+        self._stats["penalties"] += 1
+        logger.warning(f"Chattigo rate limited DID {self.did}, pausing sends for {seconds:.0f}s")
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get limiter statistics."""
+        return {
+            **self._stats,
+            "did": self.did,
+            "tier": self.tier,
+            "messages_per_second": self._throughput.rate,
+            "daily_remaining": int(max(0.0, self._daily.tokens)) if self._daily is not None else None,
+        }
+
+
+# Limiters keyed by DID
+_did_limiters: dict[str, DIDRateLimiter] = {}
+
+
+def get_did_rate_limiter(did: str) -> DIDRateLimiter:
+    """Get the shared rate limiter of a DID.
+
+    Args:
+        did: WhatsApp Business number.
+
+    Returns:
+        DIDRateLimiter shared by every sender of the DID in this process.
+    """
+    limiter = _did_limiters.get(did)
+    if limiter is None:
+        settings = get_settings()
+        limiter = _did_limiters[did] = DIDRateLimiter(
+            did,
+            messages_per_second=settings.CHATTIGO_MESSAGES_PER_SECOND,
+            tier=settings.CHATTIGO_MESSAGING_TIER,
+        )
+    return limiter
+
+
+def get_did_rate_limiter_stats() -> list[dict[str, Any]]:
+    """Get statistics of all DID limiters."""
+    return [limiter.get_stats() for limiter in _did_limiters.values()]
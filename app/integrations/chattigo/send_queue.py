@@ -0,0 +1,212 @@
+# ============================================================================
+# SCOPE: MULTI-TENANT
+# Description: Cola de envío saliente Chattigo: orden por destinatario,
+#              concurrencia acotada por DID y reintentos ante 429/errores de red.
+# Tenant-Aware: Yes - lanes per (DID, recipient), fairness per DID.
+# ============================================================================
+"""
+Chattigo Outbound Send Queue.
+
+Every outbound message of the process goes through one queue built on
+ConversationDispatcher:
+
+- Per-recipient ordering: messages to the same (DID, msisdn) are sent one
+  at a time, in submission order, so a reply split in several messages
+  never arrives shuffled
+- Bursts are drained concurrently across recipients, bounded globally and
+  per DID (round-robin between DIDs), over the pooled adapters' shared
+  keep-alive connections
+- Each send takes a throughput slot of the DID's token bucket
+- 429: the DID is paused for Retry-After and the send is retried;
+  errors raised before the request reached Chattigo (connect, pool
+  timeout) are retried with exponential backoff and jitter. Read timeouts
+  and other errors fail at once: the message may already be delivered
+  (5xx are already retried by ChattigoHttpClient)
+- Latency: queue wait and send duration are reported as histograms
+
+Usage:
+    queue = get_chattigo_send_queue()
+    result = await queue.send(did, msisdn, lambda: adapter.send_message(msisdn, text))
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any, TypeVar
+
+from app.core.conversation_dispatcher import ConversationDispatcher
+from app.core.infrastructure.monitoring import metrics_collector
+
+from .exceptions import UNSENT_REQUEST_ERRORS, ChattigoRateLimitError
+from .rate_limiter import get_did_rate_limiter
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Pause after a 429 without Retry-After
+RATE_LIMITED_DELAY = 30.0
+
+
+class ChattigoSendQueue:
+    """Ordered, bounded and retrying outbound delivery for all DIDs."""
+
+    def __init__(
+        self,
+        max_concurrency: int = 32,
+        max_per_did: int = 16,
+        max_pending: int = 10000,
+        max_attempts: int = 3,
+        retry_base_delay: float = 1.0,
+        retry_max_delay: float = 30.0,
+    ) -> None:
+        """
+        Initialize the queue.
+
+        Args:
+            max_concurrency: Max sends in flight in the process
+            max_per_did: Max sends in flight per DID
+            max_pending: Max sends waiting (submit raises QueueFull beyond it)
+            max_attempts: Attempts per message (first send included)
+            retry_base_delay: Backoff of the first retry in seconds
+            retry_max_delay: Max backoff in seconds
+        """
+        self._dispatcher = ConversationDispatcher(
+            max_concurrency=max_concurrency,
+            max_per_tenant=max_per_did,
+            max_pending=max_pending,
+        )
+        self.max_attempts = max(1, max_attempts)
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self._stats = {"sent": 0, "failed": 0, "retries": 0, "rate_limited": 0}
+
+    async def send(
+        self,
+        did: str,
+        msisdn: str,
+        send: Callable[[], Awaitable[T]],
+        kind: str = "text",
+    ) -> T:
+        """
+        Queue a send and wait for its delivery.
+
+        Args:
+            did: Sending WhatsApp Business number
+            msisdn: Recipient phone number
+            send: Performs the API call (called again on retry)
+            kind: Message kind for metrics (text, buttons, list, document...)
+
+        Returns:
+            Result of `send`
+
+        Raises:
+            asyncio.QueueFull: If the queue is full
+            Exception: The send's last error after all attempts
+        """
+        enqueued_at = time.monotonic()
+        future = self._dispatcher.submit(
+            session_id=f"{did}:{msisdn}",
+            tenant_id=did,
+            factory=lambda: self._deliver(did, kind, send, enqueued_at),
+        )
+        return await future
+
+    async def _deliver(
+        self,
+        did: str,
+        kind: str,
+        send: Callable[[], Awaitable[T]],
+        enqueued_at: float,
+    ) -> T:
+        """Send one message, retrying 429s and errors raised before the request was sent."""
+        labels = {"did": did, "kind": kind}
+        metrics_collector.observe("chattigo_send_queue_wait_seconds", time.monotonic() - enqueued_at, labels)
+        limiter = get_did_rate_limiter(did)
+
+        attempt = 0
+        while True:
+            attempt += 1
+            await limiter.acquire(daily=False)
+            started = time.monotonic()
+            try:
+                result = await send()
+            except ChattigoRateLimitError as e:
+                self._stats["rate_limited"] += 1
+                # The next acquire() waits out the pause in the DID's bucket
+                limiter.penalize(RATE_LIMITED_DELAY if e.retry_after is None else e.retry_after)
+                if attempt == self.max_attempts:
+                    self._record_failure(labels, "rate_limited")
+                    raise
+                delay = random.uniform(0, self.retry_base_delay)
+            except UNSENT_REQUEST_ERRORS as e:
+                if attempt == self.max_attempts:
+                    self._record_failure(labels, "connection_error")
+                    raise
+                delay = min(self.retry_max_delay, self.retry_base_delay * 2 ** (attempt - 1))
+                delay += random.uniform(0, self.retry_base_delay)
+                logger.warning(f"Chattigo send via DID {did} failed ({e}), retrying in {delay:.1f}s")
+            except Exception:
+                self._record_failure(labels, "error")
+                raise
+            else:
+                metrics_collector.observe("chattigo_send_duration_seconds", time.monotonic() - started, labels)
+                metrics_collector.observe("chattigo_send_latency_seconds", time.monotonic() - enqueued_at, labels)
+                metrics_collector.increment("chattigo_sends_total", labels={**labels, "outcome": "sent"})
+                self._stats["sent"] += 1
+                return result
+
+            self._stats["retries"] += 1
+            await asyncio.sleep(delay)
+
+    def _record_failure(self, labels: dict[str, str], outcome: str) -> None:
+        self._stats["failed"] += 1
+        metrics_collector.increment("chattigo_sends_total", labels={**labels, "outcome": outcome})
+
+    async def drain(self, timeout: float | None = None) -> None:
+        """Wait for in-flight sends to finish (used on shutdown)."""
+        await self._dispatcher.drain(timeout)
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get queue statistics."""
+        return {**self._stats, "dispatcher": self._dispatcher.get_stats()}
+
+
+# Global instance for singleton pattern
+_send_queue: ChattigoSendQueue | None = None
+
+
+def get_chattigo_send_queue() -> ChattigoSendQueue:
+    """Get or create the global outbound send queue."""
+    global _send_queue
+    if _send_queue is None:
+        from app.config.settings import get_settings
+
+        settings = get_settings()
+        _send_queue = ChattigoSendQueue(
+            max_concurrency=settings.CHATTIGO_SEND_MAX_CONCURRENCY,
+            max_per_did=settings.CHATTIGO_SEND_MAX_PER_DID,
+            max_attempts=settings.CHATTIGO_SEND_MAX_ATTEMPTS,
+        )
+    return _send_queue
+
+
+def get_chattigo_send_queue_stats() -> dict[str, Any] | None:
+    """Get statistics of the send queue (None if never used)."""
+    return _send_queue.get_stats() if _send_queue is not None else None
+
+
+async def shutdown_chattigo_send_queue(timeout: float = 10.0) -> None:
+    """Let in-flight sends finish and drop pooled adapters."""
+    global _send_queue
+    if _send_queue is not None:
+        await _send_queue.drain(timeout)
+        _send_queue = None
+
+    from .adapter_factory import get_chattigo_adapter_factory
+
+    get_chattigo_adapter_factory().invalidate_local({})
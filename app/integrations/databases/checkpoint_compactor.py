@@ -0,0 +1,330 @@
+"""
+Checkpoint compaction for LangGraph PostgreSQL checkpointer tables.
+
+Every graph super-step writes a new checkpoint, and WhatsApp threads are
+keyed by phone number (`whatsapp_{wa_id}`), so the checkpoints,
+checkpoint_blobs and checkpoint_writes tables grow with every turn of every
+returning customer. Only the latest checkpoint of a thread is read to resume
+a conversation.
+
+CheckpointCompactor:
+- prunes superseded checkpoints, keeping the most recent `keep_per_thread`
+  per (thread_id, checkpoint_ns), together with their pending writes and
+  the channel blobs they no longer reference;
+- deletes threads idle for more than `retention_days`;
+- reports checkpoint storage size per thread.
+
+Message history inside the latest checkpoint is bounded separately by the
+message window applied in the orchestrator node (see message_window.py).
+
+Blobs are only deleted when their version is older than the newest version
+referenced for the channel, so blobs written by an in-flight graph run
+(stored before its checkpoint row) are never removed.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable
+from contextlib import AbstractAsyncContextManager
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+SessionFactory = Callable[[], AbstractAsyncContextManager[AsyncSession]]
+
+_DELETE_SUPERSEDED_CHECKPOINTS = text(
+    """
+    DELETE FROM checkpoints c
+    USING (
+        SELECT checkpoint_ns, checkpoint_id,
+               row_number() OVER (PARTITION BY checkpoint_ns ORDER BY checkpoint_id DESC) AS rn
+        FROM checkpoints
+        WHERE thread_id = :thread_id
+    ) ranked
+    WHERE c.thread_id = :thread_id
+      AND c.checkpoint_ns = ranked.checkpoint_ns
+      AND c.checkpoint_id = ranked.checkpoint_id
+      AND ranked.rn > :keep
+    """
+)
+
+_DELETE_ORPHAN_WRITES = text(
+    """
+    DELETE FROM checkpoint_writes w
+    WHERE w.thread_id = :thread_id
+      AND NOT EXISTS (
+        SELECT 1 FROM checkpoints c
+        WHERE c.thread_id = w.thread_id
+          AND c.checkpoint_ns = w.checkpoint_ns
+          AND c.checkpoint_id = w.checkpoint_id
+      )
+    """
+)
+
+_DELETE_UNREFERENCED_BLOBS = text(
+    """
+    DELETE FROM checkpoint_blobs b
+    WHERE b.thread_id = :thread_id
+      AND NOT EXISTS (
+        SELECT 1 FROM checkpoints c
+        WHERE c.thread_id = b.thread_id
+          AND c.checkpoint_ns = b.checkpoint_ns
+          AND c.checkpoint -> 'channel_versions' ->> b.channel = b.version
+      )
+      AND b.version < (
+        SELECT max(c.checkpoint -> 'channel_versions' ->> b.channel)
+        FROM checkpoints c
+        WHERE c.thread_id = b.thread_id
+          AND c.checkpoint_ns = b.checkpoint_ns
+      )
+    """
+)
+
+_SELECT_THREADS_TO_PRUNE = text(
+    """
+    SELECT DISTINCT thread_id FROM (
+        SELECT thread_id
+        FROM checkpoints
+        GROUP BY thread_id, checkpoint_ns
+        HAVING count(*) > :keep
+        LIMIT :limit
+    ) t
+    """
+)
+
+_SELECT_IDLE_THREADS = text(
+    """
+    SELECT thread_id
+    FROM checkpoints
+    GROUP BY thread_id
+    HAVING max((checkpoint ->> 'ts')::timestamptz) < now() - make_interval(days => :days)
+    LIMIT :limit
+    """
+)
+
+_THREAD_SIZE = text(
+    """
+    SELECT
+        (SELECT count(*) FROM checkpoints WHERE thread_id = :thread_id),
+        (SELECT coalesce(sum(pg_column_size(checkpoint) + pg_column_size(metadata)), 0)
+           FROM checkpoints WHERE thread_id = :thread_id),
+        (SELECT count(*) FROM checkpoint_blobs WHERE thread_id = :thread_id),
+        (SELECT coalesce(sum(pg_column_size(blob)), 0) FROM checkpoint_blobs WHERE thread_id = :thread_id),
+        (SELECT count(*) FROM checkpoint_writes WHERE thread_id = :thread_id),
+        (SELECT coalesce(sum(pg_column_size(blob)), 0) FROM checkpoint_writes WHERE thread_id = :thread_id)
+    """
+)
+
+_LARGEST_THREADS = text(
+    """
+    SELECT thread_id, count(*) FILTER (WHERE kind = 'checkpoint') AS checkpoints, sum(bytes) AS total_bytes
+    FROM (
+        SELECT thread_id, 'checkpoint' AS kind, pg_column_size(checkpoint) + pg_column_size(metadata) AS bytes
+        FROM checkpoints
+        UNION ALL
+        SELECT thread_id, 'blob', coalesce(pg_column_size(blob), 0) FROM checkpoint_blobs
+        UNION ALL
+        SELECT thread_id, 'write', pg_column_size(blob) FROM checkpoint_writes
+    ) s
+    GROUP BY thread_id
+    ORDER BY total_bytes DESC
+    LIMIT :limit
+    """
+)
+
+
+@dataclass
+class CompactionResult:
+    """Counters of a compaction run."""
+
+    threads_pruned: int = 0
+    checkpoints_deleted: int = 0
+    writes_deleted: int = 0
+    blobs_deleted: int = 0
+    idle_threads_deleted: int = 0
+
+    def to_dict(self) -> dict[str, int]:
+        """Convert to dictionary for API response."""
+        return asdict(self)
+
+
+class CheckpointCompactor:
+    """
+    Prunes superseded LangGraph checkpoints and reports per-thread size.
+
+    Usage:
+        compactor = CheckpointCompactor(get_async_db_context, keep_per_thread=1, retention_days=30)
+        result = await compactor.compact()
+        stats = await compactor.get_thread_stats("whatsapp_5492641234567")
+    """
+
+    def __init__(
+        self,
+        session_factory: SessionFactory,
+        keep_per_thread: int = 1,
+        retention_days: int = 30,
+        batch_size: int = 500,
+    ):
+        if keep_per_thread < 1:
+            raise ValueError("keep_per_thread must be at least 1")
+
+        self._session_factory = session_factory
+        self.keep_per_thread = keep_per_thread
+        self.retention_days = retention_days
+        self.batch_size = batch_size
+
+    async def prune_thread(self, thread_id: str) -> CompactionResult:
+        """
+        Delete superseded checkpoints of one thread with their writes and blobs.
+
+        Args:
+            thread_id: Conversation thread (e.g. "whatsapp_{wa_id}")
+
+        Returns:
+            CompactionResult with deleted row counts
+        """
+        params = {"thread_id": thread_id, "keep": self.keep_per_thread}
+        async with self._session_factory() as session:
+            checkpoints = await session.execute(_DELETE_SUPERSEDED_CHECKPOINTS, params)
+            writes = await session.execute(_DELETE_ORPHAN_WRITES, params)
+            blobs = await session.execute(_DELETE_UNREFERENCED_BLOBS, params)
+            await session.commit()
+
+        return CompactionResult(
+            threads_pruned=1,
+            checkpoints_deleted=checkpoints.rowcount,
+            writes_deleted=writes.rowcount,
+            blobs_deleted=blobs.rowcount,
+        )
+
+    async def delete_idle_threads(self) -> int:
+        """
+        Delete all checkpoint data of threads idle for more than retention_days.
+
+        Returns:
+            Number of threads deleted
+        """
+        if self.retention_days <= 0:
+            return 0
+
+        async with self._session_factory() as session:
+            result = await session.execute(
+                _SELECT_IDLE_THREADS, {"days": self.retention_days, "limit": self.batch_size}
+            )
+            thread_ids = [row[0] for row in result.all()]
+            if not thread_ids:
+                return 0
+
+            for table in ("checkpoint_writes", "checkpoint_blobs", "checkpoints"):
+                await session.execute(
+                    text(f"DELETE FROM {table} WHERE thread_id = ANY(:thread_ids)"),  # noqa: S608
+                    {"thread_ids": thread_ids},
+                )
+            await session.commit()
+
+        return len(thread_ids)
+
+    async def compact(self) -> CompactionResult:
+        """
+        Run one compaction sweep (idle threads first, then superseded checkpoints).
+
+        Returns:
+            Aggregated CompactionResult
+        """
+        total = CompactionResult(idle_threads_deleted=await self.delete_idle_threads())
+
+        async with self._session_factory() as session:
+            result = await session.execute(
+                _SELECT_THREADS_TO_PRUNE, {"keep": self.keep_per_thread, "limit": self.batch_size}
+            )
+            thread_ids = [row[0] for row in result.all()]
+
+        for thread_id in thread_ids:
+            try:
+                pruned = await self.prune_thread(thread_id)
+            except Exception as e:
+                logger.warning(f"Error pruning checkpoints for thread {thread_id}: {e}")
+                continue
+            total.threads_pruned += 1
+            total.checkpoints_deleted += pruned.checkpoints_deleted
+            total.writes_deleted += pruned.writes_deleted
+            total.blobs_deleted += pruned.blobs_deleted
+
+        logger.info(f"Checkpoint compaction finished: {total.to_dict()}")
+        return total
+
+    async def get_thread_stats(self, thread_id: str) -> dict[str, Any]:
+        """
+        Get checkpoint storage size of one thread.
+
+        Args:
+            thread_id: Conversation thread
+
+        Returns:
+            Row counts and bytes per checkpoint table, plus total bytes
+        """
+        async with self._session_factory() as session:
+            result = await session.execute(_THREAD_SIZE, {"thread_id": thread_id})
+            row = result.one()
+
+        checkpoints, checkpoint_bytes, blobs, blob_bytes, writes, write_bytes = (int(value) for value in row)
+        return {
+            "thread_id": thread_id,
+            "checkpoints": checkpoints,
+            "checkpoint_bytes": checkpoint_bytes,
+            "blobs": blobs,
+            "blob_bytes": blob_bytes,
+            "writes": writes,
+            "write_bytes": write_bytes,
+            "total_bytes": checkpoint_bytes + blob_bytes + write_bytes,
+        }
+
+    async def get_largest_threads(self, limit: int = 20) -> list[dict[str, Any]]:
+        """
+        Get the threads using the most checkpoint storage.
+
+        Args:
+            limit: Number of threads to return
+
+        Returns:
+            List of {thread_id, checkpoints, total_bytes}, largest first
+        """
+        async with self._session_factory() as session:
+            result = await session.execute(_LARGEST_THREADS, {"limit": limit})
+            rows = result.all()
+
+        return [
+            {"thread_id": thread_id, "checkpoints": int(checkpoints), "total_bytes": int(total_bytes)}
+            for thread_id, checkpoints, total_bytes in rows
+        ]
+
+
+def create_checkpoint_compactor(session_factory: SessionFactory | None = None) -> CheckpointCompactor:
+    """
+    Create a compactor configured from settings.
+
+    Args:
+        session_factory: Async session context factory (defaults to the app DB)
+
+    Returns:
+        Configured CheckpointCompactor
+    """
+    from app.config.settings import get_settings
+
+    if session_factory is None:
+        from app.database.async_db import get_async_db_context
+
+        session_factory = get_async_db_context
+
+    settings = get_settings()
+    return CheckpointCompactor(
+        session_factory,
+        keep_per_thread=settings.CHECKPOINT_KEEP_PER_THREAD,
+        retention_days=settings.CHECKPOINT_RETENTION_DAYS,
+        batch_size=settings.CHECKPOINT_COMPACTION_BATCH,
+    )
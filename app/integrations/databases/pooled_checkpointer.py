@@ -0,0 +1,98 @@
+"""
+Pooled LangGraph checkpointer.
+
+AsyncPostgresSaver guards every cursor with an instance-wide asyncio.Lock,
+so even when it is given an AsyncConnectionPool all checkpoint reads and
+writes of the process run one at a time. PooledAsyncPostgresSaver checks out
+a dedicated pool connection per operation instead, so checkpoint I/O of
+different conversations runs in parallel up to the pool size, and records
+how long each operation waited for a connection.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+
+from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
+from psycopg import AsyncCursor
+from psycopg.rows import DictRow, dict_row
+from psycopg_pool import AsyncConnectionPool
+
+logger = logging.getLogger(__name__)
+
+
+class PooledAsyncPostgresSaver(AsyncPostgresSaver):
+    """
+    AsyncPostgresSaver that runs concurrent operations on separate pool connections.
+
+    Usage:
+        pool = AsyncConnectionPool(conninfo=db_url, max_size=20, kwargs={"autocommit": True, ...})
+        await pool.open()
+        checkpointer = PooledAsyncPostgresSaver(pool)
+        await checkpointer.setup()
+    """
+
+    def __init__(self, conn: AsyncConnectionPool, **kwargs: Any) -> None:
+        super().__init__(conn, **kwargs)
+        self._wait_stats: dict[str, float] = {
+            "acquisitions": 0,
+            "total_wait_time": 0.0,
+            "max_wait_time": 0.0,
+        }
+
+    @asynccontextmanager
+    async def _cursor(self, *, pipeline: bool = False) -> AsyncIterator[AsyncCursor[DictRow]]:
+        """Create a cursor on a connection checked out for this operation only."""
+        pool = self.conn
+        if not isinstance(pool, AsyncConnectionPool):
+            async with super()._cursor(pipeline=pipeline) as cur:
+                yield cur
+            return
+
+        started = time.monotonic()
+        async with pool.connection() as conn:
+            self._record_wait(time.monotonic() - started)
+            if pipeline and self.supports_pipeline:
+                async with conn.pipeline(), conn.cursor(binary=True, row_factory=dict_row) as cur:
+                    yield cur
+            elif pipeline:
+                async with conn.transaction(), conn.cursor(binary=True, row_factory=dict_row) as cur:
+                    yield cur
+            else:
+                async with conn.cursor(binary=True, row_factory=dict_row) as cur:
+                    yield cur
+
+    def _record_wait(self, wait_time: float) -> None:
+        """Track time spent waiting for a pool connection."""
+        self._wait_stats["acquisitions"] += 1
+        self._wait_stats["total_wait_time"] += wait_time
+        self._wait_stats["max_wait_time"] = max(self._wait_stats["max_wait_time"], wait_time)
+
+    def get_pool_stats(self) -> dict[str, Any]:
+        """Get pool status and connection wait-time metrics."""
+        acquisitions = int(self._wait_stats["acquisitions"])
+        total_wait = self._wait_stats["total_wait_time"]
+        stats: dict[str, Any] = {
+            "acquisitions": acquisitions,
+            "avg_wait_ms": round(total_wait / acquisitions * 1000, 2) if acquisitions else 0.0,
+            "max_wait_ms": round(self._wait_stats["max_wait_time"] * 1000, 2),
+        }
+        if isinstance(self.conn, AsyncConnectionPool):
+            pool_stats = self.conn.get_stats()
+            stats.update(
+                {
+                    "pool_min": pool_stats.get("pool_min"),
+                    "pool_max": pool_stats.get("pool_max"),
+                    "pool_size": pool_stats.get("pool_size"),
+                    "pool_available": pool_stats.get("pool_available"),
+                    "requests_waiting": pool_stats.get("requests_waiting", 0),
+                    "requests_queued": pool_stats.get("requests_queued", 0),
+                    "requests_errors": pool_stats.get("requests_errors", 0),
+                    "connections_lost": pool_stats.get("connections_lost", 0),
+                }
+            )
+        return stats
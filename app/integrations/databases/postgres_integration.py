@@ -6,10 +6,14 @@ import logging
 from typing import Optional
 
 from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
+from psycopg.rows import dict_row
+from psycopg_pool import AsyncConnectionPool
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from app.config.settings import get_settings
+from app.integrations.databases.checkpoint_compactor import CheckpointCompactor, create_checkpoint_compactor
+from app.integrations.databases.pooled_checkpointer import PooledAsyncPostgresSaver
 
 logger = logging.getLogger(__name__)
 
@@ -23,7 +27,7 @@ class PostgreSQLIntegration:
 
         # Para checkpointing de LangGraph (usa psycopg internamente)
         self._checkpointer: AsyncPostgresSaver | None = None
-        self._checkpointer_context = None  # Context manager for cleanup
+        self._checkpoint_pool: AsyncConnectionPool | None = None
 
         # Para queries regulares
         self.engine = None
@@ -60,25 +64,50 @@ class PostgreSQLIntegration:
             raise
 
     async def _setup_checkpoint_connection(self):
-        """Configura conexión para checkpointing de LangGraph (async con psycopg)"""
+        """Configura el pool de conexiones para checkpointing de LangGraph (async con psycopg)"""
         try:
             # Asegurar URL sin driver específico (psycopg usa postgresql://)
             db_url = self.connection_string.replace("postgresql+asyncpg://", "postgresql://")
 
-            # AsyncPostgresSaver.from_conn_string usa psycopg internamente
-            # Guardamos el context manager para cleanup posterior
-            self._checkpointer_context = AsyncPostgresSaver.from_conn_string(db_url)
+            # Mismos parámetros que AsyncPostgresSaver.from_conn_string
+            connection_kwargs: dict[str, object] = {
+                "autocommit": True,
+                "prepare_threshold": 0,
+                "row_factory": dict_row,
+            }
+            if self.settings.CHECKPOINT_STATEMENT_TIMEOUT_MS > 0:
+                connection_kwargs["options"] = f"-c statement_timeout={self.settings.CHECKPOINT_STATEMENT_TIMEOUT_MS}"
+
+            self._checkpoint_pool = AsyncConnectionPool(
+                conninfo=db_url,
+                min_size=self.settings.CHECKPOINT_POOL_MIN_SIZE,
+                max_size=self.settings.CHECKPOINT_POOL_MAX_SIZE,
+                timeout=self.settings.CHECKPOINT_POOL_TIMEOUT,
+                max_idle=self.settings.CHECKPOINT_POOL_MAX_IDLE,
+                kwargs=connection_kwargs,
+                check=AsyncConnectionPool.check_connection if self.settings.CHECKPOINT_POOL_HEALTH_CHECK else None,
+                name="langgraph-checkpointer",
+                open=False,
+            )
+            await self._checkpoint_pool.open(wait=True, timeout=self.settings.CHECKPOINT_POOL_TIMEOUT)
 
-            # Entrar al context manager manualmente (se cierra en close())
-            self._checkpointer = await self._checkpointer_context.__aenter__()
+            # Una conexión del pool por operación: el I/O de checkpoints escala con la concurrencia
+            self._checkpointer = PooledAsyncPostgresSaver(self._checkpoint_pool)
 
             # Crear tablas de checkpointing si no existen
             await self._checkpointer.setup()
 
-            logger.info("PostgreSQL async checkpoint connection initialized (psycopg)")
+            logger.info(
+                f"PostgreSQL async checkpoint pool initialized (psycopg, "
+                f"min={self.settings.CHECKPOINT_POOL_MIN_SIZE}, max={self.settings.CHECKPOINT_POOL_MAX_SIZE})"
+            )
 
         except Exception as e:
             logger.error(f"Error initializing PostgreSQL checkpoint connection: {e}")
+            if self._checkpoint_pool is not None:
+                await self._checkpoint_pool.close()
+                self._checkpoint_pool = None
+            self._checkpointer = None
             raise
 
     def get_checkpointer(self) -> AsyncPostgresSaver:
@@ -93,6 +122,18 @@ class PostgreSQLIntegration:
 
         return self._checkpointer
 
+    def get_checkpoint_pool_stats(self) -> dict:
+        """
+        Obtiene métricas del pool de conexiones del checkpointer
+
+        Returns:
+            Estado del pool y tiempos de espera por conexión
+        """
+        if not isinstance(self._checkpointer, PooledAsyncPostgresSaver):
+            return {"status": "not_initialized"}
+
+        return {"status": "initialized", **self._checkpointer.get_pool_stats()}
+
     async def get_session(self) -> AsyncSession:
         """
         Obtiene una sesión de base de datos asíncrona
@@ -212,35 +253,52 @@ class PostgreSQLIntegration:
             logger.error(f"Error getting conversation checkpoints: {e}")
             return []
 
-    async def cleanup_old_checkpoints(self, days_old: int = 30) -> int:
+    def get_checkpoint_compactor(self) -> CheckpointCompactor:
         """
-        Limpia checkpoints antiguos
+        Obtiene el compactador de checkpoints sobre la conexión regular
 
-        Args:
-            days_old: Días de antigüedad para limpiar
+        Returns:
+            CheckpointCompactor configurado desde settings
+        """
+        if self.async_session is None:
+            raise RuntimeError("Database not initialized. Call initialize() first.")
+
+        return create_checkpoint_compactor(self.async_session)
+
+    async def compact_checkpoints(self) -> dict:
+        """
+        Elimina checkpoints superados y threads inactivos
+
+        Reemplaza la limpieza por antigüedad: conserva solo los últimos
+        checkpoints de cada thread y borra threads sin actividad.
 
         Returns:
-            Número de checkpoints eliminados
+            Contadores de filas eliminadas
         """
         try:
-            if self.async_session is None:
-                return 0
+            result = await self.get_checkpoint_compactor().compact()
+            return result.to_dict()
 
-            async with self.async_session() as session:
-                # Query para eliminar checkpoints antiguos (usa SQLAlchemy)
-                result = await session.execute(
-                    text("DELETE FROM checkpoints WHERE created_at < NOW() - INTERVAL :days DAY"),
-                    {"days": days_old},
-                )
-                await session.commit()
-                deleted_count = result.rowcount
+        except Exception as e:
+            logger.error(f"Error compacting checkpoints: {e}")
+            return {}
 
-                logger.info(f"Cleaned up {deleted_count} old checkpoints")
-                return deleted_count
+    async def get_thread_checkpoint_stats(self, thread_id: str) -> dict:
+        """
+        Obtiene el tamaño de los checkpoints de un thread
+
+        Args:
+            thread_id: ID del hilo de conversación
+
+        Returns:
+            Filas y bytes por tabla de checkpoints
+        """
+        try:
+            return await self.get_checkpoint_compactor().get_thread_stats(thread_id)
 
         except Exception as e:
-            logger.error(f"Error cleaning up old checkpoints: {e}")
-            return 0
+            logger.error(f"Error getting thread checkpoint stats: {e}")
+            return {}
 
     async def get_checkpoint_stats(self) -> dict:
         """
@@ -262,11 +320,14 @@ class PostgreSQLIntegration:
                 threads_result = await session.execute(text("SELECT COUNT(DISTINCT thread_id) FROM checkpoints"))
                 threads = threads_result.scalar()
 
-                return {
-                    "total_checkpoints": total,
-                    "unique_threads": threads,
-                    "checkpointer_type": "AsyncPostgresSaver",
-                }
+            largest_threads = await self.get_checkpoint_compactor().get_largest_threads(limit=10)
+
+            return {
+                "total_checkpoints": total,
+                "unique_threads": threads,
+                "largest_threads": largest_threads,
+                "checkpointer_type": "PooledAsyncPostgresSaver",
+            }
 
         except Exception as e:
             logger.error(f"Error getting checkpoint stats: {e}")
@@ -319,8 +380,8 @@ class PostgreSQLIntegration:
                     "checked_out": getattr(self.engine.pool, "checkedout", 0) if self.engine else 0,
                 },
                 "checkpoint_connection": {
-                    "status": "initialized" if self._checkpointer else "not_initialized",
-                    "type": "AsyncPostgresSaver (psycopg)",
+                    **self.get_checkpoint_pool_stats(),
+                    "type": "PooledAsyncPostgresSaver (psycopg AsyncConnectionPool)",
                 },
             }
 
@@ -338,10 +399,11 @@ class PostgreSQLIntegration:
                 await self.engine.dispose()
                 logger.info("Regular PostgreSQL connection closed")
 
-            # Cerrar checkpointer context manager (psycopg pool)
-            if self._checkpointer_context:
-                await self._checkpointer_context.__aexit__(None, None, None)
-                logger.info("Checkpoint PostgreSQL connection closed")
+            # Cerrar pool de conexiones del checkpointer (psycopg)
+            if self._checkpoint_pool:
+                await self._checkpoint_pool.close()
+                self._checkpoint_pool = None
+                logger.info("Checkpoint PostgreSQL connection pool closed")
 
         except Exception as e:
             logger.error(f"Error closing PostgreSQL connections: {e}")
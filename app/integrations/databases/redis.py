@@ -12,6 +12,7 @@ from app.config.settings import get_settings
 logger = logging.getLogger(__name__)
 
 _redis_client: Any = None
+_shared_async_redis_client: Any = None
 
 
 def get_redis_client() -> Any:
@@ -79,6 +80,23 @@ async def get_async_redis_client() -> Any:
         raise
 
 
+async def get_shared_async_redis_client() -> Any:
+    """
+    Get the process-wide async Redis client (singleton).
+
+    Unlike get_async_redis_client(), the client and its connection pool are
+    reused across calls, so hot paths can await Redis without reconnecting.
+
+    Returns:
+        Async Redis client instance
+    """
+    global _shared_async_redis_client
+
+    if _shared_async_redis_client is None:
+        _shared_async_redis_client = await get_async_redis_client()
+    return _shared_async_redis_client
+
+
 def close_redis_client() -> None:
     """Close Redis client connection."""
     global _redis_client
@@ -92,5 +110,6 @@ def close_redis_client() -> None:
 __all__ = [
     "get_redis_client",
     "get_async_redis_client",
+    "get_shared_async_redis_client",
     "close_redis_client",
 ]
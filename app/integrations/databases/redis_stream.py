@@ -0,0 +1,199 @@
+"""
+Redis Streams queue with a consumer group.
+
+Shared building block for durable, at-least-once work queues:
+
+- Entries stay in the group's Pending Entries List (PEL) until XACK.
+- Entries idle in the PEL longer than a visibility timeout are re-claimed
+  with XAUTOCLAIM, together with their delivery count.
+- Entries that keep failing are moved to a dead-letter stream.
+
+Redis Key Pattern:
+    {stream}          → work stream (XADD, MAXLEN ~ trimmed)
+    {stream}:dead     → dead-letter stream
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import redis.asyncio as aioredis
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class StreamEntry:
+    """A stream entry delivered to a consumer."""
+
+    entry_id: str
+    fields: dict[str, Any]
+    deliveries: int = 1
+
+
+class RedisStreamQueue:
+    """
+    Thin async wrapper over a Redis Stream with a consumer group.
+
+    Usage:
+        queue = RedisStreamQueue("jobs", "workers", maxlen=100_000)
+        await queue.add({"job": "..."})
+
+        entries = await queue.read("worker-1", count=8)
+        for entry in entries:
+            ...
+            await queue.ack(entry.entry_id)
+    """
+
+    def __init__(
+        self,
+        stream: str,
+        group: str,
+        maxlen: int,
+        redis_client: aioredis.Redis | None = None,
+    ):
+        self._redis: aioredis.Redis | None = redis_client
+        self._group_ready = False
+        self.stream = stream
+        self.group = group
+        self.maxlen = maxlen
+        self.dead_letter_stream = f"{stream}:dead"
+
+    async def _ensure_connected(self) -> aioredis.Redis:
+        """Lazy initialization of Redis connection and consumer group."""
+        redis = self._redis
+        if redis is None:
+            from app.integrations.databases.redis import get_async_redis_client
+
+            redis = self._redis = await get_async_redis_client()
+
+        if not self._group_ready:
+            try:
+                await redis.xgroup_create(self.stream, self.group, id="0", mkstream=True)
+                logger.info(f"Created consumer group '{self.group}' on stream '{self.stream}'")
+            except Exception as e:
+                # BUSYGROUP: group already exists (created by another worker)
+                if "BUSYGROUP" not in str(e):
+                    raise
+            self._group_ready = True
+
+        return redis
+
+    async def add(self, fields: dict[str, str]) -> str:
+        """
+        Append an entry to the stream.
+
+        Args:
+            fields: Entry fields
+
+        Returns:
+            Stream entry ID
+        """
+        redis = await self._ensure_connected()
+        entry_id = await redis.xadd(self.stream, fields, maxlen=self.maxlen, approximate=True)
+        return entry_id.decode() if isinstance(entry_id, bytes) else entry_id
+
+    async def read(self, consumer: str, count: int, block_ms: int = 1000) -> list[StreamEntry]:
+        """
+        Read new entries for a consumer (XREADGROUP with '>').
+
+        Args:
+            consumer: Consumer name within the group
+            count: Maximum number of entries to read
+            block_ms: Max time to block waiting for entries
+
+        Returns:
+            List of delivered entries (empty on timeout)
+        """
+        redis = await self._ensure_connected()
+        response = await redis.xreadgroup(
+            self.group,
+            consumer,
+            {self.stream: ">"},
+            count=count,
+            block=block_ms,
+        )
+        entries: list[StreamEntry] = []
+        for _stream, messages in response or []:
+            for entry_id, fields in messages:
+                entries.append(StreamEntry(entry_id=entry_id, fields=fields))
+        return entries
+
+    async def reclaim(self, consumer: str, min_idle_ms: int, count: int) -> list[StreamEntry]:
+        """
+        Claim entries whose visibility timeout expired (XAUTOCLAIM).
+
+        Delivery counts are read from the PEL so callers can dead-letter
+        entries that keep failing.
+
+        Args:
+            consumer: Consumer that takes ownership
+            min_idle_ms: Visibility timeout in milliseconds
+            count: Maximum number of entries to claim
+
+        Returns:
+            Claimed entries with their delivery count
+        """
+        redis = await self._ensure_connected()
+        response = await redis.xautoclaim(
+            self.stream,
+            self.group,
+            consumer,
+            min_idle_time=min_idle_ms,
+            start_id="0-0",
+            count=count,
+        )
+        claimed = response[1] if response and len(response) > 1 else []
+
+        entries: list[StreamEntry] = []
+        for entry_id, fields in claimed:
+            if not fields:
+                # Entry was trimmed from the stream while pending
+                await self.ack(entry_id)
+                continue
+            pending = await redis.xpending_range(
+                self.stream, self.group, min=entry_id, max=entry_id, count=1
+            )
+            deliveries = pending[0]["times_delivered"] if pending else 1
+            entries.append(StreamEntry(entry_id=entry_id, fields=fields, deliveries=deliveries))
+        return entries
+
+    async def ack(self, *entry_ids: str) -> None:
+        """Acknowledge entries so they leave the PEL."""
+        if not entry_ids:
+            return
+        redis = await self._ensure_connected()
+        await redis.xack(self.stream, self.group, *entry_ids)
+
+    async def dead_letter(self, entry: StreamEntry, error: str) -> None:
+        """Move an entry to the dead-letter stream and acknowledge it."""
+        redis = await self._ensure_connected()
+        await redis.xadd(
+            self.dead_letter_stream,
+            {
+                **entry.fields,
+                "source_id": entry.entry_id,
+                "deliveries": str(entry.deliveries),
+                "error": error[:500],
+                "dead_lettered_at": str(time.time()),
+            },
+            maxlen=self.maxlen,
+            approximate=True,
+        )
+        await self.ack(entry.entry_id)
+
+    async def get_stats(self) -> dict[str, Any]:
+        """Get stream length, pending count and dead-letter length."""
+        redis = await self._ensure_connected()
+        pending = await redis.xpending(self.stream, self.group)
+        return {
+            "stream": self.stream,
+            "group": self.group,
+            "length": await redis.xlen(self.stream),
+            "pending": pending.get("pending", 0) if isinstance(pending, dict) else 0,
+            "dead_letter_length": await redis.xlen(self.dead_letter_stream),
+        }
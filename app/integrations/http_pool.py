@@ -0,0 +1,110 @@
+# ============================================================================
+# SCOPE: GLOBAL
+# Description: Process-wide pooled httpx client (keep-alive, optional HTTP/2)
+#              shared by TEI, vLLM health checks and WhatsApp Graph API calls.
+# Tenant-Aware: No - configuration via settings.
+# ============================================================================
+"""
+Shared HTTP connection pool.
+
+Opening an `httpx.AsyncClient` per request pays a new TCP (and TLS)
+handshake every time. Call sites without per-client state (base URL, auth
+headers, cookies) use the shared client instead and pass URL, headers and
+timeout per request, so connections to TEI, vLLM and the Graph API are
+kept alive and reused.
+
+HTTP/2 is negotiated when HTTP_POOL_HTTP2 is enabled and the optional `h2`
+package is installed (`httpx[http2]`); otherwise the pool uses HTTP/1.1.
+
+The client is bound to the event loop that created it: a different running
+loop (tests, scripts using asyncio.run) gets its own client.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import logging
+from typing import Any
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+_shared_client: httpx.AsyncClient | None = None
+_shared_loop: asyncio.AbstractEventLoop | None = None
+
+
+def _http2_available() -> bool:
+    """Check if the optional h2 package is installed."""
+    return importlib.util.find_spec("h2") is not None
+
+
+def _create_client() -> httpx.AsyncClient:
+    """Create the pooled client from settings."""
+    from app.config.settings import get_settings
+
+    settings = get_settings()
+    http2 = settings.HTTP_POOL_HTTP2 and _http2_available()
+    if settings.HTTP_POOL_HTTP2 and not http2:
+        logger.info("HTTP/2 requested but 'h2' is not installed, shared HTTP pool uses HTTP/1.1")
+
+    client = httpx.AsyncClient(
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=settings.HTTP_POOL_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_POOL_MAX_KEEPALIVE,
+            keepalive_expiry=settings.HTTP_POOL_KEEPALIVE_EXPIRY,
+        ),
+        timeout=httpx.Timeout(settings.HTTP_POOL_DEFAULT_TIMEOUT),
+    )
+    logger.info(
+        f"Shared HTTP pool created: max_connections={settings.HTTP_POOL_MAX_CONNECTIONS}, "
+        f"keepalive={settings.HTTP_POOL_MAX_KEEPALIVE}, http2={http2}"
+    )
+    return client
+
+
+def get_shared_http_client() -> httpx.AsyncClient:
+    """
+    Get the process-wide pooled httpx client for the running event loop.
+
+    Do not close the returned client or use it in `async with`; call
+    close_shared_http_client() on shutdown instead.
+
+    Returns:
+        Shared httpx.AsyncClient
+    """
+    global _shared_client, _shared_loop
+
+    loop = asyncio.get_running_loop()
+    if _shared_client is None or _shared_client.is_closed or _shared_loop is not loop:
+        _shared_client = _create_client()
+        _shared_loop = loop
+    return _shared_client
+
+
+async def close_shared_http_client() -> None:
+    """Close the shared client and its pooled connections."""
+    global _shared_client, _shared_loop
+
+    if _shared_client is not None and not _shared_client.is_closed:
+        await _shared_client.aclose()
+        logger.info("Shared HTTP pool closed")
+    _shared_client = None
+    _shared_loop = None
+
+
+def get_shared_http_stats() -> dict[str, Any]:
+    """Get shared pool configuration and state."""
+    if _shared_client is None:
+        return {"initialized": False}
+
+    pool = getattr(_shared_client._transport, "_pool", None)
+    connections = getattr(pool, "connections", [])
+    return {
+        "initialized": True,
+        "closed": _shared_client.is_closed,
+        "connections": len(connections),
+        "idle_connections": sum(1 for conn in connections if conn.is_idle()),
+    }
@@ -0,0 +1,170 @@
+# ============================================================================
+# SCOPE: GLOBAL
+# Description: Async micro-batcher that merges concurrent single-text
+#              embedding requests into one TEI /embed call.
+# Tenant-Aware: No - embeddings depend only on model and text.
+# ============================================================================
+"""
+Micro-batching for embedding requests.
+
+Concurrent conversations embed their RAG queries one text at a time
+(TenantVectorStore._get_embedding, PgVectorIntegration.generate_embedding),
+while TEI's /embed accepts arrays. EmbeddingBatcher collects the texts
+submitted within `max_wait` seconds, or until `max_batch_size` texts are
+waiting, sends them as one batch and resolves each waiter with its vector.
+
+A failed batch fails every waiter of that batch with the same exception.
+A waiter that is cancelled does not affect the rest of the batch.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+BatchEmbedFn = Callable[[list[str]], Awaitable[list[list[float]]]]
+
+
+class EmbeddingBatcher:
+    """
+    Collects single-text embedding requests into batches.
+
+    Usage:
+        batcher = EmbeddingBatcher(embedder.embed_batch, max_batch_size=32, max_wait=0.005)
+        vector = await batcher.submit("¿tienen ibuprofeno?")
+    """
+
+    def __init__(self, batch_fn: BatchEmbedFn, max_batch_size: int = 32, max_wait: float = 0.005):
+        self._batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+
+        self._pending: list[tuple[str, asyncio.Future[list[float]]]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._tasks: set[asyncio.Task[None]] = set()
+        self._stats = {
+            "requests": 0,
+            "batches": 0,
+            "max_batch": 0,
+            "failed_batches": 0,
+        }
+
+    async def submit(self, text: str) -> list[float]:
+        """
+        Queue a text for the next batch and wait for its embedding.
+
+        Args:
+            text: Text to embed
+
+        Returns:
+            Embedding vector
+        """
+        self._stats["requests"] += 1
+        if self.max_wait <= 0 or self.max_batch_size <= 1:
+            self._record_batch(1)
+            return (await self._batch_fn([text]))[0]
+
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # New event loop (e.g. asyncio.run in scripts): drop state bound to the old one
+            self._pending, self._timer, self._loop = [], None, loop
+
+        future: asyncio.Future[list[float]] = loop.create_future()
+        self._pending.append((text, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+
+        return await future
+
+    def _flush(self) -> None:
+        """Send the pending texts as one batch."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._pending = self._pending, []
+        batch = [(text, future) for text, future in batch if not future.done()]
+        if not batch:
+            return
+
+        self._record_batch(len(batch))
+        task = asyncio.create_task(self._run_batch(batch), name="embedding_batch")
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, batch: list[tuple[str, asyncio.Future[list[float]]]]) -> None:
+        """Embed a batch and resolve its waiters."""
+        try:
+            embeddings = await self._batch_fn([text for text, _ in batch])
+        except Exception as e:
+            self._stats["failed_batches"] += 1
+            logger.warning(f"Embedding batch of {len(batch)} texts failed: {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), embedding in zip(batch, embeddings, strict=True):
+            if not future.done():
+                future.set_result(embedding)
+
+    def _record_batch(self, size: int) -> None:
+        """Update batch counters."""
+        self._stats["batches"] += 1
+        self._stats["max_batch"] = max(self._stats["max_batch"], size)
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get batching statistics."""
+        batches = self._stats["batches"]
+        return {
+            **self._stats,
+            "pending": len(self._pending),
+            "in_flight_batches": len(self._tasks),
+            "avg_batch_size": round(self._stats["requests"] / batches, 2) if batches else 0.0,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+        }
+
+
+# Batchers shared by all embedder instances pointing at the same server/model
+_embedding_batchers: dict[tuple[str, str], EmbeddingBatcher] = {}
+
+
+def get_embedding_batcher(base_url: str, model: str, batch_fn: BatchEmbedFn) -> EmbeddingBatcher:
+    """
+    Get or create the batcher for a TEI server and model.
+
+    Args:
+        base_url: Embedding server URL
+        model: Embedding model name
+        batch_fn: Batch embedding function used when the batcher is created
+
+    Returns:
+        Shared EmbeddingBatcher
+    """
+    key = (base_url, model)
+    batcher = _embedding_batchers.get(key)
+    if batcher is None:
+        from app.config.settings import get_settings
+
+        settings = get_settings()
+        batcher = EmbeddingBatcher(
+            batch_fn,
+            max_batch_size=settings.EMBEDDING_BATCH_MAX_SIZE,
+            max_wait=settings.EMBEDDING_BATCH_WAIT_MS / 1000,
+        )
+        _embedding_batchers[key] = batcher
+    return batcher
+
+
+def get_embedding_batcher_stats() -> dict[str, Any]:
+    """Get statistics of all embedding batchers."""
+    return {f"{model}@{base_url}": batcher.get_stats() for (base_url, model), batcher in _embedding_batchers.items()}
@@ -0,0 +1,211 @@
+# ============================================================================
+# SCOPE: GLOBAL
+# Description: Content-hash embedding cache (in-process LRU + Redis) in front
+#              of the TEI embedding server.
+# Tenant-Aware: No - embeddings depend only on model and text.
+# ============================================================================
+"""
+Embedding cache keyed by a content hash of (model, text).
+
+Repeated RAG queries and re-indexing of unchanged documents produce the same
+vectors, so TEI only needs to embed each distinct text once:
+
+- L1: per-process LRU holding float32 arrays (~4 KB per 1024-dim vector),
+  evicting the least recently used entry beyond `max_entries`.
+- L2: Redis, shared by all workers, with a TTL. Vectors are stored as
+  base64-encoded float32 bytes. Redis errors never fail an embedding call;
+  after an error Redis is skipped for RETRY_AFTER seconds.
+
+Redis Key Pattern:
+    emb:{model}:{sha256(text)}
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import logging
+import time
+from array import array
+from collections import OrderedDict
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "emb"
+
+
+class EmbeddingCache:
+    """
+    Two-level cache of embedding vectors.
+
+    Usage:
+        cache = EmbeddingCache(max_entries=5000, ttl=604800)
+        vectors = await cache.get_many("BAAI/bge-m3", ["hola", "ibuprofeno"])  # None for misses
+        await cache.set_many("BAAI/bge-m3", ["hola"], [[0.1, ...]])
+    """
+
+    RETRY_AFTER = 30.0
+
+    def __init__(self, max_entries: int = 5000, ttl: int = 604800, redis_client: Any | None = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lru: OrderedDict[str, array] = OrderedDict()
+        self._redis = redis_client
+        self._redis_retry_at = 0.0
+        self._stats = {
+            "l1_hits": 0,
+            "l2_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "redis_errors": 0,
+        }
+
+    @staticmethod
+    def make_key(model: str, text: str) -> str:
+        """Build the cache key for a model/text pair."""
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return f"{KEY_PREFIX}:{model}:{digest}"
+
+    async def get_many(self, model: str, texts: list[str]) -> list[list[float] | None]:
+        """
+        Look up embeddings, L1 first and then Redis.
+
+        Args:
+            model: Embedding model name
+            texts: Texts to look up
+
+        Returns:
+            One vector per text, None where not cached
+        """
+        keys = [self.make_key(model, text) for text in texts]
+        results: list[list[float] | None] = [None] * len(keys)
+        missing: list[int] = []
+
+        for index, key in enumerate(keys):
+            vector = self._lru.get(key)
+            if vector is None:
+                missing.append(index)
+                continue
+            self._lru.move_to_end(key)
+            results[index] = vector.tolist()
+            self._stats["l1_hits"] += 1
+
+        if missing:
+            stored = await self._redis_mget([keys[index] for index in missing])
+            for index, value in zip(missing, stored, strict=True):
+                if value is None:
+                    self._stats["misses"] += 1
+                    continue
+                vector = self._decode(value)
+                self._remember(keys[index], vector)
+                results[index] = vector.tolist()
+                self._stats["l2_hits"] += 1
+
+        return results
+
+    async def set_many(self, model: str, texts: list[str], embeddings: list[list[float]]) -> None:
+        """
+        Store embeddings in L1 and Redis.
+
+        Args:
+            model: Embedding model name
+            texts: Embedded texts
+            embeddings: Vectors in the same order as texts
+        """
+        entries: dict[str, str] = {}
+        for text, embedding in zip(texts, embeddings, strict=True):
+            key = self.make_key(model, text)
+            vector = array("f", embedding)
+            self._remember(key, vector)
+            entries[key] = base64.b64encode(vector.tobytes()).decode("ascii")
+
+        redis = await self._get_redis()
+        if redis is None or not entries:
+            return
+        try:
+            async with redis.pipeline(transaction=False) as pipe:
+                for key, value in entries.items():
+                    pipe.set(key, value, ex=self.ttl)
+                await pipe.execute()
+        except Exception as e:
+            self._redis_failed(e)
+
+    def clear(self) -> None:
+        """Drop all in-process entries."""
+        self._lru.clear()
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get hit/miss counters and L1 size."""
+        lookups = self._stats["l1_hits"] + self._stats["l2_hits"] + self._stats["misses"]
+        hits = self._stats["l1_hits"] + self._stats["l2_hits"]
+        return {
+            **self._stats,
+            "l1_size": len(self._lru),
+            "max_entries": self.max_entries,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def _remember(self, key: str, vector: array) -> None:
+        """Insert into the LRU, evicting the oldest entries beyond max_entries."""
+        self._lru[key] = vector
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    @staticmethod
+    def _decode(value: str | bytes) -> array:
+        """Decode a base64 float32 vector."""
+        vector = array("f")
+        vector.frombytes(base64.b64decode(value))
+        return vector
+
+    async def _redis_mget(self, keys: list[str]) -> list[Any]:
+        """MGET from Redis, treating errors as misses."""
+        redis = await self._get_redis()
+        if redis is None:
+            return [None] * len(keys)
+        try:
+            return await redis.mget(keys)
+        except Exception as e:
+            self._redis_failed(e)
+            return [None] * len(keys)
+
+    async def _get_redis(self) -> Any | None:
+        """Lazy Redis connection, skipped while backing off after an error."""
+        if time.monotonic() < self._redis_retry_at:
+            return None
+        if self._redis is not None:
+            return self._redis
+        try:
+            from app.integrations.databases.redis import get_async_redis_client
+
+            self._redis = await get_async_redis_client()
+        except Exception as e:
+            self._redis_failed(e)
+        return self._redis
+
+    def _redis_failed(self, error: Exception) -> None:
+        """Record a Redis error and back off."""
+        self._stats["redis_errors"] += 1
+        self._redis_retry_at = time.monotonic() + self.RETRY_AFTER
+        logger.warning(f"Embedding cache Redis unavailable, using L1 only for {self.RETRY_AFTER:.0f}s: {error}")
+
+
+# Global instance for singleton pattern
+_embedding_cache: EmbeddingCache | None = None
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    """Get or create the global embedding cache."""
+    global _embedding_cache
+    if _embedding_cache is None:
+        from app.config.settings import get_settings
+
+        settings = get_settings()
+        _embedding_cache = EmbeddingCache(
+            max_entries=settings.EMBEDDING_CACHE_MAX_ENTRIES,
+            ttl=settings.EMBEDDING_CACHE_TTL,
+        )
+    return _embedding_cache
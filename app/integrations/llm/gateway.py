@@ -0,0 +1,472 @@
+# ============================================================================
+# SCOPE: GLOBAL
+# Description: Gateway de concurrencia para llamadas LLM: límite adaptativo
+#              (AIMD sobre la latencia) por modelo y clases de prioridad.
+# Tenant-Aware: No - protege al servidor vLLM compartido por todos los tenants.
+# ============================================================================
+"""
+Adaptive concurrency governor for LLM calls.
+
+Agents, analyzers, summarizers and the supervisor all call
+`VllmLLM.get_llm(...).ainvoke`. Without a limit, a burst of background work
+(rolling summaries, quality audits, sync jobs) competes equally with replies
+and pushes vLLM into queueing collapse. Every call of a governed chat model
+(VllmLLM.get_llm returns GovernedChatOpenAI) first takes a slot from the
+governor of its model:
+
+- Adaptive limit (AIMD): each completed call adds ~1/limit to the limit while
+  the limit is in use; a call slower than `latency_target` (time to first
+  token for streams) or failing with an overload error (timeout, 429, 5xx)
+  multiplies it by `backoff`, at most once per `latency_target` seconds
+- Priority classes: INTERACTIVE > BACKGROUND > BATCH. Waiting calls are
+  admitted strictly by class, and BACKGROUND / BATCH calls only run while
+  fewer than 75% / 50% of the limit is in use, leaving headroom for replies
+- Deadlines: a call that waits longer than its class's `max_wait` raises
+  LLMRateLimitError instead of running late
+- Metrics: llm_gateway_wait_seconds{model, priority},
+  llm_gateway_requests_total{model, priority},
+  llm_gateway_deadline_exceeded_total{model, priority},
+  llm_gateway_latency_seconds{model} and the llm_gateway_limit{model} gauge
+
+The priority comes from the caller's context (default INTERACTIVE):
+
+    from app.integrations.llm.gateway import LLMPriority, llm_priority
+
+    with llm_priority(LLMPriority.BACKGROUND):
+        summary = await llm.ainvoke(prompt)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from enum import Enum
+from typing import Any
+
+from app.core.infrastructure.monitoring import MetricsCollector, metrics_collector
+from app.core.interfaces.llm import LLMRateLimitError
+
+logger = logging.getLogger(__name__)
+
+
+class LLMPriority(str, Enum):
+    """Priority class of an LLM call (highest first)."""
+
+    INTERACTIVE = "interactive"
+    BACKGROUND = "background"
+    BATCH = "batch"
+
+
+# Admission order of the priority classes
+PRIORITY_ORDER = (LLMPriority.INTERACTIVE, LLMPriority.BACKGROUND, LLMPriority.BATCH)
+
+# Fraction of the limit each class may fill (in-flight calls of any class)
+PRIORITY_SHARE = {
+    LLMPriority.INTERACTIVE: 1.0,
+    LLMPriority.BACKGROUND: 0.75,
+    LLMPriority.BATCH: 0.5,
+}
+
+# Error status codes / type names that signal an overloaded server
+OVERLOAD_STATUS_CODES = {429, 500, 502, 503, 504}
+OVERLOAD_ERROR_NAMES = ("Timeout", "RateLimit", "Connect")
+
+_current_priority: ContextVar[LLMPriority] = ContextVar("llm_priority", default=LLMPriority.INTERACTIVE)
+# Set while a call holds a slot, so nested calls of the same request
+# (ChatOpenAI._agenerate -> _astream when streaming) do not take a second one
+_slot_held: ContextVar[bool] = ContextVar("llm_slot_held", default=False)
+
+
+@contextmanager
+def llm_priority(priority: LLMPriority) -> Iterator[None]:
+    """
+    Run the LLM calls of a block with the given priority.
+
+    Tasks created inside the block inherit it.
+
+    Args:
+        priority: Priority class
+    """
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def current_llm_priority() -> LLMPriority:
+    """Priority class of the current context."""
+    return _current_priority.get()
+
+
+def is_overload_error(error: BaseException) -> bool:
+    """Whether an error of an LLM call indicates an overloaded server."""
+    if isinstance(error, TimeoutError):
+        return True
+    if getattr(error, "status_code", None) in OVERLOAD_STATUS_CODES:
+        return True
+    name = type(error).__name__
+    return any(part in name for part in OVERLOAD_ERROR_NAMES)
+
+
+class _Call:
+    """Timing of one admitted call."""
+
+    def __init__(self) -> None:
+        self.started = time.monotonic()
+        self.first_token: float | None = None
+
+    def mark_first_token(self) -> None:
+        """Record the arrival of the first streamed chunk."""
+        if self.first_token is None:
+            self.first_token = time.monotonic()
+
+    @property
+    def latency(self) -> float:
+        """Time to first token for streams, total time otherwise."""
+        end = self.first_token if self.first_token is not None else time.monotonic()
+        return end - self.started
+
+
+class LLMConcurrencyGovernor:
+    """
+    Adaptive concurrency limit with priority classes for one model.
+
+    Usage:
+        governor = LLMConcurrencyGovernor("qwen-3b")
+        async with governor.slot(LLMPriority.BACKGROUND):
+            result = await llm.ainvoke(prompt)
+    """
+
+    DEFAULT_MAX_WAIT = {
+        LLMPriority.INTERACTIVE: 30.0,
+        LLMPriority.BACKGROUND: 120.0,
+        LLMPriority.BATCH: 600.0,
+    }
+
+    def __init__(
+        self,
+        model: str,
+        initial_limit: int = 8,
+        min_limit: int = 2,
+        max_limit: int = 64,
+        latency_target: float = 8.0,
+        backoff: float = 0.7,
+        max_wait: dict[LLMPriority, float] | None = None,
+        metrics: MetricsCollector | None = None,
+    ):
+        """
+        Initialize the governor.
+
+        Args:
+            model: Model name (metrics label)
+            initial_limit: Starting concurrency limit
+            min_limit: Lowest limit after backoffs
+            max_limit: Highest limit after increases
+            latency_target: Latency above which the limit is decreased (seconds)
+            backoff: Multiplicative decrease factor
+            max_wait: Max queue wait per priority class (seconds)
+            metrics: Metrics collector (defaults to the global one)
+        """
+        self.model = model
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_target = latency_target
+        self.backoff = backoff
+        self.max_wait = {**self.DEFAULT_MAX_WAIT, **(max_wait or {})}
+        self.metrics = metrics or metrics_collector
+
+        self._limit = float(min(max(initial_limit, min_limit), max_limit))
+        self._in_flight = 0
+        self._in_flight_by_priority = dict.fromkeys(LLMPriority, 0)
+        self._waiters: dict[LLMPriority, deque[asyncio.Future[None]]] = {p: deque() for p in LLMPriority}
+        self._last_decrease = 0.0
+        self._stats = {
+            "admitted": 0,
+            "queued": 0,
+            "deadline_exceeded": 0,
+            "increases": 0,
+            "decreases": 0,
+        }
+        self.metrics.set_gauge("llm_gateway_limit", self._limit, {"model": model})
+
+    @property
+    def limit(self) -> int:
+        """Current concurrency limit."""
+        return math.floor(self._limit)
+
+    def _capacity(self, priority: LLMPriority) -> int:
+        """Max in-flight calls (of any class) while a call of this class is admitted."""
+        return max(1, math.floor(self._limit * PRIORITY_SHARE[priority]))
+
+    def _can_admit(self, priority: LLMPriority) -> bool:
+        """Whether a call of this class fits now."""
+        return self._in_flight < self._capacity(priority)
+
+    def _has_waiters_before(self, priority: LLMPriority) -> bool:
+        """Whether calls of this class or a higher one are queued."""
+        for p in PRIORITY_ORDER:
+            if self._waiters[p]:
+                return True
+            if p == priority:
+                return False
+        return False
+
+    def _admit(self, priority: LLMPriority) -> None:
+        """Count an admitted call."""
+        self._in_flight += 1
+        self._in_flight_by_priority[priority] += 1
+        self._stats["admitted"] += 1
+
+    def _wake(self) -> None:
+        """Admit queued calls in priority order while they fit."""
+        for priority in PRIORITY_ORDER:
+            queue = self._waiters[priority]
+            while queue:
+                if not self._can_admit(priority):
+                    # Lower classes have smaller shares: none of them fits either
+                    return
+                future = queue.popleft()
+                if not future.done():
+                    self._admit(priority)
+                    future.set_result(None)
+
+    async def acquire(self, priority: LLMPriority) -> float:
+        """
+        Wait for a slot.
+
+        Args:
+            priority: Priority class of the call
+
+        Returns:
+            Seconds waited in the queue
+
+        Raises:
+            LLMRateLimitError: If no slot frees up within the class's max wait
+        """
+        labels = {"model": self.model, "priority": priority.value}
+        self.metrics.increment("llm_gateway_requests_total", labels=labels)
+
+        if not self._has_waiters_before(priority) and self._can_admit(priority):
+            self._admit(priority)
+            self.metrics.observe("llm_gateway_wait_seconds", 0.0, labels)
+            return 0.0
+
+        start = time.monotonic()
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._waiters[priority].append(future)
+        self._stats["queued"] += 1
+        try:
+            await asyncio.wait_for(asyncio.shield(future), timeout=self.max_wait[priority])
+        except TimeoutError:
+            if not future.done():
+                future.cancel()
+                self._remove_waiter(priority, future)
+                self._stats["deadline_exceeded"] += 1
+                self.metrics.increment("llm_gateway_deadline_exceeded_total", labels=labels)
+                raise LLMRateLimitError(
+                    f"LLM queue wait for {self.model} exceeded {self.max_wait[priority]:.0f}s ({priority.value})"
+                ) from None
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Slot granted while the caller was being cancelled
+                self._release_slot(priority)
+            else:
+                future.cancel()
+                self._remove_waiter(priority, future)
+            raise
+
+        waited = time.monotonic() - start
+        self.metrics.observe("llm_gateway_wait_seconds", waited, labels)
+        return waited
+
+    def _remove_waiter(self, priority: LLMPriority, future: asyncio.Future[None]) -> None:
+        """Drop an abandoned waiter from its queue."""
+        try:
+            self._waiters[priority].remove(future)
+        except ValueError:
+            pass
+
+    def _release_slot(self, priority: LLMPriority) -> None:
+        """Free a slot and admit waiters."""
+        self._in_flight -= 1
+        self._in_flight_by_priority[priority] -= 1
+        self._wake()
+
+    def release(self, priority: LLMPriority, latency: float | None = None, overloaded: bool = False) -> None:
+        """
+        Free a slot and adapt the limit to the call's outcome.
+
+        Args:
+            priority: Priority class the slot was acquired with
+            latency: Observed latency (None for calls without a usable sample)
+            overloaded: Whether the call failed with an overload error
+        """
+        saturated = self._in_flight >= self.limit
+        if overloaded or (latency is not None and latency > self.latency_target):
+            self._decrease()
+        elif latency is not None and saturated:
+            self._increase()
+
+        if latency is not None:
+            self.metrics.observe("llm_gateway_latency_seconds", latency, {"model": self.model})
+        self._release_slot(priority)
+
+    def _increase(self) -> None:
+        """Additive increase: about +1 per limit's worth of fast calls."""
+        if self._limit >= self.max_limit:
+            return
+        self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+        self._stats["increases"] += 1
+        self.metrics.set_gauge("llm_gateway_limit", self._limit, {"model": self.model})
+
+    def _decrease(self) -> None:
+        """Multiplicative decrease, once per latency window."""
+        now = time.monotonic()
+        if now - self._last_decrease < self.latency_target:
+            return
+        self._last_decrease = now
+        new_limit = max(self.min_limit, self._limit * self.backoff)
+        if new_limit < self._limit:
+            logger.info(f"LLM concurrency limit for {self.model}: {self._limit:.1f} -> {new_limit:.1f}")
+            self._limit = new_limit
+            self._stats["decreases"] += 1
+            self.metrics.set_gauge("llm_gateway_limit", self._limit, {"model": self.model})
+
+    @asynccontextmanager
+    async def slot(self, priority: LLMPriority | None = None) -> AsyncIterator[_Call]:
+        """
+        Hold a slot for the duration of a call.
+
+        Args:
+            priority: Priority class (defaults to the context's)
+
+        Yields:
+            Call timing; streams call mark_first_token() on their first chunk
+        """
+        priority = priority or current_llm_priority()
+        await self.acquire(priority)
+        call = _Call()
+        try:
+            yield call
+        except Exception as e:
+            self.release(priority, call.latency, overloaded=is_overload_error(e))
+            raise
+        except BaseException:
+            # Cancelled or closed early: no latency sample
+            self.release(priority)
+            raise
+        else:
+            self.release(priority, call.latency)
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get governor statistics."""
+        stats: dict[str, Any] = {
+            **self._stats,
+            "limit": round(self._limit, 2),
+            "in_flight": self._in_flight,
+            "latency_target_s": self.latency_target,
+        }
+        for priority in LLMPriority:
+            labels = {"model": self.model, "priority": priority.value}
+            wait = self.metrics.get_histogram_stats("llm_gateway_wait_seconds", labels)
+            stats[priority.value] = {
+                "in_flight": self._in_flight_by_priority[priority],
+                "queued": len(self._waiters[priority]),
+                "wait_p50_s": round(wait["p50"], 3) if wait else 0.0,
+                "wait_p90_s": round(wait["p90"], 3) if wait else 0.0,
+            }
+        return stats
+
+
+class GovernedChatModelMixin:
+    """
+    Routes the async calls of a LangChain chat model through its governor.
+
+    Mixed in before the chat model class:
+        class GovernedChatOpenAI(GovernedChatModelMixin, ChatOpenAI): ...
+    """
+
+    def _governor_model(self) -> str:
+        """Model name the governor is keyed by."""
+        return getattr(self, "model_name", None) or getattr(self, "_llm_type", "llm")
+
+    async def _agenerate(self, messages: Any, stop: Any = None, run_manager: Any = None, **kwargs: Any) -> Any:
+        parent = super()._agenerate  # type: ignore[misc]
+        if _slot_held.get():
+            return await parent(messages, stop=stop, run_manager=run_manager, **kwargs)
+        async with get_llm_governor(self._governor_model()).slot():
+            token = _slot_held.set(True)
+            try:
+                return await parent(messages, stop=stop, run_manager=run_manager, **kwargs)
+            finally:
+                _slot_held.reset(token)
+
+    async def _astream(self, messages: Any, stop: Any = None, run_manager: Any = None, **kwargs: Any) -> Any:
+        parent = super()._astream  # type: ignore[misc]
+        if _slot_held.get():
+            async for chunk in parent(messages, stop=stop, run_manager=run_manager, **kwargs):
+                yield chunk
+            return
+        async with get_llm_governor(self._governor_model()).slot() as call:
+            async for chunk in parent(messages, stop=stop, run_manager=run_manager, **kwargs):
+                call.mark_first_token()
+                yield chunk
+
+
+# Governors shared by all clients of the same model
+_llm_governors: dict[str, LLMConcurrencyGovernor] = {}
+
+
+def get_llm_governor(model: str) -> LLMConcurrencyGovernor:
+    """
+    Get or create the governor for a model.
+
+    Args:
+        model: Model name
+
+    Returns:
+        Shared LLMConcurrencyGovernor
+    """
+    governor = _llm_governors.get(model)
+    if governor is None:
+        from app.config.settings import get_settings
+
+        settings = get_settings()
+        governor = LLMConcurrencyGovernor(
+            model,
+            initial_limit=settings.LLM_GOVERNOR_INITIAL_LIMIT,
+            min_limit=settings.LLM_GOVERNOR_MIN_LIMIT,
+            max_limit=settings.LLM_GOVERNOR_MAX_LIMIT,
+            latency_target=settings.LLM_GOVERNOR_LATENCY_TARGET_S,
+            max_wait={
+                LLMPriority.INTERACTIVE: settings.LLM_GOVERNOR_MAX_WAIT_INTERACTIVE_S,
+                LLMPriority.BACKGROUND: settings.LLM_GOVERNOR_MAX_WAIT_BACKGROUND_S,
+                LLMPriority.BATCH: settings.LLM_GOVERNOR_MAX_WAIT_BATCH_S,
+            },
+        )
+        _llm_governors[model] = governor
+    return governor
+
+
+def get_llm_governor_stats() -> dict[str, Any]:
+    """Get statistics of all LLM governors."""
+    return {model: governor.get_stats() for model, governor in _llm_governors.items()}
+
+
+__all__ = [
+    "GovernedChatModelMixin",
+    "LLMConcurrencyGovernor",
+    "LLMPriority",
+    "current_llm_priority",
+    "get_llm_governor",
+    "get_llm_governor_stats",
+    "is_overload_error",
+    "llm_priority",
+]
@@ -0,0 +1,187 @@
+# ============================================================================
+# SCOPE: GLOBAL
+# Description: Streaming de tokens de respuestas al usuario a través del
+#              canal "custom" de LangGraph (get_stream_writer).
+# Tenant-Aware: No - funciona con cualquier chat model de LangChain.
+# ============================================================================
+"""
+Token streaming of user-facing LLM responses.
+
+Agents generate their replies with `llm.get_llm(...).ainvoke(prompt)`, so the
+graph only reports a node once the whole reply exists. astream_response()
+generates the same reply with `astream()` and publishes each decoded delta on
+LangGraph's "custom" stream channel while it accumulates the full text:
+
+    {"type": "token", "agent": "greeting_agent", "delta": "Hola"}
+
+AynuxGraph.astream subscribes to that channel (stream_mode "custom", with
+subgraphs), so /chat/message/stream can forward the deltas as SSE frames.
+
+LangGraph gives every node a writer, also in runs that do not stream the
+"custom" mode (ainvoke(), as on the WhatsApp webhook path), where it is a
+no-op that cannot be told apart. Runs that forward tokens therefore opt in
+with `config["configurable"][STREAM_TOKENS_KEY] = True` (inherited by nested
+graphs). Otherwise, and outside a graph run, the call is a plain ainvoke().
+
+Only user-facing generations should use it: classifier or JSON prompts would
+leak into the stream. `<think>` blocks of reasoning models are filtered from
+the deltas and from the returned text.
+
+Usage:
+    from app.integrations.llm.streaming import astream_response
+
+    llm = self.llm.get_llm(complexity=ModelComplexity.SIMPLE, temperature=0.7)
+    text = await astream_response(llm, prompt, agent=self.name)
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from langchain_core.language_models import BaseChatModel
+    from langgraph.types import StreamWriter
+
+logger = logging.getLogger(__name__)
+
+# "type" of token payloads on the custom stream channel
+TOKEN_EVENT = "token"
+
+# RunnableConfig "configurable" key of runs that forward token deltas
+STREAM_TOKENS_KEY = "stream_tokens"
+
+THINK_PATTERN = re.compile(r"<think>.*?</think>", re.DOTALL)
+
+
+class ThinkTagFilter:
+    """
+    Drops `<think>...</think>` spans from a stream of text chunks.
+
+    Tags may be split across chunks: a chunk ending in a possible tag prefix
+    ("<thi") is held back until the next chunk decides. Leading whitespace of
+    the visible text is dropped, as strip() does on the full response.
+    """
+
+    OPEN = "<think>"
+    CLOSE = "</think>"
+
+    def __init__(self) -> None:
+        self._buffer = ""
+        self._inside = False
+        self._started = False
+
+    def feed(self, text: str) -> str:
+        """
+        Add a chunk.
+
+        Args:
+            text: Raw chunk from the model
+
+        Returns:
+            Visible text that can be emitted now (may be empty)
+        """
+        self._buffer += text
+        visible: list[str] = []
+        while True:
+            tag = self.CLOSE if self._inside else self.OPEN
+            index = self._buffer.find(tag)
+            if index >= 0:
+                if not self._inside:
+                    visible.append(self._buffer[:index])
+                self._buffer = self._buffer[index + len(tag) :]
+                self._inside = not self._inside
+                continue
+
+            held = self._partial_tag_length(tag)
+            if not self._inside:
+                visible.append(self._buffer[: len(self._buffer) - held])
+            self._buffer = self._buffer[len(self._buffer) - held :]
+            return self._emit("".join(visible))
+
+    def flush(self) -> str:
+        """Visible text still held back at the end of the stream."""
+        rest = "" if self._inside else self._buffer
+        self._buffer = ""
+        return self._emit(rest)
+
+    def _partial_tag_length(self, tag: str) -> int:
+        """Length of the longest buffer suffix that is a proper prefix of tag."""
+        for length in range(min(len(tag) - 1, len(self._buffer)), 0, -1):
+            if tag.startswith(self._buffer[-length:]):
+                return length
+        return 0
+
+    def _emit(self, text: str) -> str:
+        """Drop whitespace before the first visible character."""
+        if not self._started:
+            text = text.lstrip()
+            self._started = bool(text)
+        return text
+
+
+def get_token_writer() -> StreamWriter | None:
+    """
+    LangGraph stream writer of the running node, if the run streams tokens.
+
+    Returns:
+        Writer, or None outside a graph run and in runs that did not set
+        `configurable[STREAM_TOKENS_KEY]`
+    """
+    try:
+        from langgraph.config import get_config, get_stream_writer
+
+        if not get_config().get("configurable", {}).get(STREAM_TOKENS_KEY):
+            return None
+        return get_stream_writer()
+    except RuntimeError:
+        return None
+
+
+def _content_text(content: Any) -> str:
+    """Text of a message (chunk) content, which may be a list of parts."""
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return "".join(part if isinstance(part, str) else str(part.get("text", "")) for part in content)
+    return str(content)
+
+
+async def astream_response(llm: BaseChatModel, prompt: Any, *, agent: str | None = None) -> str:
+    """
+    Generate a user-facing response, publishing token deltas to the graph stream.
+
+    Args:
+        llm: LangChain chat model (e.g. VllmLLM.get_llm())
+        prompt: Prompt or messages, as accepted by ainvoke()
+        agent: Agent name attached to each delta
+
+    Returns:
+        Full response text without `<think>` blocks, stripped
+    """
+    writer = get_token_writer()
+    if writer is None:
+        response = await llm.ainvoke(prompt)
+        return THINK_PATTERN.sub("", _content_text(response.content)).strip()
+
+    think_filter = ThinkTagFilter()
+    parts: list[str] = []
+    async for chunk in llm.astream(prompt):
+        text = _content_text(chunk.content)
+        if not text:
+            continue
+        parts.append(text)
+        delta = think_filter.feed(text)
+        if delta:
+            writer({"type": TOKEN_EVENT, "agent": agent, "delta": delta})
+
+    # Trailing text held back as a possible tag prefix
+    delta = think_filter.flush()
+    if delta:
+        writer({"type": TOKEN_EVENT, "agent": agent, "delta": delta})
+
+    return THINK_PATTERN.sub("", "".join(parts)).strip()
+
+
+__all__ = ["STREAM_TOKENS_KEY", "TOKEN_EVENT", "ThinkTagFilter", "astream_response", "get_token_writer"]
@@ -15,7 +15,11 @@ Features:
 - Batch embedding support
 - 1024-dimensional vectors for semantic search
 - Health check functionality
-- Connection pooling with httpx
+- Connection pooling through the shared httpx client (keep-alive)
+- Content-hash embedding cache (in-process LRU + Redis), so repeated
+  queries and unchanged documents are only embedded once
+- Micro-batching: concurrent embed_text() calls are merged into one
+  /embed request (EmbeddingBatcher)
 """
 
 import logging
@@ -25,6 +29,9 @@ import httpx
 
 from app.config.settings import get_settings
 from app.core.interfaces.llm import IEmbeddingModel, LLMConnectionError, LLMError
+from app.integrations.http_pool import get_shared_http_client
+from app.integrations.llm.embedding_batcher import get_embedding_batcher
+from app.integrations.llm.embedding_cache import EmbeddingCache, get_embedding_cache
 
 logger = logging.getLogger(__name__)
 
@@ -61,6 +68,9 @@ class TEIEmbeddingModel(IEmbeddingModel):
         model: str | None = None,
         embedding_dimension: int | None = None,
         timeout: float | None = None,
+        cache: EmbeddingCache | None = None,
+        use_cache: bool | None = None,
+        use_batching: bool | None = None,
     ):
         """
         Initialize TEI embedding client.
@@ -70,6 +80,10 @@ class TEIEmbeddingModel(IEmbeddingModel):
             model: Embedding model name. Uses TEI_MODEL from settings if not provided.
             embedding_dimension: Vector dimension. Uses TEI_EMBEDDING_DIMENSION from settings.
             timeout: Request timeout in seconds. Uses TEI_REQUEST_TIMEOUT from settings.
+            cache: Embedding cache. Uses the global cache if not provided.
+            use_cache: Enable the embedding cache. Uses EMBEDDING_CACHE_ENABLED from settings.
+            use_batching: Merge concurrent embed_text() calls into batches.
+                Enabled when EMBEDDING_BATCH_WAIT_MS > 0 if not provided.
         """
         settings = get_settings()
 
@@ -78,6 +92,18 @@ class TEIEmbeddingModel(IEmbeddingModel):
         self._embedding_dimension = embedding_dimension or settings.TEI_EMBEDDING_DIMENSION
         self._timeout = timeout or float(settings.TEI_REQUEST_TIMEOUT)
 
+        if use_cache is None:
+            use_cache = settings.EMBEDDING_CACHE_ENABLED
+        self._cache = (cache or get_embedding_cache()) if use_cache else None
+
+        if use_batching is None:
+            use_batching = settings.EMBEDDING_BATCH_WAIT_MS > 0
+        self._batcher = (
+            get_embedding_batcher(self._base_url, self._model, self._fetch_embeddings)
+            if use_batching
+            else None
+        )
+
         logger.info(
             f"Initialized TEIEmbeddingModel: "
             f"url={self._base_url}, model={self._model}, dims={self._embedding_dimension}"
@@ -108,26 +134,32 @@ class TEIEmbeddingModel(IEmbeddingModel):
             # Returns [0.123, -0.456, 0.789, ...] (1024 floats)
             ```
         """
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self._base_url}/embed",
-                    json={"inputs": text},
-                    timeout=self._timeout,
-                )
-                response.raise_for_status()
-                data = response.json()
+        if self._cache is not None:
+            cached = (await self._cache.get_many(self._model, [text]))[0]
+            if cached is not None:
+                return cached
 
-                # TEI returns [[float, float, ...]] for single input
-                embedding = data[0]
+        if self._batcher is not None:
+            # Merged with concurrent requests into one /embed call
+            return await self._batcher.submit(text)
 
-                if len(embedding) != self._embedding_dimension:
-                    logger.warning(
-                        f"Embedding dimension mismatch: got {len(embedding)}, "
-                        f"expected {self._embedding_dimension}"
-                    )
-
-                return embedding
+        try:
+            response = await get_shared_http_client().post(
+                f"{self._base_url}/embed",
+                json={"inputs": text},
+                timeout=self._timeout,
+            )
+            response.raise_for_status()
+            data = response.json()
+
+            # TEI returns [[float, float, ...]] for single input
+            embedding = data[0]
+
+            if len(embedding) != self._embedding_dimension:
+                logger.warning(
+                    f"Embedding dimension mismatch: got {len(embedding)}, "
+                    f"expected {self._embedding_dimension}"
+                )
 
         except httpx.TimeoutException as e:
             logger.error(f"Timeout calling TEI API: {e}")
@@ -142,12 +174,17 @@ class TEIEmbeddingModel(IEmbeddingModel):
             logger.error(f"Error generating TEI embedding: {e}")
             raise LLMError(f"Failed to generate embedding: {e}") from e
 
+        if self._cache is not None:
+            await self._cache.set_many(self._model, [text], [embedding])
+        return embedding
+
     async def embed_batch(self, texts: List[str]) -> List[List[float]]:
         """
         Generate embeddings for multiple texts in batch.
 
         More efficient than calling embed_text() multiple times
-        as it sends all texts in a single request.
+        as it sends all texts in a single request. Cached texts and
+        duplicates within the batch are not sent to TEI.
 
         Args:
             texts: List of texts to embed.
@@ -172,27 +209,45 @@ class TEIEmbeddingModel(IEmbeddingModel):
         if not texts:
             return []
 
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self._base_url}/embed",
-                    json={"inputs": texts},
-                    timeout=self._timeout * 2,  # Longer timeout for batch
-                )
-                response.raise_for_status()
-                embeddings = response.json()
+        if self._cache is not None:
+            results = await self._cache.get_many(self._model, texts)
+        else:
+            results = [None] * len(texts)
+
+        pending = [text for text, result in zip(texts, results, strict=True) if result is None]
+        if not pending:
+            return results  # type: ignore[return-value]
+
+        fetched = iter(await self._fetch_embeddings(pending))
+        return [result if result is not None else next(fetched) for result in results]
 
-                # TEI returns [[...], [...], ...] directly (no sorting needed)
+    async def _fetch_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed texts with a single /embed call and cache the results.
 
-                # Validate dimensions
-                for i, emb in enumerate(embeddings):
-                    if len(emb) != self._embedding_dimension:
-                        logger.warning(
-                            f"Embedding {i} dimension mismatch: got {len(emb)}, "
-                            f"expected {self._embedding_dimension}"
-                        )
+        Duplicate texts are sent once. Used by embed_batch() and as the
+        batch function of the shared EmbeddingBatcher.
+        """
+        distinct = list(dict.fromkeys(texts))
 
-                return embeddings
+        try:
+            response = await get_shared_http_client().post(
+                f"{self._base_url}/embed",
+                json={"inputs": distinct},
+                timeout=self._timeout * 2,  # Longer timeout for batch
+            )
+            response.raise_for_status()
+            embeddings = response.json()
+
+            # TEI returns [[...], [...], ...] directly (no sorting needed)
+
+            # Validate dimensions
+            for i, emb in enumerate(embeddings):
+                if len(emb) != self._embedding_dimension:
+                    logger.warning(
+                        f"Embedding {i} dimension mismatch: got {len(emb)}, "
+                        f"expected {self._embedding_dimension}"
+                    )
 
         except httpx.TimeoutException as e:
             logger.error(f"Timeout calling TEI API (batch): {e}")
@@ -207,6 +262,12 @@ class TEIEmbeddingModel(IEmbeddingModel):
             logger.error(f"Error in batch embedding: {e}")
             raise LLMError(f"Failed to generate batch embeddings: {e}") from e
 
+        if self._cache is not None:
+            await self._cache.set_many(self._model, distinct, embeddings)
+
+        by_text = dict(zip(distinct, embeddings, strict=True))
+        return [by_text[text] for text in texts]
+
     async def health_check(self) -> bool:
         """
         Check if TEI service is healthy.
@@ -215,12 +276,11 @@ class TEIEmbeddingModel(IEmbeddingModel):
             True if service is responding, False otherwise.
         """
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self._base_url}/health",
-                    timeout=5.0,
-                )
-                return response.status_code == 200
+            response = await get_shared_http_client().get(
+                f"{self._base_url}/health",
+                timeout=5.0,
+            )
+            return response.status_code == 200
         except Exception as e:
             logger.error(f"TEI health check failed: {e}")
             return False
@@ -13,6 +13,7 @@ Uses a single model (VLLM_MODEL) for all complexity tiers.
 Features:
 - Uses langchain_openai.ChatOpenAI with vLLM base_url
 - LRU caching of ChatOpenAI instances by (model, temperature)
+- Calls routed through the per-model concurrency governor (gateway.py)
 - Automatic <think> tag cleaning for reasoning-style responses
 - Single model for all complexity tiers (backward compatible API)
 - Health check functionality
@@ -36,6 +37,8 @@ from app.core.interfaces.llm import (
     LLMProvider,
     LLMRateLimitError,
 )
+from app.integrations.http_pool import get_shared_http_client
+from app.integrations.llm.gateway import GovernedChatModelMixin
 from app.integrations.llm.model_provider import ModelComplexity
 
 logger = logging.getLogger(__name__)
@@ -44,6 +47,10 @@ logger = logging.getLogger(__name__)
 DEEPSEEK_THINK_PATTERN = re.compile(r"<think>.*?</think>", re.DOTALL)
 
 
+class GovernedChatOpenAI(GovernedChatModelMixin, ChatOpenAI):
+    """ChatOpenAI whose async calls wait for a slot of the model's concurrency governor."""
+
+
 class VllmLLM(ILLM, IChatLLM):
     """
     vLLM implementation using OpenAI-compatible API.
@@ -169,7 +176,8 @@ class VllmLLM(ILLM, IChatLLM):
         final_kwargs = {**self._kwargs, **kwargs}
 
         # Create new instance
-        llm = ChatOpenAI(
+        chat_class = GovernedChatOpenAI if self.settings.LLM_GOVERNOR_ENABLED else ChatOpenAI
+        llm = chat_class(
             model=model,
             api_key=self._api_key,
             base_url=self._base_url,
@@ -390,27 +398,26 @@ class VllmLLM(ILLM, IChatLLM):
         Returns:
             True if API is healthy, False otherwise.
         """
+        client = get_shared_http_client()
         try:
             # Try health endpoint first
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self._base_url.rstrip('/v1')}/health",
-                    timeout=5.0,
-                )
-                if response.status_code == 200:
-                    return True
+            response = await client.get(
+                f"{self._base_url.rstrip('/v1')}/health",
+                timeout=5.0,
+            )
+            if response.status_code == 200:
+                return True
         except Exception:
             pass
 
         # Fallback to model list endpoint
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self._base_url}/models",
-                    timeout=5.0,
-                    headers={"Authorization": f"Bearer {self._api_key}"} if self._api_key != "EMPTY" else {},
-                )
-                return response.status_code == 200
+            response = await client.get(
+                f"{self._base_url}/models",
+                timeout=5.0,
+                headers={"Authorization": f"Bearer {self._api_key}"} if self._api_key != "EMPTY" else {},
+            )
+            return response.status_code == 200
         except Exception as e:
             logger.error(f"Health check failed for vLLM: {e}")
             return False
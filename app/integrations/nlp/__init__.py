@@ -0,0 +1,27 @@
+"""
+NLP Integrations
+
+spaCy parsing outside the event loop (process pool + nlp.pipe micro-batching).
+"""
+
+from app.integrations.nlp.spacy_service import (
+    ParsedDoc,
+    ParsedEntity,
+    ParsedToken,
+    SpacyNLPService,
+    get_nlp_service,
+    get_nlp_service_stats,
+    is_model_installed,
+    shutdown_nlp_service,
+)
+
+__all__ = [
+    "ParsedDoc",
+    "ParsedEntity",
+    "ParsedToken",
+    "SpacyNLPService",
+    "get_nlp_service",
+    "get_nlp_service_stats",
+    "is_model_installed",
+    "shutdown_nlp_service",
+]
@@ -0,0 +1,393 @@
+# ============================================================================
+# SCOPE: GLOBAL
+# Description: Servicio de ejecución spaCy fuera del event loop: pool de
+#              procesos con modelos precargados por worker, micro-batching
+#              con nlp.pipe y API async que devuelve features del Doc.
+# Tenant-Aware: No - el análisis depende solo del modelo y el texto.
+# ============================================================================
+"""
+Out-of-event-loop spaCy execution.
+
+SpacyIntentAnalyzer, PharmacyIntentAnalyzer and LanguageDetector used to run
+`nlp(text)` inline in async handlers, blocking the event loop for every
+conversation for the duration of the parse. SpacyNLPService moves parsing to
+a process pool:
+
+- Each worker process loads the configured models once (initializer)
+- Texts submitted within `max_wait` seconds, or until `max_batch_size` texts
+  are waiting, are parsed together with `nlp.pipe`
+- Callers pass the pipeline components they do not need (`disable`), which
+  are skipped for that batch
+- Results come back as ParsedDoc: a picklable snapshot of the Doc features
+  the analyzers read (tokens, lemmas, POS/dependency labels, entities and
+  the document vector)
+
+With `workers=0` parsing runs on one background thread of this process
+instead (development, or hosts where the extra memory of worker processes
+is not wanted); the event loop stays free either way.
+
+Worker processes are started with the "spawn" method, so this module only
+imports the standard library at module level: spaCy is imported inside the
+workers.
+
+Usage:
+    service = get_nlp_service()
+    doc = await service.parse("quiero pagar mi deuda", "es_core_news_sm", disable=("parser",))
+    lemmas = [token.lemma_ for token in doc if not token.is_stop]
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import multiprocessing
+from collections.abc import Iterator, Sequence
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class ParsedToken:
+    """Token features (same attribute names as spacy.tokens.Token)."""
+
+    text: str
+    lemma_: str
+    pos_: str
+    dep_: str
+    is_stop: bool
+    is_punct: bool
+    is_alpha: bool
+    is_digit: bool
+    like_num: bool
+    is_oov: bool
+    has_head: bool  # token.head is another token (attached by the parser)
+
+
+@dataclass(frozen=True, slots=True)
+class ParsedEntity:
+    """Named entity span features (same attribute names as spacy.tokens.Span)."""
+
+    text: str
+    label_: str
+    start_char: int
+    end_char: int
+
+
+@dataclass(frozen=True, slots=True)
+class ParsedDoc:
+    """
+    Picklable snapshot of a spaCy Doc.
+
+    Supports the Doc API subset the analyzers use: iteration over tokens,
+    len(), .text, .ents, .vector, .has_vector and .similarity().
+    """
+
+    text: str
+    tokens: tuple[ParsedToken, ...]
+    ents: tuple[ParsedEntity, ...]
+    vector: tuple[float, ...]
+    has_vector: bool
+    model: str
+
+    @classmethod
+    def from_spacy(cls, doc: Any, model: str) -> ParsedDoc:
+        """
+        Snapshot a spaCy Doc.
+
+        Args:
+            doc: spacy.tokens.Doc
+            model: Name of the model that produced it
+
+        Returns:
+            ParsedDoc with the same features
+        """
+        has_vector = bool(doc.has_vector)
+        return cls(
+            text=doc.text,
+            tokens=tuple(
+                ParsedToken(
+                    text=token.text,
+                    lemma_=token.lemma_,
+                    pos_=token.pos_,
+                    dep_=token.dep_,
+                    is_stop=token.is_stop,
+                    is_punct=token.is_punct,
+                    is_alpha=token.is_alpha,
+                    is_digit=token.is_digit,
+                    like_num=token.like_num,
+                    is_oov=token.is_oov,
+                    has_head=token.head.i != token.i,
+                )
+                for token in doc
+            ),
+            ents=tuple(
+                ParsedEntity(text=ent.text, label_=ent.label_, start_char=ent.start_char, end_char=ent.end_char)
+                for ent in doc.ents
+            ),
+            vector=tuple(float(value) for value in doc.vector) if has_vector else (),
+            has_vector=has_vector,
+            model=model,
+        )
+
+    def __iter__(self) -> Iterator[ParsedToken]:
+        return iter(self.tokens)
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+    def similarity(self, other: ParsedDoc) -> float:
+        """Cosine similarity of the document vectors (0.0 if either is empty), as Doc.similarity."""
+        if not self.vector or not other.vector or len(self.vector) != len(other.vector):
+            return 0.0
+        norm = math.sqrt(sum(value * value for value in self.vector)) * math.sqrt(
+            sum(value * value for value in other.vector)
+        )
+        if norm == 0:
+            return 0.0
+        return sum(a * b for a, b in zip(self.vector, other.vector, strict=True)) / norm
+
+
+# ---------------------------------------------------------------------------
+# Worker side (runs in the pool processes, or the fallback thread)
+# ---------------------------------------------------------------------------
+
+_worker_models: dict[str, Any] = {}
+
+
+def _load_model(model_name: str) -> Any:
+    """Load a model once per worker; a missing package falls back to a blank pipeline."""
+    nlp = _worker_models.get(model_name)
+    if nlp is None:
+        import spacy
+
+        try:
+            nlp = spacy.load(model_name)
+        except OSError:
+            logger.warning(f"spaCy model '{model_name}' not found, using blank pipeline")
+            nlp = spacy.blank(model_name.split("_")[0])
+        _worker_models[model_name] = nlp
+    return nlp
+
+
+def _init_worker(model_names: tuple[str, ...]) -> None:
+    """Pool initializer: preload the configured models."""
+    for model_name in model_names:
+        _load_model(model_name)
+
+
+def _parse_batch(model_name: str, disable: tuple[str, ...], texts: list[str]) -> list[ParsedDoc]:
+    """Parse a batch with nlp.pipe, skipping the disabled components."""
+    nlp = _load_model(model_name)
+    return [
+        ParsedDoc.from_spacy(doc, model_name)
+        for doc in nlp.pipe(texts, disable=list(disable), batch_size=len(texts))
+    ]
+
+
+# ---------------------------------------------------------------------------
+# Event loop side
+# ---------------------------------------------------------------------------
+
+_BatchKey = tuple[str, tuple[str, ...]]
+
+
+class SpacyNLPService:
+    """
+    Micro-batches parse requests and runs them outside the event loop.
+
+    Usage:
+        service = SpacyNLPService(("es_core_news_sm",), workers=2)
+        doc = await service.parse("hola", "es_core_news_sm")
+        await service.shutdown()
+    """
+
+    def __init__(
+        self,
+        preload_models: Sequence[str] = (),
+        workers: int = 2,
+        max_batch_size: int = 32,
+        max_wait: float = 0.002,
+    ):
+        self.preload_models = tuple(preload_models)
+        self.workers = workers
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+
+        self._executor: Executor | None = None
+        self._pending: list[tuple[_BatchKey, str, asyncio.Future[ParsedDoc]]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._tasks: set[asyncio.Task[None]] = set()
+        self._stats = {
+            "requests": 0,
+            "batches": 0,
+            "max_batch": 0,
+            "failed_batches": 0,
+        }
+
+    async def parse(self, text: str, model: str, disable: Sequence[str] = ()) -> ParsedDoc:
+        """
+        Parse a text in the next batch for its model.
+
+        Args:
+            text: Text to parse
+            model: spaCy model (package) name
+            disable: Pipeline components to skip (e.g. ("parser", "ner"))
+
+        Returns:
+            Parsed document features
+        """
+        self._stats["requests"] += 1
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # New event loop (e.g. asyncio.run in scripts): drop state bound to the old one
+            self._pending, self._timer, self._loop = [], None, loop
+
+        future: asyncio.Future[ParsedDoc] = loop.create_future()
+        self._pending.append(((model, tuple(sorted(disable))), text, future))
+
+        if self.max_wait <= 0 or len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+
+        return await future
+
+    async def parse_many(self, texts: Sequence[str], model: str, disable: Sequence[str] = ()) -> list[ParsedDoc]:
+        """Parse several texts (batched together when they fit in one batch)."""
+        return list(await asyncio.gather(*(self.parse(text, model, disable) for text in texts)))
+
+    def _get_executor(self) -> Executor:
+        """Create the pool on first use."""
+        if self._executor is None:
+            if self.workers > 0:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(self.preload_models,),
+                )
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=1,
+                    thread_name_prefix="spacy_nlp",
+                    initializer=_init_worker,
+                    initargs=(self.preload_models,),
+                )
+            logger.info(
+                f"spaCy NLP service started ({self.workers or 'in-process'} workers, "
+                f"models preloaded: {', '.join(self.preload_models) or 'none'})"
+            )
+        return self._executor
+
+    def _flush(self) -> None:
+        """Send the pending texts, one batch per (model, disabled components)."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        pending, self._pending = self._pending, []
+        batches: dict[_BatchKey, list[tuple[str, asyncio.Future[ParsedDoc]]]] = {}
+        for key, text, future in pending:
+            if not future.done():
+                batches.setdefault(key, []).append((text, future))
+
+        for key, batch in batches.items():
+            self._stats["batches"] += 1
+            self._stats["max_batch"] = max(self._stats["max_batch"], len(batch))
+            task = asyncio.create_task(self._run_batch(key, batch), name="spacy_nlp_batch")
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, key: _BatchKey, batch: list[tuple[str, asyncio.Future[ParsedDoc]]]) -> None:
+        """Parse a batch in the executor and resolve its waiters."""
+        model, disable = key
+        loop = asyncio.get_running_loop()
+        try:
+            docs = await loop.run_in_executor(
+                self._get_executor(), _parse_batch, model, disable, [text for text, _ in batch]
+            )
+        except Exception as e:
+            if isinstance(e, BrokenProcessPool):
+                # A worker died (e.g. OOM-killed): the next batch starts a new pool
+                self._executor = None
+            self._stats["failed_batches"] += 1
+            logger.warning(f"spaCy batch of {len(batch)} texts ({model}) failed: {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), doc in zip(batch, docs, strict=True):
+            if not future.done():
+                future.set_result(doc)
+
+    async def shutdown(self) -> None:
+        """Finish in-flight batches and stop the pool."""
+        if self._timer is not None:
+            self._flush()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._executor is not None:
+            executor, self._executor = self._executor, None
+            await asyncio.to_thread(executor.shutdown, wait=True)
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get batching statistics."""
+        batches = self._stats["batches"]
+        return {
+            **self._stats,
+            "pending": len(self._pending),
+            "in_flight_batches": len(self._tasks),
+            "avg_batch_size": round(self._stats["requests"] / batches, 2) if batches else 0.0,
+            "workers": self.workers,
+            "started": self._executor is not None,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+        }
+
+
+def is_model_installed(model_name: str) -> bool:
+    """Check whether a spaCy model package is installed, without loading it."""
+    try:
+        import spacy.util
+    except ImportError:
+        return False
+    return spacy.util.is_package(model_name)
+
+
+_nlp_service: SpacyNLPService | None = None
+
+
+def get_nlp_service() -> SpacyNLPService:
+    """Get the process-wide spaCy NLP service (configured from settings)."""
+    global _nlp_service
+    if _nlp_service is None:
+        from app.config.settings import get_settings
+
+        settings = get_settings()
+        _nlp_service = SpacyNLPService(
+            preload_models=[name.strip() for name in settings.NLP_PRELOAD_MODELS.split(",") if name.strip()],
+            workers=settings.NLP_PROCESS_WORKERS,
+            max_batch_size=settings.NLP_BATCH_MAX_SIZE,
+            max_wait=settings.NLP_BATCH_WAIT_MS / 1000,
+        )
+    return _nlp_service
+
+
+def get_nlp_service_stats() -> dict[str, Any]:
+    """Get statistics of the NLP service (empty if never used)."""
+    return _nlp_service.get_stats() if _nlp_service is not None else {}
+
+
+async def shutdown_nlp_service() -> None:
+    """Stop the NLP service worker processes."""
+    global _nlp_service
+    if _nlp_service is not None:
+        service, _nlp_service = _nlp_service, None
+        await service.shutdown()
@@ -2,6 +2,8 @@
 WhatsApp HTTP Client.
 
 Single Responsibility: Handle HTTP communication with WhatsApp Business API.
+Requests go through the shared pooled client, so connections to the Graph
+API are kept alive between messages.
 """
 
 import logging
@@ -9,6 +11,8 @@ from typing import Any
 
 import httpx
 
+from app.integrations.http_pool import get_shared_http_client
+
 logger = logging.getLogger(__name__)
 
 
@@ -80,17 +84,18 @@ class WhatsAppHttpClient:
         try:
             logger.debug(f"POST {url}")
 
-            async with httpx.AsyncClient(timeout=self._timeout) as client:
-                response = await client.post(url, json=payload, headers=self.headers)
+            response = await get_shared_http_client().post(
+                url, json=payload, headers=self.headers, timeout=self._timeout
+            )
 
-                logger.info(f"WhatsApp API Response: {response.status_code}")
+            logger.info(f"WhatsApp API Response: {response.status_code}")
 
-                if response.status_code == 200:
-                    result = response.json()
-                    logger.info(f"Request successful: {result}")
-                    return {"success": True, "data": result}
-                else:
-                    return self._handle_error_response(response)
+            if response.status_code == 200:
+                result = response.json()
+                logger.info(f"Request successful: {result}")
+                return {"success": True, "data": result}
+            else:
+                return self._handle_error_response(response)
 
         except httpx.TimeoutException:
             return {"success": False, "error": "Timeout connecting to WhatsApp API"}
@@ -118,13 +123,14 @@ class WhatsAppHttpClient:
         url = self.get_url(endpoint)
 
         try:
-            async with httpx.AsyncClient(timeout=self._timeout) as client:
-                response = await client.get(url, headers=self.headers, params=params)
-
-                if response.status_code == 200:
-                    return {"success": True, "data": response.json()}
-                else:
-                    return self._handle_error_response(response)
+            response = await get_shared_http_client().get(
+                url, headers=self.headers, params=params, timeout=self._timeout
+            )
+
+            if response.status_code == 200:
+                return {"success": True, "data": response.json()}
+            else:
+                return self._handle_error_response(response)
 
         except Exception as e:
             logger.error(f"GET request failed: {e}")
@@ -12,9 +12,16 @@ Multi-DID Support:
   - Credentials are fetched from chattigo_credentials table (encrypted)
   - Requires db_session and chattigo_context with 'did' to be provided
   - Configure credentials via Admin API: POST /api/v1/admin/chattigo-credentials
+
+Delivery:
+  - Adapters are pooled per DID by the adapter factory, so building a
+    service per message is cheap and reuses the shared connections
+  - Sends go through the outbound send queue (ordered per recipient,
+    retried on 429 and connection errors)
 """
 
 import logging
+from collections.abc import Awaitable, Callable
 from typing import TYPE_CHECKING, Any
 
 from app.config.settings import Settings, get_settings
@@ -94,23 +101,50 @@ class ChattigoMessagingService:
         factory = get_chattigo_adapter_factory()
         self._adapter = await factory.get_adapter(self._db_session, did)
         await self._adapter.initialize()
-        logger.info(f"Using database credentials for DID {did}")
+        logger.debug(f"Using pooled Chattigo adapter for DID {did}")
         return self._adapter
 
-    async def send_message(self, numero: str, mensaje: str) -> dict[str, Any]:
-        """Send text message via Chattigo API."""
+    async def _send(
+        self,
+        operation: str,
+        numero: str,
+        call: Callable[[Any], Awaitable[Any]],
+    ) -> dict[str, Any]:
+        """
+        Deliver a message through the outbound send queue.
+
+        Args:
+            operation: Adapter operation name (for logs and metrics)
+            numero: Recipient phone number
+            call: Performs the send with the DID's adapter
+
+        Returns:
+            Response dict with success status
+        """
+        from app.integrations.chattigo.send_queue import get_chattigo_send_queue
+
         adapter = await self._get_adapter()
 
         try:
-            result = await adapter.send_message(
-                msisdn=numero,
-                message=mensaje,
+            result = await get_chattigo_send_queue().send(
+                adapter.did,
+                numero,
+                lambda: call(adapter),
+                kind=operation.removeprefix("send_"),
             )
             return {"success": True, "data": result}
         except Exception as e:
-            logger.error(f"Chattigo send_message failed: {e}")
+            logger.error(f"Chattigo {operation} failed: {e}")
             return {"success": False, "error": str(e)}
 
+    async def send_message(self, numero: str, mensaje: str) -> dict[str, Any]:
+        """Send text message via Chattigo API."""
+        return await self._send(
+            "send_message",
+            numero,
+            lambda adapter: adapter.send_message(msisdn=numero, message=mensaje),
+        )
+
     async def send_document(
         self,
         numero: str,
@@ -119,19 +153,16 @@ class ChattigoMessagingService:
         caption: str | None = None,
     ) -> dict[str, Any]:
         """Send document via Chattigo API."""
-        adapter = await self._get_adapter()
-
-        try:
-            result = await adapter.send_document(
+        return await self._send(
+            "send_document",
+            numero,
+            lambda adapter: adapter.send_document(
                 msisdn=numero,
                 document_url=document_url,
                 filename=nombre,
                 caption=caption,
-            )
-            return {"success": True, "data": result}
-        except Exception as e:
-            logger.error(f"Chattigo send_document failed: {e}")
-            return {"success": False, "error": str(e)}
+            ),
+        )
 
     async def send_image(
         self,
@@ -140,18 +171,15 @@ class ChattigoMessagingService:
         caption: str | None = None,
     ) -> dict[str, Any]:
         """Send image via Chattigo API."""
-        adapter = await self._get_adapter()
-
-        try:
-            result = await adapter.send_image(
+        return await self._send(
+            "send_image",
+            numero,
+            lambda adapter: adapter.send_image(
                 msisdn=numero,
                 image_url=image_url,
                 caption=caption,
-            )
-            return {"success": True, "data": result}
-        except Exception as e:
-            logger.error(f"Chattigo send_image failed: {e}")
-            return {"success": False, "error": str(e)}
+            ),
+        )
 
     # Aliases for compatibility
     enviar_mensaje_texto = send_message
@@ -178,19 +206,17 @@ class ChattigoMessagingService:
         Returns:
             Response dict with success status
         """
-        adapter = await self._get_adapter()
-        try:
-            result = await adapter.send_interactive_buttons(
+        return await self._send(
+            "send_interactive_buttons",
+            numero,
+            lambda adapter: adapter.send_interactive_buttons(
                 msisdn=numero,
                 body=body,
                 buttons=buttons,
                 header=header,
                 footer=footer,
-            )
-            return {"success": True, "data": result}
-        except Exception as e:
-            logger.error(f"Chattigo send_interactive_buttons failed: {e}")
-            return {"success": False, "error": str(e)}
+            ),
+        )
 
     async def send_interactive_list(
         self,
@@ -215,20 +241,18 @@ class ChattigoMessagingService:
         Returns:
             Response dict with success status
         """
-        adapter = await self._get_adapter()
-        try:
-            result = await adapter.send_interactive_list(
+        return await self._send(
+            "send_interactive_list",
+            numero,
+            lambda adapter: adapter.send_interactive_list(
                 msisdn=numero,
                 body=body,
                 button_text=button_text,
                 sections=sections,
                 header=header,
                 footer=footer,
-            )
-            return {"success": True, "data": result}
-        except Exception as e:
-            logger.error(f"Chattigo send_interactive_list failed: {e}")
-            return {"success": False, "error": str(e)}
+            ),
+        )
 
     async def enviar_template(
         self,
@@ -285,7 +309,7 @@ class ChattigoMessagingService:
     send_template_with_document = enviar_template_con_documento
 
     async def close(self):
-        """Close adapter."""
+        """Release adapter (pooled adapters stay open)."""
         if self._adapter:
             await self._adapter.close()
             self._adapter = None
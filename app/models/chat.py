@@ -14,6 +14,7 @@ class StreamEventType(str, Enum):
     THINKING = "thinking"
     PROCESSING = "processing"
     GENERATING = "generating"
+    TOKEN = "token"  # Delta de texto de la respuesta (provisorio; COMPLETE es el definitivo)
     COMPLETE = "complete"
     ERROR = "error"
 
@@ -17,6 +17,7 @@ import inspect
 import logging
 from typing import Any, Dict, List, Optional
 
+from app.core.cache.semantic_classification_cache import context_fingerprint, semantic_classification_cache
 from app.core.interfaces.agent import IAgent
 from app.core.interfaces.llm import ILLM
 from app.prompts.manager import PromptManager
@@ -24,6 +25,8 @@ from app.prompts.registry import PromptRegistry
 
 logger = logging.getLogger(__name__)
 
+SEMANTIC_CACHE_ANALYZER = "super_orchestrator"
+
 
 class SuperOrchestrator:
     """
@@ -139,6 +142,17 @@ class SuperOrchestrator:
             available_domains = list(self.domain_agents.keys())
             domains_list = ", ".join(available_domains)
 
+            # Similar message already routed among the same domains
+            fingerprint = context_fingerprint(domains=sorted(available_domains), default=self.default_domain)
+            org_id = state.get("organization_id")
+            cached = await semantic_classification_cache.get(
+                SEMANTIC_CACHE_ANALYZER, message, tenant=org_id, fingerprint=fingerprint
+            )
+            if cached is not None and cached.value["domain"] in self.domain_agents:
+                cached_domain = cached.value["domain"]
+                logger.info(f"Domain semantic cache hit: {cached_domain} (similarity: {cached.similarity:.2f})")
+                return cached_domain
+
             # Load prompt from YAML
             prompt = await self._prompt_manager.get_prompt(
                 PromptRegistry.ORCHESTRATOR_DOMAIN_DETECTION,
@@ -178,6 +192,15 @@ class SuperOrchestrator:
                 )
                 return self.default_domain
 
+            # The LLM answers with a bare domain name: a valid one counts as confident
+            await semantic_classification_cache.set(
+                SEMANTIC_CACHE_ANALYZER,
+                message,
+                {"domain": detected_domain},
+                1.0,
+                tenant=org_id,
+                fingerprint=fingerprint,
+            )
             return detected_domain
 
         except Exception as e:
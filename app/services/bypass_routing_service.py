@@ -8,15 +8,12 @@ Single Responsibility: Phone number pattern matching and organization routing.
 from __future__ import annotations
 
 import logging
-from collections.abc import Sequence
 from dataclasses import dataclass
-from typing import cast
 from uuid import UUID
 
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.db.tenancy import BypassRule, Organization, TenantConfig
+from app.core.cache.bypass_rule_index import CompiledBypassRule, bypass_rule_index
 
 logger = logging.getLogger(__name__)
 
@@ -56,7 +53,9 @@ class BypassRoutingService:
     - phone_number_list: Exact match against list
     - whatsapp_phone_number_id: Match WhatsApp business phone ID
 
-    Rules are loaded from the bypass_rules table, ordered by priority (highest first).
+    Rules are loaded from the bypass_rules table, ordered by priority (highest first),
+    and compiled into the in-memory BypassRuleIndex (refreshed when the admin
+    bypass-rule endpoints bump its version).
     """
 
     def __init__(self, db: AsyncSession):
@@ -76,6 +75,9 @@ class BypassRoutingService:
         """
         Evaluate bypass routing rules across all organizations.
 
+        Uses the compiled in-memory rule index; the database is only queried
+        when the index is (re)built.
+
         Args:
             wa_id: WhatsApp ID of the incoming message sender
             whatsapp_phone_number_id: WhatsApp Business phone number ID
@@ -84,71 +86,30 @@ class BypassRoutingService:
             BypassMatch if a rule matches, None otherwise
         """
         try:
-            logger.info(
+            logger.debug(
                 f"[BYPASS] Evaluating rules with wa_id={wa_id}, "
                 f"whatsapp_phone_number_id={whatsapp_phone_number_id}"
             )
 
-            # Load all enabled rules ordered by priority
-            rules = await self._load_active_rules()
-            logger.debug(f"[BYPASS] Loaded {len(rules)} active bypass rules")
-
-            for rule, org, tenant_config in rules:
-                if rule.matches(wa_id, whatsapp_phone_number_id):
-                    # Use rule's target_domain or fallback to tenant's default_domain
-                    domain = (
-                        rule.target_domain
-                        or (tenant_config.default_domain if tenant_config else None)
-                        or "excelencia"
-                    )
-                    logger.info(
-                        f"[BYPASS] Rule '{rule.rule_name}' matched for {wa_id}: "
-                        f"org={org.slug}, domain={domain}, agent={rule.target_agent}, "
-                        f"pharmacy_id={rule.pharmacy_id}"
-                    )
-                    return BypassMatch(
-                        organization_id=cast(UUID, org.id),
-                        domain=cast(str, domain),
-                        target_agent=cast(str, rule.target_agent),
-                        pharmacy_id=cast(UUID | None, rule.pharmacy_id),
-                        isolated_history=bool(rule.isolated_history) if rule.isolated_history else False,
-                        rule_id=cast(UUID, rule.id),
-                    )
-
-            # No rule matched
-            logger.debug(
-                f"[BYPASS] No rule matched for wa_id={wa_id}, "
-                f"whatsapp_phone_number_id={whatsapp_phone_number_id}, "
-                f"evaluated {len(rules)} rules"
+            rule = await bypass_rule_index.match(self._db, wa_id, whatsapp_phone_number_id)
+            if rule is None:
+                logger.debug(
+                    f"[BYPASS] No rule matched for wa_id={wa_id}, "
+                    f"whatsapp_phone_number_id={whatsapp_phone_number_id}"
+                )
+                return None
+
+            logger.info(
+                f"[BYPASS] Rule '{rule.rule_name}' matched for {wa_id}: "
+                f"org={rule.organization_slug}, domain={rule.domain}, agent={rule.target_agent}, "
+                f"pharmacy_id={rule.pharmacy_id}"
             )
-            return None
+            return self._to_match(rule)
 
         except Exception as e:
             logger.warning(f"Error checking bypass routing: {e}")
             return None
 
-    async def _load_active_rules(
-        self,
-    ) -> Sequence[tuple[BypassRule, Organization, TenantConfig | None]]:
-        """
-        Load all active bypass rules with their organizations.
-
-        Rules are ordered by priority (highest first).
-
-        Returns:
-            List of (BypassRule, Organization, TenantConfig) tuples
-        """
-        query = (
-            select(BypassRule, Organization, TenantConfig)
-            .join(Organization, BypassRule.organization_id == Organization.id)
-            .outerjoin(TenantConfig, TenantConfig.organization_id == Organization.id)
-            .where(Organization.status == "active")
-            .where(BypassRule.enabled == True)  # noqa: E712
-            .order_by(BypassRule.priority.desc(), BypassRule.rule_name)  # type: ignore[union-attr]
-        )
-        result = await self._db.execute(query)
-        return [tuple(row) for row in result.all()]
-
     async def evaluate_bypass_rules_for_org(
         self,
         organization_id: UUID,
@@ -167,56 +128,33 @@ class BypassRoutingService:
             BypassMatch if a rule matches, None otherwise
         """
         try:
-            rules = await self._load_rules_for_org(organization_id)
-
-            for rule, tenant_config in rules:
-                if rule.matches(wa_id, whatsapp_phone_number_id):
-                    domain = (
-                        rule.target_domain
-                        or (tenant_config.default_domain if tenant_config else None)
-                        or "excelencia"
-                    )
-                    logger.info(
-                        f"[BYPASS] Rule '{rule.rule_name}' matched for org {organization_id}, "
-                        f"pharmacy_id={rule.pharmacy_id}"
-                    )
-                    return BypassMatch(
-                        organization_id=organization_id,
-                        domain=cast(str, domain),
-                        target_agent=cast(str, rule.target_agent),
-                        pharmacy_id=cast(UUID | None, rule.pharmacy_id),
-                        isolated_history=bool(rule.isolated_history) if rule.isolated_history else False,
-                        rule_id=cast(UUID, rule.id),
-                    )
+            rule = await bypass_rule_index.match_for_org(
+                self._db, organization_id, wa_id, whatsapp_phone_number_id
+            )
+            if rule is None:
+                return None
 
-            return None
+            logger.info(
+                f"[BYPASS] Rule '{rule.rule_name}' matched for org {organization_id}, "
+                f"pharmacy_id={rule.pharmacy_id}"
+            )
+            return self._to_match(rule)
 
         except Exception as e:
             logger.warning(f"Error checking bypass routing for org {organization_id}: {e}")
             return None
 
-    async def _load_rules_for_org(
-        self,
-        organization_id: UUID,
-    ) -> Sequence[tuple[BypassRule, TenantConfig | None]]:
-        """
-        Load bypass rules for a specific organization.
-
-        Args:
-            organization_id: Organization UUID
-
-        Returns:
-            List of (BypassRule, TenantConfig) tuples
-        """
-        query = (
-            select(BypassRule, TenantConfig)
-            .outerjoin(TenantConfig, TenantConfig.organization_id == BypassRule.organization_id)
-            .where(BypassRule.organization_id == organization_id)
-            .where(BypassRule.enabled == True)  # noqa: E712
-            .order_by(BypassRule.priority.desc(), BypassRule.rule_name)  # type: ignore[union-attr]
+    @staticmethod
+    def _to_match(rule: CompiledBypassRule) -> BypassMatch:
+        """Convert a compiled rule into a BypassMatch."""
+        return BypassMatch(
+            organization_id=rule.organization_id,
+            domain=rule.domain,
+            target_agent=rule.target_agent,
+            pharmacy_id=rule.pharmacy_id,
+            isolated_history=rule.isolated_history,
+            rule_id=rule.rule_id,
         )
-        result = await self._db.execute(query)
-        return [tuple(row) for row in result.all()]
 
 
 def get_bypass_routing_service(db: AsyncSession) -> BypassRoutingService:
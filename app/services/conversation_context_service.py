@@ -5,13 +5,17 @@ Manages conversation context across Redis (hot cache) and PostgreSQL (persistent
 Implements a tiered storage strategy:
 - Redis: Fast access for active conversations (7-day TTL)
 - PostgreSQL: Persistent storage as source of truth
+
+With write-behind enabled, the response path only updates Redis
+(cache_context) and ConversationWriteBehind persists turns to PostgreSQL
+in batches (upsert_context_if_newer, update_summary, add_messages).
 """
 
 import logging
 from datetime import UTC, datetime
 from typing import Any
 
-from sqlalchemy import select
+from sqlalchemy import func, literal, select, update
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -29,6 +33,14 @@ CONTEXT_REDIS_TTL = 604800  # 7 days in seconds
 MESSAGE_REDIS_TTL = 86400  # 24 hours in seconds
 DEFAULT_MESSAGE_LIMIT = 20
 
+# Metadata key recording the turn at which rolling_summary was generated
+SUMMARY_TURN_KEY = "summary_turn"
+
+
+def get_summary_turn(context: ConversationContextModel) -> int:
+    """Get the turn at which the context's rolling summary was generated."""
+    return int((context.metadata or {}).get(SUMMARY_TURN_KEY) or 0)
+
 
 class ConversationContextService:
     """
@@ -117,6 +129,46 @@ class ConversationContextService:
             await self._upsert_to_db(conversation_id, context)
             logger.debug(f"Context saved to DB for {conversation_id}")
 
+    async def cache_context(
+        self, conversation_id: str, context: ConversationContextModel
+    ) -> None:
+        """
+        Save conversation context to the Redis cache only.
+
+        Used by the write-behind path, where PostgreSQL is updated later.
+        A summary cached by the write-behind worker after this context was
+        loaded is kept instead of being overwritten by the older one.
+
+        Args:
+            conversation_id: Unique conversation identifier
+            context: The context model to cache
+        """
+        context.updated_at = datetime.now(UTC)
+        context.last_activity_at = datetime.now(UTC)
+
+        cached = await self._get_from_cache(conversation_id)
+        if cached and get_summary_turn(cached) > get_summary_turn(context):
+            context.rolling_summary = cached.rolling_summary
+            context.metadata[SUMMARY_TURN_KEY] = get_summary_turn(cached)
+
+        await self._save_to_cache(conversation_id, context)
+
+    async def cache_summary(self, conversation_id: str, summary: str, turn: int) -> None:
+        """
+        Apply a rolling summary to the cached context if it is newer.
+
+        Args:
+            conversation_id: Unique conversation identifier
+            summary: Summary generated at `turn`
+            turn: Turn number the summary covers
+        """
+        cached = await self._get_from_cache(conversation_id)
+        if cached is None or get_summary_turn(cached) >= turn:
+            return
+        cached.rolling_summary = summary
+        cached.metadata[SUMMARY_TURN_KEY] = turn
+        await self._save_to_cache(conversation_id, cached)
+
     async def save_message(
         self,
         conversation_id: str,
@@ -151,6 +203,103 @@ class ConversationContextService:
         await self.db.commit()
         logger.debug(f"Message saved for {conversation_id}: {sender_type}")
 
+    async def add_messages(self, messages: list[dict[str, Any]]) -> int:
+        """
+        Insert messages in one statement, skipping ids that already exist.
+
+        Does not commit: callers batch this with the context upsert.
+
+        Args:
+            messages: Rows with id, conversation_id, sender_type, content,
+                agent_name, extra_data and created_at
+
+        Returns:
+            Number of inserted rows
+        """
+        if not self.db or not messages:
+            return 0
+
+        stmt = (
+            insert(ConversationMessage)
+            .values(messages)
+            .on_conflict_do_nothing(index_elements=["id"])
+        )
+        result = await self.db.execute(stmt)
+        return result.rowcount or 0
+
+    async def upsert_context_if_newer(
+        self, conversation_id: str, context: ConversationContextModel
+    ) -> None:
+        """
+        Upsert context unless the stored row already has more turns.
+
+        The rolling summary and its summary turn are only written on insert;
+        existing rows get them through update_summary(). Does not commit.
+
+        Args:
+            conversation_id: Unique conversation identifier
+            context: Context snapshot taken after the turn
+        """
+        if not self.db:
+            return
+
+        values = self._context_values(conversation_id, context)
+        stmt = insert(ConversationContext).values(**values)
+        excluded = stmt.excluded
+        stored_summary_turn = func.jsonb_strip_nulls(
+            func.jsonb_build_object(
+                literal(SUMMARY_TURN_KEY),
+                ConversationContext.extra_data.op("->")(literal(SUMMARY_TURN_KEY)),
+            )
+        )
+
+        set_: dict[str, Any] = {
+            key: getattr(excluded, key)
+            for key in values
+            if key not in ("conversation_id", "rolling_summary", "extra_data")
+        }
+        set_["extra_data"] = excluded.extra_data.op("||")(stored_summary_turn)
+        set_["updated_at"] = datetime.now(UTC)
+
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["conversation_id"],
+            set_=set_,
+            where=ConversationContext.total_turns <= excluded.total_turns,
+        )
+        await self.db.execute(stmt)
+
+    async def update_summary(self, conversation_id: str, summary: str, turn: int) -> None:
+        """
+        Store a rolling summary unless a newer one is already stored.
+
+        Does not commit.
+
+        Args:
+            conversation_id: Unique conversation identifier
+            summary: Summary generated at `turn`
+            turn: Turn number the summary covers
+        """
+        if not self.db:
+            return
+
+        stored_turn = func.coalesce(
+            ConversationContext.extra_data[SUMMARY_TURN_KEY].as_integer(), 0
+        )
+        await self.db.execute(
+            update(ConversationContext)
+            .where(
+                ConversationContext.conversation_id == conversation_id,
+                stored_turn < turn,
+            )
+            .values(
+                rolling_summary=summary,
+                extra_data=ConversationContext.extra_data.op("||")(
+                    func.jsonb_build_object(literal(SUMMARY_TURN_KEY), turn)
+                ),
+                updated_at=datetime.now(UTC),
+            )
+        )
+
     async def get_recent_messages(
         self, conversation_id: str, limit: int = DEFAULT_MESSAGE_LIMIT
     ) -> list[ConversationMessageModel]:
@@ -392,35 +541,12 @@ class ConversationContextService:
         if not self.db:
             return
 
-        stmt = insert(ConversationContext).values(
-            conversation_id=conversation_id,
-            organization_id=context.organization_id,
-            pharmacy_id=context.pharmacy_id,
-            user_phone=context.user_phone,
-            rolling_summary=context.rolling_summary,
-            topic_history=context.topic_history,
-            key_entities=context.key_entities,
-            total_turns=context.total_turns,
-            last_user_message=context.last_user_message,
-            last_bot_response=context.last_bot_response,
-            extra_data=context.metadata,
-            last_activity_at=context.last_activity_at,
-        )
-
+        values = self._context_values(conversation_id, context)
+        stmt = insert(ConversationContext).values(**values)
         stmt = stmt.on_conflict_do_update(
             index_elements=["conversation_id"],
             set_={
-                "organization_id": context.organization_id,
-                "pharmacy_id": context.pharmacy_id,
-                "user_phone": context.user_phone,
-                "rolling_summary": context.rolling_summary,
-                "topic_history": context.topic_history,
-                "key_entities": context.key_entities,
-                "total_turns": context.total_turns,
-                "last_user_message": context.last_user_message,
-                "last_bot_response": context.last_bot_response,
-                "extra_data": context.metadata,
-                "last_activity_at": context.last_activity_at,
+                **{key: value for key, value in values.items() if key != "conversation_id"},
                 "updated_at": datetime.now(UTC),
             },
         )
@@ -428,6 +554,26 @@ class ConversationContextService:
         await self.db.execute(stmt)
         await self.db.commit()
 
+    @staticmethod
+    def _context_values(
+        conversation_id: str, context: ConversationContextModel
+    ) -> dict[str, Any]:
+        """Build conversation_contexts column values from a context model."""
+        return {
+            "conversation_id": conversation_id,
+            "organization_id": context.organization_id,
+            "pharmacy_id": context.pharmacy_id,
+            "user_phone": context.user_phone,
+            "rolling_summary": context.rolling_summary,
+            "topic_history": context.topic_history,
+            "key_entities": context.key_entities,
+            "total_turns": context.total_turns,
+            "last_user_message": context.last_user_message,
+            "last_bot_response": context.last_bot_response,
+            "extra_data": context.metadata,
+            "last_activity_at": context.last_activity_at,
+        }
+
     @staticmethod
     def _ensure_utc(dt: datetime | None) -> datetime:
         """Normalize datetime to UTC-aware.
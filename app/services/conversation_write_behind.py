@@ -0,0 +1,413 @@
+# ============================================================================
+# SCOPE: GLOBAL
+# Description: Write-behind pipeline for conversation history. Persists turns
+#              (rolling summary, context, messages) after the reply is sent.
+# ============================================================================
+"""
+Conversation Write-Behind Pipeline.
+
+Updating history inline used to cost one context upsert and two message
+commits per turn, plus an LLM summary every N turns, all before the reply
+reached the user. With write-behind, the response path only updates the
+Redis context cache and appends a ContextWriteJob to a Redis Stream; a
+background worker persists the turns:
+
+- Batching: up to BATCH_SIZE turns per DB transaction, one context upsert
+  per conversation and one multi-row message insert, a single commit.
+- At-least-once: entries stay pending in the consumer group until the
+  transaction commits; un-acked entries are re-claimed after the visibility
+  timeout and dead-lettered after MAX_DELIVERIES.
+- Idempotent replays: message ids are derived from the job (uuid5) and
+  inserted with ON CONFLICT DO NOTHING.
+- Per-conversation ordering: jobs of a conversation are applied in stream
+  order, summaries are chained turn by turn, the context upsert never
+  replaces a row with more turns, and a summary never replaces one
+  generated at a later turn (even across workers).
+
+If the stream is unavailable, the job is applied inline so no turn is lost.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import socket
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from contextlib import AbstractAsyncContextManager
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.integrations.databases.redis_stream import RedisStreamQueue, StreamEntry
+from app.models.conversation_context import ConversationContextModel
+from app.services.conversation_context_service import (
+    SUMMARY_TURN_KEY,
+    ConversationContextService,
+)
+
+logger = logging.getLogger(__name__)
+
+SessionFactory = Callable[[], AbstractAsyncContextManager[AsyncSession]]
+Summarizer = Callable[[str, str, str], Awaitable[str]]
+
+JOB_FIELD = "job"
+
+# Namespace for deterministic conversation message ids
+MESSAGE_ID_NAMESPACE = uuid.UUID("6f1c7c52-3f0e-4d55-9a43-0c2b7e1d9a10")
+
+
+@dataclass
+class ContextWriteJob:
+    """One conversation turn waiting to be persisted."""
+
+    conversation_id: str
+    context: ConversationContextModel
+    user_message: str
+    bot_response: str
+    agent_name: str | None = None
+    summarize: bool = False
+    created_at: float = field(default_factory=time.time)
+
+    @property
+    def turn(self) -> int:
+        """Turn number of this exchange."""
+        return self.context.total_turns
+
+    def to_fields(self) -> dict[str, str]:
+        """Serialize to Redis Stream fields."""
+        payload = {
+            "conversation_id": self.conversation_id,
+            "context": self.context.model_dump(mode="json"),
+            "user_message": self.user_message,
+            "bot_response": self.bot_response,
+            "agent_name": self.agent_name,
+            "summarize": self.summarize,
+            "created_at": self.created_at,
+        }
+        return {JOB_FIELD: json.dumps(payload, ensure_ascii=False)}
+
+    @classmethod
+    def from_fields(cls, fields: dict[str, Any]) -> ContextWriteJob:
+        """Deserialize from Redis Stream fields."""
+        raw = fields[JOB_FIELD]
+        payload = json.loads(raw.decode() if isinstance(raw, bytes) else raw)
+        return cls(
+            conversation_id=payload["conversation_id"],
+            context=ConversationContextModel.model_validate(payload["context"]),
+            user_message=payload["user_message"],
+            bot_response=payload["bot_response"],
+            agent_name=payload.get("agent_name"),
+            summarize=bool(payload.get("summarize", False)),
+            created_at=float(payload["created_at"]),
+        )
+
+    def message_rows(self) -> list[dict[str, Any]]:
+        """
+        Build conversation_messages rows for this turn.
+
+        Ids are stable across redeliveries, and the assistant message is
+        stamped one microsecond after the user message so both keep their
+        order when read back by created_at.
+        """
+        created_at = datetime.fromtimestamp(self.created_at, UTC)
+        key = f"{self.conversation_id}:{self.turn}:{self.created_at!r}"
+        return [
+            {
+                "id": uuid.uuid5(MESSAGE_ID_NAMESPACE, f"{key}:user"),
+                "conversation_id": self.conversation_id,
+                "sender_type": "user",
+                "content": self.user_message,
+                "agent_name": None,
+                "extra_data": {},
+                "created_at": created_at,
+            },
+            {
+                "id": uuid.uuid5(MESSAGE_ID_NAMESPACE, f"{key}:assistant"),
+                "conversation_id": self.conversation_id,
+                "sender_type": "assistant",
+                "content": self.bot_response,
+                "agent_name": self.agent_name,
+                "extra_data": {},
+                "created_at": created_at + timedelta(microseconds=1),
+            },
+        ]
+
+
+def group_by_conversation(jobs: list[ContextWriteJob]) -> dict[str, list[ContextWriteJob]]:
+    """Group jobs by conversation, keeping stream order within each group."""
+    groups: dict[str, list[ContextWriteJob]] = {}
+    for job in jobs:
+        groups.setdefault(job.conversation_id, []).append(job)
+    return groups
+
+
+class ConversationWriteBehind:
+    """
+    Redis Stream backed write-behind worker for conversation turns.
+
+    Usage:
+        write_behind = ConversationWriteBehind(queue, summarizer=history_agent.summarize)
+        await write_behind.submit(job)   # returns once the job is queued
+        ...
+        await write_behind.stop()        # drain on shutdown
+    """
+
+    def __init__(
+        self,
+        queue: RedisStreamQueue,
+        session_factory: SessionFactory,
+        summarizer: Summarizer | None = None,
+        batch_size: int = 100,
+        visibility_timeout: int = 60,
+        max_deliveries: int = 5,
+    ):
+        self._queue = queue
+        self._session_factory = session_factory
+        self._summarizer = summarizer
+        self.batch_size = batch_size
+        self._visibility_timeout_ms = visibility_timeout * 1000
+        self._max_deliveries = max_deliveries
+        self._consumer = f"{socket.gethostname()}-{os.getpid()}"
+
+        self._worker: asyncio.Task[None] | None = None
+        self._running = False
+        self._stats = {
+            "enqueued": 0,
+            "inline_fallbacks": 0,
+            "batches": 0,
+            "turns_persisted": 0,
+            "summaries": 0,
+            "summary_errors": 0,
+            "failed_batches": 0,
+            "reclaimed": 0,
+            "dead_lettered": 0,
+        }
+
+    @property
+    def is_running(self) -> bool:
+        """Check if the worker loop is running."""
+        return self._running
+
+    def set_summarizer(self, summarizer: Summarizer) -> None:
+        """Set the callable used to regenerate rolling summaries."""
+        self._summarizer = summarizer
+
+    async def submit(self, job: ContextWriteJob) -> None:
+        """
+        Queue a turn for persistence, starting the worker on first use.
+
+        Falls back to persisting the turn inline when the stream is
+        unavailable.
+
+        Args:
+            job: Turn to persist
+        """
+        try:
+            await self._queue.add(job.to_fields())
+            self._stats["enqueued"] += 1
+        except Exception as e:
+            logger.warning(f"Write-behind enqueue failed for {job.conversation_id}, persisting inline: {e}")
+            self._stats["inline_fallbacks"] += 1
+            await self.apply([job])
+            return
+
+        if not self._running:
+            self.start()
+
+    def start(self) -> None:
+        """Start the worker loop."""
+        if self._running:
+            return
+        self._running = True
+        self._worker = asyncio.create_task(self._run(), name="conversation_write_behind")
+        logger.info(f"Conversation write-behind started: stream={self._queue.stream}, batch={self.batch_size}")
+
+    async def stop(self, grace_period: float = 10.0) -> None:
+        """
+        Stop the worker after the batch in progress.
+
+        Entries not yet acknowledged stay pending and are re-claimed by the
+        next worker once their visibility timeout expires.
+        """
+        if not self._running:
+            return
+
+        self._running = False
+        if self._worker is not None:
+            try:
+                await asyncio.wait_for(asyncio.shield(self._worker), timeout=grace_period)
+            except TimeoutError:
+                self._worker.cancel()
+                await asyncio.gather(self._worker, return_exceptions=True)
+            self._worker = None
+        logger.info("Conversation write-behind stopped")
+
+    async def _run(self) -> None:
+        """Worker loop: re-claim abandoned entries, read new ones, persist."""
+        next_reclaim = 0.0
+        reclaim_interval = max(self._visibility_timeout_ms / 2000, 1.0)
+
+        while self._running:
+            try:
+                entries: list[StreamEntry] = []
+                if time.monotonic() >= next_reclaim:
+                    entries = await self._queue.reclaim(
+                        self._consumer, self._visibility_timeout_ms, self.batch_size
+                    )
+                    self._stats["reclaimed"] += len(entries)
+                    next_reclaim = time.monotonic() + reclaim_interval
+
+                if not entries:
+                    entries = await self._queue.read(self._consumer, count=self.batch_size)
+
+                if entries:
+                    await self._handle_batch(entries)
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Conversation write-behind error: {e}", exc_info=True)
+                await asyncio.sleep(1.0)
+
+    async def _handle_batch(self, entries: list[StreamEntry]) -> None:
+        """Persist a batch of entries: ack on commit, dead-letter after max deliveries."""
+        jobs: list[ContextWriteJob] = []
+        decoded: list[StreamEntry] = []
+        for entry in entries:
+            if entry.deliveries > self._max_deliveries:
+                await self._dead_letter(entry, "max deliveries exceeded")
+                continue
+            try:
+                jobs.append(ContextWriteJob.from_fields(entry.fields))
+                decoded.append(entry)
+            except Exception as e:
+                await self._dead_letter(entry, f"decode error: {e}")
+
+        if not jobs:
+            return
+
+        try:
+            await self.apply(jobs)
+        except Exception as e:
+            self._stats["failed_batches"] += 1
+            logger.error(f"Write-behind batch of {len(jobs)} turns failed: {e}", exc_info=True)
+            for entry in decoded:
+                if entry.deliveries >= self._max_deliveries:
+                    await self._dead_letter(entry, str(e))
+            # Otherwise leave pending: re-claimed after the visibility timeout
+            return
+
+        await self._queue.ack(*(entry.entry_id for entry in decoded))
+        self._stats["batches"] += 1
+        self._stats["turns_persisted"] += len(jobs)
+
+    async def apply(self, jobs: list[ContextWriteJob]) -> None:
+        """
+        Summarize and persist turns in a single transaction.
+
+        Args:
+            jobs: Turns in stream order
+        """
+        groups = group_by_conversation(jobs)
+        summaries = await asyncio.gather(*(self._summarize(group) for group in groups.values()))
+
+        async with self._session_factory() as session:
+            service = ConversationContextService(db=session)
+            for conversation_id, group in groups.items():
+                # Context first: messages reference it (FK)
+                await service.upsert_context_if_newer(conversation_id, group[-1].context)
+            for (conversation_id, _group), summary in zip(groups.items(), summaries, strict=True):
+                if summary is not None:
+                    await service.update_summary(conversation_id, *summary)
+            await service.add_messages([row for job in jobs for row in job.message_rows()])
+            await session.commit()
+
+        cache = ConversationContextService()
+        for (conversation_id, _group), summary in zip(groups.items(), summaries, strict=True):
+            if summary is not None:
+                await cache.cache_summary(conversation_id, *summary)
+
+    async def _summarize(self, jobs: list[ContextWriteJob]) -> tuple[str, int] | None:
+        """
+        Regenerate rolling summaries for one conversation's turns, in order.
+
+        Each summary builds on the previous one from the same batch, so a
+        summary never skips a turn that is still in flight.
+
+        Returns:
+            (summary, turn) of the latest summary generated, or None
+        """
+        latest: tuple[str, int] | None = None
+        for job in jobs:
+            if latest is not None:
+                job.context.rolling_summary, job.context.metadata[SUMMARY_TURN_KEY] = latest
+            if not job.summarize or self._summarizer is None:
+                continue
+            try:
+                summary = await self._summarizer(job.context.rolling_summary, job.user_message, job.bot_response)
+            except Exception as e:
+                # Graceful degradation: keep the previous summary
+                self._stats["summary_errors"] += 1
+                logger.error(f"Error generating summary for {job.conversation_id}: {e}")
+                continue
+            self._stats["summaries"] += 1
+            latest = (summary, job.turn)
+            job.context.rolling_summary = summary
+            job.context.metadata[SUMMARY_TURN_KEY] = job.turn
+        return latest
+
+    async def _dead_letter(self, entry: StreamEntry, error: str) -> None:
+        """Move an entry to the dead-letter stream."""
+        try:
+            await self._queue.dead_letter(entry, error)
+            self._stats["dead_lettered"] += 1
+            logger.warning(f"Conversation write dead-lettered: {entry.entry_id} ({error})")
+        except Exception as e:
+            logger.error(f"Failed to dead-letter conversation write {entry.entry_id}: {e}")
+
+    async def get_stats(self) -> dict[str, Any]:
+        """Get worker counters merged with stream statistics."""
+        stats: dict[str, Any] = {"running": self._running, **self._stats}
+        try:
+            stats["queue"] = await self._queue.get_stats()
+        except Exception as e:
+            stats["queue"] = {"error": str(e)}
+        return stats
+
+
+# Global instance for singleton pattern
+_conversation_write_behind: ConversationWriteBehind | None = None
+
+
+def get_conversation_write_behind() -> ConversationWriteBehind:
+    """Get or create the global conversation write-behind worker."""
+    global _conversation_write_behind
+    if _conversation_write_behind is None:
+        from app.config.settings import get_settings
+        from app.database.async_db import get_async_db_context
+
+        settings = get_settings()
+        _conversation_write_behind = ConversationWriteBehind(
+            RedisStreamQueue(
+                stream=settings.CONVERSATION_WRITE_BEHIND_STREAM,
+                group=settings.CONVERSATION_WRITE_BEHIND_GROUP,
+                maxlen=settings.CONVERSATION_WRITE_BEHIND_MAXLEN,
+            ),
+            session_factory=get_async_db_context,
+            batch_size=settings.CONVERSATION_WRITE_BEHIND_BATCH_SIZE,
+            visibility_timeout=settings.CONVERSATION_WRITE_BEHIND_VISIBILITY_TIMEOUT,
+            max_deliveries=settings.CONVERSATION_WRITE_BEHIND_MAX_DELIVERIES,
+        )
+    return _conversation_write_behind
+
+
+async def shutdown_conversation_write_behind() -> None:
+    """Stop the global write-behind worker if it was started."""
+    if _conversation_write_behind is not None:
+        await _conversation_write_behind.stop()
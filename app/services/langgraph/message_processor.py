@@ -3,6 +3,7 @@ Message processing logic for LangGraph chatbot service
 """
 
 import logging
+from contextlib import aclosing
 from datetime import datetime
 from typing import Any, AsyncGenerator, Dict, cast
 from uuid import UUID
@@ -13,6 +14,7 @@ from app.core.graph import AynuxGraph
 from app.core.schemas import ConversationContext, CustomerContext
 from app.models.chat import ChatStreamEvent, StreamEventType
 from app.models.message import WhatsAppMessage
+from app.services.langgraph.token_stream import coalesce_token_events
 from app.utils.language_detector import get_language_detector
 
 logger = logging.getLogger(__name__)
@@ -50,10 +52,10 @@ class MessageProcessor:
 
         return ""
 
-    def detect_language(self, text: str) -> str:
-        """Detecta el idioma del mensaje usando spaCy con fallback robusto"""
+    async def detect_language(self, text: str) -> str:
+        """Detecta el idioma del mensaje usando spaCy (servicio NLP) con fallback robusto"""
         try:
-            result = self.language_detector.detect_language(text)
+            result = await self.language_detector.adetect_language(text)
             detected_language = result.get("language", "es")
             confidence = result.get("confidence", 0.0)
             method = result.get("method", "unknown")
@@ -204,98 +206,114 @@ class MessageProcessor:
             step_count = 0
             current_agent = "orchestrator"
 
-            # Stream through the graph execution
-            async for raw_chunk in graph_system.astream(
+            # Stream through the graph execution (token deltas coalesced when
+            # the client reads slower than the LLM generates)
+            graph_stream = graph_system.astream(
                 message=message_text,
                 conversation_id=session_id,
                 customer_data=customer_context.model_dump(),
                 conversation_data=conversation_context.model_dump(),
-            ):
-                step_count += 1
-                # Cast to dict - LangGraph stream yields dicts
-                chunk = cast(Dict[str, Any], raw_chunk)
-
-                if chunk.get("type") == "stream_event":
-                    data = cast(Dict[str, Any], chunk.get("data", {}))
-                    current_node = str(data.get("current_node", "unknown"))
-
-                    # Map node names to user-friendly agent names and messages
-                    agent_info = self._map_node_to_agent_info(current_node)
-                    current_agent = agent_info["agent_name"]
-
-                    # Calculate progress based on step count
-                    progress = min(0.9, 0.1 + (step_count * 0.15))
-
-                    yield ChatStreamEvent(
-                        event_type=agent_info["event_type"],
-                        message=agent_info["message"],
-                        agent_current=current_agent,
-                        progress=progress,
-                        metadata={
-                            "step": step_count,
-                            "node": current_node,
-                            "state_preview": data.get("state_preview", {}),
-                        },
-                        timestamp=datetime.now().isoformat(),
-                    )
-
-                elif chunk.get("type") == "final_result":
-                    # Process final result
-                    result = cast(Dict[str, Any], chunk.get("data", {}))
-
-                    # Extract response text from final result
-                    response_text = "Lo siento, no pude procesar tu mensaje."
-                    agent_used = str(result.get("current_agent", current_agent))
-
-                    # Get response from last AI message
-                    messages = cast(list[Any], result.get("messages", []))
-                    for msg in reversed(messages):
-                        if hasattr(msg, "content") and msg.__class__.__name__ == "AIMessage":
-                            response_text = msg.content
-                            break
-
-                    # Calculate processing time
-                    processing_time = (datetime.now() - start_time).total_seconds() * 1000
-
-                    # Emit final generation event
-                    yield ChatStreamEvent(
-                        event_type=StreamEventType.GENERATING,
-                        message="✨ Generando respuesta final...",
-                        agent_current=agent_used,
-                        progress=0.95,
-                        metadata={"step": "final_generation"},
-                        timestamp=datetime.now().isoformat(),
-                    )
-
-                    # Emit completion event with response
-                    yield ChatStreamEvent(
-                        event_type=StreamEventType.COMPLETE,
-                        message=response_text,
-                        agent_current=agent_used,
-                        progress=1.0,
-                        metadata={
-                            "requires_human": bool(result.get("human_handoff_requested", False)),
-                            "is_complete": bool(result.get("is_complete", True)),
-                            "processing_time_ms": int(processing_time),
-                            "total_steps": step_count,
-                            "session_id": session_id,
-                        },
-                        timestamp=datetime.now().isoformat(),
-                    )
-
-                elif chunk.get("type") == "error":
-                    # Emit error event
-                    error_data = cast(Dict[str, Any], chunk.get("data", {}))
-                    error_msg = str(error_data.get("error", "Error desconocido"))
-                    yield ChatStreamEvent(
-                        event_type=StreamEventType.ERROR,
-                        message=f"❌ Error procesando tu mensaje: {error_msg}",
-                        agent_current=current_agent,
-                        progress=0.0,
-                        metadata={"error": error_msg},
-                        timestamp=datetime.now().isoformat(),
-                    )
-                    break
+            )
+            async with aclosing(coalesce_token_events(graph_stream)) as events:
+                async for raw_chunk in events:
+                    # Cast to dict - LangGraph stream yields dicts
+                    chunk = cast(Dict[str, Any], raw_chunk)
+
+                    if chunk.get("type") == "token":
+                        # Provisional response text; COMPLETE carries the final one
+                        data = cast(Dict[str, Any], chunk.get("data", {}))
+                        yield ChatStreamEvent(
+                            event_type=StreamEventType.TOKEN,
+                            message=str(data.get("delta", "")),
+                            agent_current=str(data.get("agent") or current_agent),
+                            metadata={"step": "token"},
+                            timestamp=str(data.get("timestamp") or datetime.now().isoformat()),
+                        )
+                        continue
+
+                    step_count += 1
+
+                    if chunk.get("type") == "stream_event":
+                        data = cast(Dict[str, Any], chunk.get("data", {}))
+                        current_node = str(data.get("current_node", "unknown"))
+
+                        # Map node names to user-friendly agent names and messages
+                        agent_info = self._map_node_to_agent_info(current_node)
+                        current_agent = agent_info["agent_name"]
+
+                        # Calculate progress based on step count
+                        progress = min(0.9, 0.1 + (step_count * 0.15))
+
+                        yield ChatStreamEvent(
+                            event_type=agent_info["event_type"],
+                            message=agent_info["message"],
+                            agent_current=current_agent,
+                            progress=progress,
+                            metadata={
+                                "step": step_count,
+                                "node": current_node,
+                                "state_preview": data.get("state_preview", {}),
+                            },
+                            timestamp=datetime.now().isoformat(),
+                        )
+
+                    elif chunk.get("type") == "final_result":
+                        # Process final result
+                        result = cast(Dict[str, Any], chunk.get("data", {}))
+
+                        # Extract response text from final result
+                        response_text = "Lo siento, no pude procesar tu mensaje."
+                        agent_used = str(result.get("current_agent", current_agent))
+
+                        # Get response from last AI message
+                        messages = cast(list[Any], result.get("messages", []))
+                        for msg in reversed(messages):
+                            if hasattr(msg, "content") and msg.__class__.__name__ == "AIMessage":
+                                response_text = msg.content
+                                break
+
+                        # Calculate processing time
+                        processing_time = (datetime.now() - start_time).total_seconds() * 1000
+
+                        # Emit final generation event
+                        yield ChatStreamEvent(
+                            event_type=StreamEventType.GENERATING,
+                            message="✨ Generando respuesta final...",
+                            agent_current=agent_used,
+                            progress=0.95,
+                            metadata={"step": "final_generation"},
+                            timestamp=datetime.now().isoformat(),
+                        )
+
+                        # Emit completion event with response
+                        yield ChatStreamEvent(
+                            event_type=StreamEventType.COMPLETE,
+                            message=response_text,
+                            agent_current=agent_used,
+                            progress=1.0,
+                            metadata={
+                                "requires_human": bool(result.get("human_handoff_requested", False)),
+                                "is_complete": bool(result.get("is_complete", True)),
+                                "processing_time_ms": int(processing_time),
+                                "total_steps": step_count,
+                                "session_id": session_id,
+                            },
+                            timestamp=datetime.now().isoformat(),
+                        )
+
+                    elif chunk.get("type") == "error":
+                        # Emit error event
+                        error_data = cast(Dict[str, Any], chunk.get("data", {}))
+                        error_msg = str(error_data.get("error", "Error desconocido"))
+                        yield ChatStreamEvent(
+                            event_type=StreamEventType.ERROR,
+                            message=f"❌ Error procesando tu mensaje: {error_msg}",
+                            agent_current=current_agent,
+                            progress=0.0,
+                            metadata={"error": error_msg},
+                            timestamp=datetime.now().isoformat(),
+                        )
+                        break
 
         except Exception as e:
             self.logger.error(f"Error in LangGraph streaming: {e}")
@@ -397,15 +415,18 @@ class MessageProcessor:
             preferences=metadata.get("preferences", {}),
         )
 
-    def create_conversation_context(
+    async def create_conversation_context(
         self, session_id: str, message_text: str, metadata: Dict[str, Any] | None = None
     ) -> ConversationContext:
-        """Crea contexto de conversación"""
+        """Crea contexto de conversación (detecta el idioma solo si metadata no lo trae)"""
         metadata = metadata or {}
+        language = metadata.get("language")
+        if language is None:
+            language = await self.detect_language(message_text)
 
         return ConversationContext(
             conversation_id=session_id,
             session_id=session_id,
             channel=metadata.get("channel", "whatsapp"),
-            language=metadata.get("language", self.detect_language(message_text)),
+            language=language,
         )
@@ -202,6 +202,68 @@ class SystemMonitor:
             # Check database health
             health_status["database"] = await self.security_validator.check_database_health()
 
+            # Checkpointer pool metrics (wait time, saturation)
+            postgres = getattr(graph_system, "postgres", None) if graph_system else None
+            if postgres is not None:
+                health_status["checkpoint_pool"] = postgres.get_checkpoint_pool_stats()
+
+            # Shared HTTP pool, embedding cache hit rate and batch sizes
+            from app.integrations.http_pool import get_shared_http_stats
+            from app.integrations.llm.embedding_batcher import get_embedding_batcher_stats
+            from app.integrations.llm.embedding_cache import get_embedding_cache
+            from app.integrations.llm.gateway import get_llm_governor_stats
+
+            health_status["http_pool"] = get_shared_http_stats()
+            health_status["embedding_cache"] = get_embedding_cache().get_stats()
+            health_status["embedding_batchers"] = get_embedding_batcher_stats()
+
+            # LLM concurrency governors (limit, queues and waits per priority)
+            health_status["llm_governors"] = get_llm_governor_stats()
+
+            # Pooled Plex ERP clients (coalesced lookups, balance cache)
+            from app.clients.plex_client import get_plex_client_stats
+
+            health_status["plex_clients"] = get_plex_client_stats()
+
+            # HCWeb catalog caches (hit rate, availability prefetch)
+            from app.domains.medical_appointments.infrastructure.external.hcweb.catalog import (
+                get_hcweb_catalog_stats,
+            )
+
+            health_status["hcweb_catalogs"] = get_hcweb_catalog_stats()
+
+            # Outbound rate limiters per Chattigo DID (throughput, daily tier budget)
+            from app.integrations.chattigo.rate_limiter import get_did_rate_limiter_stats
+
+            health_status["chattigo_rate_limits"] = get_did_rate_limiter_stats()
+
+            # Outbound Chattigo send queue and pooled adapters per DID
+            from app.integrations.chattigo.adapter_factory import get_chattigo_adapter_factory
+            from app.integrations.chattigo.send_queue import get_chattigo_send_queue_stats
+
+            health_status["chattigo_send_queue"] = get_chattigo_send_queue_stats()
+            health_status["chattigo_adapters"] = get_chattigo_adapter_factory().get_stats()
+
+            # spaCy NLP service batching
+            from app.integrations.nlp import get_nlp_service_stats
+
+            health_status["nlp_service"] = get_nlp_service_stats()
+
+            # Compiled bypass routing index
+            from app.core.cache.bypass_rule_index import bypass_rule_index
+
+            health_status["bypass_rule_index"] = bypass_rule_index.get_stats()
+
+            # Cross-instance cache invalidation
+            from app.core.cache.invalidation_bus import cache_invalidation_bus
+
+            health_status["cache_invalidation_bus"] = cache_invalidation_bus.get_stats()
+
+            # Semantic cache of LLM classifications
+            from app.core.cache.semantic_classification_cache import semantic_classification_cache
+
+            health_status["semantic_classification_cache"] = semantic_classification_cache.get_stats()
+
             # Overall status
             if initialized and graph_system and health_status["database"]:
                 health_status["overall_status"] = "healthy"
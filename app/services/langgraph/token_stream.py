@@ -0,0 +1,108 @@
+"""
+Backpressure for graph stream events forwarded to SSE clients.
+
+AynuxGraph.astream emits one "token" event per LLM delta. When the client
+reads slower than the model generates, coalesce_token_events() merges the
+pending deltas of the same agent into one event instead of queueing them,
+and holds at most `max_buffered_events` other events, pausing the graph
+stream when the buffer is full.
+"""
+
+import asyncio
+import logging
+from collections import deque
+from typing import Any, AsyncGenerator, AsyncIterator
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BUFFERED_EVENTS = 256
+
+
+def _merge_token(buffer: deque[dict[str, Any]], event: dict[str, Any]) -> bool:
+    """
+    Append a token event's delta to the last buffered event if compatible.
+
+    Returns:
+        True if the event was merged
+    """
+    if event.get("type") != "token" or not buffer:
+        return False
+    last = buffer[-1]
+    if last.get("type") != "token":
+        return False
+
+    last_data = last.get("data", {})
+    data = event.get("data", {})
+    if last_data.get("agent") != data.get("agent"):
+        return False
+
+    buffer[-1] = {
+        **last,
+        "data": {**last_data, **data, "delta": last_data.get("delta", "") + data.get("delta", "")},
+    }
+    return True
+
+
+async def coalesce_token_events(
+    source: AsyncIterator[dict[str, Any]],
+    max_buffered_events: int = DEFAULT_MAX_BUFFERED_EVENTS,
+) -> AsyncGenerator[dict[str, Any], None]:
+    """
+    Relay graph stream events, merging token deltas the consumer has not read yet.
+
+    The source is drained by a background task. Event order is preserved;
+    only consecutive token events of the same agent are merged. Errors of
+    the source are raised after the events buffered before them.
+
+    Args:
+        source: Event stream (e.g. AynuxGraph.astream())
+        max_buffered_events: Max events held for the consumer
+
+    Yields:
+        Events of the source, with pending token deltas coalesced
+    """
+    buffer: deque[dict[str, Any]] = deque()
+    condition = asyncio.Condition()
+    done = False
+    error: Exception | None = None
+
+    async def produce() -> None:
+        nonlocal done, error
+        try:
+            async for event in source:
+                async with condition:
+                    if not _merge_token(buffer, event):
+                        await condition.wait_for(lambda: len(buffer) < max_buffered_events)
+                        buffer.append(event)
+                    condition.notify_all()
+        except Exception as e:
+            error = e
+        async with condition:
+            done = True
+            condition.notify_all()
+
+    producer = asyncio.create_task(produce())
+    try:
+        while True:
+            async with condition:
+                await condition.wait_for(lambda: bool(buffer) or done)
+                if not buffer:
+                    break
+                event = buffer.popleft()
+                condition.notify_all()
+            yield event
+
+        if error is not None:
+            raise error
+    finally:
+        producer.cancel()
+        try:
+            await producer
+        except asyncio.CancelledError:
+            pass
+        aclose = getattr(source, "aclose", None)
+        if aclose is not None:
+            try:
+                await aclose()
+            except Exception as e:
+                logger.debug(f"Error closing graph stream: {e}")
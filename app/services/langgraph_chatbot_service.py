@@ -160,7 +160,7 @@ class LangGraphChatbotService:
                 contact.profile.get("name") if contact.profile and isinstance(contact.profile, dict) else None
             ) or "Usuario"
             customer_context = await self._get_or_create_customer_context(user_number, profile_name, db_session)
-            conversation_context = self.message_processor.create_conversation_context(
+            conversation_context = await self.message_processor.create_conversation_context(
                 session_id, message_text, {"channel": "whatsapp"}
             )
 
@@ -263,7 +263,9 @@ class LangGraphChatbotService:
             customer_context = self.message_processor.create_customer_context(user_id, metadata)
 
             # Crear contexto de conversación
-            conversation_context = self.message_processor.create_conversation_context(session_id, message, metadata)
+            conversation_context = await self.message_processor.create_conversation_context(
+                session_id, message, metadata
+            )
 
             # Procesar con el sistema LangGraph
             assert self.graph_system is not None  # Guaranteed after initialize()
@@ -321,7 +323,9 @@ class LangGraphChatbotService:
         try:
             # Preparar contextos
             customer_context = self.message_processor.create_customer_context(user_id, metadata)
-            conversation_context = self.message_processor.create_conversation_context(session_id, message, metadata)
+            conversation_context = await self.message_processor.create_conversation_context(
+                session_id, message, metadata
+            )
 
             # Procesar con streaming usando el sistema LangGraph
             assert self.graph_system is not None  # Guaranteed after initialize()
@@ -471,10 +475,11 @@ class LangGraphChatbotService:
 
     def set_tenant_registry_for_request(self, registry: "TenantAgentRegistry") -> None:
         """
-        Configure agents for tenant-specific processing.
+        Configure tenant-specific processing for the current request.
 
-        Called before processing a request in multi-tenant mode to apply
-        tenant-specific agent configurations from database.
+        Called before processing a request in multi-tenant mode. The registry
+        is scoped to the calling task, so concurrent requests of other tenants
+        keep their own configuration.
 
         Args:
             registry: TenantAgentRegistry loaded from database for current tenant
@@ -498,10 +503,10 @@ class LangGraphChatbotService:
 
     def reset_tenant_config(self) -> None:
         """
-        Reset agents to global default configuration.
+        Clear the tenant configuration of the current request.
 
-        Called after processing a request in multi-tenant mode to ensure
-        agents don't retain tenant-specific config for next request.
+        Called after processing a request in multi-tenant mode so later work
+        in the same task runs with global defaults.
         """
         if not self._initialized or not self.graph_system:
             return
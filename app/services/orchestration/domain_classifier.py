@@ -7,8 +7,10 @@ mensajes en dominios de negocio usando múltiples estrategias.
 
 import logging
 from typing import Any
+from uuid import UUID
 
 from app.config.settings import get_settings
+from app.core.cache.semantic_classification_cache import context_fingerprint, semantic_classification_cache
 from app.integrations.llm import VllmLLM
 from app.integrations.llm.model_provider import ModelComplexity
 from app.models.message import Contact
@@ -18,6 +20,8 @@ from app.services.orchestration.domain_pattern_repository import DomainPatternRe
 
 logger = logging.getLogger(__name__)
 
+SEMANTIC_CACHE_ANALYZER = "domain_classifier"
+
 
 class ClassificationResult:
     """Value object para resultados de clasificación."""
@@ -92,6 +96,7 @@ class DomainClassifier:
         self,
         message: str,
         contact: Contact | None = None,
+        organization_id: UUID | str | None = None,
     ) -> ClassificationResult:
         """
         Classify message into business domain.
@@ -104,6 +109,7 @@ class DomainClassifier:
         Args:
             message: User message text
             contact: Optional contact information for context
+            organization_id: Tenant of the conversation (scopes the semantic cache)
 
         Returns:
             ClassificationResult with domain and confidence
@@ -122,7 +128,7 @@ class DomainClassifier:
 
         # Strategy 2: AI-based classification (slower, more accurate)
         try:
-            ai_result = await self._classify_with_ai(message, contact)
+            ai_result = await self._classify_with_ai(message, contact, organization_id)
 
             # Use AI result if confidence is higher
             if ai_result.confidence > keyword_result.confidence:
@@ -217,6 +223,7 @@ class DomainClassifier:
         self,
         message: str,
         contact: Contact | None = None,
+        organization_id: UUID | str | None = None,
     ) -> ClassificationResult:
         """
         Classify using AI (LLM).
@@ -224,12 +231,31 @@ class DomainClassifier:
         Args:
             message: User message
             contact: Optional contact for context
+            organization_id: Tenant of the conversation
 
         Returns:
             ClassificationResult with AI-based classification
         """
         # Build context
         available_domains = self.pattern_repository.get_all_domains()
+
+        # Similar message already classified against the same domains
+        fingerprint = context_fingerprint(domains=sorted(available_domains))
+        cached = await semantic_classification_cache.get(
+            SEMANTIC_CACHE_ANALYZER, message, tenant=organization_id, fingerprint=fingerprint
+        )
+        if cached is not None:
+            return ClassificationResult(
+                domain=cached.value["domain"],
+                confidence=cached.confidence,
+                method="ai",
+                metadata={
+                    "reasoning": cached.value.get("reasoning", ""),
+                    "model": self.settings.VLLM_MODEL,
+                    "semantic_cache_similarity": cached.similarity,
+                },
+            )
+
         domain_descriptions = []
 
         for domain in available_domains:
@@ -283,6 +309,16 @@ class DomainClassifier:
             confidence = float(result_dict.get("confidence", 0.5))
             reasoning = result_dict.get("reasoning", "")
 
+            if domain in available_domains:
+                await semantic_classification_cache.set(
+                    SEMANTIC_CACHE_ANALYZER,
+                    message,
+                    {"domain": domain, "reasoning": reasoning},
+                    confidence,
+                    tenant=organization_id,
+                    fingerprint=fingerprint,
+                )
+
             return ClassificationResult(
                 domain=domain,
                 confidence=confidence,
@@ -9,8 +9,11 @@ Webhook Services Module.
 Provides:
 - IdempotencyService: Redis-based duplicate detection (SET NX)
 - WebhookProcessor: Background message processing
+- WebhookQueue / WebhookConsumerPool: Durable Redis Streams ingest queue
+- CoalesceWindowResolver: Per-tenant message coalescing window lookup
 """
 
+from app.services.webhook.coalesce_window_resolver import CoalesceWindowResolver
 from app.services.webhook.idempotency_service import (
     IdempotencyResult,
     IdempotencyService,
@@ -18,12 +21,16 @@ from app.services.webhook.idempotency_service import (
     ProcessingState,
 )
 from app.services.webhook.webhook_processor import WebhookProcessor, WebhookTask
+from app.services.webhook.webhook_queue import WebhookConsumerPool, WebhookQueue
 
 __all__ = [
+    "CoalesceWindowResolver",
     "IdempotencyService",
     "IdempotencyResult",
     "IdempotencyState",
     "ProcessingState",
     "WebhookProcessor",
     "WebhookTask",
+    "WebhookQueue",
+    "WebhookConsumerPool",
 ]
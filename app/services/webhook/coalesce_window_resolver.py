@@ -0,0 +1,114 @@
+# ============================================================================
+# SCOPE: MULTI-TENANT
+# Description: Resolves the per-tenant message coalescing window by DID.
+#              Loaded from TenantConfig.advanced_config and cached in-process.
+# ============================================================================
+"""
+Coalesce Window Resolver.
+
+The coalescing stage runs before bypass routing, so the tenant is only known
+by the business DID. The window is read from
+TenantConfig.advanced_config["message_coalesce_window_ms"] and mapped to the
+DIDs of the organization (TenantConfig.whatsapp_phone_number_id and enabled
+bypass rules of type "whatsapp_phone_number_id").
+
+The whole DID → window map is reloaded at most every REFRESH_INTERVAL
+seconds, so the webhook path never queries the DB per message.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Any
+
+from sqlalchemy import select
+
+from app.database.async_db import get_async_db_context
+from app.models.db.tenancy import BypassRule, TenantConfig
+
+logger = logging.getLogger(__name__)
+
+ADVANCED_CONFIG_KEY = "message_coalesce_window_ms"
+
+
+class CoalesceWindowResolver:
+    """
+    Per-DID coalescing window lookup with periodic refresh.
+
+    Usage:
+        resolver = CoalesceWindowResolver(default_window=1.0)
+        window = await resolver.get_window("5492644710400")  # seconds
+    """
+
+    REFRESH_INTERVAL = 60.0
+
+    def __init__(self, default_window: float):
+        self._default_window = default_window
+        self._windows: dict[str, float] = {}
+        self._loaded_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def get_window(self, did: str | None) -> float:
+        """
+        Get the coalescing window for a DID.
+
+        Args:
+            did: Business phone number (Chattigo DID / display_phone_number)
+
+        Returns:
+            Window in seconds (0 disables coalescing)
+        """
+        if time.monotonic() - self._loaded_at > self.REFRESH_INTERVAL:
+            await self._refresh()
+        if not did:
+            return self._default_window
+        return self._windows.get(did, self._default_window)
+
+    async def _refresh(self) -> None:
+        """Reload the DID → window map (single loader, errors keep stale map)."""
+        async with self._lock:
+            if time.monotonic() - self._loaded_at <= self.REFRESH_INTERVAL:
+                return
+            try:
+                self._windows = await self._load()
+            except Exception as e:
+                logger.warning(f"Failed to load coalesce windows, keeping previous map: {e}")
+            # Back off even on failure to avoid hammering the DB
+            self._loaded_at = time.monotonic()
+
+    async def _load(self) -> dict[str, float]:
+        """Query tenant configs with a custom window."""
+        windows: dict[str, float] = {}
+        async with get_async_db_context() as db:
+            configs = await db.execute(
+                select(
+                    TenantConfig.organization_id,
+                    TenantConfig.whatsapp_phone_number_id,
+                    TenantConfig.advanced_config,
+                )
+            )
+            org_windows: dict[Any, float] = {}
+            for org_id, phone_id, advanced in configs.all():
+                window_ms = (advanced or {}).get(ADVANCED_CONFIG_KEY)
+                if window_ms is None:
+                    continue
+                org_windows[org_id] = max(float(window_ms), 0.0) / 1000
+                if phone_id:
+                    windows[phone_id] = org_windows[org_id]
+
+            if org_windows:
+                rules = await db.execute(
+                    select(BypassRule.organization_id, BypassRule.phone_number_id).where(
+                        BypassRule.rule_type == "whatsapp_phone_number_id",
+                        BypassRule.enabled.is_(True),
+                        BypassRule.organization_id.in_(list(org_windows)),
+                    )
+                )
+                for org_id, phone_id in rules.all():
+                    if phone_id:
+                        windows.setdefault(phone_id, org_windows[org_id])
+
+        logger.debug(f"Loaded coalesce windows for {len(windows)} DIDs")
+        return windows
@@ -12,17 +12,20 @@ Per Chattigo ISV Documentation (Section 4.2):
    receive webhook, respond 200 OK immediately, queue message internally,
    process in background"
 
-This module provides background processing via FastAPI BackgroundTasks.
+This module provides background processing via FastAPI BackgroundTasks
+or the durable Redis Streams queue (see webhook_queue.py).
 """
 
 from __future__ import annotations
 
+import copy
 import logging
 import time
 from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any, Awaitable, Callable
 
 from app.config.settings import Settings
+from app.core.message_batcher import BatchMessage
 from app.integrations.chattigo import ChattigoWebhookPayload
 from app.models.message import ChattigoToWhatsAppAdapter, WhatsAppWebhookRequest
 from app.models.parsers.whatsapp_webhook_parser import (
@@ -35,7 +38,10 @@ from app.services.webhook.idempotency_service import IdempotencyService
 if TYPE_CHECKING:
     from sqlalchemy.ext.asyncio import AsyncSession
 
+    from app.core.conversation_dispatcher import ConversationDispatcher
+    from app.core.message_coalescer import MessageCoalescer
     from app.services.langgraph_chatbot_service import LangGraphChatbotService
+    from app.services.webhook.coalesce_window_resolver import CoalesceWindowResolver
 
 logger = logging.getLogger(__name__)
 
@@ -49,6 +55,74 @@ class WebhookTask:
     raw_json: dict[str, Any]
     settings: Settings
 
+    @property
+    def session_key(self) -> str:
+        """Conversation key used for ordering (matches LangGraph session_id)."""
+        user_number: str | None = None
+        if self.payload_type == "chattigo":
+            user_number = self.raw_json.get("msisdn")
+        else:
+            try:
+                value = self.raw_json["entry"][0]["changes"][0]["value"]
+                user_number = value["messages"][0].get("from")
+            except (IndexError, KeyError, TypeError):
+                pass
+        return f"whatsapp_{user_number}" if user_number else f"message_{self.message_id}"
+
+    @property
+    def text(self) -> str | None:
+        """Plain text content, or None if the message cannot be coalesced."""
+        if self.payload_type == "chattigo":
+            if self.raw_json.get("isAttachment") or self.raw_json.get("chatType") == "OUTBOUND":
+                return None
+            if str(self.raw_json.get("type") or "Text").lower() != "text":
+                return None
+            return self.raw_json.get("content") or None
+        try:
+            message = self.raw_json["entry"][0]["changes"][0]["value"]["messages"][0]
+            if message.get("type") != "text":
+                return None
+            return message["text"]["body"] or None
+        except (IndexError, KeyError, TypeError):
+            return None
+
+    @property
+    def tenant_key(self) -> str:
+        """Tenant key used for fairness (business DID, known before DB lookup)."""
+        if self.payload_type == "chattigo":
+            return str(self.raw_json.get("did") or "default")
+        try:
+            value = self.raw_json["entry"][0]["changes"][0]["value"]
+            return str(value["metadata"].get("display_phone_number") or "default")
+        except (IndexError, KeyError, TypeError, AttributeError):
+            return "default"
+
+
+def merge_webhook_tasks(tasks: list[WebhookTask]) -> WebhookTask:
+    """
+    Merge consecutive text messages into a single turn.
+
+    The latest message is used as the base payload (ids, timestamps, Chattigo
+    context) and its text is replaced by all texts joined by newlines.
+    """
+    if len(tasks) == 1:
+        return tasks[0]
+
+    latest = tasks[-1]
+    merged_text = "\n".join(t.text or "" for t in tasks)
+    raw_json = copy.deepcopy(latest.raw_json)
+    if latest.payload_type == "chattigo":
+        raw_json["content"] = merged_text
+    else:
+        raw_json["entry"][0]["changes"][0]["value"]["messages"][0]["text"]["body"] = merged_text
+
+    return WebhookTask(
+        message_id=latest.message_id,
+        payload_type=latest.payload_type,
+        raw_json=raw_json,
+        settings=latest.settings,
+    )
+
 
 class WebhookProcessor:
     """
@@ -57,6 +131,12 @@ class WebhookProcessor:
     Handles the heavy business logic asynchronously to meet
     Chattigo's fast response requirement.
 
+    When a ConversationDispatcher is provided, messages of the same
+    conversation are processed strictly in order and concurrency across
+    conversations and tenants is bounded. When a MessageCoalescer is
+    provided, rapid-fire text messages of a conversation are merged into a
+    single graph invocation.
+
     Usage:
         processor = WebhookProcessor(idempotency, get_service, get_db)
         background_tasks.add_task(processor.process_in_background, task)
@@ -67,57 +147,141 @@ class WebhookProcessor:
         idempotency_service: IdempotencyService,
         langgraph_service_factory: Callable[[], Awaitable[LangGraphChatbotService]],
         db_session_factory: Callable,
+        dispatcher: ConversationDispatcher | None = None,
+        coalescer: MessageCoalescer | None = None,
+        coalesce_window_resolver: CoalesceWindowResolver | None = None,
     ):
         self._idempotency = idempotency_service
         self._get_langgraph_service = langgraph_service_factory
         self._get_db_session = db_session_factory
+        self._dispatcher = dispatcher
+        self._coalescer = coalescer
+        self._coalesce_window_resolver = coalesce_window_resolver
 
     async def process_in_background(self, task: WebhookTask) -> None:
         """
         Process webhook in background.
 
         This method is designed to be called via BackgroundTasks.add_task().
+        Failures are logged and the idempotency lock is released so Chattigo
+        can retry.
 
         Args:
             task: WebhookTask containing message context
         """
-        start_time = time.time()
-        logger.info(f"Background processing started: {task.message_id}")
-
         try:
-            async for db_session in self._get_db_session():
-                try:
-                    if task.payload_type == "whatsapp":
-                        await self._process_whatsapp(task, db_session)
-                    else:
-                        await self._process_chattigo(task, db_session)
-
-                    # Mark as completed
-                    await self._idempotency.mark_completed(task.message_id)
-
-                    elapsed = time.time() - start_time
-                    logger.info(
-                        f"Background processing completed: {task.message_id} "
-                        f"(elapsed={elapsed:.2f}s)"
-                    )
-
-                except Exception as e:
-                    logger.error(
-                        f"Background processing failed: {task.message_id} - {e}",
-                        exc_info=True,
-                    )
-                    # Mark as failed to allow retry from Chattigo
-                    await self._idempotency.mark_failed(task.message_id)
-                finally:
-                    break  # Only need one session iteration
-
+            await self.process(task)
         except Exception as e:
             logger.error(
-                f"Background task error (session): {task.message_id} - {e}",
+                f"Background processing failed: {task.message_id} - {e}",
                 exc_info=True,
             )
+            # Mark as failed to allow retry from Chattigo
             await self._idempotency.mark_failed(task.message_id)
 
+    async def process(self, task: WebhookTask) -> None:
+        """
+        Process webhook and mark it completed.
+
+        Unlike process_in_background(), errors are propagated so queue
+        consumers can decide between redelivery and dead-lettering.
+
+        Args:
+            task: WebhookTask containing message context
+
+        Raises:
+            Exception: Any processing or session error
+        """
+        if self._coalescer is None:
+            await self._dispatch([task])
+            return
+
+        text = task.text
+        window = None
+        if text and self._coalesce_window_resolver is not None:
+            window = await self._coalesce_window_resolver.get_window(task.tenant_key)
+
+        await self._coalescer.submit(
+            key=task.session_key,
+            message=BatchMessage(
+                user_id=task.session_key,
+                message_id=task.message_id,
+                content=text or "",
+                timestamp=time.time(),
+                metadata={"task": task},
+            ),
+            handler=self._process_coalesced,
+            window=window,
+            # Non-text messages are never delayed; they close any open buffer
+            flush=text is None,
+        )
+
+    async def _process_coalesced(self, session_key: str, messages: list[BatchMessage]) -> None:
+        """Merge runs of text messages and dispatch each turn in arrival order."""
+        turns: list[list[WebhookTask]] = []
+        for message in messages:
+            task: WebhookTask = message.metadata["task"]
+            if turns and task.text and turns[-1][-1].text:
+                turns[-1].append(task)
+            else:
+                turns.append([task])
+
+        if self._dispatcher is None:
+            for turn in turns:
+                await self._process_turn(turn)
+            return
+
+        # Submit all turns before awaiting so the dispatcher keeps their order
+        futures = [
+            self._dispatcher.submit(
+                session_id=session_key,
+                tenant_id=turn[-1].tenant_key,
+                factory=lambda turn=turn: self._process_turn(turn),
+            )
+            for turn in turns
+        ]
+        for future in futures:
+            await future
+
+    async def _dispatch(self, tasks: list[WebhookTask]) -> None:
+        """Process one turn through the dispatcher (if configured)."""
+        if self._dispatcher is None:
+            await self._process_turn(tasks)
+            return
+
+        await self._dispatcher.submit(
+            session_id=tasks[-1].session_key,
+            tenant_id=tasks[-1].tenant_key,
+            factory=lambda: self._process_turn(tasks),
+        )
+
+    async def _process_turn(self, tasks: list[WebhookTask]) -> None:
+        """Process merged messages as one turn and mark every message completed."""
+        await self._process_now(merge_webhook_tasks(tasks))
+        for task in tasks[:-1]:
+            await self._idempotency.mark_completed(task.message_id)
+
+    async def _process_now(self, task: WebhookTask) -> None:
+        """Process webhook in the current task and mark it completed."""
+        start_time = time.time()
+        logger.info(f"Background processing started: {task.message_id}")
+
+        async for db_session in self._get_db_session():
+            if task.payload_type == "whatsapp":
+                await self._process_whatsapp(task, db_session)
+            else:
+                await self._process_chattigo(task, db_session)
+            break  # Only need one session iteration
+
+        # Mark as completed
+        await self._idempotency.mark_completed(task.message_id)
+
+        elapsed = time.time() - start_time
+        logger.info(
+            f"Background processing completed: {task.message_id} "
+            f"(elapsed={elapsed:.2f}s)"
+        )
+
     async def _process_whatsapp(
         self,
         task: WebhookTask,
@@ -0,0 +1,305 @@
+# ============================================================================
+# SCOPE: GLOBAL
+# Description: Durable webhook ingest queue backed by Redis Streams.
+#              Decouples the <50ms Chattigo ack from message processing.
+# ============================================================================
+"""
+Webhook Ingest Queue (Redis Streams + Consumer Groups).
+
+The webhook endpoint appends each accepted message to a Redis Stream and
+returns immediately. A pool of consumers (one or more per worker process,
+any number of pods) reads the stream through a shared consumer group:
+
+- At-least-once: entries stay in the group's Pending Entries List (PEL)
+  until the processor succeeds and the consumer sends XACK.
+- Visibility timeout: entries idle in the PEL longer than the timeout
+  (consumer crashed, pod restarted) are re-claimed with XAUTOCLAIM.
+- Dead-lettering: entries that exceed the maximum delivery count are moved
+  to a dead-letter stream and their idempotency lock is released.
+- Per-consumer concurrency: each consumer never holds more than N
+  in-flight messages, so load is shed to other consumers in the group.
+
+IdempotencyService remains the dedupe gate: the webhook acquires the lock
+before enqueueing, and consumers skip entries already marked COMPLETED.
+
+Redis Key Pattern:
+    {stream}          → ingest stream (XADD, MAXLEN ~ trimmed)
+    {stream}:dead     → dead-letter stream
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import socket
+import time
+from typing import TYPE_CHECKING, Any
+
+from app.config.settings import Settings, get_settings
+from app.integrations.databases.redis_stream import RedisStreamQueue, StreamEntry
+from app.services.webhook.idempotency_service import IdempotencyService, ProcessingState
+from app.services.webhook.webhook_processor import WebhookProcessor, WebhookTask
+
+if TYPE_CHECKING:
+    import redis.asyncio as aioredis
+
+logger = logging.getLogger(__name__)
+
+TASK_FIELD = "task"
+
+
+def serialize_task(task: WebhookTask) -> dict[str, str]:
+    """Encode a WebhookTask as stream entry fields (Settings are not shipped)."""
+    return {
+        TASK_FIELD: json.dumps(
+            {
+                "message_id": task.message_id,
+                "payload_type": task.payload_type,
+                "raw_json": task.raw_json,
+                "enqueued_at": time.time(),
+            }
+        )
+    }
+
+
+def deserialize_task(fields: dict[str, Any], settings: Settings) -> WebhookTask:
+    """Decode stream entry fields back into a WebhookTask."""
+    data = json.loads(fields[TASK_FIELD])
+    return WebhookTask(
+        message_id=data["message_id"],
+        payload_type=data["payload_type"],
+        raw_json=data["raw_json"],
+        settings=settings,
+    )
+
+
+# Backwards-compatible name for stream entries delivered to consumers
+QueueEntry = StreamEntry
+
+
+class WebhookQueue(RedisStreamQueue):
+    """
+    Webhook ingest stream configured from WEBHOOK_QUEUE_* settings.
+
+    Usage:
+        queue = WebhookQueue()
+        await queue.enqueue(task)
+
+        entries = await queue.read("worker-1", count=8)
+        for entry in entries:
+            ...
+            await queue.ack(entry.entry_id)
+    """
+
+    def __init__(
+        self,
+        settings: Settings | None = None,
+        redis_client: aioredis.Redis | None = None,
+    ):
+        self._settings = settings or get_settings()
+        super().__init__(
+            stream=self._settings.WEBHOOK_QUEUE_STREAM,
+            group=self._settings.WEBHOOK_QUEUE_GROUP,
+            maxlen=self._settings.WEBHOOK_QUEUE_MAXLEN,
+            redis_client=redis_client,
+        )
+
+    async def enqueue(self, task: WebhookTask) -> str:
+        """
+        Append a task to the ingest stream.
+
+        Args:
+            task: WebhookTask to persist
+
+        Returns:
+            Stream entry ID
+        """
+        return await self.add(serialize_task(task))
+
+
+class WebhookConsumerPool:
+    """
+    Pool of stream consumers that feed WebhookProcessor.
+
+    Each consumer runs a read loop that keeps at most
+    WEBHOOK_QUEUE_CONSUMER_CONCURRENCY messages in flight and periodically
+    re-claims entries abandoned by dead consumers.
+
+    Usage:
+        pool = WebhookConsumerPool(queue, processor, idempotency)
+        await pool.start()
+        ...
+        await pool.stop()
+    """
+
+    def __init__(
+        self,
+        queue: WebhookQueue,
+        processor: WebhookProcessor,
+        idempotency_service: IdempotencyService,
+        settings: Settings | None = None,
+    ):
+        self._queue = queue
+        self._processor = processor
+        self._idempotency = idempotency_service
+        self._settings = settings or get_settings()
+
+        self._consumers = self._settings.WEBHOOK_QUEUE_CONSUMERS
+        self._concurrency = self._settings.WEBHOOK_QUEUE_CONSUMER_CONCURRENCY
+        self._visibility_timeout_ms = self._settings.WEBHOOK_QUEUE_VISIBILITY_TIMEOUT * 1000
+        self._max_deliveries = self._settings.WEBHOOK_QUEUE_MAX_DELIVERIES
+        self._name_prefix = f"{socket.gethostname()}-{os.getpid()}"
+
+        self._loops: set[asyncio.Task[None]] = set()
+        self._in_flight: set[asyncio.Task[None]] = set()
+        self._running = False
+        self._stats = {
+            "processed": 0,
+            "failed": 0,
+            "skipped_completed": 0,
+            "reclaimed": 0,
+            "dead_lettered": 0,
+        }
+
+    @property
+    def is_running(self) -> bool:
+        """Check if consumers are running."""
+        return self._running
+
+    async def start(self) -> None:
+        """Start consumer loops."""
+        if self._running:
+            logger.warning("Webhook consumer pool already running")
+            return
+
+        self._running = True
+        for index in range(self._consumers):
+            consumer = f"{self._name_prefix}-{index}"
+            loop_task = asyncio.create_task(self._consume(consumer), name=f"webhook_consumer_{index}")
+            self._loops.add(loop_task)
+            loop_task.add_done_callback(self._loops.discard)
+
+        logger.info(
+            f"Webhook consumer pool started: consumers={self._consumers}, "
+            f"concurrency={self._concurrency}, stream={self._queue.stream}"
+        )
+
+    async def stop(self, grace_period: float = 10.0) -> None:
+        """
+        Stop consumer loops and wait for in-flight messages.
+
+        Messages still running after the grace period stay un-acked and are
+        re-claimed by another consumer once their visibility timeout expires.
+        """
+        if not self._running:
+            return
+
+        self._running = False
+        for loop_task in list(self._loops):
+            loop_task.cancel()
+        await asyncio.gather(*self._loops, return_exceptions=True)
+
+        if self._in_flight:
+            await asyncio.wait(set(self._in_flight), timeout=grace_period)
+
+        logger.info("Webhook consumer pool stopped")
+
+    async def _consume(self, consumer: str) -> None:
+        """Read loop for a single consumer."""
+        next_reclaim = 0.0
+        reclaim_interval = max(self._visibility_timeout_ms / 2000, 1.0)
+        owned: set[asyncio.Task[None]] = set()
+
+        while self._running:
+            try:
+                free_slots = self._concurrency - len(owned)
+                if free_slots <= 0:
+                    await asyncio.wait(owned, return_when=asyncio.FIRST_COMPLETED)
+                    continue
+
+                entries: list[QueueEntry] = []
+                if time.monotonic() >= next_reclaim:
+                    entries = await self._queue.reclaim(
+                        consumer, self._visibility_timeout_ms, free_slots
+                    )
+                    self._stats["reclaimed"] += len(entries)
+                    next_reclaim = time.monotonic() + reclaim_interval
+
+                if not entries:
+                    entries = await self._queue.read(consumer, count=free_slots)
+
+                for entry in entries:
+                    handler = asyncio.create_task(self._handle(entry))
+                    for tracker in (owned, self._in_flight):
+                        tracker.add(handler)
+                        handler.add_done_callback(tracker.discard)
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Webhook consumer {consumer} error: {e}", exc_info=True)
+                await asyncio.sleep(1.0)
+
+    async def _handle(self, entry: QueueEntry) -> None:
+        """Process one entry: ack on success, dead-letter after max deliveries."""
+        try:
+            task = deserialize_task(entry.fields, self._settings)
+        except Exception as e:
+            logger.error(f"Undecodable webhook queue entry {entry.entry_id}: {e}")
+            await self._dead_letter(entry, f"decode error: {e}", message_id=None)
+            return
+
+        try:
+            state = await self._idempotency.get_state(task.message_id)
+            if state == ProcessingState.COMPLETED:
+                self._stats["skipped_completed"] += 1
+                await self._queue.ack(entry.entry_id)
+                return
+
+            if entry.deliveries > self._max_deliveries:
+                await self._dead_letter(entry, "max deliveries exceeded", task.message_id)
+                return
+
+            await self._processor.process(task)
+            await self._queue.ack(entry.entry_id)
+            self._stats["processed"] += 1
+
+        except Exception as e:
+            self._stats["failed"] += 1
+            logger.error(
+                f"Queued processing failed: {task.message_id} "
+                f"(delivery {entry.deliveries}/{self._max_deliveries}) - {e}",
+                exc_info=True,
+            )
+            if entry.deliveries >= self._max_deliveries:
+                await self._dead_letter(entry, str(e), task.message_id)
+            # Otherwise leave pending: re-claimed after the visibility timeout
+
+    async def _dead_letter(self, entry: QueueEntry, error: str, message_id: str | None) -> None:
+        """Dead-letter an entry and release its idempotency lock."""
+        try:
+            await self._queue.dead_letter(entry, error)
+            self._stats["dead_lettered"] += 1
+            logger.warning(f"Webhook queue entry dead-lettered: {entry.entry_id} ({error})")
+        except Exception as e:
+            logger.error(f"Failed to dead-letter entry {entry.entry_id}: {e}")
+            return
+
+        if message_id:
+            await self._idempotency.mark_failed(message_id)
+
+    async def get_stats(self) -> dict[str, Any]:
+        """Get pool counters merged with stream statistics."""
+        stats: dict[str, Any] = {
+            "running": self._running,
+            "consumers": len(self._loops),
+            "in_flight": len(self._in_flight),
+            **self._stats,
+        }
+        try:
+            stats["queue"] = await self._queue.get_stats()
+        except Exception as e:
+            stats["queue"] = {"error": str(e)}
+        return stats
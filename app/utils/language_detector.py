@@ -2,12 +2,15 @@
 Utilidad para detección de idioma usando spaCy con fallback robusto
 """
 
+import asyncio
 import hashlib
 import logging
 import time
 from collections import OrderedDict
 from typing import Any, Dict, List, Optional
 
+from app.integrations.nlp import ParsedDoc, get_nlp_service, is_model_installed
+
 logger = logging.getLogger(__name__)
 
 
@@ -16,7 +19,8 @@ class LanguageDetector:
     Detector de idioma inteligente usando spaCy con múltiples estrategias de detección
 
     Características:
-    - Detección usando modelos spaCy cuando están disponibles
+    - Detección usando modelos spaCy cuando están disponibles (adetect_language
+      parsea en el servicio NLP, fuera del event loop)
     - Fallback a análisis de palabras clave
     - Sistema de caché para optimizar rendimiento
     - Configuración flexible de idiomas soportados
@@ -38,7 +42,9 @@ class LanguageDetector:
         self._detection_cache = OrderedDict()
         self._cache_timestamps = {}
 
-        # Modelos spaCy disponibles
+        # Modelos spaCy disponibles: {lang_code: model_name}. Solo detect_language
+        # (síncrono) los carga en este proceso, la primera vez que se usan
+        self._spacy_model_names: Dict[str, str] = {}
         self._spacy_models = {}
         self._spacy_available = False
 
@@ -144,22 +150,17 @@ class LanguageDetector:
         )
 
     def _initialize_spacy_models(self):
-        """Inicializa los modelos spaCy disponibles"""
+        """Registra los modelos spaCy instalados (sin cargarlos)"""
         model_mapping = {"es": "es_core_news_sm", "en": "en_core_web_sm"}
 
         for lang_code in self.supported_languages:
             model_name = model_mapping.get(lang_code)
             if model_name:
-                try:
-                    import spacy
-
-                    nlp = spacy.load(model_name)
-                    self._spacy_models[lang_code] = nlp
+                if is_model_installed(model_name):
+                    self._spacy_model_names[lang_code] = model_name
                     self._spacy_available = True
-                    logger.info(f"spaCy model loaded for {lang_code}: {model_name}")
-                except (OSError, ImportError) as e:
-                    logger.warning(f"Could not load spaCy model for {lang_code}: {e}")
-                    continue
+                else:
+                    logger.warning(f"spaCy model for {lang_code} not installed: {model_name}")
 
         if not self._spacy_available:
             logger.warning("No spaCy models available, using keyword-based detection only")
@@ -168,6 +169,9 @@ class LanguageDetector:
         """
         Detecta el idioma del texto usando múltiples estrategias
 
+        Parsea con spaCy en el hilo actual: desde código async usar
+        adetect_language.
+
         Args:
             text: Texto a analizar
 
@@ -181,111 +185,171 @@ class LanguageDetector:
             }
         """
         start_time = time.time()
+        cached_result, text_normalized, cache_key = self._begin_detection(text)
+        if cached_result:
+            self._update_response_time_stats(time.time() - start_time)
+            return cached_result
+
+        # 1. Intentar con spaCy si está disponible
+        result = self._detect_with_spacy(text_normalized) if self._spacy_available else None
+        return self._finish_detection(result, text_normalized, cache_key, start_time)
+
+    async def adetect_language(self, text: str) -> Dict[str, Any]:
+        """
+        Detecta el idioma del texto sin bloquear el event loop
+
+        Igual que detect_language, pero el parsing spaCy corre en el
+        servicio NLP (procesos worker, nlp.pipe).
+
+        Args:
+            text: Texto a analizar
+
+        Returns:
+            Dict con información de detección (ver detect_language)
+        """
+        start_time = time.time()
+        cached_result, text_normalized, cache_key = self._begin_detection(text)
+        if cached_result:
+            self._update_response_time_stats(time.time() - start_time)
+            return cached_result
+
+        # 1. Intentar con spaCy si está disponible
+        result = await self._adetect_with_spacy(text_normalized) if self._spacy_available else None
+        return self._finish_detection(result, text_normalized, cache_key, start_time)
+
+    def _begin_detection(self, text: str) -> tuple[Optional[Dict[str, Any]], str, str]:
+        """
+        Cuenta la solicitud y resuelve texto vacío o cacheado
+
+        Returns:
+            (resultado si ya está resuelto, texto normalizado, clave de caché)
+        """
         self._stats["total_requests"] += 1
 
         if not text or len(text.strip()) == 0:
-            return self._create_result(
+            result = self._create_result(
                 language=self.default_language, confidence=0.5, method="default", details={"reason": "Empty text"}
             )
+            return result, "", ""
 
         # Normalizar texto para caché
         text_normalized = text.lower().strip()
         cache_key = self._get_cache_key(text_normalized)
 
         # Verificar caché
-        cached_result = self._get_from_cache(cache_key)
-        if cached_result:
-            self._update_response_time_stats(time.time() - start_time)
-            return cached_result
-
-        # Detectar idioma
-        result = None
-
-        # 1. Intentar con spaCy si está disponible
-        if self._spacy_available:
-            result = self._detect_with_spacy(text_normalized)
-            if result and result["confidence"] >= self.confidence_threshold:
-                self._stats["spacy_detections"] += 1
-                self._store_in_cache(cache_key, result)
-                self._update_response_time_stats(time.time() - start_time)
-                return result
-
-        # 2. Fallback a detección por palabras clave
-        result = self._detect_with_keywords(text_normalized)
-        self._stats["keyword_detections"] += 1
+        return self._get_from_cache(cache_key), text_normalized, cache_key
+
+    def _finish_detection(
+        self, spacy_result: Optional[Dict[str, Any]], text_normalized: str, cache_key: str, start_time: float
+    ) -> Dict[str, Any]:
+        """Acepta el resultado spaCy si supera el umbral o cae a palabras clave, y lo cachea"""
+        if spacy_result and spacy_result["confidence"] >= self.confidence_threshold:
+            self._stats["spacy_detections"] += 1
+            result = spacy_result
+        else:
+            # 2. Fallback a detección por palabras clave
+            result = self._detect_with_keywords(text_normalized)
+            self._stats["keyword_detections"] += 1
 
         # Almacenar en caché y devolver
         self._store_in_cache(cache_key, result)
         self._update_response_time_stats(time.time() - start_time)
         return result
 
+    def _get_spacy_model(self, lang_code: str):
+        """Carga (una vez) el modelo spaCy de un idioma en este proceso"""
+        nlp = self._spacy_models.get(lang_code)
+        if nlp is None:
+            import spacy
+
+            nlp = spacy.load(self._spacy_model_names[lang_code])
+            self._spacy_models[lang_code] = nlp
+            logger.info(f"spaCy model loaded for {lang_code}: {self._spacy_model_names[lang_code]}")
+        return nlp
+
     def _detect_with_spacy(self, text: str) -> Optional[Dict[str, Any]]:
-        """Detecta idioma usando modelos spaCy"""
+        """Detecta idioma usando modelos spaCy cargados en este proceso"""
         try:
-            scores = {}
-            details = {}
-
-            for lang_code, nlp in self._spacy_models.items():
-                # Procesar texto con el modelo
-                doc = nlp(text[:1000])  # Limitar longitud para rendimiento
-
-                # Calcular score basado en diferentes características
-                score = 0.0
-                features = {}
-
-                # 1. Análisis de tokens conocidos
-                known_tokens = sum(1 for token in doc if not token.is_oov)
-                total_tokens = len([token for token in doc if token.is_alpha])
-                if total_tokens > 0:
-                    token_score = known_tokens / total_tokens
-                    score += token_score * 0.4
-                    features["token_score"] = token_score
-
-                # 2. Análisis de entidades nombradas
-                if doc.ents:
-                    ner_score = min(len(doc.ents) / max(total_tokens, 1), 1.0)
-                    score += ner_score * 0.2
-                    features["ner_score"] = ner_score
-
-                # 3. Análisis de POS tagging
-                pos_tags = [token.pos_ for token in doc if token.is_alpha]
-                if pos_tags:
-                    # Diversidad de etiquetas POS indica buena comprensión del idioma
-                    pos_diversity = len(set(pos_tags)) / len(pos_tags)
-                    score += pos_diversity * 0.3
-                    features["pos_diversity"] = pos_diversity
-
-                # 4. Análisis sintáctico
-                parsed_tokens = sum(1 for token in doc if token.dep_ != "ROOT" and token.head != token)
-                if total_tokens > 0:
-                    syntax_score = parsed_tokens / total_tokens
-                    score += syntax_score * 0.1
-                    features["syntax_score"] = syntax_score
-
-                scores[lang_code] = score
-                details[lang_code] = features
-
-            if scores:
-                # Encontrar el idioma con mayor score
-                best_lang = max(scores.items(), key=lambda x: x[1])
-                language, confidence = best_lang
-
-                return self._create_result(
-                    language=language,
-                    confidence=min(confidence, 1.0),
-                    method="spacy_nlp",
-                    details={
-                        "scores": scores,
-                        "features": details,
-                        "model_used": self._spacy_models[language].meta.get("name", "unknown"),
-                    },
-                )
+            docs = {
+                lang_code: ParsedDoc.from_spacy(self._get_spacy_model(lang_code)(text[:1000]), model_name)
+                for lang_code, model_name in self._spacy_model_names.items()
+            }
+        except Exception as e:
+            logger.warning(f"Error in spaCy language detection: {e}")
+            return None
+        return self._score_spacy_docs(docs)
 
+    async def _adetect_with_spacy(self, text: str) -> Optional[Dict[str, Any]]:
+        """Detecta idioma usando el servicio NLP (un parse por modelo, en paralelo)"""
+        try:
+            service = get_nlp_service()
+            # Limitar longitud para rendimiento
+            parsed = await asyncio.gather(
+                *(service.parse(text[:1000], model_name) for model_name in self._spacy_model_names.values())
+            )
         except Exception as e:
             logger.warning(f"Error in spaCy language detection: {e}")
             return None
+        return self._score_spacy_docs(dict(zip(self._spacy_model_names, parsed, strict=True)))
+
+    def _score_spacy_docs(self, docs: Dict[str, ParsedDoc]) -> Optional[Dict[str, Any]]:
+        """Puntúa cada idioma según cómo lo analizó su modelo"""
+        scores = {}
+        details = {}
+
+        for lang_code, doc in docs.items():
+            # Calcular score basado en diferentes características
+            score = 0.0
+            features = {}
+
+            # 1. Análisis de tokens conocidos
+            known_tokens = sum(1 for token in doc if not token.is_oov)
+            total_tokens = len([token for token in doc if token.is_alpha])
+            if total_tokens > 0:
+                token_score = known_tokens / total_tokens
+                score += token_score * 0.4
+                features["token_score"] = token_score
+
+            # 2. Análisis de entidades nombradas
+            if doc.ents:
+                ner_score = min(len(doc.ents) / max(total_tokens, 1), 1.0)
+                score += ner_score * 0.2
+                features["ner_score"] = ner_score
+
+            # 3. Análisis de POS tagging
+            pos_tags = [token.pos_ for token in doc if token.is_alpha]
+            if pos_tags:
+                # Diversidad de etiquetas POS indica buena comprensión del idioma
+                pos_diversity = len(set(pos_tags)) / len(pos_tags)
+                score += pos_diversity * 0.3
+                features["pos_diversity"] = pos_diversity
+
+            # 4. Análisis sintáctico
+            parsed_tokens = sum(1 for token in doc if token.dep_ != "ROOT" and token.has_head)
+            if total_tokens > 0:
+                syntax_score = parsed_tokens / total_tokens
+                score += syntax_score * 0.1
+                features["syntax_score"] = syntax_score
 
-        return None
+            scores[lang_code] = score
+            details[lang_code] = features
+
+        if not scores:
+            return None
+
+        # Encontrar el idioma con mayor score
+        language, confidence = max(scores.items(), key=lambda x: x[1])
+
+        return self._create_result(
+            language=language,
+            confidence=min(confidence, 1.0),
+            method="spacy_nlp",
+            details={
+                "scores": scores,
+                "features": details,
+                "model_used": docs[language].model,
+            },
+        )
 
     def _detect_with_keywords(self, text: str) -> Dict[str, Any]:
         """Detecta idioma usando análisis de palabras clave"""
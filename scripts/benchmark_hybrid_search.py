@@ -0,0 +1,305 @@
+"""
+Benchmark for TenantVectorStore hybrid search over a large tenant.
+
+Seeds a throwaway organization with synthetic documents (clustered 1024-dim
+embeddings plus Spanish text), builds its partial HNSW index and compares:
+
+- legacy: the previous hybrid query (vector similarity computed for every
+  tenant row, joined with full-text matches, sorted by the combined score)
+- ann: TenantVectorStore.hybrid_search (HNSW KNN + GIN full-text top-K,
+  fused with Reciprocal Rank Fusion)
+
+It reports p50/p95/max latency per query and the recall@top_k of the
+hybrid_search results against an exact reference: the same RRF fusion
+computed in Python over a sequential-scan KNN and the full-text top-K.
+The organization and its documents are deleted at the end (ON DELETE CASCADE).
+
+Usage:
+    uv run python scripts/benchmark_hybrid_search.py --documents 100000 --queries 50
+    uv run python scripts/benchmark_hybrid_search.py --documents 5000 --min-documents 0
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import text  # noqa: E402
+
+from app.core.tenancy.vector_index_manager import TenantIndexManager, knn_predicate  # noqa: E402
+from app.core.tenancy.vector_store import TenantVectorStore  # noqa: E402
+from app.database.async_db import get_async_db_context  # noqa: E402
+from app.models.db.tenancy import Organization  # noqa: E402
+
+logging.basicConfig(
+    level=logging.WARNING,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+DIMENSION = 1024
+TOPICS = 200
+WORDS = [
+    "medicamento", "receta", "turno", "farmacia", "pago", "deuda", "cuota", "factura",
+    "horario", "sucursal", "obra", "social", "consulta", "especialista", "vacuna",
+    "descuento", "envio", "stock", "precio", "reclamo", "garantia", "soporte", "sistema",
+    "usuario", "clave", "acceso", "reporte", "modulo", "contable", "hospital",
+]
+
+LEGACY_QUERY = """
+    WITH vector_results AS (
+        SELECT id, 1 - (embedding <=> CAST(:query_vector AS vector)) as vector_score
+        FROM tenant_documents
+        WHERE organization_id = :org_id
+          AND active = true
+          AND embedding IS NOT NULL
+    ),
+    text_results AS (
+        SELECT id, ts_rank(search_vector, plainto_tsquery('spanish', :query)) as text_score
+        FROM tenant_documents
+        WHERE organization_id = :org_id
+          AND active = true
+          AND search_vector @@ plainto_tsquery('spanish', :query)
+    )
+    SELECT d.id,
+           COALESCE(v.vector_score, 0) * :vector_weight
+             + COALESCE(t.text_score, 0) * :keyword_weight as combined_score
+    FROM tenant_documents d
+    LEFT JOIN vector_results v ON d.id = v.id
+    LEFT JOIN text_results t ON d.id = t.id
+    WHERE d.organization_id = :org_id
+      AND d.active = true
+      AND (v.vector_score IS NOT NULL OR t.text_score IS NOT NULL)
+    ORDER BY combined_score DESC
+    LIMIT :limit
+"""
+
+
+class FixedEmbeddings:
+    """Embedding model returning precomputed query vectors."""
+
+    def __init__(self, vectors: dict[str, list[float]]):
+        self.vectors = vectors
+
+    async def embed_text(self, text_: str) -> list[float]:
+        return self.vectors[text_]
+
+
+def _vector_literal(vector: np.ndarray) -> str:
+    return "[" + ",".join(f"{x:.6f}" for x in vector) + "]"
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+async def seed(org_id: uuid.UUID, documents: int, rng: np.random.Generator, batch_size: int = 1000) -> np.ndarray:
+    """Create the organization and insert synthetic documents. Returns topic centers."""
+    centers = rng.standard_normal((TOPICS, DIMENSION)).astype(np.float32)
+
+    async with get_async_db_context() as db:
+        db.add(Organization(id=org_id, slug=f"bench-{org_id.hex[:12]}", name="Hybrid search benchmark"))
+
+    inserted = 0
+    while inserted < documents:
+        count = min(batch_size, documents - inserted)
+        topics = rng.integers(0, TOPICS, count)
+        vectors = centers[topics] + 0.6 * rng.standard_normal((count, DIMENSION)).astype(np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        rows = []
+        for i in range(count):
+            words = rng.choice(WORDS, 12)
+            rows.append(
+                {
+                    "org_id": org_id,
+                    "title": f"Documento {inserted + i} tema {topics[i]}",
+                    "content": f"tema{topics[i]} " + " ".join(words),
+                    "embedding": _vector_literal(vectors[i]),
+                }
+            )
+        async with get_async_db_context() as db:
+            await db.execute(
+                text(
+                    """
+                    INSERT INTO tenant_documents
+                        (id, organization_id, title, content, document_type, tags, meta_data,
+                         embedding, active, sort_order, created_at, updated_at)
+                    VALUES
+                        (gen_random_uuid(), :org_id, :title, :content, 'general', '{}', '{}',
+                         CAST(:embedding AS vector), true, 0, NOW(), NOW())
+                    """
+                ),
+                rows,
+            )
+            await db.execute(
+                text(
+                    """
+                    UPDATE tenant_documents
+                    SET search_vector = to_tsvector('spanish', title || ' ' || content)
+                    WHERE organization_id = :org_id AND search_vector IS NULL
+                    """
+                ),
+                {"org_id": org_id},
+            )
+        inserted += count
+        print(f"\rSeeded {inserted}/{documents} documents", end="", flush=True)
+    print()
+
+    async with get_async_db_context() as db:
+        await db.execute(text("ANALYZE tenant_documents"))
+    return centers
+
+
+async def exact_knn(org_id: uuid.UUID, vector: str, k: int) -> list[str]:
+    """Exact KNN with index scans disabled."""
+    async with get_async_db_context() as db:
+        await db.execute(text("SET LOCAL enable_indexscan = off"))
+        result = await db.execute(
+            text(
+                f"""
+                SELECT id FROM tenant_documents
+                WHERE {knn_predicate(org_id)}
+                ORDER BY embedding <=> CAST(:query_vector AS vector)
+                LIMIT :k
+                """
+            ),
+            {"query_vector": vector, "k": k},
+        )
+        return [str(row[0]) for row in result.all()]
+
+
+async def text_top_k(org_id: uuid.UUID, query: str, k: int) -> list[str]:
+    """Full-text matches ordered by ts_rank."""
+    async with get_async_db_context() as db:
+        result = await db.execute(
+            text(
+                """
+                SELECT id FROM tenant_documents
+                WHERE organization_id = :org_id
+                  AND active = true
+                  AND search_vector @@ plainto_tsquery('spanish', :query)
+                ORDER BY ts_rank(search_vector, plainto_tsquery('spanish', :query)) DESC
+                LIMIT :k
+                """
+            ),
+            {"org_id": org_id, "query": query, "k": k},
+        )
+        return [str(row[0]) for row in result.all()]
+
+
+def rrf_fuse(
+    vector_ids: list[str], text_ids: list[str], vector_weight: float, keyword_weight: float, rrf_k: int, k: int
+) -> list[str]:
+    """Reference weighted Reciprocal Rank Fusion of two rankings."""
+    scores: dict[str, float] = {}
+    for weight, ids in ((vector_weight, vector_ids), (keyword_weight, text_ids)):
+        for rank, doc_id in enumerate(ids, start=1):
+            scores[doc_id] = scores.get(doc_id, 0.0) + weight / (rrf_k + rank)
+    return sorted(scores, key=scores.__getitem__, reverse=True)[:k]
+
+
+async def run(args: argparse.Namespace) -> None:
+    rng = np.random.default_rng(args.seed)
+    org_id = uuid.uuid4()
+
+    try:
+        start = time.perf_counter()
+        centers = await seed(org_id, args.documents, rng)
+        print(f"Seed time: {time.perf_counter() - start:.1f}s")
+
+        manager = TenantIndexManager(min_documents=args.min_documents)
+        start = time.perf_counter()
+        indexed = await manager.ensure_index(org_id)
+        print(f"HNSW index: {'ready' if indexed else 'not built'} ({time.perf_counter() - start:.1f}s)")
+
+        queries: dict[str, list[float]] = {}
+        for _ in range(args.queries):
+            topic = int(rng.integers(0, TOPICS))
+            vector = centers[topic] + 0.6 * rng.standard_normal(DIMENSION).astype(np.float32)
+            vector /= np.linalg.norm(vector)
+            words = " ".join(rng.choice(WORDS, 2))
+            queries[f"tema{topic} {words}"] = vector.tolist()
+
+        store = TenantVectorStore(organization_id=org_id, embedding_model=FixedEmbeddings(queries))
+        store._ef_search = args.ef_search
+        candidates = max(store._hybrid_candidates, args.top_k)
+
+        legacy_times: list[float] = []
+        ann_times: list[float] = []
+        recalls: list[float] = []
+        for query, vector in queries.items():
+            vector_str = _vector_literal(np.asarray(vector))
+
+            start = time.perf_counter()
+            async with get_async_db_context() as db:
+                await db.execute(
+                    text(LEGACY_QUERY),
+                    {
+                        "query_vector": vector_str,
+                        "query": query,
+                        "org_id": org_id,
+                        "vector_weight": 0.7,
+                        "keyword_weight": 0.3,
+                        "limit": args.top_k,
+                    },
+                )
+            legacy_times.append((time.perf_counter() - start) * 1000)
+
+            start = time.perf_counter()
+            results = await store.hybrid_search(query, top_k=args.top_k, vector_weight=0.7, keyword_weight=0.3)
+            ann_times.append((time.perf_counter() - start) * 1000)
+
+            exact = rrf_fuse(
+                await exact_knn(org_id, vector_str, candidates),
+                await text_top_k(org_id, query, candidates),
+                vector_weight=0.7,
+                keyword_weight=0.3,
+                rrf_k=store._rrf_k,
+                k=args.top_k,
+            )
+            if exact:
+                returned = {result.document.id for result in results}
+                recalls.append(len(set(exact) & returned) / len(exact))
+
+        print(f"\nDocuments: {args.documents}, queries: {len(queries)}, top_k: {args.top_k}")
+        for label, values in (("legacy", legacy_times), ("ann+rrf", ann_times)):
+            print(
+                f"{label:>8}: p50={statistics.median(values):8.1f}ms "
+                f"p95={_percentile(values, 95):8.1f}ms max={max(values):8.1f}ms"
+            )
+        if recalls:
+            print(f"hybrid recall@{args.top_k} (ef_search={args.ef_search}): {statistics.mean(recalls):.3f}")
+
+    finally:
+        if not args.keep:
+            await TenantIndexManager().drop_index(org_id)
+            async with get_async_db_context() as db:
+                await db.execute(text("DELETE FROM core.organizations WHERE id = :id"), {"id": org_id})
+            print("Benchmark tenant removed")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark tenant hybrid search")
+    parser.add_argument("--documents", type=int, default=100_000, help="Documents to seed")
+    parser.add_argument("--queries", type=int, default=50, help="Queries to run")
+    parser.add_argument("--top-k", type=int, default=5, help="Results per hybrid query")
+    parser.add_argument("--ef-search", type=int, default=80, help="hnsw.ef_search used by hybrid_search")
+    parser.add_argument("--min-documents", type=int, default=1000, help="Index threshold (RAG_HNSW_MIN_DOCUMENTS)")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    parser.add_argument("--keep", action="store_true", help="Keep the benchmark tenant")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# ============================================================================
+# Tests for pooled Chattigo adapters
+# ============================================================================
+"""
+Tests for ChattigoAdapterFactory adapter pooling.
+
+Verifies:
+- Credentials are read once per DID and the adapter is shared
+- Pooled adapters survive close() and use the shared HTTP pool
+- invalidate() drops the adapter and the cached token
+"""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.integrations.chattigo.adapter_factory import ChattigoAdapterFactory
+
+
+def create_factory() -> tuple[ChattigoAdapterFactory, AsyncMock]:
+    """Create a factory with fake credential service and token cache."""
+    credential_service = MagicMock()
+    credential_service.get_credentials_by_did = AsyncMock(
+        side_effect=lambda db, did: MagicMock(did=did, base_url="https://chattigo.test")
+    )
+    token_cache = MagicMock()
+    token_cache.invalidate = AsyncMock()
+    return ChattigoAdapterFactory(credential_service=credential_service, token_cache=token_cache), credential_service
+
+
+class TestAdapterPooling:
+    """Tests for pooled adapters."""
+
+    @pytest.mark.asyncio
+    async def test_adapter_shared_per_did(self):
+        """Repeated lookups of a DID reuse one adapter and one credential read."""
+        factory, credential_service = create_factory()
+
+        first = await factory.get_adapter(db=None, did="5492644710400")
+        await first.close()
+        second = await factory.get_adapter(db=None, did="5492644710400")
+        other = await factory.get_adapter(db=None, did="5492645668671")
+
+        assert first is second
+        assert other is not first
+        assert credential_service.get_credentials_by_did.await_count == 2
+        assert first._get_http_client()._pooled is True
+
+    @pytest.mark.asyncio
+    async def test_invalidate_drops_adapter_and_token(self, monkeypatch):
+        """After invalidate() the next lookup reads credentials again."""
+        from app.integrations.chattigo import adapter_factory as factory_module
+
+        publish = AsyncMock()
+        monkeypatch.setattr(factory_module.cache_invalidation_bus, "publish", publish)
+        factory, credential_service = create_factory()
+
+        first = await factory.get_adapter(db=None, did="5492644710400")
+        await factory.invalidate("5492644710400")
+        second = await factory.get_adapter(db=None, did="5492644710400")
+
+        assert first is not second
+        assert credential_service.get_credentials_by_did.await_count == 2
+        factory.token_cache.invalidate.assert_awaited_once_with("5492644710400")
+        publish.assert_awaited_once_with("chattigo_adapters", did="5492644710400")
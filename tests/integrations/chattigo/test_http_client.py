@@ -113,6 +113,7 @@ class TestChattigoHttpClientRetry:
 
         assert "Rate limited" in str(exc_info.value)
         assert "120" in str(exc_info.value)
+        assert exc_info.value.retry_after == 120
 
     @pytest.mark.asyncio
     async def test_500_retries_with_exponential_backoff(self, client):
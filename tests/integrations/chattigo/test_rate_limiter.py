@@ -0,0 +1,81 @@
+# ============================================================================
+# Tests for Chattigo DID rate limiter
+# ============================================================================
+"""
+Tests for the per-DID token buckets.
+
+Verifies:
+- Ordered reservations spread sends at the configured rate
+- The daily messaging tier budget rejects sends beyond max_wait
+- A 429 penalty pauses the DID
+"""
+
+import pytest
+
+from app.integrations.chattigo.rate_limiter import DIDRateLimiter, TokenBucket
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestTokenBucket:
+    """Tests for TokenBucket."""
+
+    def test_reservations_wait_in_order(self):
+        """Reservations beyond the burst wait one interval more each."""
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2.0, capacity=2.0, clock=clock)
+
+        waits = [bucket.reserve() for _ in range(4)]
+
+        assert waits == [0.0, 0.0, 0.5, 1.0]
+        clock.now = 1.0
+        assert bucket.wait_time() == pytest.approx(0.5)
+
+    def test_refill_capped_at_capacity(self):
+        """An idle bucket holds at most its capacity."""
+        clock = FakeClock()
+        bucket = TokenBucket(rate=1.0, capacity=3.0, clock=clock)
+        bucket.reserve()
+
+        clock.now = 100.0
+
+        assert bucket.tokens == 3.0
+
+
+class TestDIDRateLimiter:
+    """Tests for DIDRateLimiter."""
+
+    @pytest.mark.asyncio
+    async def test_daily_tier_budget_rejects_sends(self):
+        """Once the tier's daily budget is used, sends are rejected instead of waiting."""
+        clock = FakeClock()
+        limiter = DIDRateLimiter("5492644710400", messages_per_second=1000.0, tier="tier_1k", clock=clock)
+
+        results = [await limiter.acquire(max_wait=0) for _ in range(1001)]
+
+        assert results.count(True) == 1000
+        assert results[-1] is False
+        stats = limiter.get_stats()
+        assert stats["rejected"] == 1
+        assert stats["daily_remaining"] == 0
+
+    @pytest.mark.asyncio
+    async def test_penalty_pauses_did(self):
+        """After a 429 the DID waits out the Retry-After period."""
+        clock = FakeClock()
+        limiter = DIDRateLimiter("5492644710400", messages_per_second=10.0, tier="unlimited", clock=clock)
+
+        limiter.penalize(30)
+
+        assert limiter.wait_time() == pytest.approx(30)
+        assert await limiter.acquire(max_wait=5) is False
+        clock.now = 30.0
+        assert await limiter.acquire(max_wait=0) is True
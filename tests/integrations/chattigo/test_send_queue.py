@@ -0,0 +1,157 @@
+# ============================================================================
+# Tests for the Chattigo outbound send queue
+# ============================================================================
+"""
+Tests for ChattigoSendQueue.
+
+Verifies:
+- Messages to one recipient are sent in submission order
+- Different recipients are sent concurrently
+- 429 pauses the DID and the send is retried
+- Connection errors are retried; read timeouts and other errors fail immediately
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from app.integrations.chattigo import rate_limiter as rate_limiter_module
+from app.integrations.chattigo.exceptions import ChattigoRateLimitError, ChattigoSendError
+from app.integrations.chattigo.rate_limiter import DIDRateLimiter
+from app.integrations.chattigo.send_queue import ChattigoSendQueue
+
+DID = "5492644710400"
+
+
+@pytest.fixture(autouse=True)
+def fast_limiter(monkeypatch):
+    """Use an unthrottled limiter per test."""
+    monkeypatch.setattr(
+        rate_limiter_module,
+        "_did_limiters",
+        {DID: DIDRateLimiter(DID, messages_per_second=1000.0, tier="unlimited")},
+    )
+
+
+def create_queue(**kwargs) -> ChattigoSendQueue:
+    """Create a queue without retry delays."""
+    return ChattigoSendQueue(**{"retry_base_delay": 0.0, **kwargs})
+
+
+class TestOrdering:
+    """Tests for per-recipient ordering."""
+
+    @pytest.mark.asyncio
+    async def test_same_recipient_sent_in_order(self):
+        """A slow first message is not overtaken by the next one to the same recipient."""
+        queue = create_queue()
+        delivered: list[str] = []
+
+        async def send(text: str, delay: float) -> dict:
+            await asyncio.sleep(delay)
+            delivered.append(text)
+            return {"status": "ok"}
+
+        await asyncio.gather(
+            queue.send(DID, "5492641111111", lambda: send("first", 0.02)),
+            queue.send(DID, "5492641111111", lambda: send("second", 0)),
+        )
+
+        assert delivered == ["first", "second"]
+
+    @pytest.mark.asyncio
+    async def test_recipients_sent_concurrently(self):
+        """Messages to different recipients do not wait for each other."""
+        queue = create_queue()
+        in_flight, peak = 0, 0
+
+        async def send() -> dict:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return {"status": "ok"}
+
+        await asyncio.gather(*(queue.send(DID, f"54926400000{i}", send) for i in range(5)))
+
+        assert peak == 5
+        assert queue.get_stats()["sent"] == 5
+
+
+class TestRetries:
+    """Tests for retry behavior."""
+
+    @pytest.mark.asyncio
+    async def test_rate_limited_send_retried(self):
+        """A 429 pauses the DID for Retry-After, then the send is retried."""
+        queue = create_queue()
+        attempts = 0
+
+        async def send() -> dict:
+            nonlocal attempts
+            attempts += 1
+            if attempts == 1:
+                raise ChattigoRateLimitError("Rate limited", retry_after=0.01)
+            return {"status": "ok"}
+
+        assert await queue.send(DID, "5492641111111", send) == {"status": "ok"}
+        assert attempts == 2
+        assert queue.get_stats()["rate_limited"] == 1
+        assert rate_limiter_module._did_limiters[DID].get_stats()["penalties"] == 1
+
+    @pytest.mark.asyncio
+    async def test_connection_errors_retried_until_max_attempts(self):
+        """Connection errors are retried; the last one reaches the caller."""
+        queue = create_queue(max_attempts=2)
+        attempts = 0
+
+        async def send() -> dict:
+            nonlocal attempts
+            attempts += 1
+            raise httpx.ConnectError("connection refused")
+
+        with pytest.raises(httpx.ConnectError):
+            await queue.send(DID, "5492641111111", send)
+
+        assert attempts == 2
+        assert queue.get_stats()["failed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_read_timeout_not_retried(self):
+        """A read timeout may follow a delivered message, so it is not resent."""
+        queue = create_queue()
+        attempts = 0
+
+        async def send() -> dict:
+            nonlocal attempts
+            attempts += 1
+            raise httpx.ReadTimeout("timed out")
+
+        with pytest.raises(httpx.ReadTimeout):
+            await queue.send(DID, "5492641111111", send)
+
+        assert attempts == 1
+        assert queue.get_stats()["retries"] == 0
+
+    @pytest.mark.asyncio
+    async def test_send_errors_not_retried(self):
+        """Client errors fail at once and do not block the recipient's next message."""
+        queue = create_queue()
+
+        async def fail() -> dict:
+            raise ChattigoSendError("HTTP 400")
+
+        async def succeed() -> dict:
+            return {"status": "ok"}
+
+        results = await asyncio.gather(
+            queue.send(DID, "5492641111111", fail),
+            queue.send(DID, "5492641111111", succeed),
+            return_exceptions=True,
+        )
+
+        assert isinstance(results[0], ChattigoSendError)
+        assert results[1] == {"status": "ok"}
+        assert queue.get_stats()["retries"] == 0
@@ -0,0 +1,166 @@
+"""
+Tests for CheckpointCompactor.
+
+Verifies the SQL and parameters of pruning, idle thread cleanup and storage
+stats, and that BackgroundServiceManager runs compaction sweeps periodically.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.core import background_services
+from app.integrations.databases import checkpoint_compactor as compactor_module
+from app.integrations.databases.checkpoint_compactor import CheckpointCompactor
+
+
+class FakeSession:
+    """Records executed statements and answers them in order."""
+
+    def __init__(self, results: list[MagicMock]) -> None:
+        self.results = list(results)
+        self.executed: list[tuple[str, dict]] = []
+        self.commits = 0
+
+    async def execute(self, statement, params: dict) -> MagicMock:
+        self.executed.append((" ".join(str(statement).split()), params))
+        return self.results.pop(0) if self.results else MagicMock(rowcount=0)
+
+    async def commit(self) -> None:
+        self.commits += 1
+
+
+def make_factory(*sessions: FakeSession):
+    """Session factory handing out the given sessions in order."""
+    pending = list(sessions)
+
+    @asynccontextmanager
+    async def factory():
+        yield pending.pop(0)
+
+    return factory
+
+
+def rows(*values) -> MagicMock:
+    """Result whose all() returns the given rows."""
+    result = MagicMock()
+    result.all.return_value = list(values)
+    return result
+
+
+class TestCheckpointCompactor:
+    """Tests for the compaction SQL."""
+
+    def test_keep_per_thread_must_be_positive(self):
+        """Test that keeping no checkpoint is rejected."""
+        with pytest.raises(ValueError):
+            CheckpointCompactor(make_factory(), keep_per_thread=0)
+
+    @pytest.mark.asyncio
+    async def test_prune_thread(self):
+        """Test that superseded checkpoints, then orphan writes and blobs are deleted."""
+        session = FakeSession([MagicMock(rowcount=4), MagicMock(rowcount=6), MagicMock(rowcount=9)])
+        compactor = CheckpointCompactor(make_factory(session), keep_per_thread=2)
+
+        result = await compactor.prune_thread("whatsapp_5492641234567")
+
+        statements = [sql for sql, _ in session.executed]
+        assert statements[0].startswith("DELETE FROM checkpoints c")
+        assert "ranked.rn > :keep" in statements[0]
+        assert statements[1].startswith("DELETE FROM checkpoint_writes w")
+        assert statements[2].startswith("DELETE FROM checkpoint_blobs b")
+        # Blobs newer than every referenced version belong to an in-flight run
+        assert "b.version < (" in statements[2]
+        assert all(params == {"thread_id": "whatsapp_5492641234567", "keep": 2} for _, params in session.executed)
+        assert session.commits == 1
+        assert result.to_dict() == {
+            "threads_pruned": 1,
+            "checkpoints_deleted": 4,
+            "writes_deleted": 6,
+            "blobs_deleted": 9,
+            "idle_threads_deleted": 0,
+        }
+
+    @pytest.mark.asyncio
+    async def test_delete_idle_threads(self):
+        """Test that idle threads are selected by age and deleted from every table."""
+        session = FakeSession([rows(("whatsapp_1",), ("whatsapp_2",))])
+        compactor = CheckpointCompactor(make_factory(session), retention_days=30, batch_size=100)
+
+        deleted = await compactor.delete_idle_threads()
+
+        select_sql, select_params = session.executed[0]
+        assert "make_interval(days => :days)" in select_sql
+        assert select_params == {"days": 30, "limit": 100}
+        assert [sql for sql, _ in session.executed[1:]] == [
+            f"DELETE FROM {table} WHERE thread_id = ANY(:thread_ids)"
+            for table in ("checkpoint_writes", "checkpoint_blobs", "checkpoints")
+        ]
+        assert all(params == {"thread_ids": ["whatsapp_1", "whatsapp_2"]} for _, params in session.executed[1:])
+        assert deleted == 2
+        assert session.commits == 1
+
+    @pytest.mark.asyncio
+    async def test_idle_cleanup_disabled(self):
+        """Test that retention_days=0 keeps idle threads without querying."""
+        compactor = CheckpointCompactor(make_factory(), retention_days=0)
+
+        assert await compactor.delete_idle_threads() == 0
+
+    @pytest.mark.asyncio
+    async def test_compact_aggregates_and_skips_failed_threads(self):
+        """Test that a failing thread does not stop the sweep."""
+        idle = FakeSession([rows()])
+        select = FakeSession([rows(("whatsapp_1",), ("whatsapp_2",))])
+        compactor = CheckpointCompactor(make_factory(idle, select), keep_per_thread=1, batch_size=50)
+        pruned = compactor_module.CompactionResult(threads_pruned=1, checkpoints_deleted=3, blobs_deleted=2)
+        compactor.prune_thread = AsyncMock(side_effect=[RuntimeError("lock timeout"), pruned])
+
+        result = await compactor.compact()
+
+        assert select.executed[0][1] == {"keep": 1, "limit": 50}
+        assert "HAVING count(*) > :keep" in select.executed[0][0]
+        assert (result.threads_pruned, result.checkpoints_deleted, result.blobs_deleted) == (1, 3, 2)
+
+    @pytest.mark.asyncio
+    async def test_get_thread_stats(self):
+        """Test that per-table sizes are summed."""
+        result = MagicMock()
+        result.one.return_value = (2, 1000, 5, 4000, 3, 500)
+        session = FakeSession([result])
+        compactor = CheckpointCompactor(make_factory(session))
+
+        stats = await compactor.get_thread_stats("whatsapp_1")
+
+        assert session.executed[0][1] == {"thread_id": "whatsapp_1"}
+        assert stats["checkpoints"] == 2
+        assert stats["total_bytes"] == 5500
+
+
+class TestCompactionScheduling:
+    """Tests for BackgroundServiceManager compaction sweeps."""
+
+    @pytest.mark.asyncio
+    async def test_sweeps_run_periodically(self, monkeypatch):
+        """Test that sweeps repeat after a failure and stop on cancel."""
+        compactor = MagicMock()
+        compactor.compact = AsyncMock(side_effect=[RuntimeError("db down"), None, None])
+        monkeypatch.setattr(background_services, "settings", SimpleNamespace(CHECKPOINT_COMPACTION_INTERVAL=0.01))
+        monkeypatch.setattr(compactor_module, "create_checkpoint_compactor", lambda: compactor)
+        manager = background_services.BackgroundServiceManager()
+
+        async def three_sweeps() -> None:
+            while compactor.compact.await_count < 3:
+                await asyncio.sleep(0.01)
+
+        manager._start_checkpoint_compaction()
+        (task,) = manager._background_tasks
+        await asyncio.wait_for(three_sweeps(), timeout=2)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+        assert task.get_name() == "checkpoint_compaction"
+        assert not manager._background_tasks
@@ -0,0 +1,72 @@
+"""
+Tests for PooledAsyncPostgresSaver.
+
+Verifies that checkpoint operations use separate pool connections
+concurrently and that connection wait time is recorded.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from unittest.mock import MagicMock
+
+import pytest
+from psycopg_pool import AsyncConnectionPool
+
+from app.integrations.databases.pooled_checkpointer import PooledAsyncPostgresSaver
+
+
+def make_pool() -> tuple[MagicMock, dict[str, int]]:
+    """Build a pool mock that tracks concurrently checked-out connections."""
+    usage = {"active": 0, "peak": 0}
+
+    @asynccontextmanager
+    async def cursor(**kwargs):
+        yield MagicMock()
+
+    @asynccontextmanager
+    async def connection():
+        usage["active"] += 1
+        usage["peak"] = max(usage["peak"], usage["active"])
+        conn = MagicMock()
+        conn.cursor = cursor
+        try:
+            yield conn
+        finally:
+            usage["active"] -= 1
+
+    pool = MagicMock(spec=AsyncConnectionPool)
+    pool.connection = connection
+    pool.get_stats.return_value = {"pool_size": 4, "pool_available": 4}
+    return pool, usage
+
+
+class TestPooledAsyncPostgresSaver:
+    """Tests for per-operation connection checkout."""
+
+    @pytest.mark.asyncio
+    async def test_operations_run_concurrently(self):
+        """Test that concurrent cursors are not serialized on one lock."""
+        pool, usage = make_pool()
+        saver = PooledAsyncPostgresSaver(pool)
+
+        async def operation():
+            async with saver._cursor():
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(*[operation() for _ in range(3)])
+
+        assert usage["peak"] == 3
+
+    @pytest.mark.asyncio
+    async def test_pool_stats_include_wait_metrics(self):
+        """Test that wait metrics and pool status are reported."""
+        pool, _ = make_pool()
+        saver = PooledAsyncPostgresSaver(pool)
+
+        async with saver._cursor():
+            pass
+        stats = saver.get_pool_stats()
+
+        assert stats["acquisitions"] == 1
+        assert "avg_wait_ms" in stats and "max_wait_ms" in stats
+        assert stats["pool_size"] == 4
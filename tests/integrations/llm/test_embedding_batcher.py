@@ -0,0 +1,56 @@
+"""
+Tests for the embedding micro-batcher.
+
+Verifies that concurrent requests share one batch call, that the batch is
+flushed at max size, and that failures reach every waiter.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.integrations.llm.embedding_batcher import EmbeddingBatcher
+
+
+async def fake_embed(texts: list[str]) -> list[list[float]]:
+    """Embed each text as its length."""
+    return [[float(len(text))] for text in texts]
+
+
+class TestEmbeddingBatcher:
+    """Tests for EmbeddingBatcher."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_one_call(self):
+        """Texts submitted within the window are embedded together."""
+        batch_fn = AsyncMock(side_effect=fake_embed)
+        batcher = EmbeddingBatcher(batch_fn, max_batch_size=32, max_wait=0.01)
+
+        results = await asyncio.gather(*(batcher.submit("x" * n) for n in (1, 2, 3)))
+
+        assert results == [[1.0], [2.0], [3.0]]
+        batch_fn.assert_awaited_once_with(["x", "xx", "xxx"])
+
+    @pytest.mark.asyncio
+    async def test_flushes_at_max_batch_size(self):
+        """A full batch is sent without waiting for the window."""
+        batch_fn = AsyncMock(side_effect=fake_embed)
+        batcher = EmbeddingBatcher(batch_fn, max_batch_size=2, max_wait=10.0)
+
+        results = await asyncio.wait_for(
+            asyncio.gather(batcher.submit("a"), batcher.submit("bb")), timeout=1.0
+        )
+
+        assert results == [[1.0], [2.0]]
+        assert batcher.get_stats()["max_batch"] == 2
+
+    @pytest.mark.asyncio
+    async def test_failure_reaches_all_waiters(self):
+        """Every waiter of a failed batch receives the exception."""
+        batcher = EmbeddingBatcher(AsyncMock(side_effect=RuntimeError("tei down")), max_wait=0.001)
+
+        results = await asyncio.gather(batcher.submit("a"), batcher.submit("b"), return_exceptions=True)
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert batcher.get_stats()["failed_batches"] == 1
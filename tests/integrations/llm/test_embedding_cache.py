@@ -0,0 +1,105 @@
+"""
+Tests for the TEI embedding cache.
+
+Verifies LRU eviction, Redis fallback, and that TEIEmbeddingModel only
+sends uncached, distinct texts to TEI.
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.integrations.llm.embedding_cache import EmbeddingCache
+from app.integrations.llm.tei import TEIEmbeddingModel
+
+MODEL = "BAAI/bge-m3"
+
+
+class FakeRedis:
+    """Minimal async Redis with MGET and pipelined SET."""
+
+    def __init__(self):
+        self.data: dict[str, str] = {}
+
+    async def mget(self, keys):
+        return [self.data.get(key) for key in keys]
+
+    def pipeline(self, transaction=False):
+        redis = self
+
+        class Pipeline:
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *args):
+                return False
+
+            def set(self, key, value, ex=None):
+                redis.data[key] = value
+
+            async def execute(self):
+                return []
+
+        return Pipeline()
+
+
+class TestEmbeddingCache:
+    """Tests for EmbeddingCache."""
+
+    @pytest.mark.asyncio
+    async def test_lru_evicts_least_recently_used(self):
+        """Entries beyond max_entries are evicted oldest-first."""
+        cache = EmbeddingCache(max_entries=2, redis_client=FakeRedis())
+        await cache.set_many(MODEL, ["a", "b"], [[1.0], [2.0]])
+        await cache.get_many(MODEL, ["a"])
+        await cache.set_many(MODEL, ["c"], [[3.0]])
+
+        assert cache.make_key(MODEL, "b") not in cache._lru
+        assert cache.make_key(MODEL, "a") in cache._lru
+        assert cache.get_stats()["evictions"] == 1
+
+    @pytest.mark.asyncio
+    async def test_redis_hit_after_process_restart(self):
+        """A fresh L1 is filled from Redis."""
+        redis = FakeRedis()
+        await EmbeddingCache(redis_client=redis).set_many(MODEL, ["hola"], [[0.5, -0.25]])
+        cache = EmbeddingCache(redis_client=redis)
+
+        assert await cache.get_many(MODEL, ["hola", "chau"]) == [[0.5, -0.25], None]
+        assert cache.get_stats()["l2_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_redis_errors_are_misses(self):
+        """Redis failures degrade to L1 only."""
+        redis = MagicMock()
+        redis.mget = AsyncMock(side_effect=ConnectionError("down"))
+        cache = EmbeddingCache(redis_client=redis)
+
+        assert await cache.get_many(MODEL, ["hola"]) == [None]
+        assert cache.get_stats()["redis_errors"] == 1
+
+
+class TestTEIEmbeddingModelCache:
+    """Tests for cached TEI embedding calls."""
+
+    @pytest.mark.asyncio
+    async def test_batch_sends_only_uncached_distinct_texts(self):
+        """Cached and duplicate texts are not sent to TEI."""
+        cache = EmbeddingCache(redis_client=FakeRedis())
+        await cache.set_many(MODEL, ["cached"], [[1.0, 1.0]])
+        response = MagicMock()
+        response.json.return_value = [[2.0, 2.0]]
+        client = MagicMock()
+        client.post = AsyncMock(return_value=response)
+        embedder = TEIEmbeddingModel(
+            base_url="http://tei", model=MODEL, embedding_dimension=2, cache=cache, use_cache=True, use_batching=False
+        )
+
+        with patch("app.integrations.llm.tei.get_shared_http_client", return_value=client):
+            first = await embedder.embed_batch(["cached", "new", "new"])
+            second = await embedder.embed_text("new")
+
+        assert first == [[1.0, 1.0], [2.0, 2.0], [2.0, 2.0]]
+        assert second == [2.0, 2.0]
+        client.post.assert_awaited_once()
+        assert client.post.await_args.kwargs["json"] == {"inputs": ["new"]}
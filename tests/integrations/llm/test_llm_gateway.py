@@ -0,0 +1,144 @@
+"""
+Tests for the LLM concurrency governor.
+
+Verifies priority admission and shares, queue deadlines, the AIMD limit
+updates, and that governed chat models take one slot per call.
+"""
+
+import asyncio
+
+import pytest
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+
+from app.core.infrastructure.monitoring import MetricsCollector
+from app.core.interfaces.llm import LLMRateLimitError
+from app.integrations.llm import gateway
+from app.integrations.llm.gateway import (
+    GovernedChatModelMixin,
+    LLMConcurrencyGovernor,
+    LLMPriority,
+    llm_priority,
+)
+
+
+def create_governor(**kwargs) -> LLMConcurrencyGovernor:
+    """Helper to create a governor with its own metrics."""
+    options = {"initial_limit": 4, "min_limit": 1, "max_limit": 8, "latency_target": 1.0, "metrics": MetricsCollector()}
+    return LLMConcurrencyGovernor("test-model", **{**options, **kwargs})
+
+
+async def hold(governor: LLMConcurrencyGovernor, priority: LLMPriority, release: asyncio.Event, order: list):
+    """Take a slot, record the admission and hold it until released."""
+    async with governor.slot(priority):
+        order.append(priority)
+        await release.wait()
+
+
+class TestAdmission:
+    """Tests for priority classes and deadlines."""
+
+    @pytest.mark.asyncio
+    async def test_background_share_leaves_headroom(self):
+        """Background calls only fill 75% of the limit; interactive ones the rest."""
+        governor = create_governor()
+        release, order = asyncio.Event(), []
+        tasks = [asyncio.create_task(hold(governor, LLMPriority.BACKGROUND, release, order)) for _ in range(4)]
+        await asyncio.sleep(0)
+
+        assert governor.get_stats()["in_flight"] == 3
+        interactive = asyncio.create_task(hold(governor, LLMPriority.INTERACTIVE, release, order))
+        await asyncio.sleep(0)
+
+        assert order.count(LLMPriority.INTERACTIVE) == 1
+        assert governor.get_stats()["background"]["queued"] == 1
+        release.set()
+        await asyncio.gather(*tasks, interactive)
+
+    @pytest.mark.asyncio
+    async def test_waiters_admitted_by_priority(self):
+        """Queued interactive calls are admitted before earlier batch calls."""
+        governor = create_governor(initial_limit=1)
+        first_release, release, order = asyncio.Event(), asyncio.Event(), []
+        first = asyncio.create_task(hold(governor, LLMPriority.INTERACTIVE, first_release, order))
+        await asyncio.sleep(0)
+        batch = asyncio.create_task(hold(governor, LLMPriority.BATCH, release, order))
+        await asyncio.sleep(0)
+        interactive = asyncio.create_task(hold(governor, LLMPriority.INTERACTIVE, release, order))
+        await asyncio.sleep(0)
+
+        first_release.set()
+        release.set()
+        await asyncio.gather(first, batch, interactive)
+
+        assert order == [LLMPriority.INTERACTIVE, LLMPriority.INTERACTIVE, LLMPriority.BATCH]
+
+    @pytest.mark.asyncio
+    async def test_deadline_exceeded_raises(self):
+        """A call that cannot get a slot within its max wait fails."""
+        governor = create_governor(initial_limit=1, max_wait={LLMPriority.INTERACTIVE: 0.01})
+        release = asyncio.Event()
+        holder = asyncio.create_task(hold(governor, LLMPriority.INTERACTIVE, release, []))
+        await asyncio.sleep(0)
+
+        with pytest.raises(LLMRateLimitError):
+            await governor.acquire(LLMPriority.INTERACTIVE)
+
+        stats = governor.get_stats()
+        assert stats["deadline_exceeded"] == 1
+        assert stats["interactive"]["queued"] == 0
+        release.set()
+        await holder
+
+
+class TestAdaptiveLimit:
+    """Tests for the AIMD limit."""
+
+    @pytest.mark.asyncio
+    async def test_fast_saturated_calls_increase_limit(self):
+        """Fast calls while the limit is in use raise it additively."""
+        governor = create_governor(initial_limit=1)
+
+        await governor.acquire(LLMPriority.INTERACTIVE)
+        governor.release(LLMPriority.INTERACTIVE, latency=0.1)
+
+        assert governor.get_stats()["limit"] == 2.0
+
+    @pytest.mark.asyncio
+    async def test_slow_or_overloaded_calls_back_off_once_per_window(self):
+        """Slow calls and overload errors decrease the limit once per latency window."""
+        governor = create_governor(initial_limit=8)
+
+        await governor.acquire(LLMPriority.INTERACTIVE)
+        governor.release(LLMPriority.INTERACTIVE, latency=5.0)
+        await governor.acquire(LLMPriority.INTERACTIVE)
+        governor.release(LLMPriority.INTERACTIVE, overloaded=True)
+
+        assert governor.get_stats()["limit"] == pytest.approx(5.6)
+        assert governor.get_stats()["decreases"] == 1
+
+
+class FakeGovernedChatModel(GovernedChatModelMixin, GenericFakeChatModel):
+    """Fake chat model routed through the governor."""
+
+
+class TestGovernedChatModel:
+    """Tests for GovernedChatModelMixin."""
+
+    @pytest.mark.asyncio
+    async def test_calls_take_slot_with_context_priority(self, monkeypatch):
+        """ainvoke and astream take one slot each, with the context's priority."""
+        governor = create_governor()
+        monkeypatch.setattr(gateway, "get_llm_governor", lambda model: governor)
+        llm = FakeGovernedChatModel(messages=iter([AIMessage(content="hola"), AIMessage(content="chau que tal")]))
+
+        with llm_priority(LLMPriority.BACKGROUND):
+            assert (await llm.ainvoke("hi")).content == "hola"
+        chunks = [chunk.content async for chunk in llm.astream("hi")]
+
+        assert "".join(chunks) == "chau que tal"
+        metrics = governor.metrics
+        for priority in ("background", "interactive"):
+            labels = {"model": "test-model", "priority": priority}
+            assert metrics.get_counter("llm_gateway_requests_total", labels) == 1
+        assert governor.get_stats()["in_flight"] == 0
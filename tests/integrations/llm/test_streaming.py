@@ -0,0 +1,107 @@
+"""
+Tests for token streaming of user-facing responses.
+
+Verifies that <think> blocks are filtered across chunk boundaries, and that
+astream_response publishes deltas inside a graph run that streams tokens and
+falls back to a plain ainvoke otherwise (outside a graph or under ainvoke).
+"""
+
+from typing import TypedDict
+from unittest.mock import patch
+
+import pytest
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+from langgraph.graph import END, START, StateGraph
+
+from app.integrations.llm.streaming import STREAM_TOKENS_KEY, TOKEN_EVENT, ThinkTagFilter, astream_response
+
+
+def filter_chunks(chunks: list[str]) -> str:
+    """Run chunks through a ThinkTagFilter and join the visible text."""
+    think_filter = ThinkTagFilter()
+    return "".join(think_filter.feed(chunk) for chunk in chunks) + think_filter.flush()
+
+
+def fake_llm(text: str) -> GenericFakeChatModel:
+    """Fake chat model that streams text word by word."""
+    return GenericFakeChatModel(messages=iter([AIMessage(content=text)]))
+
+
+class State(TypedDict):
+    response: str
+
+
+def respond_graph(text: str):
+    """Graph whose only node answers through astream_response."""
+
+    async def respond(state: State) -> State:
+        return {"response": await astream_response(fake_llm(text), "prompt", agent="greeting_agent")}
+
+    builder = StateGraph(State)
+    builder.add_node("respond", respond)
+    builder.add_edge(START, "respond")
+    builder.add_edge("respond", END)
+    return builder.compile()
+
+
+class TestThinkTagFilter:
+    """Tests for ThinkTagFilter."""
+
+    def test_tags_split_across_chunks(self):
+        """A think block split at any point is removed."""
+        chunks = ["<thi", "nk>razonando", " mucho</th", "ink>\n Hola", " mundo"]
+
+        assert filter_chunks(chunks) == "Hola mundo"
+
+    def test_partial_tag_prefix_is_released(self):
+        """Text that only looks like a tag prefix is emitted at flush."""
+        think_filter = ThinkTagFilter()
+
+        assert think_filter.feed("a <") == "a "
+        assert think_filter.flush() == "<"
+
+    def test_unclosed_think_block_is_dropped(self):
+        """A think block that never closes emits nothing."""
+        assert filter_chunks(["Hola", "<think>sin cerrar"]) == "Hola"
+
+
+class TestAstreamResponse:
+    """Tests for astream_response."""
+
+    @pytest.mark.asyncio
+    async def test_outside_graph_uses_ainvoke(self):
+        """Without a stream writer the response is generated in one call."""
+        result = await astream_response(fake_llm("<think>x</think> Hola mundo"), "prompt")
+
+        assert result == "Hola mundo"
+
+    @pytest.mark.asyncio
+    async def test_graph_ainvoke_uses_ainvoke(self):
+        """A graph run that does not stream tokens (webhook path) never calls astream()."""
+        graph = respond_graph("<think>x</think> Hola mundo")
+
+        with patch.object(GenericFakeChatModel, "astream") as astream:
+            final = await graph.ainvoke({"response": ""})
+
+        astream.assert_not_called()
+        assert final == {"response": "Hola mundo"}
+
+    @pytest.mark.asyncio
+    async def test_inside_graph_publishes_deltas(self):
+        """Inside a run that streams tokens deltas go to the custom stream channel."""
+        graph = respond_graph("Hola, como estas?")
+
+        events = []
+        final = None
+        config = {"configurable": {STREAM_TOKENS_KEY: True}}
+        async for mode, chunk in graph.astream({"response": ""}, config, stream_mode=["custom", "values"]):
+            if mode == "custom":
+                events.append(chunk)
+            else:
+                final = chunk
+
+        assert len(events) > 1
+        assert all(event["type"] == TOKEN_EVENT and event["agent"] == "greeting_agent" for event in events)
+        assert "".join(event["delta"] for event in events) == "Hola, como estas?"
+        assert final == {"response": "Hola, como estas?"}
@@ -0,0 +1,96 @@
+"""
+Tests for the spaCy NLP service.
+
+Verifies that concurrent parses are grouped into one nlp.pipe batch per
+model and disabled components, that failures reach every waiter, and the
+ParsedDoc similarity.
+"""
+
+import asyncio
+
+import pytest
+
+from app.integrations.nlp import spacy_service
+from app.integrations.nlp.spacy_service import ParsedDoc, SpacyNLPService
+
+
+def make_doc(text: str, model: str = "es_core_news_sm", vector: tuple[float, ...] = ()) -> ParsedDoc:
+    """Build a ParsedDoc without spaCy."""
+    return ParsedDoc(text=text, tokens=(), ents=(), vector=vector, has_vector=bool(vector), model=model)
+
+
+@pytest.fixture
+def parse_calls(monkeypatch):
+    """Replace the worker batch function, recording each batch."""
+    calls: list[tuple[str, tuple[str, ...], list[str]]] = []
+
+    def fake_parse_batch(model_name: str, disable: tuple[str, ...], texts: list[str]) -> list[ParsedDoc]:
+        calls.append((model_name, disable, texts))
+        return [make_doc(text, model_name) for text in texts]
+
+    monkeypatch.setattr(spacy_service, "_parse_batch", fake_parse_batch)
+    return calls
+
+
+class TestSpacyNLPService:
+    """Tests for SpacyNLPService (in-process thread executor)."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_parses_share_one_batch(self, parse_calls):
+        """Texts for the same model and disabled pipes are parsed together."""
+        service = SpacyNLPService(workers=0, max_wait=0.01)
+
+        docs = await asyncio.gather(
+            service.parse("hola", "es_core_news_sm", disable=("parser",)),
+            service.parse("quiero pagar", "es_core_news_sm", disable=("parser",)),
+            service.parse("hello", "en_core_web_sm"),
+        )
+        await service.shutdown()
+
+        assert [doc.text for doc in docs] == ["hola", "quiero pagar", "hello"]
+        assert sorted(parse_calls) == [
+            ("en_core_web_sm", (), ["hello"]),
+            ("es_core_news_sm", ("parser",), ["hola", "quiero pagar"]),
+        ]
+        assert service.get_stats()["max_batch"] == 2
+
+    @pytest.mark.asyncio
+    async def test_flushes_at_max_batch_size(self, parse_calls):
+        """A full batch is parsed without waiting for the window."""
+        service = SpacyNLPService(workers=0, max_batch_size=2, max_wait=10.0)
+
+        docs = await asyncio.wait_for(service.parse_many(["a", "b"], "es_core_news_sm"), timeout=1.0)
+        await service.shutdown()
+
+        assert [doc.text for doc in docs] == ["a", "b"]
+        assert len(parse_calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_failure_reaches_all_waiters(self, monkeypatch):
+        """Every waiter of a failed batch receives the exception."""
+
+        def failing_parse_batch(model_name, disable, texts):
+            raise RuntimeError("worker crashed")
+
+        monkeypatch.setattr(spacy_service, "_parse_batch", failing_parse_batch)
+        service = SpacyNLPService(workers=0, max_wait=0.001)
+
+        results = await asyncio.gather(
+            service.parse("a", "es_core_news_sm"), service.parse("b", "es_core_news_sm"), return_exceptions=True
+        )
+        await service.shutdown()
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert service.get_stats()["failed_batches"] == 1
+
+
+class TestParsedDoc:
+    """Tests for the Doc snapshot."""
+
+    def test_similarity_is_cosine(self):
+        """Similarity is the cosine of the document vectors."""
+        doc = make_doc("a", vector=(1.0, 0.0))
+
+        assert doc.similarity(make_doc("b", vector=(1.0, 0.0))) == pytest.approx(1.0)
+        assert doc.similarity(make_doc("c", vector=(1.0, 1.0))) == pytest.approx(0.7071, abs=1e-4)
+        assert doc.similarity(make_doc("d")) == 0.0
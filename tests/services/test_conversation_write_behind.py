@@ -0,0 +1,165 @@
+"""
+Tests for the conversation write-behind pipeline.
+
+Tests job serialization, idempotent message ids, per-conversation summary
+chaining and ack / redelivery / dead-letter decisions.
+"""
+
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.integrations.databases.redis_stream import RedisStreamQueue, StreamEntry
+from app.models.conversation_context import ConversationContextModel
+from app.services.conversation_context_service import SUMMARY_TURN_KEY
+from app.services.conversation_write_behind import (
+    ContextWriteJob,
+    ConversationWriteBehind,
+    group_by_conversation,
+)
+
+
+def make_job(conversation_id: str, turn: int, summarize: bool = False) -> ContextWriteJob:
+    """Build a job for the given turn."""
+    context = ConversationContextModel(
+        conversation_id=conversation_id, total_turns=turn, rolling_summary="previous"
+    )
+    return ContextWriteJob(
+        conversation_id=conversation_id,
+        context=context,
+        user_message=f"user {turn}",
+        bot_response=f"bot {turn}",
+        agent_name="pharmacy_operations_agent",
+        summarize=summarize,
+        created_at=1_700_000_000.0 + turn,
+    )
+
+
+@pytest.fixture
+def queue():
+    """Stream queue mock."""
+    mock = MagicMock(spec=RedisStreamQueue)
+    mock.stream = "conversation:writes"
+    mock.add = AsyncMock(return_value="1-0")
+    mock.ack = AsyncMock()
+    mock.dead_letter = AsyncMock()
+    return mock
+
+
+@pytest.fixture
+def session():
+    """DB session mock."""
+    mock = MagicMock()
+    mock.commit = AsyncMock()
+    return mock
+
+
+@pytest.fixture
+def write_behind(queue, session):
+    """Write-behind with mocked queue and session."""
+
+    @asynccontextmanager
+    async def session_factory():
+        yield session
+
+    return ConversationWriteBehind(queue, session_factory, batch_size=10, max_deliveries=3)
+
+
+class TestContextWriteJob:
+    """Tests for job serialization and message rows."""
+
+    def test_round_trip(self):
+        """Jobs survive serialization to stream fields."""
+        job = make_job("whatsapp_1", 5, summarize=True)
+
+        restored = ContextWriteJob.from_fields(job.to_fields())
+
+        assert restored == job
+
+    def test_message_ids_are_stable_and_ordered(self):
+        """Redelivered jobs produce the same ids; assistant sorts after user."""
+        job = make_job("whatsapp_1", 3)
+        replay = ContextWriteJob.from_fields(job.to_fields())
+
+        rows = job.message_rows()
+
+        assert [row["id"] for row in rows] == [row["id"] for row in replay.message_rows()]
+        assert rows[0]["id"] != rows[1]["id"]
+        assert [row["sender_type"] for row in rows] == ["user", "assistant"]
+        assert rows[0]["created_at"] < rows[1]["created_at"]
+
+    def test_group_by_conversation_keeps_order(self):
+        """Jobs are grouped per conversation in stream order."""
+        jobs = [make_job("a", 1), make_job("b", 1), make_job("a", 2)]
+
+        groups = group_by_conversation(jobs)
+
+        assert [job.turn for job in groups["a"]] == [1, 2]
+        assert [job.turn for job in groups["b"]] == [1]
+
+
+class TestConversationWriteBehind:
+    """Tests for batch persistence and delivery handling."""
+
+    @pytest.mark.asyncio
+    async def test_summaries_chain_within_conversation(self, write_behind):
+        """A later turn in the same batch builds on the new summary."""
+        summarizer = AsyncMock(side_effect=["summary 5", "summary 10"])
+        write_behind.set_summarizer(summarizer)
+        jobs = [make_job("a", 5, summarize=True), make_job("a", 6), make_job("a", 10, summarize=True)]
+
+        latest = await write_behind._summarize(jobs)
+
+        assert latest == ("summary 10", 10)
+        assert summarizer.await_args_list[1].args[0] == "summary 5"
+        assert jobs[1].context.rolling_summary == "summary 5"
+        assert jobs[2].context.metadata[SUMMARY_TURN_KEY] == 10
+
+    @pytest.mark.asyncio
+    async def test_batch_is_persisted_in_one_commit_and_acked(self, write_behind, queue, session):
+        """Context upserts, messages and commit happen once per batch."""
+        entries = [
+            StreamEntry(entry_id=f"{turn}-0", fields=make_job("a", turn).to_fields())
+            for turn in (1, 2)
+        ]
+        service = MagicMock()
+        service.upsert_context_if_newer = AsyncMock()
+        service.update_summary = AsyncMock()
+        service.add_messages = AsyncMock()
+
+        with patch(
+            "app.services.conversation_write_behind.ConversationContextService", return_value=service
+        ):
+            await write_behind._handle_batch(entries)
+
+        service.upsert_context_if_newer.assert_awaited_once()
+        assert service.upsert_context_if_newer.await_args.args[1].total_turns == 2
+        assert len(service.add_messages.await_args.args[0]) == 4
+        session.commit.assert_awaited_once()
+        queue.ack.assert_awaited_once_with("1-0", "2-0")
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_stays_pending_until_max_deliveries(self, write_behind, queue):
+        """Failures are retried through redelivery, then dead-lettered."""
+        retry = StreamEntry(entry_id="1-0", fields=make_job("a", 1).to_fields(), deliveries=1)
+        last = StreamEntry(entry_id="2-0", fields=make_job("b", 1).to_fields(), deliveries=3)
+
+        with patch.object(write_behind, "apply", AsyncMock(side_effect=RuntimeError("db down"))):
+            await write_behind._handle_batch([retry, last])
+
+        queue.ack.assert_not_awaited()
+        queue.dead_letter.assert_awaited_once()
+        assert queue.dead_letter.await_args.args[0] is last
+
+    @pytest.mark.asyncio
+    async def test_enqueue_failure_persists_inline(self, write_behind, queue):
+        """A job is applied inline when the stream is unavailable."""
+        queue.add.side_effect = ConnectionError("redis down")
+        job = make_job("a", 1)
+
+        with patch.object(write_behind, "apply", AsyncMock()) as apply:
+            await write_behind.submit(job)
+
+        apply.assert_awaited_once_with([job])
+        assert not write_behind.is_running
@@ -10,6 +10,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import pytest
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache.bypass_rule_index import BypassRuleIndex, CompiledBypassRule, CompiledBypassRules
 from app.models.db.tenancy import BypassRule
 from app.services.bypass_routing_service import (
     BypassMatch,
@@ -142,6 +143,57 @@ class TestBypassRuleMatches:
         assert rule.matches(None, None) is False
 
 
+def make_rule(
+    rule_type: str = "phone_number",
+    pattern: str | None = "549115*",
+    priority: int = 0,
+    rule_name: str = "test_rule",
+    target_domain: str | None = "pharmacy",
+    target_agent: str = "pharmacy_agent",
+    **kwargs,
+) -> BypassRule:
+    """Build an enabled bypass rule."""
+    return BypassRule(
+        id=uuid.uuid4(),
+        organization_id=uuid.uuid4(),
+        rule_name=rule_name,
+        rule_type=rule_type,
+        pattern=pattern,
+        priority=priority,
+        target_domain=target_domain,
+        target_agent=target_agent,
+        enabled=True,
+        **kwargs,
+    )
+
+
+def make_org(slug: str = "test-org", status: str = "active") -> MagicMock:
+    """Build a mock organization."""
+    org = MagicMock()
+    org.id = uuid.uuid4()
+    org.slug = slug
+    org.status = status
+    return org
+
+
+def make_db(rows: list) -> AsyncMock:
+    """Mock session whose query returns rows already in priority order."""
+    mock_db = AsyncMock(spec=AsyncSession)
+    mock_result = MagicMock()
+    mock_result.all.return_value = rows
+    mock_db.execute = AsyncMock(return_value=mock_result)
+    return mock_db
+
+
+@pytest.fixture(autouse=True)
+def fresh_index():
+    """Use an empty rule index per test (no Redis)."""
+    index = BypassRuleIndex()
+    index._redis_retry_at = float("inf")
+    with patch("app.services.bypass_routing_service.bypass_rule_index", index):
+        yield index
+
+
 class TestBypassRoutingService:
     """Tests for BypassRoutingService."""
 
@@ -156,112 +208,56 @@ class TestBypassRoutingService:
         return BypassRoutingService(mock_db)
 
     @pytest.mark.asyncio
-    async def test_evaluate_bypass_rules_returns_match(self, mock_db, service):
+    async def test_evaluate_bypass_rules_returns_match(self):
         """Test that matching rule returns BypassMatch."""
-        org_id = uuid.uuid4()
-
-        # Create mock rule
-        mock_rule = MagicMock(spec=BypassRule)
-        mock_rule.matches.return_value = True
-        mock_rule.rule_name = "test_rule"
-        mock_rule.target_domain = "pharmacy"
-        mock_rule.target_agent = "pharmacy_agent"
-
-        # Create mock org
-        mock_org = MagicMock()
-        mock_org.id = org_id
-        mock_org.slug = "test-org"
-
-        # Create mock tenant config
+        rule = make_rule()
+        org = make_org()
         mock_tenant_config = MagicMock()
         mock_tenant_config.default_domain = "excelencia"
-
-        # Setup mock query result
-        mock_result = MagicMock()
-        mock_result.all.return_value = [(mock_rule, mock_org, mock_tenant_config)]
-        mock_db.execute = AsyncMock(return_value=mock_result)
+        service = BypassRoutingService(make_db([(rule, org, mock_tenant_config)]))
 
         result = await service.evaluate_bypass_rules("5491155001234", "123456789")
 
         assert result is not None
         assert isinstance(result, BypassMatch)
-        assert result.organization_id == org_id
+        assert result.organization_id == org.id
         assert result.domain == "pharmacy"
         assert result.target_agent == "pharmacy_agent"
+        assert result.rule_id == rule.id
 
     @pytest.mark.asyncio
-    async def test_evaluate_bypass_rules_uses_tenant_default_domain(self, mock_db, service):
+    async def test_evaluate_bypass_rules_uses_tenant_default_domain(self):
         """Test that tenant default domain is used when rule has no target_domain."""
-        org_id = uuid.uuid4()
-
-        mock_rule = MagicMock(spec=BypassRule)
-        mock_rule.matches.return_value = True
-        mock_rule.rule_name = "test_rule"
-        mock_rule.target_domain = None  # No target domain
-        mock_rule.target_agent = "test_agent"
-
-        mock_org = MagicMock()
-        mock_org.id = org_id
-        mock_org.slug = "test-org"
-
         mock_tenant_config = MagicMock()
         mock_tenant_config.default_domain = "ecommerce"
-
-        mock_result = MagicMock()
-        mock_result.all.return_value = [(mock_rule, mock_org, mock_tenant_config)]
-        mock_db.execute = AsyncMock(return_value=mock_result)
+        service = BypassRoutingService(make_db([(make_rule(target_domain=None), make_org(), mock_tenant_config)]))
 
         result = await service.evaluate_bypass_rules("5491155001234")
 
         assert result.domain == "ecommerce"
 
     @pytest.mark.asyncio
-    async def test_evaluate_bypass_rules_uses_fallback_domain(self, mock_db, service):
+    async def test_evaluate_bypass_rules_uses_fallback_domain(self):
         """Test that 'excelencia' is used as fallback domain."""
-        org_id = uuid.uuid4()
-
-        mock_rule = MagicMock(spec=BypassRule)
-        mock_rule.matches.return_value = True
-        mock_rule.rule_name = "test_rule"
-        mock_rule.target_domain = None
-        mock_rule.target_agent = "test_agent"
-
-        mock_org = MagicMock()
-        mock_org.id = org_id
-        mock_org.slug = "test-org"
-
-        # No tenant config
-        mock_result = MagicMock()
-        mock_result.all.return_value = [(mock_rule, mock_org, None)]
-        mock_db.execute = AsyncMock(return_value=mock_result)
+        service = BypassRoutingService(make_db([(make_rule(target_domain=None), make_org(), None)]))
 
         result = await service.evaluate_bypass_rules("5491155001234")
 
         assert result.domain == "excelencia"
 
     @pytest.mark.asyncio
-    async def test_evaluate_bypass_rules_returns_none_when_no_match(self, mock_db, service):
+    async def test_evaluate_bypass_rules_returns_none_when_no_match(self):
         """Test that None is returned when no rules match."""
-        mock_rule = MagicMock(spec=BypassRule)
-        mock_rule.matches.return_value = False
+        service = BypassRoutingService(make_db([(make_rule(), make_org(), MagicMock())]))
 
-        mock_org = MagicMock()
-        mock_tenant_config = MagicMock()
-
-        mock_result = MagicMock()
-        mock_result.all.return_value = [(mock_rule, mock_org, mock_tenant_config)]
-        mock_db.execute = AsyncMock(return_value=mock_result)
-
-        result = await service.evaluate_bypass_rules("5491155001234")
+        result = await service.evaluate_bypass_rules("5492645001234")
 
         assert result is None
 
     @pytest.mark.asyncio
-    async def test_evaluate_bypass_rules_returns_none_when_no_rules(self, mock_db, service):
+    async def test_evaluate_bypass_rules_returns_none_when_no_rules(self):
         """Test that None is returned when no rules exist."""
-        mock_result = MagicMock()
-        mock_result.all.return_value = []
-        mock_db.execute = AsyncMock(return_value=mock_result)
+        service = BypassRoutingService(make_db([]))
 
         result = await service.evaluate_bypass_rules("5491155001234")
 
@@ -277,29 +273,147 @@ class TestBypassRoutingService:
         assert result is None
 
     @pytest.mark.asyncio
-    async def test_evaluate_bypass_rules_for_org(self, mock_db, service):
-        """Test evaluating rules for a specific organization."""
-        org_id = uuid.uuid4()
+    async def test_evaluate_bypass_rules_skips_inactive_organizations(self):
+        """Test that rules of inactive organizations only apply per organization."""
+        org = make_org(status="suspended")
+        service = BypassRoutingService(make_db([(make_rule(), org, None)]))
 
-        mock_rule = MagicMock(spec=BypassRule)
-        mock_rule.matches.return_value = True
-        mock_rule.rule_name = "test_rule"
-        mock_rule.target_domain = "pharmacy"
-        mock_rule.target_agent = "pharmacy_agent"
+        assert await service.evaluate_bypass_rules("5491155001234") is None
+        assert await service.evaluate_bypass_rules_for_org(org.id, "5491155001234") is not None
 
+    @pytest.mark.asyncio
+    async def test_evaluate_bypass_rules_for_org(self):
+        """Test evaluating rules for a specific organization."""
+        org = make_org()
+        other_org = make_org(slug="other-org")
         mock_tenant_config = MagicMock()
         mock_tenant_config.default_domain = "excelencia"
+        service = BypassRoutingService(
+            make_db(
+                [
+                    (make_rule(priority=10, target_domain="ecommerce"), other_org, None),
+                    (make_rule(), org, mock_tenant_config),
+                ]
+            )
+        )
 
-        mock_result = MagicMock()
-        mock_result.all.return_value = [(mock_rule, mock_tenant_config)]
-        mock_db.execute = AsyncMock(return_value=mock_result)
-
-        result = await service.evaluate_bypass_rules_for_org(org_id, "5491155001234")
+        result = await service.evaluate_bypass_rules_for_org(org.id, "5491155001234")
 
         assert result is not None
-        assert result.organization_id == org_id
+        assert result.organization_id == org.id
         assert result.domain == "pharmacy"
 
+    @pytest.mark.asyncio
+    async def test_index_is_reused_between_messages(self):
+        """Test that the database is only queried to build the index."""
+        db = make_db([(make_rule(), make_org(), None)])
+        service = BypassRoutingService(db)
+
+        for _ in range(3):
+            assert await service.evaluate_bypass_rules("5491155001234") is not None
+
+        assert db.execute.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_invalidate_rebuilds_index(self, fresh_index):
+        """Test that invalidation (admin endpoints) reloads the rules."""
+        db = make_db([(make_rule(), make_org(), None)])
+        service = BypassRoutingService(db)
+        assert await service.evaluate_bypass_rules("5492645001234") is None
+
+        db.execute.return_value.all.return_value = [(make_rule(pattern="549264*"), make_org(), None)]
+        await fresh_index.invalidate()
+
+        assert await service.evaluate_bypass_rules("5492645001234") is not None
+        assert db.execute.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_remote_version_change_rebuilds_index(self, fresh_index):
+        """Test that a version bump from another process triggers a rebuild."""
+        redis = AsyncMock()
+        redis.get = AsyncMock(return_value="1")
+        fresh_index._redis = redis
+        fresh_index._redis_retry_at = 0.0
+        fresh_index.VERSION_CHECK_SECONDS = 0
+        db = make_db([(make_rule(), make_org(), None)])
+        service = BypassRoutingService(db)
+
+        await service.evaluate_bypass_rules("5491155001234")
+        await service.evaluate_bypass_rules("5491155001234")
+        assert db.execute.await_count == 1
+
+        redis.get.return_value = "2"
+        await service.evaluate_bypass_rules("5491155001234")
+        assert db.execute.await_count == 2
+
+
+class TestCompiledBypassRules:
+    """Tests for the compiled rule lookup structures."""
+
+    @staticmethod
+    def compile(*specs: tuple[str, str | None, list[str] | None]) -> tuple[CompiledBypassRules, list]:
+        """Compile rules given as (rule_type, pattern, values), in evaluation order."""
+        compiled = CompiledBypassRules()
+        rules = []
+        for order, (rule_type, pattern, values) in enumerate(specs):
+            rule = CompiledBypassRule(
+                order=order,
+                organization_id=uuid.uuid4(),
+                organization_slug=f"org-{order}",
+                organization_active=True,
+                rule_id=uuid.uuid4(),
+                rule_name=f"rule-{order}",
+                domain="pharmacy",
+                target_agent="pharmacy_agent",
+                pharmacy_id=None,
+                isolated_history=False,
+            )
+            compiled.add(rule, rule_type, pattern, values)
+            rules.append(rule)
+        return compiled, rules
+
+    def test_priority_order_across_rule_types(self):
+        """Test that the first rule in priority order wins, whatever its type."""
+        compiled, rules = self.compile(
+            ("phone_number", "54926*", None),
+            ("phone_number_list", None, ["5492641234567"]),
+            ("whatsapp_phone_number_id", "123456789", None),
+            ("phone_number", "5492641*", None),
+        )
+
+        assert compiled.match("5492641234567", "123456789") is rules[0]
+        assert compiled.match("5491141234567", "123456789") is rules[2]
+        assert compiled.match("5491141234567") is None
+
+    def test_longer_prefix_does_not_beat_priority(self):
+        """Test that a more specific prefix only wins when it comes first."""
+        compiled, rules = self.compile(
+            ("phone_number", "5492641*", None),
+            ("phone_number", "54926*", None),
+        )
+
+        assert compiled.match("5492641234567") is rules[0]
+        assert compiled.match("5492649999999") is rules[1]
+
+    def test_matches_agree_with_bypass_rule(self):
+        """Test that the index returns what BypassRule.matches would, in order."""
+        specs = [
+            ("phone_number", "5491155001234", None),
+            ("phone_number", "549115*", None),
+            ("phone_number", "*", None),
+            ("phone_number_list", None, ["5492641111111", "5491155001234"]),
+        ]
+        compiled, rules = self.compile(*specs)
+        models = [
+            BypassRule(rule_type=t, pattern=p, phone_numbers=v, enabled=True, phone_number_id=None)
+            for t, p, v in specs
+        ]
+
+        for wa_id in ["5491155001234", "5491159999999", "5492641111111", "1", ""]:
+            expected = next((i for i, m in enumerate(models) if m.matches(wa_id)), None)
+            result = compiled.match(wa_id)
+            assert (result.order if result else None) == expected, wa_id
+
 
 class TestFactoryFunction:
     """Tests for get_bypass_routing_service factory function."""
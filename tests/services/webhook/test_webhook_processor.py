@@ -0,0 +1,87 @@
+"""
+Tests for WebhookProcessor helpers.
+
+Tests conversation keys and merging of coalesced text messages.
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.services.webhook.webhook_processor import WebhookTask, merge_webhook_tasks
+
+
+def _chattigo_task(message_id: str, content: str, **extra) -> WebhookTask:
+    return WebhookTask(
+        message_id=f"chattigo:{message_id}",
+        payload_type="chattigo",
+        raw_json={"id": message_id, "msisdn": "5492640000000", "did": "5492644710400", "content": content, **extra},
+        settings=MagicMock(),
+    )
+
+
+def _whatsapp_task(message_id: str, body: str, msg_type: str = "text") -> WebhookTask:
+    message = {"from": "5492640000000", "id": message_id, "type": msg_type}
+    if msg_type == "text":
+        message["text"] = {"body": body}
+    return WebhookTask(
+        message_id=f"whatsapp:{message_id}",
+        payload_type="whatsapp",
+        raw_json={
+            "object": "whatsapp_business_account",
+            "entry": [
+                {
+                    "changes": [
+                        {
+                            "value": {
+                                "metadata": {"display_phone_number": "5492644710400"},
+                                "messages": [message],
+                            }
+                        }
+                    ]
+                }
+            ],
+        },
+        settings=MagicMock(),
+    )
+
+
+class TestWebhookTaskKeys:
+    """Tests for conversation and tenant keys."""
+
+    @pytest.mark.parametrize("task", [_chattigo_task("1", "hola"), _whatsapp_task("1", "hola")])
+    def test_keys(self, task):
+        """Test that keys match the LangGraph session_id and the DID."""
+        assert task.session_key == "whatsapp_5492640000000"
+        assert task.tenant_key == "5492644710400"
+
+    def test_attachment_is_not_coalescible(self):
+        """Test that attachments have no text."""
+        assert _chattigo_task("1", "img.jpg", isAttachment=True).text is None
+        assert _whatsapp_task("1", "", msg_type="interactive").text is None
+
+
+class TestMergeWebhookTasks:
+    """Tests for merging coalesced messages."""
+
+    def test_merge_chattigo(self):
+        """Test that texts are joined on the latest payload."""
+        tasks = [_chattigo_task("1", "hola"), _chattigo_task("2", "quiero"), _chattigo_task("3", "pagar mi deuda")]
+
+        merged = merge_webhook_tasks(tasks)
+
+        assert merged.message_id == "chattigo:3"
+        assert merged.raw_json["content"] == "hola\nquiero\npagar mi deuda"
+        assert tasks[2].raw_json["content"] == "pagar mi deuda"
+
+    def test_merge_whatsapp(self):
+        """Test merging WhatsApp standard payloads."""
+        merged = merge_webhook_tasks([_whatsapp_task("1", "hola"), _whatsapp_task("2", "quiero")])
+
+        assert merged.text == "hola\nquiero"
+        assert merged.message_id == "whatsapp:2"
+
+    def test_single_task_unchanged(self):
+        """Test that a single task is returned as-is."""
+        task = _chattigo_task("1", "hola")
+        assert merge_webhook_tasks([task]) is task
@@ -0,0 +1,152 @@
+"""
+Tests for the Redis Streams webhook queue.
+
+Tests task serialization and consumer ack / redelivery / dead-letter decisions.
+"""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.services.webhook.idempotency_service import ProcessingState
+from app.services.webhook.webhook_processor import WebhookTask
+from app.services.webhook.webhook_queue import (
+    QueueEntry,
+    WebhookConsumerPool,
+    WebhookQueue,
+    deserialize_task,
+    serialize_task,
+)
+
+
+@pytest.fixture
+def settings():
+    """Settings stub with queue configuration."""
+    mock = MagicMock()
+    mock.WEBHOOK_QUEUE_STREAM = "webhook:ingest"
+    mock.WEBHOOK_QUEUE_GROUP = "webhook-processors"
+    mock.WEBHOOK_QUEUE_CONSUMERS = 1
+    mock.WEBHOOK_QUEUE_CONSUMER_CONCURRENCY = 4
+    mock.WEBHOOK_QUEUE_VISIBILITY_TIMEOUT = 60
+    mock.WEBHOOK_QUEUE_MAX_DELIVERIES = 3
+    mock.WEBHOOK_QUEUE_MAXLEN = 1000
+    return mock
+
+
+@pytest.fixture
+def task(settings):
+    """Sample Chattigo task."""
+    return WebhookTask(
+        message_id="chattigo:123",
+        payload_type="chattigo",
+        raw_json={"id": "123", "msisdn": "5492640000000", "content": "hola"},
+        settings=settings,
+    )
+
+
+@pytest.fixture
+def queue():
+    """Queue mock."""
+    mock = MagicMock(spec=WebhookQueue)
+    mock.stream = "webhook:ingest"
+    mock.ack = AsyncMock()
+    mock.dead_letter = AsyncMock()
+    return mock
+
+
+@pytest.fixture
+def processor():
+    """Processor mock."""
+    mock = MagicMock()
+    mock.process = AsyncMock()
+    return mock
+
+
+@pytest.fixture
+def idempotency():
+    """Idempotency service mock."""
+    mock = MagicMock()
+    mock.get_state = AsyncMock(return_value=ProcessingState.PROCESSING)
+    mock.mark_failed = AsyncMock()
+    return mock
+
+
+@pytest.fixture
+def pool(queue, processor, idempotency, settings):
+    """Consumer pool under test."""
+    return WebhookConsumerPool(queue, processor, idempotency, settings=settings)
+
+
+class TestTaskSerialization:
+    """Tests for stream entry encoding."""
+
+    def test_roundtrip(self, task, settings):
+        """Test that a task survives serialization."""
+        fields = serialize_task(task)
+        restored = deserialize_task(fields, settings)
+
+        assert restored.message_id == task.message_id
+        assert restored.payload_type == task.payload_type
+        assert restored.raw_json == task.raw_json
+        assert restored.settings is settings
+
+
+class TestWebhookConsumerPool:
+    """Tests for consumer handling of delivered entries."""
+
+    @pytest.mark.asyncio
+    async def test_success_acks_entry(self, pool, queue, processor, task):
+        """Test that a processed entry is acknowledged."""
+        entry = QueueEntry(entry_id="1-0", fields=serialize_task(task))
+
+        await pool._handle(entry)
+
+        processor.process.assert_awaited_once()
+        queue.ack.assert_awaited_once_with("1-0")
+        queue.dead_letter.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_failure_leaves_entry_pending(self, pool, queue, processor, idempotency, task):
+        """Test that a failed entry is not acked before max deliveries."""
+        processor.process.side_effect = RuntimeError("boom")
+        entry = QueueEntry(entry_id="1-0", fields=serialize_task(task), deliveries=1)
+
+        await pool._handle(entry)
+
+        queue.ack.assert_not_awaited()
+        queue.dead_letter.assert_not_awaited()
+        idempotency.mark_failed.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_failure_on_last_delivery_dead_letters(
+        self, pool, queue, processor, idempotency, task
+    ):
+        """Test that the last failed delivery moves the entry to the dead-letter stream."""
+        processor.process.side_effect = RuntimeError("boom")
+        entry = QueueEntry(entry_id="1-0", fields=serialize_task(task), deliveries=3)
+
+        await pool._handle(entry)
+
+        queue.dead_letter.assert_awaited_once()
+        idempotency.mark_failed.assert_awaited_once_with("chattigo:123")
+
+    @pytest.mark.asyncio
+    async def test_completed_message_is_skipped(self, pool, queue, processor, idempotency, task):
+        """Test that redelivered entries already completed are acked without processing."""
+        idempotency.get_state.return_value = ProcessingState.COMPLETED
+        entry = QueueEntry(entry_id="1-0", fields=serialize_task(task), deliveries=2)
+
+        await pool._handle(entry)
+
+        processor.process.assert_not_awaited()
+        queue.ack.assert_awaited_once_with("1-0")
+
+    @pytest.mark.asyncio
+    async def test_undecodable_entry_dead_letters(self, pool, queue, idempotency):
+        """Test that malformed entries are dead-lettered immediately."""
+        entry = QueueEntry(entry_id="1-0", fields={"task": "not json"})
+
+        await pool._handle(entry)
+
+        queue.dead_letter.assert_awaited_once()
+        idempotency.mark_failed.assert_not_awaited()
@@ -0,0 +1 @@
+# Tests for external API clients
@@ -0,0 +1,151 @@
+# ============================================================================
+# Tests for pooled PlexClient
+# ============================================================================
+"""Unit tests for the pooled Plex ERP client.
+
+Tests that pooled clients outlive `async with` blocks, that identical
+in-flight lookups share one request, and that the balance cache is
+cleared when a payment is registered.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from app.clients import plex_client as plex_module
+from app.clients.plex_client import PlexClient, get_pooled_plex_client
+
+BALANCE_RESPONSE = {
+    "response": {
+        "respcode": "0",
+        "respmsg": "OK",
+        "content": {"saldo": "1500,50", "items": [{"adeudado": "1500,50", "fecha": "20250110"}]},
+    }
+}
+PAYMENT_RESPONSE = {"response": {"respcode": "0", "respmsg": "OK", "content": {"nuevo_saldo": "0"}}}
+
+
+class FakePlex:
+    """Fake Plex API recording requests, optionally holding balance responses."""
+
+    def __init__(self) -> None:
+        self.requests: list[httpx.Request] = []
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if request.method == "POST":
+            return httpx.Response(200, json=PAYMENT_RESPONSE)
+        await self.release.wait()
+        return httpx.Response(200, json=BALANCE_RESPONSE)
+
+    def count(self, method: str) -> int:
+        return sum(1 for request in self.requests if request.method == method)
+
+
+def create_client(fake: FakePlex, pooled: bool = True) -> PlexClient:
+    """Create a client whose HTTP calls go to the fake API."""
+    client = PlexClient(base_url="http://plex.test/wsplex", username="user", password="pass", pooled=pooled)
+    client._client = httpx.AsyncClient(base_url=client.base_url, transport=httpx.MockTransport(fake))
+    client.balance_cache_ttl = 30
+    return client
+
+
+class TestPlexClientPooling:
+    """Tests for pooled clients and request coalescing."""
+
+    @pytest.mark.asyncio
+    async def test_pooled_client_shared_and_kept_open(self, monkeypatch) -> None:
+        """Same credentials get the same client, which stays open after `async with`."""
+        monkeypatch.setattr(plex_module, "_plex_clients", {})
+        client = get_pooled_plex_client(base_url="http://plex.test/wsplex", username="user", password="pass")
+
+        async with client:
+            pass
+
+        assert client.get_stats()["open"] is True
+        assert "username" not in client.get_stats()
+        base_url = "http://plex.test/wsplex"
+        assert get_pooled_plex_client(base_url=base_url, username="user", password="pass") is client
+        assert get_pooled_plex_client(base_url=base_url, username="other", password="pass") is not client
+        await plex_module.close_plex_clients()
+        assert client.get_stats()["open"] is False
+
+    @pytest.mark.asyncio
+    async def test_concurrent_balance_lookups_share_one_request(self) -> None:
+        """Identical balance lookups in flight make a single ERP round trip."""
+        fake = FakePlex()
+        fake.release.clear()
+        client = create_client(fake)
+
+        lookups = [asyncio.create_task(client.get_customer_balance(697)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        fake.release.set()
+        balances = await asyncio.gather(*lookups)
+
+        assert fake.count("GET") == 1
+        assert all(balance["saldo"] == 1500.5 for balance in balances)
+        # Callers get their own copies
+        balances[0]["saldo"] = 0
+        assert balances[1]["saldo"] == 1500.5
+        assert client.get_stats()["coalesced"] == 2
+
+    @pytest.mark.asyncio
+    async def test_search_uses_search_timeout(self) -> None:
+        """Customer searches use the search endpoint timeout."""
+        fake = FakePlex()
+        client = create_client(fake)
+        client._operation_timeouts["search_customer"] = 3
+
+        await client.search_customer(document="12345678")
+
+        assert fake.requests[0].extensions["timeout"]["read"] == 3
+
+
+class TestPlexBalanceCache:
+    """Tests for the balance cache."""
+
+    @pytest.mark.asyncio
+    async def test_balance_cached_until_payment_registered(self) -> None:
+        """Repeated lookups hit the cache; a registered payment clears it."""
+        fake = FakePlex()
+        client = create_client(fake)
+
+        await client.get_customer_balance(697)
+        await client.get_customer_balance(697)
+        await client.register_payment(customer_id=697, amount=1500.5, operation_number="123")
+        await client.get_customer_balance(697)
+
+        assert fake.count("GET") == 2
+        assert client.get_stats()["balance_cache_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_lookup_in_flight_during_payment_not_cached(self) -> None:
+        """A balance fetched while a payment is registered is not reused."""
+        fake = FakePlex()
+        fake.release.clear()
+        client = create_client(fake)
+
+        lookup = asyncio.create_task(client.get_customer_balance(697))
+        await asyncio.sleep(0.01)
+        await client.register_payment(customer_id=697, amount=100, operation_number="123")
+        after_payment = asyncio.create_task(client.get_customer_balance(697))
+        await asyncio.sleep(0.01)
+        fake.release.set()
+        await asyncio.gather(lookup, after_payment)
+        await client.get_customer_balance(697)
+
+        assert fake.count("GET") == 2
+        assert client.get_stats()["balance_cache_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_unpooled_client_closed_on_exit(self) -> None:
+        """Unpooled clients keep the per-block lifecycle."""
+        client = create_client(FakePlex(), pooled=False)
+
+        async with client:
+            await client.get_customer_balance(697)
+
+        assert client.get_stats()["open"] is False
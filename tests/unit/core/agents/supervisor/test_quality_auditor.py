@@ -0,0 +1,139 @@
+"""
+Unit tests for QualityAuditor.
+
+Tests cover:
+1. Sampling and eligibility (sample rate, heuristic skip threshold)
+2. Backpressure (max pending audits)
+3. Metrics written for completed and fallback audits
+4. Draining pending audits on shutdown
+
+Run with: uv run pytest tests/unit/core/agents/supervisor/test_quality_auditor.py -v
+"""
+
+import asyncio
+from unittest.mock import Mock
+
+import pytest
+
+from app.core.graph.agents.supervisor.llm_response_analyzer import LLMResponseAnalyzer
+from app.core.graph.agents.supervisor.quality_auditor import QualityAuditor, drain_quality_auditors
+from app.core.infrastructure.monitoring import MetricsCollector
+
+
+def submit(auditor: QualityAuditor, heuristic_score: float = 0.5, agent_name: str = "test_agent") -> bool:
+    """Submit a standard turn to the auditor."""
+    return auditor.submit(
+        user_message="Test question",
+        agent_response="Test response",
+        agent_name=agent_name,
+        conversation_context={"messages": []},
+        heuristic_score=heuristic_score,
+    )
+
+
+class TestQualityAuditorSampling:
+    """Tests for which turns are audited."""
+
+    @pytest.mark.asyncio
+    async def test_high_heuristic_score_not_eligible(self, mock_llm_with_llm, analyzer_config_enabled):
+        """Turns the analyzer would skip are never audited."""
+        mock_llm_provider, mock_llm = mock_llm_with_llm
+        analyzer = LLMResponseAnalyzer(llm=mock_llm_provider, config=analyzer_config_enabled)
+        auditor = QualityAuditor(analyzer, sample_rate=1.0, metrics=MetricsCollector())
+
+        assert submit(auditor, heuristic_score=0.95) is False
+        assert auditor.get_stats()["not_eligible"] == 1
+        mock_llm.ainvoke.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_zero_sample_rate_skips_llm(self, mock_llm_with_llm, analyzer_config_enabled):
+        """With sample_rate=0 no LLM call is made."""
+        mock_llm_provider, mock_llm = mock_llm_with_llm
+        analyzer = LLMResponseAnalyzer(llm=mock_llm_provider, config=analyzer_config_enabled)
+        auditor = QualityAuditor(analyzer, sample_rate=0.0, metrics=MetricsCollector())
+
+        assert submit(auditor) is False
+        assert auditor.get_stats()["not_sampled"] == 1
+        mock_llm.ainvoke.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_backpressure_drops_samples(self, mock_llm_with_llm, analyzer_config_enabled):
+        """Samples beyond max_pending are dropped instead of queued."""
+        mock_llm_provider, mock_llm = mock_llm_with_llm
+        release = asyncio.Event()
+
+        async def slow_invoke(prompt):
+            await release.wait()
+            return Mock(content="{}")
+
+        mock_llm.ainvoke.side_effect = slow_invoke
+        analyzer = LLMResponseAnalyzer(llm=mock_llm_provider, config=analyzer_config_enabled)
+        auditor = QualityAuditor(analyzer, sample_rate=1.0, max_pending=1, metrics=MetricsCollector())
+
+        assert submit(auditor) is True
+        assert submit(auditor) is False
+        assert auditor.get_stats()["dropped"] == 1
+
+        release.set()
+        await auditor.drain()
+        assert auditor.get_stats()["pending"] == 0
+
+
+class TestQualityAuditorMetrics:
+    """Tests for audit results written to metrics."""
+
+    @pytest.mark.asyncio
+    async def test_completed_audit_records_metrics(
+        self, mock_llm_with_llm, analyzer_config_enabled, sample_llm_json_hallucination_high
+    ):
+        """A completed audit records score, gap and hallucination risk."""
+        mock_llm_provider, mock_llm = mock_llm_with_llm
+        mock_llm.ainvoke.return_value = Mock(content=sample_llm_json_hallucination_high)
+        analyzer = LLMResponseAnalyzer(llm=mock_llm_provider, config=analyzer_config_enabled)
+        metrics = MetricsCollector()
+        auditor = QualityAuditor(analyzer, sample_rate=1.0, metrics=metrics)
+
+        assert submit(auditor, heuristic_score=0.6) is True
+        await auditor.drain()
+
+        assert auditor.get_stats()["completed"] == 1
+        assert metrics.get_histogram_stats("supervisor_llm_audit_score", {"agent": "test_agent"})["count"] == 1
+        assert metrics.get_counter(
+            "supervisor_llm_audit_hallucinations_total", {"agent": "test_agent", "risk": "high"}
+        ) == 1
+
+    @pytest.mark.asyncio
+    async def test_llm_failure_records_fallback(self, mock_llm_with_llm, analyzer_config_enabled):
+        """A failed LLM call counts as a fallback audit."""
+        mock_llm_provider, mock_llm = mock_llm_with_llm
+        mock_llm.ainvoke.side_effect = RuntimeError("vLLM down")
+        analyzer = LLMResponseAnalyzer(llm=mock_llm_provider, config=analyzer_config_enabled)
+        metrics = MetricsCollector()
+        auditor = QualityAuditor(analyzer, sample_rate=1.0, metrics=metrics)
+
+        submit(auditor)
+        await auditor.drain()
+
+        assert auditor.get_stats()["fallbacks"] == 1
+        assert metrics.get_counter("supervisor_llm_audit_fallbacks_total", {"agent": "test_agent"}) == 1
+
+
+class TestQualityAuditorShutdown:
+    """Tests for draining audits on shutdown."""
+
+    @pytest.mark.asyncio
+    async def test_drain_cancels_audits_past_timeout(self, mock_llm_with_llm, analyzer_config_enabled):
+        """Audits still running after the timeout are cancelled and awaited."""
+        mock_llm_provider, mock_llm = mock_llm_with_llm
+
+        async def hanging_invoke(prompt):
+            await asyncio.sleep(10)
+
+        mock_llm.ainvoke.side_effect = hanging_invoke
+        analyzer = LLMResponseAnalyzer(llm=mock_llm_provider, config=analyzer_config_enabled)
+        auditor = QualityAuditor(analyzer, sample_rate=1.0, metrics=MetricsCollector())
+
+        assert submit(auditor) is True
+        await drain_quality_auditors(timeout=0.01)
+
+        assert auditor.get_stats()["pending"] == 0
@@ -0,0 +1,145 @@
+"""
+Tests for ConfigCacheEngine.
+
+Verifies:
+- Concurrent misses share one load (single-flight)
+- Expired entries are served while one background refresh runs
+- Empty results use the negative TTL
+- Loads started before an invalidation do not repopulate L1
+"""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.core.cache.cache_engine import ConfigCacheEngine, merge_engine_stats
+
+
+def _expire(engine: ConfigCacheEngine, key: str, seconds: float) -> None:
+    engine._entries[key].stored_at -= seconds
+
+
+class TestConfigCacheEngine:
+    """Tests for the shared L1 engine."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_load(self):
+        """Test that N concurrent misses run the loader once."""
+        engine = ConfigCacheEngine("test", 60)
+        release = asyncio.Event()
+        calls = 0
+
+        async def loader() -> dict:
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return {"a": 1}
+
+        waiters = [asyncio.create_task(engine.get("org:x", loader)) for _ in range(10)]
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await asyncio.gather(*waiters) == [{"a": 1}] * 10
+        assert calls == 1
+        assert engine.get_stats()["coalesced_loads"] == 9
+
+    @pytest.mark.asyncio
+    async def test_fresh_hit_skips_loader(self):
+        """Test that a fresh entry is served without loading."""
+        engine = ConfigCacheEngine("test", 60, tenant_of=lambda key: key.split(":")[0])
+        loader = AsyncMock(return_value={"a": 1})
+
+        await engine.get("org:x", loader)
+        await engine.get("org:x", loader)
+
+        loader.assert_awaited_once()
+        assert engine.get_stats()["by_tenant"]["org"] == {
+            "hits": 1,
+            "misses": 1,
+            "stale_serves": 0,
+            "negative_hits": 0,
+        }
+
+    @pytest.mark.asyncio
+    async def test_stale_entry_served_while_refreshing(self):
+        """Test stale-while-revalidate with a single background refresh."""
+        engine = ConfigCacheEngine("test", 60, stale_seconds=300)
+        engine.set("k", {"v": "old"})
+        _expire(engine, "k", 120)
+        loader = AsyncMock(return_value={"v": "caller"})
+        refresh_loader = AsyncMock(return_value={"v": "new"})
+
+        assert await engine.get("k", loader, refresh_loader) == {"v": "old"}
+        assert await engine.get("k", loader, refresh_loader) == {"v": "old"}
+        await asyncio.sleep(0)
+
+        loader.assert_not_called()
+        refresh_loader.assert_awaited_once()
+        assert engine.peek("k") == {"v": "new"}
+        assert engine.get_stats()["background_refreshes"] == 1
+
+    @pytest.mark.asyncio
+    async def test_entry_past_stale_window_is_reloaded(self):
+        """Test that entries older than ttl + stale_seconds block on a load."""
+        engine = ConfigCacheEngine("test", 60, stale_seconds=10)
+        engine.set("k", {"v": "old"})
+        _expire(engine, "k", 200)
+
+        assert await engine.get("k", AsyncMock(return_value={"v": "new"})) == {"v": "new"}
+
+    @pytest.mark.asyncio
+    async def test_empty_result_uses_negative_ttl(self):
+        """Test that empty results expire after the shorter negative TTL."""
+        engine = ConfigCacheEngine("test", 3600, negative_ttl_seconds=5, stale_seconds=0)
+        loader = AsyncMock(return_value={})
+
+        await engine.get("k", loader)
+        await engine.get("k", loader)
+        assert engine.get_stats()["negative_hits"] == 1
+
+        _expire(engine, "k", 10)
+        await engine.get("k", loader)
+        assert loader.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_invalidation_during_load_is_not_cached(self):
+        """Test that a load racing an invalidation does not store its result."""
+        engine = ConfigCacheEngine("test", 60)
+        release = asyncio.Event()
+
+        async def loader() -> dict:
+            await release.wait()
+            return {"v": "before-change"}
+
+        waiter = asyncio.create_task(engine.get("k", loader))
+        await asyncio.sleep(0)
+        engine.invalidate("k")
+        release.set()
+
+        assert await waiter == {"v": "before-change"}
+        assert engine.peek("k") is None
+
+    @pytest.mark.asyncio
+    async def test_load_error_propagates_on_miss(self):
+        """Test that miss errors reach the caller and are counted."""
+        engine = ConfigCacheEngine("test", 60)
+
+        with pytest.raises(ConnectionError):
+            await engine.get("k", AsyncMock(side_effect=ConnectionError("db down")))
+
+        assert engine.get_stats()["load_errors"] == 1
+        assert engine.get_stats()["inflight_loads"] == 0
+
+    def test_merge_engine_stats(self):
+        """Test that stats of several engines are summed per counter and tenant."""
+        first = ConfigCacheEngine("a", 60, tenant_of=str)
+        second = ConfigCacheEngine("b", 60, tenant_of=str)
+        first._count("org", "hits")
+        second._count("org", "hits")
+        second._count("org", "misses")
+
+        merged = merge_engine_stats(first, second)
+
+        assert merged["hits"] == 2
+        assert merged["by_tenant"]["org"]["misses"] == 1
@@ -0,0 +1,97 @@
+"""
+Tests for the intent similarity index.
+
+Verifies:
+- One product scores a vector against every intent (cosine similarity)
+- Batch scoring matches single scoring
+- Reference texts are built from phrases, keywords and lemmas
+- domain_intent_cache rebuilds the index only when the patterns change
+"""
+
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+
+import numpy as np
+import pytest
+
+from app.core.cache.domain_intent_cache import DomainIntentCache
+from app.core.cache.intent_similarity import IntentSimilarityIndex, reference_texts_from_patterns
+
+
+class TestIntentSimilarityIndex:
+    """Tests for scoring."""
+
+    def test_score_is_cosine_per_intent(self):
+        """Test that score() returns the cosine similarity to each intent."""
+        index = IntentSimilarityIndex(["greeting", "payment", "empty"], [[2.0, 0.0], [1.0, 1.0], [0.0, 0.0]])
+
+        scores = index.score([3.0, 0.0])
+
+        assert scores["greeting"] == pytest.approx(1.0)
+        assert scores["payment"] == pytest.approx(0.7071, abs=1e-4)
+        assert scores["empty"] == 0.0
+
+    def test_missing_or_mismatched_vector_scores_zero(self):
+        """Test that messages without a usable vector score 0 everywhere."""
+        index = IntentSimilarityIndex(["greeting"], [[1.0, 0.0]])
+
+        assert index.score([]) == {"greeting": 0.0}
+        assert index.score([1.0, 0.0, 0.0]) == {"greeting": 0.0}
+
+    def test_score_batch_matches_score(self):
+        """Test that batch scoring gives the same rows as single scoring."""
+        rng = np.random.default_rng(0)
+        index = IntentSimilarityIndex([f"intent_{i}" for i in range(5)], rng.normal(size=(5, 8)))
+        messages = rng.normal(size=(3, 8))
+
+        batch = index.score_batch(messages)
+
+        assert batch.shape == (3, 5)
+        for row, message in zip(batch, messages, strict=True):
+            assert list(row) == pytest.approx(list(index.score(message).values()), abs=1e-5)
+
+
+class TestReferenceTexts:
+    """Tests for reference_texts_from_patterns."""
+
+    def test_joins_phrases_keywords_and_lemmas(self):
+        """Test the reference text of each intent."""
+        patterns = {
+            "intents": {
+                "debt_query": {
+                    "phrases": [{"phrase": "Cuánto Debo", "match_type": "contains"}, "mi deuda"],
+                    "keywords": ["deuda"],
+                    "lemmas": ["deuda", "deber"],
+                },
+                "empty": {"phrases": [], "keywords": [], "lemmas": []},
+            }
+        }
+
+        assert reference_texts_from_patterns(patterns) == {"debt_query": "cuánto debo mi deuda deuda deber"}
+
+
+class TestDomainIntentCacheSimilarity:
+    """Tests for the per-tenant index cache."""
+
+    @pytest.mark.asyncio
+    async def test_index_rebuilt_only_when_patterns_change(self):
+        """Test that the index is reused until the cached patterns object changes."""
+        cache = DomainIntentCache()
+        org_id = uuid4()
+        first = {"intents": {"greeting": {"phrases": ["hola"]}}}
+        second = {"intents": {"greeting": {"phrases": ["buenas"]}}}
+
+        async def fake_build(texts, model, *, disable=(), source=None):
+            return IntentSimilarityIndex(list(texts), [[1.0]] * len(texts), model=model, source=source)
+
+        with (
+            patch.object(cache, "get_patterns", AsyncMock(side_effect=[first, first, second])),
+            patch.object(IntentSimilarityIndex, "build", side_effect=fake_build) as build,
+        ):
+            first_index = await cache.get_similarity_index(None, org_id)
+            assert await cache.get_similarity_index(None, org_id) is first_index
+            second_index = await cache.get_similarity_index(None, org_id)
+
+        assert second_index is not first_index
+        assert build.call_count == 2
+        assert cache.get_stats()["similarity_builds"] == 2
@@ -0,0 +1,102 @@
+"""
+Tests for CacheInvalidationBus.
+
+Verifies:
+- Messages from other instances clear the matching L1 entries
+- Messages published by the same instance are ignored
+- L1 TTL is only extended while subscribed
+"""
+
+import json
+import uuid
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.core.cache.invalidation_bus import CacheInvalidationBus, cache_invalidation_bus
+from app.core.cache.response_config_cache import ResponseConfigCache
+from app.core.cache.routing_config_cache import RoutingConfigCache
+
+
+def _message(cache: str, origin: str | None = None, **payload) -> str:
+    return json.dumps({"cache": cache, "origin": origin or "other-instance", "payload": payload})
+
+
+class TestCacheInvalidationBus:
+    """Tests for message dispatch and TTL selection."""
+
+    def test_remote_message_clears_organization(self):
+        """Test that only the invalidated organization is dropped from L1."""
+        bus = CacheInvalidationBus()
+        cache = ResponseConfigCache()
+        bus.register("response_config", cache.invalidate_local)
+        org_a, org_b = uuid.uuid4(), uuid.uuid4()
+        cache._engine.set(org_a, {})
+        cache._engine.set(org_b, {})
+
+        bus._dispatch(_message("response_config", organization_id=str(org_a)))
+
+        assert cache._engine.keys() == [org_b]
+
+    def test_remote_message_matches_domain(self):
+        """Test organization + domain scoped invalidation."""
+        bus = CacheInvalidationBus()
+        cache = RoutingConfigCache()
+        bus.register("routing_config", cache.invalidate_local)
+        org = uuid.uuid4()
+        cache._engine.set(f"{org}:pharmacy", {})
+        cache._engine.set(f"{org}:healthcare", {})
+
+        bus._dispatch(_message("routing_config", organization_id=str(org), domain_key="pharmacy"))
+
+        assert cache._engine.keys() == [f"{org}:healthcare"]
+
+    def test_own_messages_are_ignored(self):
+        """Test that the publishing instance does not re-apply its invalidation."""
+        bus = CacheInvalidationBus()
+        cache = ResponseConfigCache()
+        bus.register("response_config", cache.invalidate_local)
+        org = uuid.uuid4()
+        cache._engine.set(org, {})
+
+        bus._dispatch(_message("response_config", origin=bus._instance_id, organization_id=str(org)))
+
+        assert cache._engine.keys() == [org]
+
+    def test_memory_ttl_extended_only_while_connected(self):
+        """Test that the long L1 TTL requires an active subscription."""
+        bus = CacheInvalidationBus()
+        bus._l1_ttl_seconds = 3600
+
+        assert bus.memory_ttl(60) == 60
+        bus._connected = True
+        assert bus.memory_ttl(60) == 3600
+
+    @pytest.mark.asyncio
+    async def test_publish_failure_does_not_raise(self):
+        """Test that Redis errors on publish are swallowed."""
+        bus = CacheInvalidationBus()
+        bus._enabled = True
+        failing = AsyncMock(side_effect=ConnectionError("redis down"))
+
+        with patch("app.integrations.databases.redis.get_shared_async_redis_client", failing):
+            await bus.publish("agents")
+
+        assert bus.get_stats()["publish_errors"] == 1
+
+    @pytest.mark.asyncio
+    async def test_memory_entry_ttl_follows_bus_connection(self):
+        """Test that an L1 entry outlives the short TTL only while subscribed."""
+        cache = ResponseConfigCache()
+        org = uuid.uuid4()
+        loader = AsyncMock(return_value={"greeting": "fresh"})
+        cache._engine.set(org, {"greeting": "hi"})
+        cache._engine._entries[org].stored_at -= cache.MEMORY_TTL_SECONDS * 2
+
+        with patch.object(cache_invalidation_bus, "_connected", True):
+            assert await cache._engine.get(org, loader) == {"greeting": "hi"}
+        loader.assert_not_called()
+
+        # Expired: served stale while refreshing in the background
+        assert await cache._engine.get(org, loader) == {"greeting": "hi"}
+        assert cache._engine.get_stats()["stale_serves"] == 1
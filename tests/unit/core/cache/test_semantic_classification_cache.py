@@ -0,0 +1,129 @@
+"""
+Tests for the semantic classification cache.
+
+Verifies:
+- Similar messages hit above the threshold, dissimilar ones miss
+- Entries are isolated per analyzer, tenant and context fingerprint
+- Low-confidence results are not stored; LRU and age evict entries
+- Config cache invalidations drop the tenant's entries
+"""
+
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.core.cache.invalidation_bus import CacheInvalidationBus
+from app.core.cache.semantic_classification_cache import SemanticClassificationCache, context_fingerprint
+
+# Fake embeddings: "pagar" phrasings point the same way, greetings elsewhere
+VECTORS = {
+    "quiero pagar": [1.0, 0.0, 0.0],
+    "quiero pagar mi deuda": [0.98, 0.2, 0.0],
+    "necesito pagar": [0.97, 0.0, 0.24],
+    "hola": [0.0, 1.0, 0.0],
+    "buen dia": [0.0, 0.0, 1.0],
+}
+
+
+def create_cache(**kwargs) -> tuple[SemanticClassificationCache, AsyncMock]:
+    """Helper to create a cache with fake embeddings."""
+    embed = AsyncMock(side_effect=lambda text: VECTORS[text])
+    options = {"similarity_threshold": 0.9, "max_entries": 10, "min_confidence": 0.7, "embed_fn": embed}
+    return SemanticClassificationCache(**{**options, **kwargs}), embed
+
+
+@pytest.mark.asyncio
+class TestSemanticClassificationCache:
+    """Tests for lookups and storage."""
+
+    async def test_similar_message_hits(self):
+        """Test nearest-neighbour hits above the threshold only."""
+        cache, _ = create_cache()
+        await cache.set("intent", "quiero pagar", {"intent": "debt_payment"}, 0.9, tenant="org")
+
+        hit = await cache.get("intent", "Quiero pagar mi deuda", tenant="org")
+        assert hit is not None
+        assert hit.value == {"intent": "debt_payment"}
+        assert hit.confidence == 0.9
+        assert hit.similarity == pytest.approx(0.98 / (0.98**2 + 0.2**2) ** 0.5, abs=1e-4)
+
+        assert await cache.get("intent", "hola", tenant="org") is None
+        assert cache.get_stats()["semantic_hits"] == 1
+
+    async def test_exact_text_skips_embedding(self):
+        """Test that a repeated message is served without embedding it."""
+        cache, embed = create_cache()
+        await cache.set("intent", "hola", {"intent": "greeting"}, 0.95, tenant="org")
+        embed.reset_mock()
+
+        hit = await cache.get("intent", "  HOLA ", tenant="org")
+
+        assert hit is not None and hit.similarity == 1.0
+        embed.assert_not_called()
+
+    async def test_isolation(self):
+        """Test isolation per analyzer, tenant and context fingerprint."""
+        cache, _ = create_cache()
+        fingerprint = context_fingerprint(language="es")
+        await cache.set("intent", "quiero pagar", {"intent": "debt_payment"}, 0.9, tenant="a", fingerprint=fingerprint)
+
+        assert await cache.get("domain", "quiero pagar", tenant="a", fingerprint=fingerprint) is None
+        assert await cache.get("intent", "quiero pagar", tenant="b", fingerprint=fingerprint) is None
+        other_fingerprint = context_fingerprint(language="en")
+        assert await cache.get("intent", "necesito pagar", tenant="a", fingerprint=other_fingerprint) is None
+        assert await cache.get("intent", "necesito pagar", tenant="a", fingerprint=fingerprint) is not None
+
+    async def test_low_confidence_not_stored(self):
+        """Test that results below min_confidence are not cached."""
+        cache, _ = create_cache()
+
+        assert await cache.set("intent", "hola", {"intent": "greeting"}, 0.5, tenant="org") is False
+        assert await cache.get("intent", "hola", tenant="org") is None
+
+    async def test_lru_eviction(self):
+        """Test that a full bucket evicts the least recently used entry."""
+        cache, _ = create_cache(max_entries=2)
+        await cache.set("intent", "quiero pagar", {"intent": "debt_payment"}, 0.9, tenant="org")
+        await cache.set("intent", "hola", {"intent": "greeting"}, 0.9, tenant="org")
+        await cache.get("intent", "quiero pagar", tenant="org")
+
+        await cache.set("intent", "buen dia", {"intent": "greeting"}, 0.9, tenant="org")
+
+        assert await cache.get("intent", "hola", tenant="org") is None
+        assert await cache.get("intent", "necesito pagar", tenant="org") is not None
+        assert cache.get_stats()["evictions"] == 1
+        assert cache.get_stats()["entries"] == 2
+
+    async def test_expired_entries_miss(self):
+        """Test that entries older than the TTL are not served."""
+        cache, _ = create_cache(ttl_seconds=60)
+        await cache.set("intent", "quiero pagar", {"intent": "debt_payment"}, 0.9, tenant="org")
+        bucket = cache._buckets[("intent", "org")]
+        bucket.stored_at[:] -= 120
+
+        assert await cache.get("intent", "quiero pagar", tenant="org") is None
+        assert await cache.get("intent", "necesito pagar", tenant="org") is None
+
+    async def test_embedding_failure_is_a_miss(self):
+        """Test that embedding errors never raise."""
+        cache, embed = create_cache()
+        await cache.set("intent", "quiero pagar", {"intent": "debt_payment"}, 0.9, tenant="org")
+        embed.side_effect = TimeoutError()
+
+        assert await cache.get("intent", "necesito pagar", tenant="org") is None
+        assert cache.get_stats()["embed_errors"] == 1
+
+    async def test_invalidation_listener_drops_tenant(self):
+        """Test that a followed cache's invalidation drops that tenant and the global entries."""
+        cache, _ = create_cache()
+        bus = CacheInvalidationBus()
+        bus.add_listener("intent_config", cache.invalidate_local)
+        await cache.set("intent", "quiero pagar", {"intent": "debt_payment"}, 0.9, tenant="a")
+        await cache.set("intent", "quiero pagar", {"intent": "debt_payment"}, 0.9, tenant="b")
+        await cache.set("intent", "quiero pagar", {"intent": "debt_payment"}, 0.9)
+
+        await bus.publish("intent_config", organization_id="a")
+
+        assert await cache.get("intent", "quiero pagar", tenant="a") is None
+        assert await cache.get("intent", "quiero pagar") is None
+        assert await cache.get("intent", "quiero pagar", tenant="b") is not None
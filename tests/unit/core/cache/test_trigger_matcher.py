@@ -0,0 +1,110 @@
+"""
+Tests for the compiled trigger matchers.
+
+Verifies:
+- CompiledRoutingMatcher resolves the same config as a priority-ordered scan
+- Global keywords respect word boundaries and alias matching
+- KeywordAutomaton finds every keyword occurring in a message
+"""
+
+from app.core.cache.routing_config_cache import RoutingConfigDTO
+from app.core.cache.trigger_matcher import CompiledRoutingMatcher, KeywordAutomaton
+
+
+def create_config(
+    config_type: str,
+    trigger: str,
+    intent: str,
+    metadata: dict | None = None,
+) -> RoutingConfigDTO:
+    """Helper to create a routing config."""
+    return RoutingConfigDTO(
+        id=f"{config_type}:{trigger}",
+        config_type=config_type,
+        trigger_value=trigger,
+        target_intent=intent,
+        target_node=None,
+        priority=0,
+        requires_auth=False,
+        clears_context=False,
+        metadata=metadata,
+        display_name=None,
+    )
+
+
+class TestCompiledRoutingMatcher:
+    """Tests for routing config matching."""
+
+    def test_global_keywords_in_priority_order(self):
+        """Test that all matching keywords come back in config order."""
+        pagar = create_config("global_keyword", "pagar", "pay_debt_menu")
+        pagar_deuda = create_config("global_keyword", "Pagar Deuda", "pay_full")
+        matcher = CompiledRoutingMatcher({"global_keyword": [pagar, pagar_deuda]})
+
+        assert matcher.global_keywords("pagar deuda ahora") == [pagar, pagar_deuda]
+        assert matcher.global_keywords("pagardeuda") == []
+
+    def test_global_keyword_alias(self):
+        """Test alias matching and de-duplication of trigger + alias matches."""
+        menu = create_config("global_keyword", "menu", "show_menu", {"aliases": ["Menú", "menu"]})
+        matcher = CompiledRoutingMatcher({"global_keyword": [menu]})
+
+        assert matcher.global_keywords("menú principal") == [menu]
+        assert matcher.global_keywords("menu") == [menu]
+
+    def test_find_follows_type_priority(self):
+        """Test that global keywords win over buttons and menu options."""
+        keyword = create_config("global_keyword", "1", "show_menu")
+        menu_option = create_config("menu_option", "1", "check_debt")
+        button = create_config("button_mapping", "BTN_PAY", "pay_full")
+        matcher = CompiledRoutingMatcher(
+            {"menu_option": [menu_option], "button_mapping": [button], "global_keyword": [keyword]}
+        )
+
+        assert matcher.find("1") is keyword
+        assert matcher.find(" btn_pay ") is button
+        assert matcher.find("2") is None
+
+    def test_find_prefix_and_exact_alias(self):
+        """Test find(): triggers match as prefixes, aliases only exactly."""
+        salir = create_config("global_keyword", "salir", "farewell", {"aliases": ["chau"]})
+        matcher = CompiledRoutingMatcher({"global_keyword": [salir]})
+
+        assert matcher.find("salirme") is salir
+        assert matcher.find("chau") is salir
+        assert matcher.find("chau gracias") is None
+
+    def test_exact_and_text_aliases(self):
+        """Test case-sensitive exact lookups and button text aliases."""
+        first = create_config("button_mapping", "btn_pay_full", "pay_full", {"text_aliases": ["Pagar Todo"]})
+        duplicate = create_config("button_mapping", "btn_pay_full", "pay_other")
+        matcher = CompiledRoutingMatcher({"button_mapping": [first, duplicate]})
+
+        assert matcher.exact("button_mapping", "btn_pay_full") is first
+        assert matcher.exact("button_mapping", "BTN_PAY_FULL") is None
+        assert matcher.button_id_for_text("pagar todo") == "btn_pay_full"
+
+
+class TestKeywordAutomaton:
+    """Tests for Aho-Corasick keyword matching."""
+
+    def test_finds_overlapping_keywords(self):
+        """Test keywords that overlap or are suffixes of each other."""
+        automaton = KeywordAutomaton(
+            [("he", "a"), ("she", "b"), ("hers", "c"), ("his", "d")]
+        )
+
+        found = automaton.find("ushers")
+
+        assert {intent: set(keywords) for intent, keywords in found.items()} == {
+            "a": {"he"},
+            "b": {"she"},
+            "c": {"hers"},
+        }
+
+    def test_reports_each_keyword_once(self):
+        """Test that repeated occurrences are reported once per value."""
+        automaton = KeywordAutomaton([("agregar", "account_add_new"), ("nueva", "account_add_new")])
+
+        assert automaton.find("agregar, agregar una nueva") == {"account_add_new": ["agregar", "nueva"]}
+        assert automaton.find("hola") == {}
@@ -0,0 +1,38 @@
+"""
+Tests for checkpoint message window trimming.
+"""
+
+from langchain_core.messages import AIMessage, HumanMessage, RemoveMessage
+from langgraph.graph.message import add_messages
+
+from app.core.graph.execution.message_window import trim_message_window
+
+
+def make_messages(count: int) -> list:
+    """Build alternating human/AI messages with ids."""
+    return [
+        (HumanMessage if i % 2 == 0 else AIMessage)(content=f"m{i}", id=f"id{i}")
+        for i in range(count)
+    ]
+
+
+class TestTrimMessageWindow:
+    """Tests for trim_message_window."""
+
+    def test_no_trim_within_window_and_slack(self):
+        """Test that histories up to max + slack are left untouched."""
+        assert trim_message_window(make_messages(12), max_messages=10, slack=2) == []
+
+    def test_trims_to_last_messages(self):
+        """Test that the reducer keeps only the most recent messages."""
+        messages = make_messages(13)
+
+        removals = trim_message_window(messages, max_messages=10, slack=2)
+        remaining = add_messages(messages, removals)
+
+        assert all(isinstance(r, RemoveMessage) for r in removals)
+        assert [m.content for m in remaining] == [f"m{i}" for i in range(3, 13)]
+
+    def test_disabled(self):
+        """Test that a window of 0 disables trimming."""
+        assert trim_message_window(make_messages(100), max_messages=0) == []
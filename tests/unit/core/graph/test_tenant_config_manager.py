@@ -0,0 +1,95 @@
+"""
+Tests for request-scoped tenant configuration.
+
+Verifies:
+- Tenant config is applied to per-tenant agent views, not shared agents
+- Concurrent requests of different tenants see their own configuration
+- Views are cached by organization and registry version
+"""
+
+import asyncio
+import uuid
+from typing import Any
+
+import pytest
+
+from app.core.graph.execution.tenant_config_manager import TenantConfigManager
+from app.core.graph.factories.agent_factory import AgentFactory
+from app.core.schemas.tenant_agent_config import AgentConfig, TenantAgentRegistry
+
+
+class FakeAgent:
+    """Minimal agent supporting tenant config."""
+
+    def __init__(self):
+        self.model = "default"
+        self.config: dict[str, Any] = {}
+
+    def apply_tenant_config(self, agent_config: AgentConfig) -> None:
+        self.model = agent_config.config.get("model", self.model)
+        self.config.update(agent_config.config)
+
+
+def make_registry(model: str, org_id: uuid.UUID | None = None) -> TenantAgentRegistry:
+    """Build a registry configuring greeting_agent with a model."""
+    return TenantAgentRegistry(
+        organization_id=org_id or uuid.uuid4(),
+        agents={
+            "greeting_agent": AgentConfig(
+                agent_key="greeting_agent",
+                display_name="Greeting",
+                config={"model": model},
+            )
+        },
+    )
+
+
+@pytest.fixture
+def factory():
+    """Factory with one shared agent."""
+    factory = AgentFactory(llm=None, postgres=None, config={})
+    factory.agents = {"orchestrator": object(), "greeting_agent": FakeAgent()}
+    return factory
+
+
+class TestTenantAgentViews:
+    """Tests for AgentFactory.get_tenant_agents."""
+
+    def test_shared_agent_is_not_mutated(self, factory):
+        """Test that tenant config only affects the view."""
+        views = factory.get_tenant_agents(make_registry("tenant-model"))
+
+        assert views["greeting_agent"].model == "tenant-model"
+        assert factory.agents["greeting_agent"].model == "default"
+        assert factory.agents["greeting_agent"].config == {}
+        assert views["orchestrator"] is factory.agents["orchestrator"]
+
+    def test_views_cached_by_registry_version(self, factory):
+        """Test that the same config reuses views and a changed config rebuilds them."""
+        org_id = uuid.uuid4()
+        first = factory.get_tenant_agents(make_registry("a", org_id))
+
+        assert factory.get_tenant_agents(make_registry("a", org_id)) is first
+        assert factory.get_tenant_agents(make_registry("b", org_id))["greeting_agent"].model == "b"
+
+
+class TestTenantConfigManager:
+    """Tests for request-scoped registry resolution."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_are_isolated(self, factory):
+        """Test that two tenants processed concurrently see their own agents."""
+        manager = TenantConfigManager(factory)
+
+        async def request(model: str) -> str:
+            manager.set_tenant_registry(make_registry(model))
+            await asyncio.sleep(0.01)
+            try:
+                return manager.get_request_agents()["greeting_agent"].model
+            finally:
+                manager.reset_tenant_config()
+
+        results = await asyncio.gather(request("tenant-a"), request("tenant-b"))
+
+        assert results == ["tenant-a", "tenant-b"]
+        assert manager.get_request_agents() is factory.agents
@@ -0,0 +1,128 @@
+"""
+Tests for per-tenant HNSW index helpers and hybrid search SQL.
+"""
+
+import sqlite3
+import uuid
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.core.tenancy.vector_index_manager import (
+    TenantIndexManager,
+    _organization_from_index,
+    index_name,
+    knn_predicate,
+)
+from app.core.tenancy.vector_store import RRF_FUSED_CTE, TenantVectorStore
+
+ORG_ID = uuid.UUID("4f8c2b7e-1d2a-4c3b-9e8f-0a1b2c3d4e5f")
+
+
+class TestIndexHelpers:
+    """Tests for index naming and predicates."""
+
+    def test_index_name_round_trip(self):
+        """Test that the full organization id is encoded in the index name."""
+        name = index_name(ORG_ID)
+
+        assert name == f"idx_tenant_docs_hnsw_{ORG_ID.hex}"
+        assert _organization_from_index(name) == str(ORG_ID)
+        assert _organization_from_index("idx_tenant_docs_hnsw_4f8c2b7e") is None
+
+    def test_knn_predicate_uses_literal(self):
+        """Test that the predicate embeds the organization id as a literal."""
+        predicate = knn_predicate(ORG_ID)
+
+        assert f"organization_id = '{ORG_ID}'::uuid" in predicate
+        assert "embedding IS NOT NULL" in predicate
+
+    def test_knn_predicate_rejects_non_uuid(self):
+        """Test that non-UUID input cannot reach the SQL."""
+        with pytest.raises(ValueError):
+            knn_predicate("x'; DROP TABLE tenant_documents; --")  # type: ignore[arg-type]
+
+    def test_create_index_sql(self):
+        """Test the partial HNSW index DDL."""
+        manager = TenantIndexManager(engine=MagicMock(), m=24, ef_construction=100, min_documents=10)
+
+        sql = manager.create_index_sql(ORG_ID)
+
+        assert sql.startswith(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {index_name(ORG_ID)}")
+        assert "USING hnsw (embedding vector_cosine_ops)" in sql
+        assert "WITH (m = 24, ef_construction = 100)" in sql
+        assert sql.endswith(f"WHERE {knn_predicate(ORG_ID)}")
+
+
+class TestHybridSearch:
+    """Tests for RRF hybrid search in TenantVectorStore."""
+
+    @pytest.mark.asyncio
+    async def test_hybrid_search_fuses_ranked_candidates(self):
+        """Test that hybrid search runs the KNN/full-text RRF query and normalizes scores."""
+        embedder = MagicMock()
+        embedder.embed_text = AsyncMock(return_value=[0.1, 0.2])
+        store = TenantVectorStore(organization_id=ORG_ID, embedding_model=embedder)
+        store._rrf_k = 60
+
+        row = SimpleNamespace(
+            id=uuid.uuid4(),
+            title="Horarios",
+            content="Abrimos de 8 a 20",
+            document_type="faq",
+            category=None,
+            tags=None,
+            meta_data={},
+            rrf_score=1.0 / 61,
+            vector_score=0.91,
+            text_score=None,
+        )
+        db = MagicMock()
+        db.execute = AsyncMock(side_effect=[MagicMock(), MagicMock(fetchall=MagicMock(return_value=[row]))])
+
+        @asynccontextmanager
+        async def fake_context():
+            yield db
+
+        with patch("app.core.tenancy.vector_store.get_async_db_context", fake_context):
+            results = await store.hybrid_search(
+                "horarios", top_k=3, vector_weight=0.7, keyword_weight=0.3, filter_metadata={"category": "faq"}
+            )
+
+        ef_sql = str(db.execute.call_args_list[0].args[0])
+        sql, params = str(db.execute.call_args_list[1].args[0]), db.execute.call_args_list[1].args[1]
+        assert "SET LOCAL hnsw.ef_search" in ef_sql
+        assert knn_predicate(ORG_ID) in sql
+        assert RRF_FUSED_CTE in sql
+        assert sql.count("AND category = :category") == 2
+        assert params["limit"] == 3 and params["candidates"] >= 3
+
+        assert len(results) == 1
+        assert results[0].score == pytest.approx(1.0)
+        assert results[0].document.metadata["vector_score"] == 0.91
+        assert results[0].document.metadata["text_score"] is None
+
+    @pytest.mark.parametrize("weights", [(1, 1), (0.7, 0.3)])
+    def test_rrf_fusion_ranks_documents_found_by_both(self, weights):
+        """Test that a document ranked high in both lists comes first with a non-zero score.
+
+        Integer weights reproduce how Postgres types untyped parameters next to
+        the bigint row_number() ranks; the fusion must still divide in floating point.
+        """
+        db = sqlite3.connect(":memory:")
+        db.execute("CREATE TABLE vector_hits (id TEXT, rank INTEGER, vector_score REAL)")
+        db.execute("CREATE TABLE text_hits (id TEXT, rank INTEGER, text_score REAL)")
+        db.executemany("INSERT INTO vector_hits VALUES (?, ?, ?)", [("vector_only", 1, 0.9), ("both", 2, 0.8)])
+        db.executemany("INSERT INTO text_hits VALUES (?, ?, ?)", [("text_only", 1, 0.5), ("both", 2, 0.4)])
+        vector_weight, keyword_weight = weights
+
+        rows = db.execute(
+            f"WITH {RRF_FUSED_CTE} SELECT id, rrf_score FROM fused",
+            {"vector_weight": vector_weight, "keyword_weight": keyword_weight, "rrf_k": 60, "limit": 3},
+        ).fetchall()
+
+        assert rows[0] == ("both", pytest.approx((vector_weight + keyword_weight) / 62))
+        assert {row[0] for row in rows} == {"both", "vector_only", "text_only"}
+        assert all(score > 0 for _, score in rows)
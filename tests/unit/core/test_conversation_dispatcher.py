@@ -0,0 +1,120 @@
+"""
+Tests for ConversationDispatcher.
+
+Verifies:
+- FIFO ordering within a conversation
+- Bounded concurrency across conversations
+- Per-tenant cap and round-robin fairness
+"""
+
+import asyncio
+
+import pytest
+
+from app.core.conversation_dispatcher import ConversationDispatcher
+
+
+class TestConversationOrdering:
+    """Tests for per-conversation ordering."""
+
+    @pytest.mark.asyncio
+    async def test_same_session_runs_sequentially_in_order(self):
+        """Test that jobs of one conversation never overlap and keep FIFO order."""
+        dispatcher = ConversationDispatcher(max_concurrency=10, max_per_tenant=10)
+        events: list[str] = []
+
+        def job(name: str):
+            async def run():
+                events.append(f"start:{name}")
+                await asyncio.sleep(0.01)
+                events.append(f"end:{name}")
+                return name
+
+            return run
+
+        futures = [dispatcher.submit("whatsapp_1", "did", job(str(i))) for i in range(3)]
+        results = await asyncio.gather(*futures)
+
+        assert results == ["0", "1", "2"]
+        assert events == ["start:0", "end:0", "start:1", "end:1", "start:2", "end:2"]
+
+    @pytest.mark.asyncio
+    async def test_failure_does_not_block_next_message(self):
+        """Test that a failing job propagates its error and releases the conversation."""
+        dispatcher = ConversationDispatcher()
+
+        async def fail():
+            raise RuntimeError("boom")
+
+        async def ok():
+            return "ok"
+
+        first = dispatcher.submit("whatsapp_1", "did", fail)
+        second = dispatcher.submit("whatsapp_1", "did", ok)
+
+        with pytest.raises(RuntimeError):
+            await first
+        assert await second == "ok"
+
+
+class TestConcurrencyLimits:
+    """Tests for global and per-tenant limits."""
+
+    @pytest.mark.asyncio
+    async def test_global_concurrency_bound(self):
+        """Test that no more than max_concurrency jobs run at once."""
+        dispatcher = ConversationDispatcher(max_concurrency=2, max_per_tenant=10)
+        running = 0
+        peak = 0
+
+        async def job():
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+        await asyncio.gather(*[dispatcher.submit(f"s{i}", "did", job) for i in range(6)])
+
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_noisy_tenant_does_not_starve_others(self):
+        """Test that a quiet tenant is served while a noisy tenant is capped."""
+        dispatcher = ConversationDispatcher(max_concurrency=3, max_per_tenant=2)
+        started: list[str] = []
+        release = asyncio.Event()
+
+        def job(tenant: str):
+            async def run():
+                started.append(tenant)
+                await release.wait()
+
+            return run
+
+        futures = [dispatcher.submit(f"noisy_{i}", "noisy", job("noisy")) for i in range(10)]
+        futures.append(dispatcher.submit("quiet_0", "quiet", job("quiet")))
+        await asyncio.sleep(0)
+
+        assert started.count("noisy") == 2
+        assert "quiet" in started
+
+        release.set()
+        await asyncio.gather(*futures)
+
+    @pytest.mark.asyncio
+    async def test_rejects_when_full(self):
+        """Test backpressure when max_pending is reached."""
+        dispatcher = ConversationDispatcher(max_concurrency=1, max_pending=1)
+        blocker = asyncio.Event()
+
+        async def job():
+            await blocker.wait()
+
+        running = dispatcher.submit("s1", "did", job)
+        waiting = dispatcher.submit("s1", "did", job)
+        with pytest.raises(asyncio.QueueFull):
+            dispatcher.submit("s1", "did", job)
+
+        blocker.set()
+        await asyncio.gather(running, waiting)
@@ -0,0 +1,137 @@
+"""
+Tests for MessageCoalescer.
+
+Verifies:
+- Rapid-fire messages are flushed once as a single batch
+- Disabled window processes immediately
+- Flush messages close the open buffer preserving order
+- Submitters are released when the flush task is cancelled
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from app.core.message_batcher import BatchMessage
+from app.core.message_coalescer import MessageCoalescer
+
+
+def _message(content: str) -> BatchMessage:
+    return BatchMessage(user_id="u1", message_id=content, content=content, timestamp=time.time())
+
+
+class TestMessageCoalescer:
+    """Tests for debounce behavior."""
+
+    @pytest.mark.asyncio
+    async def test_rapid_messages_flush_once(self):
+        """Test that messages inside the window reach the handler together."""
+        coalescer = MessageCoalescer(default_window=0.05, max_wait=1.0)
+        calls: list[list[str]] = []
+
+        async def handler(key, messages):
+            calls.append([m.content for m in messages])
+            return len(messages)
+
+        async def send(content: str, delay: float):
+            await asyncio.sleep(delay)
+            return await coalescer.submit("whatsapp_1", _message(content), handler)
+
+        results = await asyncio.gather(
+            send("hola", 0),
+            send("quiero", 0.01),
+            send("pagar mi deuda", 0.02),
+        )
+
+        assert calls == [["hola", "quiero", "pagar mi deuda"]]
+        assert results == [3, 3, 3]
+
+    @pytest.mark.asyncio
+    async def test_zero_window_processes_immediately(self):
+        """Test that a disabled window bypasses buffering."""
+        coalescer = MessageCoalescer(default_window=1.0)
+        calls: list[int] = []
+
+        async def handler(key, messages):
+            calls.append(len(messages))
+
+        await coalescer.submit("whatsapp_1", _message("hola"), handler, window=0)
+
+        assert calls == [1]
+
+    @pytest.mark.asyncio
+    async def test_max_wait_caps_buffering(self):
+        """Test that a steady stream of messages is flushed after max_wait."""
+        coalescer = MessageCoalescer(default_window=0.05, max_wait=0.08)
+        calls: list[int] = []
+
+        async def handler(key, messages):
+            calls.append(len(messages))
+
+        async def send(index: int):
+            await asyncio.sleep(index * 0.03)
+            await coalescer.submit("whatsapp_1", _message(str(index)), handler)
+
+        await asyncio.gather(*[send(i) for i in range(5)])
+
+        assert len(calls) >= 2
+        assert sum(calls) == 5
+
+    @pytest.mark.asyncio
+    async def test_flush_message_closes_open_buffer(self):
+        """Test that a non-delayable message flushes the buffer in arrival order."""
+        coalescer = MessageCoalescer(default_window=10.0, max_wait=10.0)
+        calls: list[list[str]] = []
+
+        async def handler(key, messages):
+            calls.append([m.content for m in messages])
+
+        async def send_button():
+            await asyncio.sleep(0.01)
+            await coalescer.submit("whatsapp_1", _message("button"), handler, flush=True)
+
+        await asyncio.wait_for(
+            asyncio.gather(coalescer.submit("whatsapp_1", _message("hola"), handler), send_button()),
+            timeout=1.0,
+        )
+
+        assert calls == [["hola", "button"]]
+
+    @pytest.mark.asyncio
+    async def test_handler_error_propagates_to_all_submitters(self):
+        """Test that every message of the batch sees the handler failure."""
+        coalescer = MessageCoalescer(default_window=0.02)
+
+        async def handler(key, messages):
+            raise RuntimeError("boom")
+
+        results = await asyncio.gather(
+            coalescer.submit("whatsapp_1", _message("a"), handler),
+            coalescer.submit("whatsapp_1", _message("b"), handler),
+            return_exceptions=True,
+        )
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+    @pytest.mark.asyncio
+    async def test_cancelled_flush_releases_submitters(self):
+        """Test that cancelling a running batch fails its submitters instead of hanging them."""
+        coalescer = MessageCoalescer(default_window=0.01)
+        started = asyncio.Event()
+
+        async def handler(key, messages):
+            started.set()
+            await asyncio.sleep(10)
+
+        submits = [
+            asyncio.create_task(coalescer.submit("whatsapp_1", _message(content), handler)) for content in ("a", "b")
+        ]
+        await started.wait()
+        for task in coalescer._tasks:
+            task.cancel()
+
+        results = await asyncio.wait_for(asyncio.gather(*submits, return_exceptions=True), timeout=1.0)
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert coalescer.get_stats()["status"]["open_buffers"] == 0
@@ -0,0 +1,118 @@
+# ============================================================================
+# Tests for MedicalGraphPool
+# ============================================================================
+"""Unit tests for MedicalGraphPool.
+
+Tests the per-institution pool of compiled graphs used by
+MedicalAppointmentsAgent: reuse, shared concurrent builds, LRU eviction
+and deferred closing of graphs still in use.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.domains.medical_appointments.agents.graph_pool import MedicalGraphPool
+
+
+def institution_config(institution: str, **overrides) -> dict:
+    """Build a normalized institution config."""
+    return {"institution": institution, "base_url": f"https://{institution}.example/soap", **overrides}
+
+
+def create_pool(max_size: int = 2) -> tuple[MedicalGraphPool, AsyncMock, AsyncMock]:
+    """Create a pool with fake graph factory and eviction hook."""
+
+    async def build(config: dict) -> MagicMock:
+        await asyncio.sleep(0)
+        return MagicMock(name=f"graph-{config['institution']}")
+
+    factory = AsyncMock(side_effect=build)
+    on_evict = AsyncMock()
+    return MedicalGraphPool(max_size=max_size, factory=factory, on_evict=on_evict), factory, on_evict
+
+
+class TestMedicalGraphPool:
+    """Tests for MedicalGraphPool."""
+
+    @pytest.mark.asyncio
+    async def test_switching_institutions_reuses_graphs(self) -> None:
+        """Alternating institutions builds each graph once."""
+        pool, factory, _ = create_pool()
+
+        graphs = []
+        for institution in ["patologia_digestiva", "mercedario", "patologia_digestiva", "mercedario"]:
+            async with pool.lease(institution_config(institution)) as graph:
+                graphs.append(graph)
+
+        assert factory.await_count == 2
+        assert graphs[0] is graphs[2] and graphs[1] is graphs[3]
+        assert pool.get_stats()["hits"] == 2
+
+    @pytest.mark.asyncio
+    async def test_config_change_builds_new_version(self) -> None:
+        """A changed config for the same institution gets its own graph."""
+        pool, factory, _ = create_pool()
+
+        async with pool.lease(institution_config("mercedario")) as old:
+            pass
+        async with pool.lease(institution_config("mercedario", timezone="America/Argentina/San_Juan")) as new:
+            pass
+
+        assert factory.await_count == 2
+        assert old is not new
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_one_build(self) -> None:
+        """Concurrent leases of a missing graph wait for a single build."""
+        pool, factory, _ = create_pool()
+
+        async def use() -> object:
+            async with pool.lease(institution_config("mercedario")) as graph:
+                return graph
+
+        graphs = await asyncio.gather(*(use() for _ in range(5)))
+
+        assert factory.await_count == 1
+        assert all(graph is graphs[0] for graph in graphs)
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction_closes_unused_graph(self) -> None:
+        """The least recently used graph is evicted and closed."""
+        pool, _, on_evict = create_pool(max_size=2)
+
+        for institution in ["a", "b", "a", "c"]:
+            async with pool.lease(institution_config(institution)) as graph:
+                if institution == "b":
+                    evicted = graph
+
+        on_evict.assert_awaited_once_with(evicted)
+        assert pool.get_stats()["institutions"] == ["a", "c"]
+
+    @pytest.mark.asyncio
+    async def test_evicted_graph_closed_after_last_lease(self) -> None:
+        """A graph evicted while in use is closed only when released."""
+        pool, _, on_evict = create_pool(max_size=1)
+
+        async with pool.lease(institution_config("a")) as in_use:
+            async with pool.lease(institution_config("b")):
+                pass
+            on_evict.assert_not_awaited()
+
+        on_evict.assert_awaited_once_with(in_use)
+
+    @pytest.mark.asyncio
+    async def test_failed_build_is_retried(self) -> None:
+        """A build error reaches the caller and the next lease builds again."""
+        pool, factory, _ = create_pool()
+        factory.side_effect = [RuntimeError("compile failed"), MagicMock()]
+
+        with pytest.raises(RuntimeError, match="compile failed"):
+            async with pool.lease(institution_config("a")):
+                pass
+        async with pool.lease(institution_config("a")):
+            pass
+
+        assert pool.get_stats()["build_errors"] == 1
+        assert pool.get_stats()["size"] == 1
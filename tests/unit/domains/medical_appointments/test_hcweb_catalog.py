@@ -0,0 +1,119 @@
+# ============================================================================
+# Tests for HCWebCatalog
+# ============================================================================
+"""Unit tests for the HCWeb catalog cache.
+
+Tests that catalog and availability lookups made through HCWebSOAPClient
+are reused per institution, invalidated by bookings and prefetched while
+they are in use.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from app.domains.medical_appointments.infrastructure.external.hcweb import (
+    CatalogCacheConfig,
+    HCWebCatalog,
+    HCWebSOAPClient,
+)
+
+
+def soap_response(action: str, body: str) -> str:
+    """Build a SOAP envelope with a method result."""
+    return (
+        '<?xml version="1.0" encoding="utf-8"?>'
+        '<soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/"><soap:Body>'
+        f'<{action}Response xmlns="http://tempuri.org/"><{action}Result>{body}</{action}Result></{action}Response>'
+        "</soap:Body></soap:Envelope>"
+    )
+
+
+class FakeHCWeb:
+    """Fake HCWeb SOAP service counting calls per action."""
+
+    def __init__(self) -> None:
+        self.calls: dict[str, int] = {}
+        self.fail: set[str] = set()
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        action = request.headers["SOAPAction"].rsplit("/", 1)[-1]
+        self.calls[action] = self.calls.get(action, 0) + 1
+        await asyncio.sleep(0)
+        if action in self.fail:
+            return httpx.Response(200, text=soap_response(action, "<ContainsErrors>true</ContainsErrors>"))
+        return httpx.Response(200, text=soap_response(action, f"<valor>{action}-{self.calls[action]}</valor>"))
+
+
+def create_client(fake: FakeHCWeb, **config) -> tuple[HCWebSOAPClient, HCWebCatalog]:
+    """Create a SOAP client with its own catalog, calling the fake service."""
+    catalog = HCWebCatalog("test", CatalogCacheConfig(**config))
+    client = HCWebSOAPClient(base_url="http://hcweb.test/WsHcweb.asmx", institution_id="1", catalog=catalog)
+    client._client = httpx.AsyncClient(transport=httpx.MockTransport(fake))
+    return client, catalog
+
+
+class TestHCWebCatalog:
+    """Tests for HCWebCatalog."""
+
+    @pytest.mark.asyncio
+    async def test_catalog_lookups_reused(self) -> None:
+        """Specialties are fetched once; concurrent lookups share the call."""
+        fake = FakeHCWeb()
+        client, catalog = create_client(fake)
+
+        responses = await asyncio.gather(*(client.obtener_especialidades_bot() for _ in range(3)))
+        again = await client.obtener_especialidades_bot()
+
+        assert fake.calls == {"EspecialidadesBot": 1}
+        assert all(r.data == {"valor": "EspecialidadesBot-1"} for r in [*responses, again])
+        # Callers get copies of the cached response
+        again.data["valor"] = "changed"
+        assert (await client.obtener_especialidades_bot()).data == {"valor": "EspecialidadesBot-1"}
+        assert catalog.get_stats()["coalesced"] == 2
+
+    @pytest.mark.asyncio
+    async def test_errors_not_cached(self) -> None:
+        """Error responses are returned but not reused."""
+        fake = FakeHCWeb()
+        fake.fail.add("ObtenerPrestadores")
+        client, _ = create_client(fake)
+
+        first = await client.obtener_prestadores("12")
+        second = await client.obtener_prestadores("12")
+
+        assert not first.success and not second.success
+        assert fake.calls["ObtenerPrestadores"] == 2
+
+    @pytest.mark.asyncio
+    async def test_booking_invalidates_provider_availability(self) -> None:
+        """A booking drops the provider's availability, not other providers'."""
+        fake = FakeHCWeb()
+        client, _ = create_client(fake)
+
+        await client.obtener_dias_disponibles("10", "1")
+        await client.obtener_dias_disponibles("20", "1")
+        await client.crear_turno_whatsapp("5", "10", "2025-03-10 10:00")
+        booked = await client.obtener_dias_disponibles("10", "1")
+        await client.obtener_dias_disponibles("20", "1")
+
+        assert booked.data == {"valor": "ObtenerDiasDisponibles-3"}
+        assert fake.calls["ObtenerDiasDisponibles"] == 3
+
+    @pytest.mark.asyncio
+    async def test_prefetch_refreshes_hot_availability(self) -> None:
+        """Availability in use is refreshed before it expires."""
+        fake = FakeHCWeb()
+        client, catalog = create_client(fake, availability_ttl=10.0, prefetch_interval=60.0)
+
+        await client.obtener_horarios_disponibles("10", "2025-03-10")
+        assert await catalog.prefetch() == 1
+        refreshed = await client.obtener_horarios_disponibles("10", "2025-03-10")
+
+        assert refreshed.data == {"valor": "ObtenerHorariosDisponibles-2"}
+        assert fake.calls["ObtenerHorariosDisponibles"] == 2
+
+        await client.close()
+        assert catalog.get_stats()["clients"] == 0
+        assert await catalog.prefetch() == 0
@@ -0,0 +1,159 @@
+# ============================================================================
+# Tests for ReminderDispatcher
+# ============================================================================
+"""Unit tests for ReminderDispatcher.
+
+Tests bounded concurrency, retries of failed sends, resuming a run that
+already sent some reminders, and deferring sends when the DID's daily
+messaging budget is used up.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from app.domains.medical_appointments.infrastructure.scheduler.reminder_dispatcher import (
+    ReminderDispatcher,
+    ReminderProgress,
+)
+from app.integrations.chattigo.exceptions import ChattigoRateLimitError, ChattigoSendError
+from app.integrations.chattigo.rate_limiter import DIDRateLimiter
+
+
+class FakeRedis:
+    """In-memory stand-in for the Redis set commands used by ReminderProgress."""
+
+    def __init__(self) -> None:
+        self.sets: dict[str, set[str]] = {}
+
+    async def smembers(self, key: str) -> set[bytes]:
+        return {member.encode() for member in self.sets.get(key, set())}
+
+    async def sadd(self, key: str, member: str) -> int:
+        self.sets.setdefault(key, set()).add(member)
+        return 1
+
+    async def expire(self, key: str, ttl: int) -> bool:
+        return True
+
+
+def appointments(count: int) -> list[dict]:
+    """Build due appointments."""
+    return [{"idTurno": str(i), "telefono": f"264400{i:04d}"} for i in range(count)]
+
+
+def create_dispatcher(send, redis: FakeRedis, tier: str = "unlimited", **kwargs) -> ReminderDispatcher:
+    """Create a dispatcher with a fast limiter and no retry delay."""
+    options = {"concurrency": 4, "max_attempts": 3, "retry_base_delay": 0.0, "max_rate_wait": 1.0}
+    return ReminderDispatcher(
+        send=send,
+        rate_limiter=DIDRateLimiter("5492644710400", messages_per_second=1000.0, tier=tier),
+        progress=ReminderProgress("schedule-1:2026-10-16", redis=redis),
+        **{**options, **kwargs},
+    )
+
+
+class TestReminderDispatcher:
+    """Tests for ReminderDispatcher."""
+
+    @pytest.mark.asyncio
+    async def test_sends_with_bounded_concurrency(self) -> None:
+        """All reminders are sent with at most `concurrency` in flight."""
+        in_flight, peak = 0, 0
+
+        async def send(appointment: dict) -> bool:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.001)
+            in_flight -= 1
+            return True
+
+        result = await create_dispatcher(send, FakeRedis()).dispatch(appointments(20))
+
+        assert result.sent == 20
+        assert peak == 4
+
+    @pytest.mark.asyncio
+    async def test_failed_sends_retried(self) -> None:
+        """429s and connection errors are retried; persistent failures count as failed."""
+        attempts: dict[str, int] = {}
+
+        async def send(appointment: dict) -> bool:
+            key = appointment["idTurno"]
+            attempts[key] = attempts.get(key, 0) + 1
+            if key == "0" and attempts[key] == 1:
+                raise ChattigoRateLimitError("Rate limited", retry_after=0)
+            if key == "1":
+                raise httpx.ConnectError("connection refused")
+            return True
+
+        result = await create_dispatcher(send, FakeRedis()).dispatch(appointments(3))
+
+        assert (result.sent, result.failed) == (2, 1)
+        assert attempts == {"0": 2, "1": 3, "2": 1}
+
+    @pytest.mark.asyncio
+    async def test_errors_after_request_sent_not_retried(self) -> None:
+        """Read timeouts and send errors may follow a delivered reminder, so they are not resent."""
+        attempts: dict[str, int] = {}
+
+        async def send(appointment: dict) -> bool:
+            key = appointment["idTurno"]
+            attempts[key] = attempts.get(key, 0) + 1
+            if key == "0":
+                raise httpx.ReadTimeout("timed out")
+            raise ChattigoSendError("HTTP 503")
+
+        result = await create_dispatcher(send, FakeRedis()).dispatch(appointments(2))
+
+        assert (result.sent, result.failed) == (0, 2)
+        assert attempts == {"0": 1, "1": 1}
+
+    @pytest.mark.asyncio
+    async def test_rerun_resumes_progress(self) -> None:
+        """A rerun of the same run only sends reminders not sent before."""
+        redis = FakeRedis()
+        sent: list[str] = []
+
+        async def send(appointment: dict) -> bool:
+            if appointment["idTurno"] == "2" and "2" not in sent:
+                sent.append("2")
+                raise RuntimeError("timeout")
+            sent.append(appointment["idTurno"])
+            return True
+
+        first = await create_dispatcher(send, redis, max_attempts=1).dispatch(appointments(4))
+        second = await create_dispatcher(send, redis, max_attempts=1).dispatch(appointments(4))
+
+        assert (first.sent, first.failed) == (3, 1)
+        assert (second.sent, second.skipped) == (1, 3)
+        assert sorted(redis.sets["reminders:sent:schedule-1:2026-10-16"]) == ["0", "1", "2", "3"]
+
+    @pytest.mark.asyncio
+    async def test_daily_budget_defers_remaining(self) -> None:
+        """Sends beyond the DID's daily tier budget are deferred, not failed."""
+
+        async def send(appointment: dict) -> bool:
+            return True
+
+        dispatcher = create_dispatcher(send, FakeRedis(), tier="tier_1k")
+        dispatcher.rate_limiter._daily._tokens = 2
+
+        result = await dispatcher.dispatch(appointments(5))
+
+        assert (result.sent, result.deferred, result.failed) == (2, 3, 0)
+
+    @pytest.mark.asyncio
+    async def test_appointments_without_phone_skipped(self) -> None:
+        """Reminders the sender cannot deliver are skipped and not recorded."""
+        redis = FakeRedis()
+
+        async def send(appointment: dict) -> bool:
+            return False
+
+        result = await create_dispatcher(send, redis).dispatch(appointments(2))
+
+        assert (result.sent, result.skipped) == (0, 2)
+        assert redis.sets == {}
@@ -0,0 +1,88 @@
+# ============================================================================
+# Tests for SoapResponseParser
+# ============================================================================
+"""Unit tests for SoapResponseParser.
+
+Tests incremental parsing of HCWeb SOAP responses: results, errors and
+faults, chunked input and early completion.
+"""
+
+from app.domains.medical_appointments.infrastructure.external.hcweb import SoapResponseParser
+
+RESPONSE = (
+    '<?xml version="1.0" encoding="utf-8"?>'
+    '<soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/">'
+    "<soap:Header><Trace>ignored</Trace></soap:Header><soap:Body>"
+    '<EspecialidadesBotResponse xmlns="http://tempuri.org/"><EspecialidadesBotResult>'
+    "<especialidad><id>1</id><nombre>Cardiología</nombre></especialidad>"
+    "<especialidad><id>2</id><nombre>Clínica</nombre></especialidad>"
+    "</EspecialidadesBotResult></EspecialidadesBotResponse>"
+    "</soap:Body></soap:Envelope>"
+)
+
+FAULT = (
+    '<soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/"><soap:Body>'
+    "<soap:Fault><faultcode>soap:Server</faultcode><faultstring>Server was unable</faultstring></soap:Fault>"
+    "</soap:Body></soap:Envelope>"
+)
+
+
+class TestSoapResponseParser:
+    """Tests for SoapResponseParser."""
+
+    def test_parse_result(self) -> None:
+        """Extracts the method result as a dict."""
+        response = SoapResponseParser().parse(RESPONSE, "EspecialidadesBot")
+
+        assert response.success
+        assert response.data == {
+            "especialidad": [{"id": "1", "nombre": "Cardiología"}, {"id": "2", "nombre": "Clínica"}]
+        }
+
+    def test_chunked_bytes_match_full_parse(self) -> None:
+        """Feeding small byte chunks gives the same result."""
+        parser = SoapResponseParser()
+        data = RESPONSE.encode("utf-8")
+
+        parse = parser.start("EspecialidadesBot")
+        for i in range(0, len(data), 7):
+            parse.feed(data[i : i + 7])
+
+        assert parse.result() == parser.parse(RESPONSE, "EspecialidadesBot")
+
+    def test_done_after_result_element(self) -> None:
+        """The parse completes at the end of the result; trailing data is skipped."""
+        parse = SoapResponseParser().start("EspecialidadesBot")
+        end = RESPONSE.index("</EspecialidadesBotResponse>")
+
+        parse.feed(RESPONSE[:end])
+        assert parse.done
+        parse.feed("<<not xml")
+
+        assert parse.result().success
+
+    def test_result_errors(self) -> None:
+        """ContainsErrors in the result becomes an error response."""
+        body = RESPONSE.replace(
+            "<EspecialidadesBotResult>",
+            "<EspecialidadesBotResult><ContainsErrors>true</ContainsErrors><ErrorMessage>Sin datos</ErrorMessage>",
+        )
+
+        response = SoapResponseParser().parse(body, "EspecialidadesBot")
+
+        assert response.error_code == "HCWEB_ERROR"
+        assert response.error_message == "Sin datos"
+
+    def test_soap_fault_and_missing_result(self) -> None:
+        """Faults are reported; responses without a result are parse errors."""
+        parser = SoapResponseParser()
+
+        assert parser.parse(FAULT, "EspecialidadesBot").error_message == "Server was unable"
+        assert parser.parse(RESPONSE, "ObtenerPrestadores").error_code == "PARSE_ERROR"
+
+    def test_malformed_xml(self) -> None:
+        """Malformed or empty XML is reported as XML_PARSE_ERROR."""
+        parser = SoapResponseParser()
+
+        assert parser.parse("<soap:Envelope><broken", "EspecialidadesBot").error_code == "XML_PARSE_ERROR"
+        assert parser.parse("", "EspecialidadesBot").error_code == "XML_PARSE_ERROR"
@@ -2,10 +2,11 @@
 
 from dataclasses import dataclass
 from typing import Any
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, PropertyMock
 
 import pytest
 
+from app.core.cache.trigger_matcher import CompiledRoutingMatcher
 from app.domains.pharmacy.agents.nodes.routing.matchers.base import MatchContext
 from app.domains.pharmacy.agents.nodes.routing.matchers.button_mapping import (
     ButtonMappingMatcher,
@@ -43,9 +44,12 @@ def list_item_matcher() -> KnownListItemMatcher:
 
 @pytest.fixture
 def mock_config_loader() -> MagicMock:
-    """Create a mock config loader."""
+    """Create a mock config loader; its matcher is compiled from get_configs_by_type."""
     loader = MagicMock()
     loader.escape_intents = frozenset()
+    type(loader).matcher = PropertyMock(
+        side_effect=lambda: CompiledRoutingMatcher({"button_mapping": loader.get_configs_by_type.return_value})
+    )
     return loader
 
 
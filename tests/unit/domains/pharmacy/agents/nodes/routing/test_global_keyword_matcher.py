@@ -2,10 +2,11 @@
 
 from dataclasses import dataclass
 from typing import Any
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, PropertyMock
 
 import pytest
 
+from app.core.cache.trigger_matcher import CompiledRoutingMatcher
 from app.domains.pharmacy.agents.nodes.routing.matchers.base import MatchContext
 from app.domains.pharmacy.agents.nodes.routing.matchers.global_keyword import (
     GlobalKeywordMatcher,
@@ -36,9 +37,12 @@ def matcher() -> GlobalKeywordMatcher:
 
 @pytest.fixture
 def mock_config_loader() -> MagicMock:
-    """Create a mock config loader."""
+    """Create a mock config loader; its matcher is compiled from get_configs_by_type."""
     loader = MagicMock()
     loader.escape_intents = frozenset({"cancel_flow", "farewell", "show_menu"})
+    type(loader).matcher = PropertyMock(
+        side_effect=lambda: CompiledRoutingMatcher({"global_keyword": loader.get_configs_by_type.return_value})
+    )
     return loader
 
 
@@ -0,0 +1,118 @@
+"""
+Tests for PharmacyIntentAnalyzer spaCy scoring.
+
+Verifies that database-pattern intents keep their classification while
+intent similarity is disabled (the default), and that the similarity term
+only applies when PHARMACY_INTENT_SIMILARITY_ENABLED is set.
+"""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import UUID
+
+import pytest
+
+from app.config.settings import Settings
+from app.domains.pharmacy.agents.intent_analyzer import PharmacyIntentAnalyzer
+from app.integrations.nlp import ParsedDoc
+from app.integrations.nlp.spacy_service import ParsedToken
+
+ORG_ID = UUID("0b7d3c6e-2f1a-4e5b-8c9d-1a2b3c4d5e6f")
+MODULE = "app.domains.pharmacy.agents.intent_analyzer"
+
+PATTERNS = {
+    "intents": {
+        "debt_query": {
+            "lemmas": ["deuda", "deber"],
+            "phrases": [{"phrase": "cuanto debo", "match_type": "contains"}],
+        },
+        "info_query": {
+            "lemmas": ["horario", "direccion"],
+            "phrases": [{"phrase": "a que hora", "match_type": "contains"}],
+        },
+        "capability_question": {
+            "lemmas": [],
+            "phrases": [{"phrase": "que puedes hacer", "match_type": "contains"}],
+        },
+    },
+}
+
+# Similarities that would favor info_query for every message
+SIMILARITIES = {"debt_query": 0.0, "info_query": 1.0, "capability_question": 0.0}
+
+STOP_WORDS = {"cuanto", "de", "la", "quiero"}
+
+# (message, lemmas, intent, confidence) from lemma/phrase matches alone
+CASES = [
+    ("cuanto debo", ["cuanto", "deber"], "debt_query", 0.9),
+    ("horario de la farmacia", ["horario", "de", "la", "farmacia"], "info_query", 0.4),
+    ("quiero comprar ibuprofeno", ["querer", "comprar", "ibuprofeno"], "unknown", 0.0),
+]
+
+
+def parsed(message: str, lemmas: list[str]) -> ParsedDoc:
+    """ParsedDoc with one token per word and a unit vector."""
+    tokens = tuple(
+        ParsedToken(
+            text=word,
+            lemma_=lemma,
+            pos_="NOUN",
+            dep_="",
+            is_stop=word in STOP_WORDS,
+            is_punct=False,
+            is_alpha=True,
+            is_digit=False,
+            like_num=False,
+            is_oov=False,
+            has_head=False,
+        )
+        for word, lemma in zip(message.split(), lemmas, strict=True)
+    )
+    return ParsedDoc(
+        text=message, tokens=tokens, ents=(), vector=(1.0, 0.0), has_vector=True, model="es_core_news_sm"
+    )
+
+
+async def classify(message: str, lemmas: list[str], similarity_enabled: bool) -> tuple[str, float, MagicMock]:
+    """Run analyze() with mocked patterns, NLP service and similarity index."""
+    cache = MagicMock()
+    cache.get_patterns = AsyncMock(return_value=PATTERNS)
+    cache.get_similarity_index = AsyncMock(return_value=MagicMock(score=MagicMock(return_value=SIMILARITIES)))
+    nlp = MagicMock(parse=AsyncMock(return_value=parsed(message, lemmas)))
+    settings = SimpleNamespace(PHARMACY_INTENT_SIMILARITY_ENABLED=similarity_enabled)
+
+    with (
+        patch(f"{MODULE}.domain_intent_cache", cache),
+        patch(f"{MODULE}.get_nlp_service", return_value=nlp),
+        patch(f"{MODULE}.get_settings", return_value=settings),
+    ):
+        analyzer = PharmacyIntentAnalyzer(use_llm_fallback=False)
+        analyzer._entity_extractor = MagicMock(extract=MagicMock(return_value={}))
+        result = await analyzer.analyze(message, organization_id=ORG_ID)
+
+    return result.intent, result.confidence, cache.get_similarity_index
+
+
+class TestIntentSimilarityScoring:
+    """Tests for the optional similarity term of intent scores."""
+
+    def test_similarity_disabled_by_default(self):
+        """Test that the setting defaults to off."""
+        assert Settings.model_fields["PHARMACY_INTENT_SIMILARITY_ENABLED"].default is False
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(("message", "lemmas", "intent", "confidence"), CASES)
+    async def test_disabled_keeps_pattern_classification(self, message, lemmas, intent, confidence):
+        """Test that intents classify from lemma/phrase matches only while disabled."""
+        result_intent, result_confidence, similarity_index = await classify(message, lemmas, False)
+
+        assert result_intent == intent
+        assert result_confidence == pytest.approx(confidence)
+        similarity_index.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_enabled_adds_similarity(self):
+        """Test that similarity raises scores once enabled."""
+        assert (await classify("cuanto debo", ["cuanto", "deber"], True))[:2] == ("debt_query", pytest.approx(0.9))
+        assert (await classify(*CASES[1][:2], True))[:2] == ("info_query", pytest.approx(0.7))
+        assert (await classify(*CASES[2][:2], True))[:2] == ("info_query", pytest.approx(0.3))
@@ -0,0 +1,55 @@
+"""
+Tests for MessageProcessor.create_conversation_context.
+
+Verifies that language detection goes through the async detector and is
+skipped when the metadata already carries the language.
+"""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.services.langgraph.message_processor import MessageProcessor
+
+
+@pytest.fixture
+def processor() -> MessageProcessor:
+    """MessageProcessor with a mocked language detector."""
+    processor = MessageProcessor()
+    processor.language_detector = MagicMock()
+    processor.language_detector.adetect_language = AsyncMock(
+        return_value={"language": "en", "confidence": 0.9, "method": "spacy"}
+    )
+    return processor
+
+
+class TestCreateConversationContext:
+    """Tests for conversation context creation."""
+
+    @pytest.mark.asyncio
+    async def test_detects_language_without_blocking(self, processor):
+        """Test that the language is detected with adetect_language."""
+        context = await processor.create_conversation_context("session-1", "Hello there", {"channel": "web"})
+
+        processor.language_detector.adetect_language.assert_awaited_once_with("Hello there")
+        processor.language_detector.detect_language.assert_not_called()
+        assert context.language == "en"
+        assert context.channel == "web"
+
+    @pytest.mark.asyncio
+    async def test_metadata_language_skips_detection(self, processor):
+        """Test that a language in the metadata is used as is."""
+        context = await processor.create_conversation_context("session-1", "Hello there", {"language": "es"})
+
+        processor.language_detector.adetect_language.assert_not_awaited()
+        assert context.language == "es"
+
+    @pytest.mark.asyncio
+    async def test_detection_error_falls_back_to_spanish(self, processor):
+        """Test that a failing detector defaults to Spanish."""
+        processor.language_detector.adetect_language.side_effect = RuntimeError("nlp service down")
+
+        context = await processor.create_conversation_context("session-1", "Hola")
+
+        assert context.language == "es"
+        assert context.channel == "whatsapp"
@@ -0,0 +1,102 @@
+"""
+Tests for coalesce_token_events.
+
+Verifies that pending token deltas are merged per agent when the consumer
+lags, that other events keep their order, and that source errors and early
+exits are handled.
+"""
+
+import asyncio
+
+import pytest
+
+from app.services.langgraph.token_stream import coalesce_token_events
+
+
+def token(delta: str, agent: str = "greeting_agent") -> dict:
+    """Build a graph token event."""
+    return {"type": "token", "data": {"delta": delta, "agent": agent}}
+
+
+async def events_from(items: list[dict], error: Exception | None = None):
+    """Async source yielding items, optionally raising at the end."""
+    for item in items:
+        yield item
+    if error is not None:
+        raise error
+
+
+class TestCoalesceTokenEvents:
+    """Tests for coalesce_token_events."""
+
+    @pytest.mark.asyncio
+    async def test_pending_tokens_merged_per_agent(self):
+        """Deltas buffered while the consumer lags are merged in order."""
+        items = [
+            {"type": "stream_event", "data": {"current_node": "greeting_agent"}},
+            token("Ho"),
+            token("la"),
+            token("!", agent="farewell_agent"),
+            {"type": "final_result", "data": {}},
+        ]
+        stream = coalesce_token_events(events_from(items))
+        first = await anext(stream)
+        # Let the producer drain the source while nothing is consumed
+        await asyncio.sleep(0)
+
+        rest = [event async for event in stream]
+
+        assert first["type"] == "stream_event"
+        assert [(e["type"], e["data"].get("delta")) for e in rest] == [
+            ("token", "Hola"),
+            ("token", "!"),
+            ("final_result", None),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_buffer_is_bounded(self):
+        """The producer waits once max_buffered_events are pending."""
+        pulled = []
+
+        async def source():
+            for i in range(10):
+                pulled.append(i)
+                yield {"type": "stream_event", "data": {"step": i}}
+
+        stream = coalesce_token_events(source(), max_buffered_events=2)
+        await anext(stream)
+        for _ in range(5):
+            await asyncio.sleep(0)
+
+        assert len(pulled) <= 4
+        assert len([event async for event in stream]) == 9
+
+    @pytest.mark.asyncio
+    async def test_source_error_raised_after_buffered_events(self):
+        """Events before a source error are delivered, then the error is raised."""
+        received = []
+
+        with pytest.raises(RuntimeError, match="graph failed"):
+            async for event in coalesce_token_events(events_from([token("Hola")], RuntimeError("graph failed"))):
+                received.append(event)
+
+        assert received == [token("Hola")]
+
+    @pytest.mark.asyncio
+    async def test_early_close_closes_source(self):
+        """Closing the stream early closes the source generator."""
+        closed = asyncio.Event()
+
+        async def source():
+            try:
+                while True:
+                    yield token("x")
+                    await asyncio.sleep(0)
+            finally:
+                closed.set()
+
+        stream = coalesce_token_events(source())
+        await anext(stream)
+        await stream.aclose()
+
+        assert closed.is_set()